@@ -43,7 +43,8 @@ class StrategyAgent(ABC):
         pass
 
     async def send_order(self, symbol: str, side: OrderSide, amount: float, reason: str, 
-                         order_type: OrderType = OrderType.MARKET, price: float = None):
+                         order_type: OrderType = OrderType.MARKET, price: float = None,
+                         stop_loss: float = None, take_profit: float = None):
         """
         Helper to construct and publish a TradeSignal.
         """
@@ -54,6 +55,8 @@ class StrategyAgent(ABC):
             order_type=order_type,
             amount=amount,
             price=price,
+            stop_loss=stop_loss,
+            take_profit=take_profit,
             reason=reason
         )
         self.logger.info(f"Signal generated: {side} {symbol}")
@@ -0,0 +1,197 @@
+"""
+Agent Host — N strategy agents, one event loop, one broker
+==========================================================
+Each StrategyAgent normally builds its own MessageBroker (own Redis client
+and pubsub) and runs as its own process, mostly idle on asyncio.sleep.
+The host runs them all in one loop over a single shared broker:
+
+* One pubsub subscription covers the union of the agents' symbols; every
+  market_data.* message is decoded once and fanned out through a
+  symbol -> agents index, so connections and subscriptions scale with
+  symbols, not agents x symbols.
+* Agent faults stay inside the agent: on_tick exceptions are counted and
+  an agent that fails `max_errors` ticks in a row is quarantined (audited,
+  no longer dispatched); a crashed run() loop is restarted with backoff.
+* Signals from every agent go out through the shared broker unchanged.
+
+Usage:
+    python -m agents.host orb grid dca mm
+"""
+import asyncio
+import importlib
+import logging
+import sys
+import time
+
+from shared.broker import MessageBroker
+from shared.schemas import MarketData, AuditLogEntry
+
+logger = logging.getLogger("AgentHost")
+
+# Agents the host can build by name (same names as krypto-agent@<name>.service)
+AGENTS = {
+    "orb": ("agents.orb", "AugmentedORBAgent"),
+    "grid": ("agents.grid", "GeometricGridAgent"),
+    "dca": ("agents.dca", "DCAAgent"),
+    "mm": ("agents.mm", "MarketMakingAgent"),
+    "arb": ("agents.arb", "SpotFuturesArbAgent"),
+    "sentiment": ("agents.sentiment", "CrossProjectSentimentAgent"),
+    "sniper": ("agents.sniper", "DEXSniperAgent"),
+}
+
+
+class _Slot:
+    """Host-side bookkeeping for one agent."""
+    __slots__ = ("agent", "ticks", "errors", "consecutive", "last_error", "quarantined", "restarts")
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.ticks = 0
+        self.errors = 0
+        self.consecutive = 0
+        self.last_error = None
+        self.quarantined = False
+        self.restarts = 0
+
+
+class AgentHost:
+    def __init__(self, agents=(), broker: MessageBroker = None, max_errors: int = 25,
+                 restart_backoff: float = 5.0, max_backoff: float = 300.0):
+        self.broker = broker or MessageBroker()
+        self.max_errors = max_errors
+        self.restart_backoff = restart_backoff
+        self.max_backoff = max_backoff
+        self.slots = {}
+        self._routes = {}  # symbol -> [_Slot]
+        self._tasks = []
+        self.running = False
+        self.messages = 0
+        for agent in agents:
+            self.add(agent)
+
+    def add(self, agent):
+        """Registers an agent and rebinds it onto the shared broker."""
+        if agent.strategy_id in self.slots:
+            raise ValueError(f"Duplicate strategy_id {agent.strategy_id}")
+        agent.broker = self.broker
+        slot = self.slots[agent.strategy_id] = _Slot(agent)
+        for symbol in agent.symbols:
+            self._routes.setdefault(symbol, []).append(slot)
+        return agent
+
+    @property
+    def symbols(self):
+        return list(self._routes)
+
+    async def start(self):
+        """Connects once, subscribes once, then runs every agent's loop under supervision."""
+        await self.broker.connect()
+        self.running = True
+        logger.info(f"🧩 Hosting {len(self.slots)} agents over {len(self._routes)} symbols: {list(self.slots)}")
+        for slot in self.slots.values():
+            slot.agent.running = True
+        self._tasks = [asyncio.create_task(self.broker.subscribe_to_market_data(self.symbols, self.dispatch))]
+        self._tasks += [asyncio.create_task(self._supervise(slot)) for slot in self.slots.values()]
+        try:
+            await asyncio.gather(*self._tasks)
+        except asyncio.CancelledError:
+            pass
+
+    async def stop(self):
+        self.running = False
+        for slot in self.slots.values():
+            await slot.agent.stop()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def dispatch(self, data: MarketData):
+        """Fans one decoded tick out to the agents subscribed to its symbol."""
+        self.messages += 1
+        slots = self._routes.get(data.symbol)
+        if not slots:
+            return
+        for slot in slots:
+            if slot.quarantined:
+                continue
+            slot.ticks += 1
+            try:
+                await slot.agent.on_tick(data)
+                slot.consecutive = 0
+            except Exception as e:
+                await self._on_tick_error(slot, data, e)
+
+    async def _on_tick_error(self, slot: _Slot, data: MarketData, error: Exception):
+        slot.errors += 1
+        slot.consecutive += 1
+        slot.last_error = repr(error)
+        sid = slot.agent.strategy_id
+        if slot.consecutive == 1:
+            logger.error(f"❌ {sid}.on_tick failed on {data.symbol}: {error!r}")
+        if slot.consecutive >= self.max_errors:
+            slot.quarantined = True
+            logger.critical(f"🚧 QUARANTINED {sid} after {slot.consecutive} consecutive on_tick failures")
+            await self._audit("agent_quarantined", sid, "CRITICAL",
+                              {"errors": slot.errors, "last_error": slot.last_error, "symbol": data.symbol})
+
+    async def _supervise(self, slot: _Slot):
+        """Runs agent.run(); restarts it with exponential backoff if it crashes."""
+        agent = slot.agent
+        backoff = self.restart_backoff
+        while self.running and agent.running:
+            started = time.monotonic()
+            try:
+                await agent.run()
+                return  # Agent stopped itself
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                slot.restarts += 1
+                slot.last_error = repr(e)
+                logger.error(f"❌ {agent.strategy_id}.run crashed ({e!r}); restart #{slot.restarts} in {backoff:.0f}s")
+                await self._audit("agent_run_crashed", agent.strategy_id, "ERROR",
+                                  {"error": repr(e), "restarts": slot.restarts})
+                # A loop that stayed up for a while earns a fresh backoff
+                if time.monotonic() - started > self.max_backoff:
+                    backoff = self.restart_backoff
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+
+    async def _audit(self, action: str, strategy_id: str, level: str, details: dict):
+        try:
+            await self.broker.log_audit(AuditLogEntry(component="agent_host", level=level, action=action,
+                                                      details=details, strategy_id=strategy_id))
+        except Exception as e:
+            logger.warning(f"Audit write failed: {e}")
+
+    def release(self, strategy_id: str):
+        """Lifts a quarantine (e.g. after a config fix) without restarting the host."""
+        slot = self.slots[strategy_id]
+        slot.quarantined, slot.consecutive = False, 0
+
+    def stats(self) -> dict:
+        return {
+            sid: {"symbols": list(slot.agent.symbols), "ticks": slot.ticks, "errors": slot.errors,
+                  "quarantined": slot.quarantined, "restarts": slot.restarts, "last_error": slot.last_error}
+            for sid, slot in self.slots.items()
+        }
+
+
+def build_agents(names):
+    agents = []
+    for name in names:
+        module_name, class_name = AGENTS[name]
+        agents.append(getattr(importlib.import_module(module_name), class_name)())
+    return agents
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or ["orb", "grid"]
+    unknown = [n for n in names if n not in AGENTS]
+    if unknown:
+        sys.exit(f"Unknown agents {unknown}; choose from {sorted(AGENTS)}")
+    host = AgentHost(build_agents(names))
+    try:
+        asyncio.run(host.start())
+    except KeyboardInterrupt:
+        pass
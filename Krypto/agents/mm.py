@@ -2,6 +2,7 @@ import asyncio
 import logging
 from .base import StrategyAgent
 from shared.schemas import TradeSignal, MarketData, OrderSide, OrderType
+from order_book import KrakenBookFeed
 
 logger = logging.getLogger("MM_Agent")
 
@@ -9,18 +10,26 @@ class MarketMakingAgent(StrategyAgent):
     """
     Simple Market Maker.
     Places Buy Limit at Best Bid - Spread and Sell Limit at Best Ask + Spread.
+    Quotes off the local L2 book when it is fresh, else off the last price.
     """
-    def __init__(self):
+    def __init__(self, book_feed: KrakenBookFeed = None):
         super().__init__(strategy_id="market_maker_v1", symbols=["SOL/USD"])
         self.spread_target = 0.002 # 0.2%
         self.order_size = 10 # Units
-        
+        # Shareable with the ExecutionManager's feed when hosted in-process
+        self.book_feed = book_feed or KrakenBookFeed(self.symbols)
+
+    def quote_prices(self, data: MarketData):
+        """(bid, ask) quotes around the book's touch, or around last price."""
+        book = self.book_feed.ensure_subscribed(data.symbol)
+        if book.is_fresh():
+            best_bid, best_ask = book.best_bid_ask()
+            if best_bid > 0 and best_ask > 0:
+                return best_bid * (1 - self.spread_target/2), best_ask * (1 + self.spread_target/2)
+        return data.price * (1 - self.spread_target/2), data.price * (1 + self.spread_target/2)
+
     async def on_tick(self, data: MarketData):
-        # Real MM needs OrderBook stream (bids/asks), not just last price.
-        # MVP: Use last price +- spread
-        
-        bid_price = data.price * (1 - self.spread_target/2)
-        ask_price = data.price * (1 + self.spread_target/2)
+        bid_price, ask_price = self.quote_prices(data)
         
         # In reality, we must cancel previous orders before placing new ones to avoid inventory bloat
         # signals = [CancelAll(), Order(Buy), Order(Sell)]
@@ -31,6 +40,7 @@ class MarketMakingAgent(StrategyAgent):
         # but here we would emit LIMIT orders
         
     async def run(self):
+        self.book_feed.start()
         while self.running:
             await asyncio.sleep(1)
 
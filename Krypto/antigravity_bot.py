@@ -10,6 +10,8 @@ import os
 import time
 import json
 import datetime
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import yfinance as yf
 from trading212_client import Trading212Client
 from telegram_bot import SovereignAlerts
@@ -21,6 +23,104 @@ UNIVERSE_FILE = 'data/master_universe.json'
 MAX_ALLOCATION = 2000.00
 RISK_PER_TRADE = 0.50 # 50% of available ledger cash per trade signal
 
+# Trap Door geometry (4H bars)
+SWING_ORDER = 3       # swing low must undercut 3 prior and 3 following lows
+ATR_PERIOD = 14
+SMA_PERIOD = 20
+MIN_BARS = 20
+
+
+def right_align(columns):
+    """
+    Packs per-ticker 1-D arrays into one (bars x tickers) matrix, each column
+    right-aligned and NaN-padded on top. Positions counted from the end
+    ([-1] forming, [-2] last closed) then mean the same thing for every ticker.
+    """
+    n = max((len(c) for c in columns), default=0)
+    out = np.full((n, len(columns)), np.nan)
+    for k, col in enumerate(columns):
+        if len(col):
+            out[n - len(col):, k] = col
+    return out
+
+
+def rolling_mean(x, window):
+    """Rolling mean down axis 0 (NaN until `window` bars, NaN-propagating like pandas)."""
+    out = np.full(x.shape, np.nan)
+    if len(x) >= window:
+        out[window - 1:] = sliding_window_view(x, window, axis=0).mean(axis=-1)
+    return out
+
+
+def swing_low_mask(lows, order=SWING_ORDER):
+    """
+    True where a low is strictly below the `order` lows before and after it.
+    One sliding-window pass; NaN neighbours never qualify.
+    """
+    mask = np.zeros(lows.shape, dtype=bool)
+    if len(lows) < 2 * order + 1:
+        return mask
+    windows = sliding_window_view(lows, 2 * order + 1, axis=0)
+    neighbours = np.concatenate([windows[..., :order], windows[..., order + 1:]], axis=-1)
+    centre = windows[..., order]
+    with np.errstate(invalid='ignore'):
+        mask[order:len(lows) - order] = centre < neighbours.min(axis=-1)
+    return mask
+
+
+def find_trap_doors(high, low, close):
+    """
+    Vectorized Trap Door scan over right-aligned (bars x tickers) arrays.
+    Same rules as the original per-ticker loop: the newest qualifying swing
+    low (searched from 4 bars back to 15 bars deep), a later wick sweeping the
+    Strike Zone (baseline - 0.5 ATR), and the last closed candle reclaiming
+    the baseline but still below SMA20.
+    Returns {column_index: signal_dict}.
+    """
+    n_bars, n_tickers = close.shape
+    if n_bars < MIN_BARS:
+        return {}
+
+    # ATR(14): true range with the first bar falling back to High-Low
+    prev_close = np.vstack([np.full((1, n_tickers), np.nan), close[:-1]])
+    tr = np.fmax(high - low, np.fmax(np.abs(high - prev_close), np.abs(low - prev_close)))
+    tr[np.isnan(high) | np.isnan(low)] = np.nan
+    atr = rolling_mean(tr, ATR_PERIOD)
+
+    lengths = np.sum(~np.isnan(close), axis=0)
+    pad = n_bars - lengths
+    bar = np.arange(n_bars)[:, None]
+
+    last_closed = close[-2]
+    sma20 = rolling_mean(close, SMA_PERIOD)[-2]
+
+    # Lowest wick after each bar up to the last closed candle (NaN-skipping)
+    sweep = np.full(low.shape, np.nan)
+    sweep[:-2] = np.fmin.accumulate(low[-2:0:-1], axis=0)[::-1]
+
+    with np.errstate(invalid='ignore'):
+        candidates = (
+            swing_low_mask(low)
+            # range(len - 4, 14, -1) in each ticker's own coordinates
+            & (bar - pad > 14) & (bar <= n_bars - 4)
+            & (sweep <= low - 0.5 * atr)          # a later wick swept the Strike Zone
+            & (last_closed > low)                 # reclaim: last closed candle back above baseline
+            & (last_closed < sma20)               # not chasing an extended move
+            & (lengths >= MIN_BARS)
+        )
+
+    signals = {}
+    for k in np.flatnonzero(candidates.any(axis=0)):
+        i = n_bars - 1 - np.argmax(candidates[::-1, k])   # newest swing wins
+        signals[int(k)] = {
+            "baseline": float(low[i, k]),
+            "sweep_low": float(sweep[i, k]),
+            "sma20": float(sma20[k]),
+            "current_price": float(close[-1, k]),
+        }
+    return signals
+
+
 class AntigravityBot:
     def __init__(self):
         self.logger = AuditLogger(JOB_ID)
@@ -144,62 +244,51 @@ class AntigravityBot:
             
         return True, "Healthy"
 
-    def scan_for_trap_door(self, ticker):
+    def fetch_4h_bars(self, tickers):
+        """
+        One batched download of 10 days of 4H bars for every ticker.
+        Returns (tickers_with_data, high, low, close) as right-aligned matrices.
         """
-        Analyzes 4-Hour timeframe for Institutional Sweeps.
+        data = yf.download(tickers, period="10d", interval="4h", group_by='column',
+                           auto_adjust=False, progress=False, threads=True)
+        found, highs, lows, closes = [], [], [], []
+        for ticker in tickers:
+            try:
+                if len(tickers) == 1 and not hasattr(data.columns, 'levels'):
+                    frame = data[['High', 'Low', 'Close']]
+                else:
+                    frame = data.xs(ticker, axis=1, level=1)[['High', 'Low', 'Close']]
+                # Drop rows from other tickers' calendars so bar positions stay per-ticker
+                frame = frame.dropna(how='all')
+            except (KeyError, ValueError):
+                continue
+            if frame.empty:
+                continue
+            found.append(ticker)
+            highs.append(frame['High'].to_numpy(dtype=float))
+            lows.append(frame['Low'].to_numpy(dtype=float))
+            closes.append(frame['Close'].to_numpy(dtype=float))
+        return found, right_align(highs), right_align(lows), right_align(closes)
+
+    def scan_universe_for_trap_doors(self, tickers):
+        """
+        Analyzes 4-Hour timeframe for Institutional Sweeps across all tickers at once.
         Logic: Swing low (lower than 3 prior and 3 post), price drops into Strike Zone (Baseline - 0.5 ATR), 
         and latest completed candle closes BACK ABOVE the Baseline.
+        Returns {ticker: signal}.
         """
+        if not tickers:
+            return {}
         try:
-            t = yf.Ticker(ticker)
-            # Need at least 20 periods for ATR 14, plus 3 post-candles for swing confirmation.
-            df = t.history(period="10d", interval="4h")
-            if len(df) < 20: 
-                return None
-                
-            # Calculate ATR (14)
-            df['H-L'] = df['High'] - df['Low']
-            df['H-PC'] = abs(df['High'] - df['Close'].shift(1))
-            df['L-PC'] = abs(df['Low'] - df['Close'].shift(1))
-            df['TR'] = df[['H-L', 'H-PC', 'L-PC']].max(axis=1)
-            df['ATR'] = df['TR'].rolling(window=14).mean()
-            
-            # Find recent Swing Lows
-            for i in range(len(df) - 4, 14, -1): # Start 1 candle back from current (which is forming) to 14 periods deep
-                is_swing_low = True
-                current_low = df['Low'].iloc[i]
-                
-                # Check 3 preceding and 3 following
-                for j in range(1, 4):
-                    if df['Low'].iloc[i-j] <= current_low or df['Low'].iloc[i+j] <= current_low:
-                        is_swing_low = False
-                        break
-                        
-                if is_swing_low:
-                    baseline = current_low
-                    atr = df['ATR'].iloc[i]
-                    strike_zone_bottom = baseline - (0.5 * atr)
-                    
-                    # Ensure the candle's wick explicitly swept the Strike Zone
-                    if float(current_low) <= float(strike_zone_bottom):
-                        # The Reclaim Check: Did the most recently *completed* 4H candle close above baseline?
-                        # Using [-2] because [-1] is the currently forming candle.
-                        last_closed = df['Close'].iloc[-2]
-                        
-                        if float(last_closed) > float(baseline):
-                            # Ensure we aren't chasing a move that already blasted off
-                            sma20 = df['Close'].rolling(window=20).mean().iloc[-2]
-                            if float(last_closed) < float(sma20):
-                                return {
-                                    "baseline": baseline,
-                                    "sweep_low": current_low,
-                                    "sma20": sma20,
-                                    "current_price": df['Close'].iloc[-1]
-                                }
-            return None
+            found, high, low, close = self.fetch_4h_bars(list(tickers))
+            return {found[k]: sig for k, sig in find_trap_doors(high, low, close).items()}
         except Exception as e:
-            self.logger.log("SCAN_ERROR", ticker, str(e), "ERROR")
-            return None
+            self.logger.log("SCAN_ERROR", "Universe", str(e), "ERROR")
+            return {}
+
+    def scan_for_trap_door(self, ticker):
+        """Single-ticker scan (see scan_universe_for_trap_doors)."""
+        return self.scan_universe_for_trap_doors([ticker]).get(ticker)
 
     def execute_strategy(self):
         """Runs the Antigravity workflow."""
@@ -215,6 +304,9 @@ class AntigravityBot:
         # Technically we should track open orders, but for v1 we'll limit to 1 active execution per run
         executions_this_run = 0
 
+        # One batched download + one array pass for the whole universe
+        signals = self.scan_universe_for_trap_doors([inst['yf_ticker'] for inst in universe])
+
         for inst in universe:
             if executions_this_run > 0:
                 break
@@ -223,7 +315,7 @@ class AntigravityBot:
             t212_ticker = inst['t212_ticker']
             sector = inst.get('sector', 'Unknown')
             
-            signal = self.scan_for_trap_door(yf_ticker)
+            signal = signals.get(yf_ticker)
             if signal:
                 self.logger.log("SWEEP_DETECTED", yf_ticker, f"Baseline: {signal['baseline']:.2f}")
                 
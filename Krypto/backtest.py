@@ -0,0 +1,826 @@
+"""
+Backtest Engine — Event-driven replay of StrategyAgents
+=======================================================
+Drives any StrategyAgent.on_tick from recorded tick/candle files with the
+live agent code unchanged:
+
+* TickTape         — one merged, time-sorted tape (numpy columns) built from
+                     tick CSVs, OHLCV candle CSVs or a saved .npz.
+* VirtualClock     — agents call datetime.now(self.ny_tz) directly, so the
+                     agent modules' `datetime` / `time` globals are swapped
+                     for clock-bound shims for the duration of the run.
+* BacktestBroker   — in-memory MessageBroker stand-in; publish_signal hands
+                     the signal straight to the simulated execution.
+* SimulatedExecution — ExecutionManager stand-in with fee, slippage and
+                     latency models, resting limits, and the stop-loss /
+                     take-profit legs the live manager places after entry.
+* offline_audit    — agents' AuditLogger and the broker's central audit DB
+                     are stubbed, so simulated triggers never reach the
+                     production audit_log.csv / audit_trail.db. Build agents
+                     inside it; the engine also applies it for the run.
+
+Dispatch walks the tape in numpy batches converted to plain floats and awaits
+on_tick directly (no queue, no task per tick), which keeps the per-tick cost
+to a MarketData construct plus the agent's own logic — several million ticks
+a minute for the bundled agents.
+
+Usage:
+    python backtest.py --agent orb --data data/BTCUSD_1m.csv --symbol BTC/USD
+    python backtest.py --agent dca --data ticks.csv --fee-bps 26 --latency-ms 250
+"""
+import argparse
+import asyncio
+import datetime as _dt
+import importlib
+import logging
+import os
+import random
+import sys
+import time as _time_module
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+from shared.schemas import TradeSignal, MarketData, AuditLogEntry, OrderSide, OrderType
+from manager.normalization import Normalizer
+
+logger = logging.getLogger("Backtest")
+
+_REAL_DATETIME = _dt.datetime
+_UTC = _dt.timezone.utc
+
+# Agents the CLI can build by name: (module, class, optional (timer method, interval s))
+AGENTS = {
+    "orb": ("agents.orb", "AugmentedORBAgent", None),
+    "grid": ("agents.grid", "GeometricGridAgent", None),
+    "dca": ("agents.dca", "DCAAgent", None),
+    "mm": ("agents.mm", "MarketMakingAgent", None),
+    "arb": ("agents.arb", "SpotFuturesArbAgent", ("check_funding", 60)),
+    "sentiment": ("agents.sentiment", "CrossProjectSentimentAgent", ("check_alt_data", 300)),
+}
+
+
+# --- TAPE ---
+def _epoch_seconds(values) -> np.ndarray:
+    """Epoch seconds (float64) from datetimes, ISO strings or numeric s/ms stamps."""
+    values = pd.Series(values)
+    if pd.api.types.is_numeric_dtype(values):
+        secs = values.to_numpy(dtype=np.float64)
+        # Millisecond stamps (Kraken trades, ccxt) are > 1e11
+        return secs / 1000.0 if len(secs) and np.nanmax(secs) > 1e11 else secs
+    stamps = pd.to_datetime(values, utc=True)
+    return ((stamps - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)).to_numpy(dtype=np.float64)
+
+
+def _column(df: pd.DataFrame, *names):
+    lower = {str(c).lower(): c for c in df.columns}
+    for name in names:
+        if name in lower:
+            return df[lower[name]]
+    return None
+
+
+class TickTape:
+    """
+    Columnar tick tape: ts (epoch s), sym (index into symbols), price, volume.
+    Always sorted by ts; ties keep file order (stable merge).
+    """
+
+    def __init__(self, ts, sym, price, volume, symbols):
+        order = np.argsort(ts, kind="stable")
+        self.ts = np.asarray(ts, dtype=np.float64)[order]
+        self.sym = np.asarray(sym, dtype=np.int32)[order]
+        self.price = np.asarray(price, dtype=np.float64)[order]
+        self.volume = np.asarray(volume, dtype=np.float64)[order]
+        self.symbols = list(symbols)
+
+    def __len__(self):
+        return len(self.ts)
+
+    @property
+    def start(self):
+        return self.ts[0] if len(self) else None
+
+    @property
+    def end(self):
+        return self.ts[-1] if len(self) else None
+
+    @classmethod
+    def from_ticks(cls, df: pd.DataFrame, symbol: str = None):
+        """Trade prints: timestamp/time/ts, price, volume/amount/qty, optional symbol."""
+        stamps = _column(df, "timestamp", "time", "ts", "datetime")
+        if stamps is None:
+            stamps = df.index.to_series()
+        price = _column(df, "price", "last")
+        volume = _column(df, "volume", "amount", "qty", "size")
+        volume = np.zeros(len(df)) if volume is None else volume.to_numpy(dtype=np.float64)
+        symbols_col = _column(df, "symbol", "pair")
+        if symbols_col is None:
+            if symbol is None:
+                raise ValueError("Tick file has no symbol column; pass symbol=")
+            return cls(_epoch_seconds(stamps), np.zeros(len(df)), price, volume, [symbol])
+        codes, names = pd.factorize(symbols_col)
+        return cls(_epoch_seconds(stamps), codes, price, volume, list(names))
+
+    @classmethod
+    def from_candles(cls, df: pd.DataFrame, symbol: str, interval: float = None):
+        """
+        OHLCV candles expanded to four ticks each along the usual path:
+        O -> L -> H -> C for up candles, O -> H -> L -> C for down candles,
+        spaced inside the candle so the close lands just before the next open.
+        """
+        stamps = _column(df, "timestamp", "time", "ts", "datetime")
+        t0 = _epoch_seconds(df.index.to_series() if stamps is None else stamps)
+        o, h, l, c = (_column(df, k).to_numpy(dtype=np.float64) for k in ("open", "high", "low", "close"))
+        volume = _column(df, "volume")
+        v = np.zeros(len(df)) if volume is None else volume.to_numpy(dtype=np.float64)
+        if interval is None:
+            interval = float(np.median(np.diff(t0))) if len(t0) > 1 else 60.0
+        up = c >= o
+        path = np.stack([o, np.where(up, l, h), np.where(up, h, l), c], axis=1)
+        offsets = np.array([0.0, interval / 3, 2 * interval / 3, interval * 0.999])
+        ts = (t0[:, None] + offsets[None, :]).ravel()
+        vols = np.repeat(v / 4.0, 4)
+        return cls(ts, np.zeros(len(ts)), path.ravel(), vols, [symbol])
+
+    @classmethod
+    def load(cls, path: str, symbol: str = None, interval: float = None):
+        """CSV of ticks (has a price column) or candles (has a close column), or a saved .npz."""
+        if path.endswith(".npz"):
+            z = np.load(path, allow_pickle=False)
+            return cls(z["ts"], z["sym"], z["price"], z["volume"], [str(s) for s in z["symbols"]])
+        df = pd.read_csv(path)
+        if _column(df, "price", "last") is not None:
+            return cls.from_ticks(df, symbol)
+        if symbol is None:
+            symbol = os.path.splitext(os.path.basename(path))[0]
+        return cls.from_candles(df, symbol, interval)
+
+    @classmethod
+    def merge(cls, tapes):
+        index, parts = {}, []
+        for tape in tapes:
+            remap = np.array([index.setdefault(s, len(index)) for s in tape.symbols], dtype=np.int32)
+            parts.append((tape.ts, remap[tape.sym] if len(tape) else tape.sym, tape.price, tape.volume))
+        if not parts:
+            return cls([], [], [], [], [])
+        return cls(*(np.concatenate([p[i] for p in parts]) for i in range(4)), list(index))
+
+    def save(self, path: str):
+        np.savez(path, ts=self.ts, sym=self.sym, price=self.price, volume=self.volume,
+                 symbols=np.array(self.symbols))
+
+    def between(self, start: float = None, end: float = None):
+        lo = 0 if start is None else np.searchsorted(self.ts, start, "left")
+        hi = len(self) if end is None else np.searchsorted(self.ts, end, "right")
+        return TickTape(self.ts[lo:hi], self.sym[lo:hi], self.price[lo:hi], self.volume[lo:hi], self.symbols)
+
+
+# --- VIRTUAL CLOCK ---
+class VirtualClock:
+    """Backtest time in epoch seconds; advanced by the engine, read by the patched modules."""
+
+    def __init__(self, start: float = 0.0):
+        self.t = float(start)
+
+    def time(self) -> float:
+        return self.t
+
+    def now(self, tz=None):
+        return _REAL_DATETIME.fromtimestamp(self.t, tz)
+
+    def utcnow(self):
+        return _REAL_DATETIME.fromtimestamp(self.t, _UTC).replace(tzinfo=None)
+
+
+class _DatetimeMeta(type(_REAL_DATETIME)):
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, _REAL_DATETIME)
+
+    def __subclasscheck__(cls, sub):
+        return issubclass(sub, _REAL_DATETIME)
+
+
+def _clock_datetime(clock: VirtualClock):
+    """A datetime class whose now()/utcnow()/today() read the virtual clock."""
+
+    class ClockDatetime(_REAL_DATETIME, metaclass=_DatetimeMeta):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now(tz)
+
+        @classmethod
+        def utcnow(cls):
+            return clock.utcnow()
+
+        @classmethod
+        def today(cls):
+            return clock.now()
+
+    return ClockDatetime
+
+
+class _ClockTime:
+    """Stands in for the `time` module inside agent modules."""
+
+    def __init__(self, clock: VirtualClock):
+        self._clock = clock
+
+    def time(self):
+        return self._clock.t
+
+    def monotonic(self):
+        return self._clock.t
+
+    def __getattr__(self, name):
+        return getattr(_time_module, name)
+
+
+@contextmanager
+def virtual_time(clock: VirtualClock, modules):
+    """Swap `datetime` / `time` globals in the given modules for clock-bound shims."""
+    fake_dt, fake_time = _clock_datetime(clock), _ClockTime(clock)
+    saved = []
+    for module in modules:
+        for name, value in list(vars(module).items()):
+            if value is _REAL_DATETIME:
+                saved.append((module, name, value))
+                setattr(module, name, fake_dt)
+            elif value is _time_module:
+                saved.append((module, name, value))
+                setattr(module, name, fake_time)
+    try:
+        yield clock
+    finally:
+        for module, name, value in saved:
+            setattr(module, name, value)
+
+
+class BacktestAuditLogger:
+    """Stands in for audit_log.AuditLogger: rows stay in memory."""
+
+    def __init__(self, process_name: str = "Unknown"):
+        self.process_name = process_name
+        self.rows = []
+
+    def log(self, action: str, target: str = "-", details: str = "", status: str = "INFO"):
+        self.rows.append((action, target, details, status))
+
+
+@contextmanager
+def offline_audit():
+    """
+    No CSV audit log, no central audit DB and no stdout re-wrapping from the
+    agents while inside (mirrors the replay harness's offline patches).
+    """
+    import shared.broker
+    saved = []
+
+    def patch(module, name, value):
+        saved.append((module, name, getattr(module, name)))
+        setattr(module, name, value)
+
+    patch(shared.broker, "_CENTRAL_AVAILABLE", False)
+    audit_log = sys.modules.get("audit_log")
+    if audit_log is not None:
+        patch(audit_log, "_load_central_logger_class", lambda: None)
+        patch(audit_log, "_STDIO_WRAPPED", True)  # leave the caller's stdout/stderr alone
+    for name, module in list(sys.modules.items()):
+        if (name == "agents" or name.startswith("agents.")) and hasattr(module, "AuditLogger"):
+            patch(module, "AuditLogger", BacktestAuditLogger)
+    try:
+        yield
+    finally:
+        for module, name, value in reversed(saved):
+            setattr(module, name, value)
+
+
+# --- EXECUTION MODELS ---
+class FeeModel:
+    """Kraken spot schedule, base tier: 0.26% taker / 0.16% maker."""
+
+    def __init__(self, taker_bps: float = 26.0, maker_bps: float = 16.0):
+        self.taker = taker_bps / 10000.0
+        self.maker = maker_bps / 10000.0
+
+    def fee(self, notional: float, maker: bool) -> float:
+        return notional * (self.maker if maker else self.taker)
+
+
+class SlippageModel:
+    """Fixed half-spread plus linear impact on the order's share of the print volume."""
+
+    def __init__(self, bps: float = 2.0, impact_bps: float = 0.0):
+        self.bps = bps
+        self.impact_bps = impact_bps
+
+    def price(self, side: int, price: float, amount: float, tick_volume: float) -> float:
+        bps = self.bps
+        if self.impact_bps and tick_volume > 0:
+            bps += self.impact_bps * min(amount / tick_volume, 1.0)
+        return price * (1.0 + side * bps / 10000.0)
+
+
+class LatencyModel:
+    """Signal-to-exchange delay: fixed mean plus seeded uniform jitter (seconds)."""
+
+    def __init__(self, mean_ms: float = 150.0, jitter_ms: float = 0.0, seed: int = 7):
+        self.mean = mean_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self._rng = random.Random(seed)
+
+    def sample(self) -> float:
+        if not self.jitter:
+            return self.mean
+        return max(0.0, self.mean + self._rng.uniform(-self.jitter, self.jitter))
+
+
+class _Order:
+    __slots__ = ("order_id", "strategy_id", "symbol", "side", "kind", "amount", "price",
+                 "stop_loss", "take_profit", "submitted", "active_at", "signal_id", "group")
+
+    def __init__(self, order_id, strategy_id, symbol, side, kind, amount, price, submitted, active_at,
+                 signal_id, stop_loss=None, take_profit=None, group=None):
+        self.order_id = order_id
+        self.strategy_id = strategy_id
+        self.symbol = symbol
+        self.side = side  # +1 buy, -1 sell
+        self.kind = kind  # market | limit | stop | take_profit
+        self.amount = amount
+        self.price = price
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.submitted = submitted
+        self.active_at = active_at
+        self.signal_id = signal_id
+        self.group = group
+
+
+class AgentLedger:
+    """Per-agent positions (signed qty, avg cost), realized P&L, fees and fill stats."""
+
+    def __init__(self, strategy_id: str):
+        self.strategy_id = strategy_id
+        self.positions = {}  # symbol -> [qty, avg_price]
+        self.realized = 0.0
+        self.fees = 0.0
+        self.signals = 0
+        self.rejected = 0
+        self.fills = 0
+        self.buys = 0
+        self.sells = 0
+        self.notional = 0.0
+        self.slippage_cost = 0.0
+        self.latency_total = 0.0
+        self.round_trips = 0
+        self.wins = 0
+        self.ticks = 0
+        self.errors = 0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+    def apply(self, symbol: str, side: int, qty: float, price: float, fee: float) -> float:
+        """Books a fill; returns the realized P&L of any closed quantity."""
+        pos = self.positions.setdefault(symbol, [0.0, 0.0])
+        held, avg = pos
+        signed = side * qty
+        pnl = 0.0
+        if held == 0 or (held > 0) == (signed > 0):
+            total = held + signed
+            pos[1] = (abs(held) * avg + qty * price) / abs(total)
+            pos[0] = total
+        else:
+            closing = min(qty, abs(held))
+            pnl = closing * (price - avg) * (1 if held > 0 else -1)
+            self.realized += pnl
+            self.round_trips += 1
+            self.wins += pnl > 0
+            remainder = held + signed
+            if abs(remainder) < 1e-12:
+                pos[0], pos[1] = 0.0, 0.0
+            else:
+                pos[0] = remainder
+                if (remainder > 0) != (held > 0):
+                    pos[1] = price  # flipped through flat
+        self.fees += fee
+        self.fills += 1
+        self.notional += qty * price
+        if side > 0:
+            self.buys += 1
+        else:
+            self.sells += 1
+        return pnl
+
+    def unrealized(self, last_prices: dict) -> float:
+        return sum(q * (last_prices.get(s, avg) - avg) for s, (q, avg) in self.positions.items() if q)
+
+    def mark(self, last_prices: dict):
+        equity = self.realized - self.fees + self.unrealized(last_prices)
+        if equity > self.peak:
+            self.peak = equity
+        elif self.peak - equity > self.max_drawdown:
+            self.max_drawdown = self.peak - equity
+        return equity
+
+    def stats(self, last_prices: dict) -> dict:
+        unrealized = self.unrealized(last_prices)
+        return {
+            "ticks": self.ticks,
+            "signals": self.signals,
+            "rejected": self.rejected,
+            "fills": self.fills,
+            "buys": self.buys,
+            "sells": self.sells,
+            "notional": round(self.notional, 8),
+            "fees": round(self.fees, 8),
+            "realized_pnl": round(self.realized, 8),
+            "unrealized_pnl": round(unrealized, 8),
+            "net_pnl": round(self.realized + unrealized - self.fees, 8),
+            "round_trips": self.round_trips,
+            "win_rate": round(self.wins / self.round_trips, 4) if self.round_trips else 0.0,
+            "max_drawdown": round(self.max_drawdown, 8),
+            "avg_slippage_bps": round(self.slippage_cost / self.notional * 10000, 4) if self.notional else 0.0,
+            "avg_latency_ms": round(self.latency_total / self.fills * 1000, 3) if self.fills else 0.0,
+            "errors": self.errors,
+            "positions": {s: {"qty": q, "avg_price": avg} for s, (q, avg) in self.positions.items() if q},
+        }
+
+
+class SimulatedExecution:
+    """
+    ExecutionManager stand-in. Signals become orders that go live after the
+    sampled latency and fill against the first print at or after that time:
+    market at print ± slippage (taker), limits when the print trades through
+    (maker), stop-loss legs as market once triggered. Amounts are normalized
+    exactly as the live manager does before sending.
+    """
+
+    def __init__(self, clock: VirtualClock, fees: FeeModel = None, slippage: SlippageModel = None,
+                 latency: LatencyModel = None):
+        self.clock = clock
+        self.fees = fees or FeeModel()
+        self.slippage = slippage or SlippageModel()
+        self.latency = latency or LatencyModel()
+        self.pending = {}  # symbol -> [_Order]
+        self.ledgers = {}
+        self.fills = []
+        self.last_price = {}
+        self.last_volume = {}
+        self._seq = 0
+
+    def ledger(self, strategy_id: str) -> AgentLedger:
+        ledger = self.ledgers.get(strategy_id)
+        if ledger is None:
+            ledger = self.ledgers[strategy_id] = AgentLedger(strategy_id)
+        return ledger
+
+    def _next_id(self) -> str:
+        self._seq += 1
+        return f"BT-{self._seq}"
+
+    def submit(self, signal: TradeSignal):
+        ledger = self.ledger(signal.strategy_id)
+        ledger.signals += 1
+        amount = Normalizer.normalize_amount(signal.symbol, signal.amount)
+        kind = {OrderType.MARKET: "market", OrderType.LIMIT: "limit",
+                OrderType.STOP_LOSS: "stop", OrderType.TAKE_PROFIT: "take_profit"}[signal.order_type]
+        if amount <= 0 or (kind != "market" and not signal.price):
+            ledger.rejected += 1
+            return None
+        now = self.clock.t
+        order = _Order(self._next_id(), signal.strategy_id, signal.symbol,
+                       1 if signal.side == OrderSide.BUY else -1, kind, amount, signal.price,
+                       now, now + self.latency.sample(), signal.signal_id,
+                       stop_loss=signal.stop_loss, take_profit=signal.take_profit)
+        self.pending.setdefault(signal.symbol, []).append(order)
+        if order.active_at <= now and signal.symbol in self.last_price:
+            self.on_tick(signal.symbol, now, self.last_price[signal.symbol], self.last_volume[signal.symbol])
+        return order.order_id
+
+    def cancel(self, strategy_id: str, symbol: str = None) -> int:
+        cancelled = 0
+        for sym, orders in self.pending.items():
+            if symbol is not None and sym != symbol:
+                continue
+            keep = [o for o in orders if o.strategy_id != strategy_id]
+            cancelled += len(orders) - len(keep)
+            orders[:] = keep
+        return cancelled
+
+    def on_tick(self, symbol: str, t: float, price: float, volume: float):
+        """Matches the symbol's live orders against one print."""
+        orders = self.pending.get(symbol)
+        if not orders:
+            return
+        filled_groups = set()
+        remaining = []
+        for order in orders:
+            if order.group in filled_groups:
+                continue
+            if order.active_at > t:
+                remaining.append(order)
+                continue
+            fill = None
+            if order.kind == "market":
+                fill = (self.slippage.price(order.side, price, order.amount, volume), False)
+            elif order.kind == "stop":
+                if (order.side < 0 and price <= order.price) or (order.side > 0 and price >= order.price):
+                    fill = (self.slippage.price(order.side, price, order.amount, volume), False)
+            elif order.side > 0 and price <= order.price:  # buy limit / take-profit
+                fill = (min(order.price, price), True)
+            elif order.side < 0 and price >= order.price:  # sell limit / take-profit
+                fill = (max(order.price, price), True)
+            if fill is None:
+                remaining.append(order)
+                continue
+            self._fill(order, t, price, *fill)
+            if order.group is not None:
+                filled_groups.add(order.group)
+            remaining.extend(self._protective_legs(order))
+        if filled_groups:
+            remaining = [o for o in remaining if o.group not in filled_groups]
+        orders[:] = remaining
+
+    def _fill(self, order: _Order, t: float, reference: float, fill_price: float, maker: bool):
+        notional = order.amount * fill_price
+        fee = self.fees.fee(notional, maker)
+        ledger = self.ledger(order.strategy_id)
+        pnl = ledger.apply(order.symbol, order.side, order.amount, fill_price, fee)
+        ledger.slippage_cost += abs(fill_price - reference) * order.amount
+        ledger.latency_total += t - order.submitted
+        ledger.mark(self.last_price)
+        self.fills.append({
+            "order_id": order.order_id, "signal_id": order.signal_id, "strategy_id": order.strategy_id,
+            "symbol": order.symbol, "side": "buy" if order.side > 0 else "sell", "kind": order.kind,
+            "amount": order.amount, "price": fill_price, "reference_price": reference, "fee": fee,
+            "realized_pnl": pnl, "submitted": order.submitted, "time": t,
+        })
+
+    def _protective_legs(self, entry: _Order):
+        """Stop-loss / take-profit placed after the entry fills (one cancels the other)."""
+        legs = []
+        group = entry.order_id if entry.stop_loss and entry.take_profit else None
+        if entry.stop_loss:
+            legs.append(_Order(self._next_id(), entry.strategy_id, entry.symbol, -entry.side, "stop",
+                               entry.amount, entry.stop_loss, self.clock.t, self.clock.t,
+                               entry.signal_id, group=group))
+        if entry.take_profit:
+            legs.append(_Order(self._next_id(), entry.strategy_id, entry.symbol, -entry.side, "take_profit",
+                               entry.amount, entry.take_profit, self.clock.t, self.clock.t,
+                               entry.signal_id, group=group))
+        return legs
+
+    def open_orders(self, strategy_id: str = None):
+        return [o for orders in self.pending.values() for o in orders
+                if strategy_id is None or o.strategy_id == strategy_id]
+
+
+class BacktestBroker:
+    """In-memory MessageBroker stand-in: same coroutine API, no Redis, no queue."""
+
+    def __init__(self, clock: VirtualClock, execution: SimulatedExecution):
+        self.clock = clock
+        self.execution = execution
+        self.redis = None
+        self._subscribers = {}
+        self.audit = []
+
+    async def connect(self):
+        return None
+
+    async def publish_signal(self, signal: TradeSignal):
+        # The schema default stamps wall-clock utcnow; backtest signals carry virtual time
+        signal.timestamp = self.clock.utcnow()
+        self.execution.submit(signal)
+
+    async def publish_market_data(self, data: MarketData):
+        for cb in self._subscribers.get(f"market_data.{data.symbol}", ()):
+            await cb(data)
+
+    async def log_audit(self, entry: AuditLogEntry):
+        self.audit.append(entry)
+
+    async def subscribe_to_market_data(self, symbols, callback):
+        for s in symbols:
+            self._subscribers.setdefault(f"market_data.{s}", []).append(callback)
+
+    async def consume_signals(self):
+        raise RuntimeError("BacktestBroker routes signals straight to SimulatedExecution")
+
+
+# --- ENGINE ---
+class BacktestEngine:
+    """
+    Replays a TickTape through any number of agents.
+
+        engine = BacktestEngine(TickTape.load("btc_1m.csv", symbol="BTC/USD"))
+        engine.add_agent(AugmentedORBAgent())
+        report = engine.run()
+    """
+
+    def __init__(self, tape: TickTape, fees: FeeModel = None, slippage: SlippageModel = None,
+                 latency: LatencyModel = None, batch_size: int = 65536, mark_interval: float = 60.0,
+                 quiet: bool = True):
+        self.tape = tape
+        self.clock = VirtualClock(tape.start or 0.0)
+        self.execution = SimulatedExecution(self.clock, fees, slippage, latency)
+        self.broker = BacktestBroker(self.clock, self.execution)
+        self.batch_size = batch_size
+        self.mark_interval = mark_interval
+        self.quiet = quiet
+        self.agents = []
+        self._timers = []  # [next_due, interval, coroutine fn, strategy_id]
+
+    def add_agent(self, agent):
+        """
+        Rebinds the agent onto the backtest broker; its live MessageBroker is
+        never connected. A live AuditLogger (agent built outside
+        offline_audit) is swapped for an in-memory one.
+        """
+        if getattr(agent, "broker", None) is not None and getattr(agent.broker, "_central", None) is not None:
+            agent.broker._central = None
+        audit = getattr(agent, "audit", None)
+        if audit is not None and not isinstance(audit, BacktestAuditLogger):
+            agent.audit = BacktestAuditLogger(getattr(audit, "process_name", agent.strategy_id))
+        agent.broker = self.broker
+        agent.running = True
+        self.agents.append(agent)
+        self.execution.ledger(agent.strategy_id)
+        return agent
+
+    def add_timer(self, interval: float, fn, agent=None):
+        """Fires `await fn()` every `interval` virtual seconds (e.g. an agent's polling run-loop body)."""
+        start = self.tape.start or 0.0
+        self._timers.append([start + interval, float(interval), fn, agent.strategy_id if agent else None])
+
+    def _agent_modules(self):
+        names = {"agents.base"} | {type(a).__module__ for a in self.agents}
+        return [sys.modules[n] for n in names if n in sys.modules]
+
+    def run(self) -> dict:
+        return asyncio.run(self.run_async())
+
+    async def run_async(self) -> dict:
+        # Per tape symbol: [(on_tick, ledger)] resolved once, in agent order
+        index = {s: i for i, s in enumerate(self.tape.symbols)}
+        routes = [[] for _ in self.tape.symbols]
+        for agent in self.agents:
+            await self.broker.subscribe_to_market_data(agent.symbols, agent.on_tick)
+            for s in agent.symbols:
+                if s in index:
+                    routes[index[s]].append((agent.on_tick, self.execution.ledger(agent.strategy_id)))
+                else:
+                    logger.warning(f"{agent.strategy_id}: no {s} ticks on the tape")
+
+        previous_disable = logging.root.manager.disable
+        if self.quiet:
+            logging.disable(logging.INFO)
+        started = _time_module.perf_counter()
+        try:
+            with offline_audit(), virtual_time(self.clock, self._agent_modules()):
+                await self._dispatch(routes)
+        finally:
+            logging.disable(previous_disable)
+        elapsed = _time_module.perf_counter() - started
+        return self._report(elapsed)
+
+    async def _dispatch(self, routes):
+        tape, clock, execution = self.tape, self.clock, self.execution
+        symbols = tape.symbols
+        pending = execution.pending
+        last_price, last_volume = execution.last_price, execution.last_volume
+        construct = MarketData.model_construct
+        fromts = _REAL_DATETIME.fromtimestamp
+        ledgers = list(execution.ledgers.values())
+        next_mark = (tape.start or 0.0) + self.mark_interval
+        next_due = min([t[0] for t in self._timers] + [next_mark])
+
+        for lo in range(0, len(tape), self.batch_size):
+            hi = lo + self.batch_size
+            batch = zip(tape.ts[lo:hi].tolist(), tape.sym[lo:hi].tolist(),
+                        tape.price[lo:hi].tolist(), tape.volume[lo:hi].tolist())
+            for t, s, price, volume in batch:
+                if t >= next_due:
+                    next_mark = await self._fire_due(t, next_mark, ledgers)
+                    next_due = min([x[0] for x in self._timers] + [next_mark])
+                clock.t = t
+                symbol = symbols[s]
+                last_price[symbol] = price
+                last_volume[symbol] = volume
+                if symbol in pending:
+                    execution.on_tick(symbol, t, price, volume)
+                subs = routes[s]
+                if not subs:
+                    continue
+                data = construct(symbol=symbol, price=price, volume=volume,
+                                 timestamp=fromts(t, _UTC).replace(tzinfo=None), source="backtest")
+                for cb, ledger in subs:
+                    ledger.ticks += 1
+                    try:
+                        await cb(data)
+                    except Exception as e:
+                        ledger.errors += 1
+                        if ledger.errors <= 3:
+                            logger.warning(f"{ledger.strategy_id} on_tick failed at {fromts(t, _UTC)}: {e!r}")
+        for ledger in ledgers:
+            ledger.mark(last_price)
+
+    async def _fire_due(self, t: float, next_mark: float, ledgers) -> float:
+        """Runs timers and equity marks due before print time t, each at its own virtual time."""
+        while True:
+            due = [x for x in self._timers if x[0] <= t]
+            if not due and next_mark > t:
+                return next_mark
+            first = min([x[0] for x in due] + [next_mark])
+            self.clock.t = first
+            if next_mark == first:
+                for ledger in ledgers:
+                    ledger.mark(self.execution.last_price)
+                next_mark += self.mark_interval
+                if next_mark <= t:
+                    # Skip empty stretches (weekends, gaps) in one step
+                    next_mark += ((t - next_mark) // self.mark_interval + 1) * self.mark_interval
+            for timer in due:
+                if timer[0] != first:
+                    continue
+                timer[0] += timer[1]
+                try:
+                    await timer[2]()
+                except Exception as e:
+                    if timer[3]:
+                        self.execution.ledger(timer[3]).errors += 1
+                    logger.warning(f"Timer {getattr(timer[2], '__name__', timer[2])} failed: {e!r}")
+
+    def _report(self, elapsed: float) -> dict:
+        tape, prices = self.tape, self.execution.last_price
+        iso = lambda t: _REAL_DATETIME.fromtimestamp(t, _UTC).isoformat() if t is not None else None
+        return {
+            "start": iso(tape.start),
+            "end": iso(tape.end),
+            "ticks": len(tape),
+            "elapsed_s": round(elapsed, 3),
+            "ticks_per_sec": round(len(tape) / elapsed) if elapsed > 0 else None,
+            "agents": {sid: ledger.stats(prices) for sid, ledger in self.execution.ledgers.items()},
+            "open_orders": len(self.execution.open_orders()),
+            "fills": self.execution.fills,
+        }
+
+
+def summary_table(report: dict) -> pd.DataFrame:
+    """One row per agent, the headline columns only."""
+    cols = ["ticks", "signals", "fills", "fees", "realized_pnl", "unrealized_pnl", "net_pnl",
+            "round_trips", "win_rate", "max_drawdown", "avg_slippage_bps", "avg_latency_ms", "errors"]
+    rows = {sid: {c: stats[c] for c in cols} for sid, stats in report["agents"].items()}
+    return pd.DataFrame.from_dict(rows, orient="index")
+
+
+def build_agent(name: str):
+    module_name, class_name, timer = AGENTS[name]
+    module = importlib.import_module(module_name)
+    with offline_audit():
+        agent = getattr(module, class_name)()
+    return agent, timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Event-driven backtest for Krypto strategy agents")
+    parser.add_argument("--agent", action="append", required=True, choices=sorted(AGENTS))
+    parser.add_argument("--data", action="append", required=True, help="tick/candle CSV or .npz tape")
+    parser.add_argument("--symbol", action="append", help="symbol per --data file (when not in the file)")
+    parser.add_argument("--interval", type=float, default=None, help="candle length in seconds")
+    parser.add_argument("--start", default=None)
+    parser.add_argument("--end", default=None)
+    parser.add_argument("--fee-bps", type=float, default=26.0)
+    parser.add_argument("--maker-bps", type=float, default=16.0)
+    parser.add_argument("--slippage-bps", type=float, default=2.0)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--fills", default=None, help="write fills CSV here")
+    args = parser.parse_args()
+
+    symbols = args.symbol or []
+    tape = TickTape.merge(TickTape.load(path, symbols[i] if i < len(symbols) else None, args.interval)
+                          for i, path in enumerate(args.data))
+    bounds = [_epoch_seconds([x])[0] if x else None for x in (args.start, args.end)]
+    tape = tape.between(*bounds)
+    print(f"📼 Tape: {len(tape):,} ticks over {tape.symbols}")
+
+    engine = BacktestEngine(tape, FeeModel(args.fee_bps, args.maker_bps), SlippageModel(args.slippage_bps),
+                            LatencyModel(args.latency_ms, args.jitter_ms))
+    for name in args.agent:
+        agent, timer = build_agent(name)
+        engine.add_agent(agent)
+        if timer:
+            engine.add_timer(timer[1], getattr(agent, timer[0]), agent)
+
+    report = engine.run()
+    print(f"⚡ {report['ticks']:,} ticks in {report['elapsed_s']}s ({report['ticks_per_sec']:,}/s)")
+    print(summary_table(report).T.to_string())
+    if args.fills:
+        pd.DataFrame(report["fills"]).to_csv(args.fills, index=False)
+        print(f"💾 Fills written to {args.fills}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Candle Store — Fixed-capacity NumPy ring buffer for OHLCV candles.
+=================================================================
+Replaces the list-of-dicts buffer in KrakenWebSocketData:
+
+- Structured array, preallocated once: no per-candle dict/row allocation.
+- The forming candle (same timestamp) is updated in place.
+- Every row is written twice (slot i and i + capacity), so the newest
+  `capacity` candles are always one contiguous slice: `view()` is a single
+  memcpy under the lock and eviction is free (no `list.pop(0)`).
+- Timestamps are UTC epoch seconds, so they only ever increase (a DST
+  change never makes a new candle look stale); local time is display-only.
+- `to_dataframe()` is cached and only rebuilt after an update.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+CANDLE_DTYPE = np.dtype([
+    ("timestamp", "f8"),   # candle end time, UTC epoch seconds
+    ("open", "f8"),
+    ("high", "f8"),
+    ("low", "f8"),
+    ("close", "f8"),
+    ("volume", "f8"),
+])
+
+
+class CandleRingBuffer:
+    """Newest-last OHLCV history with O(1) append/update."""
+
+    def __init__(self, capacity: int = 2000):
+        self.capacity = capacity
+        self._data = np.zeros(capacity * 2, dtype=CANDLE_DTYPE)
+        self._head = 0          # next write slot in [0, capacity)
+        self._size = 0
+        self._version = 0
+        self._df_cache = None
+        self._df_version = -1
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def version(self) -> int:
+        """Bumped on every append/update; lets callers cache derived data."""
+        return self._version
+
+    def last_timestamp(self) -> float:
+        if not self._size:
+            return float("-inf")
+        return float(self._data["timestamp"][self._head - 1 + self.capacity])
+
+    def upsert(self, timestamp: float, open_p: float, high_p: float, low_p: float,
+               close_p: float, volume: float) -> bool:
+        """
+        Appends a new candle, or updates the forming one in place when the
+        timestamp matches the newest candle. Stale (older) candles are ignored.
+        Returns True if the buffer changed.
+        """
+        row = (timestamp, open_p, high_p, low_p, close_p, volume)
+        with self.lock:
+            last = self.last_timestamp()
+            if timestamp == last:
+                slot = (self._head - 1) % self.capacity  # newest row (wraps to capacity - 1 at head 0)
+            elif timestamp > last:
+                slot = self._head
+                self._head = (self._head + 1) % self.capacity
+                if self._size < self.capacity:
+                    self._size += 1
+            else:
+                return False
+            self._data[slot] = row
+            self._data[slot + self.capacity] = row
+            self._version += 1
+            return True
+
+    def view(self) -> np.ndarray:
+        """
+        Read-only structured array of the candles, oldest first. Copied under
+        the lock in one contiguous slice, so the feed thread can keep writing.
+        """
+        with self.lock:
+            end = self._head + self.capacity
+            out = self._data[end - self._size:end].copy()
+        out.flags.writeable = False
+        return out
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        DataFrame with timestamp/open/high/low/close/volume columns; the
+        timestamp is local wall-clock time (as datetime.fromtimestamp).
+        Cached per version; treat it as read-only (copy before mutating).
+        """
+        with self.lock:
+            if self._df_version == self._version and self._df_cache is not None:
+                return self._df_cache
+            end = self._head + self.capacity
+            arr = self._data[end - self._size:end].copy()
+            version = self._version
+        if not len(arr):
+            df = pd.DataFrame()
+        else:
+            epochs = arr["timestamp"]
+            local = epochs + np.fromiter((time.localtime(t).tm_gmtoff for t in epochs), "f8", len(epochs))
+            df = pd.DataFrame({
+                "timestamp": pd.to_datetime(local, unit="s"),
+                "open": arr["open"],
+                "high": arr["high"],
+                "low": arr["low"],
+                "close": arr["close"],
+                "volume": arr["volume"],
+            })
+        with self.lock:
+            self._df_cache = df
+            self._df_version = version
+        return df
@@ -0,0 +1,99 @@
+import importlib.abc
+import importlib.machinery
+import os
+import sys
+
+import pytest
+
+# Krypto's top-level modules (shared, ledger, auditor, ...) share names with the
+# repo root's, and pytest puts the repo root first on sys.path because Krypto/ is
+# a package. LocalFinder resolves those names from this directory instead; when
+# the whole tree is collected in one session each side gets its own modules back
+# around its own tests.
+HERE = os.path.dirname(os.path.abspath(__file__))
+LOCAL_NAMES = {
+    name[:-3] if name.endswith(".py") else name
+    for name in os.listdir(HERE)
+    if name.endswith(".py") and not name.startswith(("test_", "conftest"))
+    or (os.path.isdir(os.path.join(HERE, name)) and name.isidentifier() and not name.startswith("_"))
+}
+
+# Live connectivity scripts: they hit Trading 212 / Telegram at import. Run them directly.
+collect_ignore = ["test_api.py", "test_tg.py"]
+
+
+def _is_local(name):
+    return name.partition(".")[0] in LOCAL_NAMES
+
+
+def _swap(incoming):
+    """Replace the Krypto-named entries in sys.modules with `incoming`; return the ones removed."""
+    outgoing = {name: mod for name, mod in sys.modules.items() if _is_local(name)}
+    for name in outgoing:
+        del sys.modules[name]
+    sys.modules.update(incoming)
+    return outgoing
+
+
+class LocalFinder(importlib.abc.MetaPathFinder):
+    """Finds Krypto's top-level modules in Krypto/ ahead of anything on sys.path."""
+
+    def find_spec(self, name, path=None, target=None):
+        if path is None and name in LOCAL_NAMES:
+            return importlib.machinery.PathFinder.find_spec(name, [HERE])
+        return None
+
+
+FINDER = LocalFinder()
+_outside = {}
+_ours = {}
+
+
+def _enter():
+    global _outside
+    if FINDER not in sys.meta_path:
+        sys.meta_path.insert(0, FINDER)
+        _outside = _swap(_ours)
+
+
+def _leave():
+    global _ours
+    if FINDER in sys.meta_path:
+        sys.meta_path.remove(FINDER)
+        _ours = _swap(_outside)
+
+
+def _switch(path):
+    if os.path.commonpath([HERE, os.path.abspath(str(path))]) == HERE:
+        _enter()
+    else:
+        _leave()
+
+
+_enter()
+
+
+class ModuleSwitch:
+    """Registered as a plugin (not a conftest hook) so it also sees the repo root's nodes."""
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_make_collect_report(self, collector):
+        _switch(collector.path)
+        return (yield)
+
+    @pytest.hookimpl(wrapper=True)
+    def pytest_runtest_protocol(self, item, nextitem):
+        _switch(item.path)
+        return (yield)
+
+
+def pytest_configure(config):
+    config.pluginmanager.register(ModuleSwitch(), "krypto-module-switch")
+
+
+@pytest.fixture(autouse=True)
+def scratch_audit_trail(tmp_path, monkeypatch):
+    """Keep the broker's dual-write to the central audit trail off the real Krypto/shared/data DB."""
+    import shared.audit_trail
+    monkeypatch.setattr(shared.audit_trail, "DB_DIR", tmp_path)
+    monkeypatch.setattr(shared.audit_trail, "DB_PATH", tmp_path / "audit_trail.db")
@@ -2,12 +2,15 @@ import logging
 import time
 import krakenex
 import app_config
+from order_book import KrakenBookFeed
 
 class ExecutionEngine:
     def __init__(self):
         self.logger = logging.getLogger('trade_logger')
         self.api = krakenex.API(key=app_config.KRAKEN_API_KEY, secret=app_config.KRAKEN_SECRET)
         self.is_paper = app_config.IS_PAPER_TRADING
+        # Local L2 book (Kraken WS); started on the first live spread check
+        self.book_feed = KrakenBookFeed()
 
     def get_balance(self, asset='ZUSD'):
         """
@@ -35,28 +38,37 @@ class ExecutionEngine:
 
     def check_spread(self, pair):
         """
-        Queries Kraken Ticker to check current spread.
+        Checks current spread from the local WS order book, falling back
+        to the Kraken Ticker until the book is fresh.
         Returns True if Spread < MAX_SPREAD_PERCENT.
         """
         if self.is_paper:
             return True 
 
         try:
-            # Raw KrakenEx Ticker Call
-            # Pair: XXBTZGBP
-            res = self.api.query_public('Ticker', {'pair': pair})
-            if res.get('error'):
-                self.logger.error(f"Ticker Error: {res['error']}")
+            self.book_feed.start()
+            book = self.book_feed.ensure_subscribed(pair)
+            if book.is_fresh():
+                bid, ask = book.best_bid_ask()
+            else:
+                # Raw KrakenEx Ticker Call
+                # Pair: XXBTZGBP
+                res = self.api.query_public('Ticker', {'pair': pair})
+                if res.get('error'):
+                    self.logger.error(f"Ticker Error: {res['error']}")
+                    return False
+
+                # Result format: {'XXBTZGBP': {'a': ['50000.0', ...], 'b': ['49900.0', ...]}}
+                res_data = res.get('result', {})
+                if not res_data: return False
+
+                p_data = list(res_data.values())[0]
+                ask = float(p_data['a'][0])
+                bid = float(p_data['b'][0])
+            if bid <= 0 or ask <= bid:
+                self.logger.warning(f"SPREAD GUARD: {pair} invalid quote {bid}/{ask}")
                 return False
             
-            # Result format: {'XXBTZGBP': {'a': ['50000.0', ...], 'b': ['49900.0', ...]}}
-            res_data = res.get('result', {})
-            if not res_data: return False
-            
-            p_data = list(res_data.values())[0]
-            ask = float(p_data['a'][0])
-            bid = float(p_data['b'][0])
-            
             spread_pct = (ask - bid) / bid
             
             if spread_pct > app_config.MAX_SPREAD_PERCENT:
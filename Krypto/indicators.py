@@ -1,3 +1,6 @@
+import math
+from collections import deque
+
 import pandas as pd
 import numpy as np
 
@@ -42,14 +45,28 @@ class TechnicalIndicators:
         return tr.rolling(window=period).mean()
 
     @staticmethod
-    def calculate_vwap(df):
+    def calculate_rsi_wilder(df, period=14, column='close'):
+        """Calculates RSI with Wilder's smoothing (alpha = 1/period), as TradingView does."""
+        delta = df[column].diff()
+        gain = (delta.where(delta > 0, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+        loss = (-delta.where(delta < 0, 0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean()
+
+        rs = gain / loss
+        return 100 - (100 / (1 + rs))
+
+    @staticmethod
+    def calculate_vwap(df, anchor=None):
         """
         Calculates Volume Weighted Average Price.
         If data is intra-day, this should be reset daily. 
-        Assuming incoming DF is the relevant session data.
+        anchor=None assumes the incoming DF is the relevant session data;
+        anchor='D' resets the cumulative sums at each UTC day of df['timestamp'].
         """
         v = df['volume']
         tp = (df['high'] + df['low'] + df['close']) / 3
+        if anchor == 'D':
+            session = pd.to_datetime(df['timestamp']).dt.floor('D')
+            return (tp * v).groupby(session).cumsum() / v.groupby(session).cumsum()
         return (tp * v).cumsum() / v.cumsum()
 
     @staticmethod
@@ -61,3 +78,250 @@ class TechnicalIndicators:
         df['atr'] = TechnicalIndicators.calculate_atr(df, 14)
         df['vwap'] = TechnicalIndicators.calculate_vwap(df)
         return df
+
+
+# ---------------------------------------------------------------------------
+# STREAMING INDICATORS
+# O(1) state objects fed one candle at a time. Each update() accepts
+# revise=True to replace the last input (the forming candle) instead of
+# appending, so the same object can track a candle as it forms and closes.
+# Outputs match the pandas implementations above (NaN until warm).
+# ---------------------------------------------------------------------------
+
+_EMPTY = object()
+
+
+class StreamingEMA:
+    """EMA matching Series.ewm(span=period | alpha=..., adjust=False, min_periods=...).mean()."""
+
+    def __init__(self, period=None, alpha=None, min_periods=1):
+        self.alpha = alpha if alpha is not None else 2.0 / (period + 1)
+        self.min_periods = min_periods
+        self._ema = None
+        self._count = 0
+        self._prev = (None, 0)
+        self.value = float('nan')
+
+    def update(self, x, revise=False):
+        if revise and self._count:
+            self._ema, self._count = self._prev
+        self._prev = (self._ema, self._count)
+        self._ema = x if self._ema is None else self.alpha * x + (1 - self.alpha) * self._ema
+        self._count += 1
+        self.value = self._ema if self._count >= self.min_periods else float('nan')
+        return self.value
+
+
+class StreamingSMA:
+    """Rolling mean matching Series.rolling(period).mean(): NaN while any NaN is in the window."""
+
+    def __init__(self, period):
+        self.period = period
+        self._window = deque()
+        self._sum = 0.0
+        self._nans = 0
+        self._evicted = _EMPTY
+        self.value = float('nan')
+
+    def _add(self, x):
+        if math.isnan(x):
+            self._nans += 1
+        else:
+            self._sum += x
+
+    def _remove(self, x):
+        if math.isnan(x):
+            self._nans -= 1
+        else:
+            self._sum -= x
+
+    def update(self, x, revise=False):
+        if revise and self._window:
+            self._remove(self._window.pop())
+            if self._evicted is not _EMPTY:
+                self._window.appendleft(self._evicted)
+                self._add(self._evicted)
+
+        self._evicted = _EMPTY
+        if len(self._window) == self.period:
+            self._evicted = self._window.popleft()
+            self._remove(self._evicted)
+        self._window.append(x)
+        self._add(x)
+
+        if len(self._window) == self.period and not self._nans:
+            self.value = self._sum / self.period
+        else:
+            self.value = float('nan')
+        return self.value
+
+
+def _rsi_from(gain, loss):
+    # Mirrors pandas: gain/0 -> inf -> RSI 100, 0/0 -> NaN
+    if math.isnan(gain) or math.isnan(loss):
+        return float('nan')
+    if loss == 0:
+        return 100.0 if gain > 0 else float('nan')
+    return 100 - (100 / (1 + gain / loss))
+
+
+class StreamingRSI:
+    """
+    RSI over closes. Default matches calculate_rsi (rolling mean of gains/losses);
+    wilder=True matches calculate_rsi_wilder.
+    """
+
+    def __init__(self, period=14, wilder=False):
+        if wilder:
+            self._gain = StreamingEMA(alpha=1 / period, min_periods=period)
+            self._loss = StreamingEMA(alpha=1 / period, min_periods=period)
+        else:
+            self._gain = StreamingSMA(period)
+            self._loss = StreamingSMA(period)
+        self._prev_close = None
+        self._prev_state = _EMPTY
+        self.value = float('nan')
+
+    def update(self, close, revise=False):
+        if revise and self._prev_state is not _EMPTY:
+            self._prev_close = self._prev_state
+        self._prev_state = self._prev_close
+        delta = float('nan') if self._prev_close is None else close - self._prev_close
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+        self._prev_close = close
+        self.value = _rsi_from(self._gain.update(gain, revise), self._loss.update(loss, revise))
+        return self.value
+
+
+class StreamingATR:
+    """ATR matching calculate_atr (rolling mean of true range)."""
+
+    def __init__(self, period=14):
+        self._tr = StreamingSMA(period)
+        self._prev_close = None
+        self._prev_state = _EMPTY
+        self.value = float('nan')
+
+    def update(self, high, low, close, revise=False):
+        if revise and self._prev_state is not _EMPTY:
+            self._prev_close = self._prev_state
+        self._prev_state = self._prev_close
+        tr = high - low
+        if self._prev_close is not None:
+            tr = max(tr, abs(high - self._prev_close), abs(low - self._prev_close))
+        self._prev_close = close
+        self.value = self._tr.update(tr, revise)
+        return self.value
+
+
+def _utc_day(timestamp):
+    if isinstance(timestamp, np.datetime64):
+        return timestamp.astype('datetime64[D]')
+    if hasattr(timestamp, 'date'):
+        return timestamp.date()
+    return int(float(timestamp) // 86400)
+
+
+class StreamingVWAP:
+    """
+    Cumulative VWAP matching calculate_vwap. anchor='D' resets at each UTC day
+    (session-anchored); anchor=None never resets.
+    """
+
+    def __init__(self, anchor=None):
+        self.anchor = anchor
+        self._pv = 0.0
+        self._v = 0.0
+        self._session = None
+        self._prev = None
+        self.value = float('nan')
+
+    def update(self, timestamp, high, low, close, volume, revise=False):
+        if revise and self._prev is not None:
+            self._pv, self._v, self._session = self._prev
+        self._prev = (self._pv, self._v, self._session)
+        if self.anchor == 'D':
+            session = _utc_day(timestamp)
+            if session != self._session:
+                self._pv, self._v, self._session = 0.0, 0.0, session
+        self._pv += (high + low + close) / 3 * volume
+        self._v += volume
+        self.value = self._pv / self._v if self._v else float('nan')
+        return self.value
+
+
+class IndicatorEngine:
+    """
+    Per-pair bundle of streaming indicators (the columns add_all_indicators
+    produces, plus the ATR mean and body mean used by the ORB gates).
+    Feed candles with update(); a repeated timestamp revises the forming candle.
+    """
+
+    def __init__(self, vwap_anchor='D', history=5):
+        self.ema_20 = StreamingEMA(20)
+        self.ema_50 = StreamingEMA(50)
+        self.rsi = StreamingRSI(14)
+        self.atr = StreamingATR(14)
+        self.atr_mean_20 = StreamingSMA(20)
+        self.vwap = StreamingVWAP(anchor=vwap_anchor)
+        self.body_mean_20 = StreamingSMA(20)
+        self.vwap_anchor = vwap_anchor
+        # Last N (close, vwap) pairs, newest last
+        self.recent = deque(maxlen=history)
+        self.last_timestamp = None
+        self.count = 0
+        self.values = {}
+
+    def reset(self):
+        self.__init__(vwap_anchor=self.vwap_anchor, history=self.recent.maxlen)
+
+    def update(self, timestamp, open_p, high, low, close, volume):
+        """Applies one candle in O(1). Returns the current indicator values."""
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            return self.values  # stale / out-of-order
+        revise = timestamp == self.last_timestamp
+
+        atr = self.atr.update(high, low, close, revise)
+        vwap = self.vwap.update(timestamp, high, low, close, volume, revise)
+        self.values = {
+            'ema_20': self.ema_20.update(close, revise),
+            'ema_50': self.ema_50.update(close, revise),
+            'rsi': self.rsi.update(close, revise),
+            'atr': atr,
+            'atr_mean_20': self.atr_mean_20.update(atr, revise),
+            'vwap': vwap,
+            'body_mean_20': self.body_mean_20.update(abs(close - open_p), revise),
+        }
+        if revise and self.recent:
+            self.recent[-1] = (close, vwap)
+        else:
+            self.recent.append((close, vwap))
+            self.count += 1
+        self.last_timestamp = timestamp
+        return self.values
+
+    def sync(self, df):
+        """
+        Feeds only the rows of an OHLCV DataFrame the engine has not seen yet
+        (plus the last seen row, which may have been revised). Rebuilds from
+        scratch if the frame no longer contains the engine's last candle.
+        """
+        if df.empty:
+            return self.values
+        ts = df['timestamp'] if 'timestamp' in df.columns else df.index.to_series()
+        ts_values = ts.to_numpy()
+
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(np.searchsorted(ts_values, np.asarray(self.last_timestamp, dtype=ts_values.dtype)))
+            if start >= len(ts_values) or ts_values[start] != self.last_timestamp:
+                if ts_values[-1] < self.last_timestamp or start == 0:
+                    self.reset()
+                    start = 0
+
+        cols = df[['open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=float)
+        for i in range(start, len(cols)):
+            o, h, l, c, v = cols[i]
+            self.update(ts_values[i], o, h, l, c, v)
+        return self.values
@@ -0,0 +1,154 @@
+import logging
+from collections import deque
+
+logger = logging.getLogger("Aggregates")
+
+DAY = 86400.0
+
+
+class RollingSum:
+    """Sum/count of (ts, value) events over a trailing window; O(1) amortized per event."""
+
+    def __init__(self, window: float = DAY):
+        self.window = window
+        self._events = deque()
+        self.total = 0.0
+        self.wins = 0
+
+    def add(self, ts: float, value: float):
+        self._events.append((ts, value))
+        self.total += value
+        self.wins += value > 0
+        self.expire(ts)
+
+    def expire(self, now: float):
+        events, cutoff = self._events, now - self.window
+        while events and events[0][0] <= cutoff:
+            _, value = events.popleft()
+            self.total -= value
+            self.wins -= value > 0
+        if not events:
+            self.total = 0.0  # drop accumulated float drift when the window empties
+
+    @property
+    def count(self) -> int:
+        return len(self._events)
+
+
+class StrategyStats:
+    """
+    Incremental per-strategy book built from fill events: positions at
+    average cost, realized P&L net of fees, closed-trade win rate and a
+    trailing 24h realized P&L. Every fill is O(1).
+    """
+
+    def __init__(self, strategy_id: str, window: float = DAY):
+        self.strategy_id = strategy_id
+        self.positions = {}  # symbol -> [signed qty, avg price]
+        self.fills = 0
+        self.realized = 0.0
+        self.fees = 0.0
+        self.closed = 0
+        self.wins = 0
+        self.last_ts = 0.0
+        self.rolling = RollingSum(window)  # realized P&L per closing fill, net of fee
+
+    def apply_fill(self, ts: float, symbol: str, side: str, amount: float, price: float, fee: float = 0.0) -> float:
+        """Books one fill; returns the net realized P&L it produced (0 for opening fills)."""
+        signed = amount if side == "buy" else -amount
+        pos = self.positions.setdefault(symbol, [0.0, 0.0])
+        held, avg = pos
+        gross = 0.0
+        closing = held != 0 and (held > 0) != (signed > 0)
+        if not closing:
+            total = held + signed
+            pos[1] = (abs(held) * avg + amount * price) / abs(total)
+            pos[0] = total
+        else:
+            qty = min(amount, abs(held))
+            gross = qty * (price - avg) * (1 if held > 0 else -1)
+            remainder = held + signed
+            pos[0] = 0.0 if abs(remainder) < 1e-12 else remainder
+            if pos[0] == 0.0:
+                pos[1] = 0.0
+            elif (remainder > 0) != (held > 0):
+                pos[1] = price  # flipped through flat
+        net = gross - fee
+        self.fills += 1
+        self.fees += fee
+        self.realized += net
+        self.last_ts = max(self.last_ts, ts)
+        if closing:
+            self.closed += 1
+            self.wins += net > 0
+            self.rolling.add(ts, net)
+        elif fee:
+            self.rolling.add(ts, -fee)
+        return net
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.closed if self.closed else 0.0
+
+    def snapshot(self, now: float = None) -> dict:
+        if now is not None:
+            self.rolling.expire(now)
+        return {
+            "fills": self.fills,
+            "closed_trades": self.closed,
+            "win_rate": round(self.win_rate, 4),
+            "realized_pnl": round(self.realized, 8),
+            "fees": round(self.fees, 8),
+            "pnl_24h": round(self.rolling.total, 8),
+            "positions": {s: {"qty": q, "avg_price": a} for s, (q, a) in self.positions.items() if q},
+        }
+
+
+def parse_fill(entry: dict):
+    """
+    (strategy_id, ts, symbol, side, amount, price, fee) from an audit entry that
+    records an executed order, else None. ExecutionManager logs these as
+    order_placed with the fill price/amount in details.
+    """
+    details = entry.get("details") or {}
+    if details.get("status") != "success" or "price" not in details or not entry.get("strategy_id"):
+        return None
+    try:
+        return (entry["strategy_id"], float(entry["ts"]), details["symbol"], str(details["side"]).lower(),
+                float(details["amount"]), float(details["price"]), float(details.get("fee") or 0.0))
+    except (KeyError, TypeError, ValueError) as e:
+        logger.warning(f"Malformed fill entry {entry.get('log_id')}: {e}")
+        return None
+
+
+class FillAggregator:
+    """Per-strategy StrategyStats plus a portfolio-wide trailing 24h realized P&L."""
+
+    def __init__(self, window: float = DAY):
+        self.window = window
+        self.strategies = {}
+        self.portfolio = RollingSum(window)
+        self.events = 0
+
+    def stats_for(self, strategy_id: str) -> StrategyStats:
+        stats = self.strategies.get(strategy_id)
+        if stats is None:
+            stats = self.strategies[strategy_id] = StrategyStats(strategy_id, self.window)
+        return stats
+
+    def apply(self, entry: dict):
+        """Feeds one audit entry; returns the fill's net P&L, or None for non-fill entries."""
+        self.events += 1
+        fill = parse_fill(entry)
+        if fill is None:
+            return None
+        strategy_id, ts, *rest = fill
+        net = self.stats_for(strategy_id).apply_fill(ts, *rest)
+        if net:
+            self.portfolio.add(ts, net)
+        return net
+
+    def loss_24h(self, now: float = None) -> float:
+        if now is not None:
+            self.portfolio.expire(now)
+        return max(0.0, -self.portfolio.total)
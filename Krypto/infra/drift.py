@@ -1,68 +1,97 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from datetime import datetime
 from shared.broker import MessageBroker
-from shared.schemas import StrategyHealthReport
+from shared.schemas import StrategyHealthReport, AuditLogEntry
+from infra.aggregates import FillAggregator
+from infra.streams import AuditStreamConsumer
 
 logger = logging.getLogger("DriftAnalyzer")
 
+# Expected metrics per strategy (backtest baselines)
+EXPECTED_WIN_RATE = {
+    "augmented_orb_v1": 0.55,
+    "geometric_grid_v1": 0.60,
+    "spot_futures_arb_v1": 0.70,
+}
+MIN_TRADES = 10  # below this a win rate says nothing
+
 class DriftAnalyzer:
-    def __init__(self):
-        self.broker = MessageBroker()
-        
+    """
+    Keeps per-strategy aggregates current from the audit stream (consumer
+    group "drift"); the daily check reads them instead of rescanning history.
+    """
+    def __init__(self, broker: MessageBroker = None):
+        self.broker = broker or MessageBroker()
+        self.aggregates = FillAggregator()
+        self.consumer = None
+
+    async def start(self, check_interval: float = 86400):
+        await self.broker.connect()
+        if not self.broker.redis:
+            logger.error("❌ Drift Analyzer needs Redis (audit stream)")
+            return
+        # Win rates are all-time: a restart replays the whole retained stream
+        self.consumer = AuditStreamConsumer(self.broker.redis, "drift", self.on_batch, replay_on_restart=True)
+        await asyncio.gather(self.consumer.run(), self._daily(check_interval))
+
+    async def on_batch(self, entries: list):
+        for entry in entries:
+            self.aggregates.apply(entry)
+
+    async def _daily(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.run_daily_check()
+
     async def analyze_strategy(self, strategy_id: str, lookback_days: int = 1) -> StrategyHealthReport:
-        # In a real impl, we'd query Redis Stream or a SQL DB for trade history
-        # Here we mock the data retrieval
-        
-        # Mock Data
-        total_trades = 50
-        wins = 22
-        win_rate = wins / total_trades
-        pnl = -0.05 # -5%
-        
-        # Expected metrics (could be loaded from config)
-        expected_win_rate = 0.55
-        
+        stats = self.aggregates.stats_for(strategy_id)
+        snapshot = stats.snapshot(time.time())
+        total_trades = snapshot["closed_trades"]
+        win_rate = snapshot["win_rate"]
+        pnl = snapshot["pnl_24h"] if lookback_days <= 1 else snapshot["realized_pnl"]
+
+        expected_win_rate = EXPECTED_WIN_RATE.get(strategy_id, 0.55)
         drift_detected = False
         reason = None
-        
-        if win_rate < (expected_win_rate - 0.1):
+
+        if total_trades >= MIN_TRADES and win_rate < (expected_win_rate - 0.1):
             drift_detected = True
             reason = f"Win Rate Deviation: {win_rate:.2f} vs {expected_win_rate}"
-            
-        report = StrategyHealthReport(
+
+        return StrategyHealthReport(
             strategy_id=strategy_id,
             date=datetime.utcnow().isoformat(),
             total_trades=total_trades,
             win_rate=win_rate,
             profit_loss=pnl,
-            benchmark_comparison=0.02, # Benchmark up 2%
+            benchmark_comparison=0.0,  # no benchmark feed on the audit stream
             drift_detected=drift_detected,
             drift_reason=reason
         )
-        
-        return report
 
     async def run_daily_check(self):
-        strategies = ["augmented_orb_v1", "geometric_grid_v1", "spot_futures_arb_v1"]
+        strategies = sorted(set(EXPECTED_WIN_RATE) | set(self.aggregates.strategies))
         logger.info("Running Daily Drift Check...")
-        
+        reports = []
         for strat in strategies:
             report = await self.analyze_strategy(strat)
+            reports.append(report)
             if report.drift_detected:
                 logger.warning(f"DRIFT DETECTED for {strat}: {report.drift_reason}")
                 # Log to audit stream so Janitor picks it up
-                await self.broker.log_audit({
-                    "action": "DRIFT_ALERT",
-                    "strategy_id": strat,
-                    "details": report.model_dump(),
-                    "level": "WARNING",
-                    "component": "DriftAnalyzer"
-                })
+                await self.broker.log_audit(AuditLogEntry(
+                    action="DRIFT_ALERT",
+                    strategy_id=strat,
+                    details=report.model_dump(),
+                    level="WARNING",
+                    component="DriftAnalyzer"
+                ))
             else:
                 logger.info(f"Strategy {strat} is healthy.")
+        return reports
 
 if __name__ == "__main__":
     analyzer = DriftAnalyzer()
-    # Mock run requires redis
-    # asyncio.run(analyzer.run_daily_check()) 
+    asyncio.run(analyzer.start())
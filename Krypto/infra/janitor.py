@@ -1,46 +1,47 @@
 import asyncio
 import logging
 from shared.broker import MessageBroker
+from infra.streams import AuditStreamConsumer
 
 logger = logging.getLogger("Janitor")
 
 class Janitor:
     """
     Consumes the 'system.audit_log' stream and syncs it to Google Docs/Drive.
+    Reads as consumer group "janitor": batches are synced then acked, and
+    anything synced-but-unacked at a crash is redelivered on restart.
     """
-    def __init__(self):
-        self.broker = MessageBroker()
+    def __init__(self, broker: MessageBroker = None, batch_size: int = 1000):
+        self.broker = broker or MessageBroker()
         self.running = False
-        
+        self.batch_size = batch_size
+        self.consumer = None
+        self.synced = 0
+
     async def start(self):
         logger.info("Janitor Service Starting...")
         await self.broker.connect()
+        if not self.broker.redis:
+            logger.error("❌ Janitor needs Redis (audit stream)")
+            return
         self.running = True
         await self.consume_logs()
 
     async def consume_logs(self):
-        last_id = "0"
-        while self.running:
-            try:
-                # XREAD the stream
-                # response = await self.broker.redis.xread({"system.audit_log": last_id}, count=10, block=1000)
-                # Mocking the read for structure
-                await asyncio.sleep(5) 
-                
-                # If we had data:
-                # for stream, messages in response:
-                #   for message_id, data in messages:
-                #       await self.sync_to_google_doc(data)
-                #       last_id = message_id
-                
-            except Exception as e:
-                logger.error(f"Janitor Error: {e}")
-                await asyncio.sleep(5)
+        # Archival is not latency sensitive: big batches, long blocks
+        self.consumer = AuditStreamConsumer(self.broker.redis, "janitor", self.sync_to_google_doc,
+                                            count=self.batch_size, block_ms=5000)
+        await self.consumer.run()
 
-    async def sync_to_google_doc(self, log_entry):
-        # Placeholder for Google API call
+    async def sync_to_google_doc(self, log_entries: list):
+        # Placeholder for Google API call: one batchUpdate per stream batch
         # doc_service.documents().batchUpdate(...)
-        pass
+        self.synced += len(log_entries)
+
+    def stop(self):
+        self.running = False
+        if self.consumer:
+            self.consumer.stop()
 
 if __name__ == "__main__":
     janitor = Janitor()
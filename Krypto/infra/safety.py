@@ -1,39 +1,63 @@
 import asyncio
 import logging
+import os
+import time
 from shared.broker import MessageBroker
-from shared.schemas import TradeSignal, MarketData, AuditLogEntry
+from shared.schemas import AuditLogEntry
+from infra.aggregates import DAY, FillAggregator
+from infra.streams import AuditStreamConsumer
 
 logger = logging.getLogger("SafetyMonitor")
 
 class SafetyMonitor:
-    def __init__(self):
-        self.broker = MessageBroker()
+    """
+    Kill switch fed by the audit stream: every fill updates the rolling 24h
+    realized P&L incrementally and the threshold is checked after each
+    XREADGROUP batch, so a breaching fill trips the switch within one batch
+    interval (block_ms) rather than on a polling cycle.
+    """
+    def __init__(self, broker: MessageBroker = None, max_loss_threshold: float = None, block_ms: int = 500):
+        self.broker = broker or MessageBroker()
         self.running = False
-        self.total_loss_24h = 0.0
-        self.max_loss_threshold = 1000.0 # Max daily loss in USD
-        self.active_agents_count = 0
+        self.aggregates = FillAggregator()
+        self.max_loss_threshold = max_loss_threshold if max_loss_threshold is not None else \
+            float(os.getenv("KRYPTO_MAX_DAILY_LOSS", "1000"))  # Max daily loss in USD
+        self.block_ms = block_ms
+        self.killed = False
+        self.consumer = None
+
+    @property
+    def total_loss_24h(self) -> float:
+        return self.aggregates.loss_24h(time.time())
 
     async def start(self):
         logger.info("Safety Monitor Starting...")
         await self.broker.connect()
         self.running = True
-        
-        # Subscribe to audit logs to track P/L
-        # Note: Redis Streams reading is more complex, here we assume a simpler pub/sub for critical alerts
-        # or polling the stream.
-        await self.monitor_loop()
+        if not self.broker.redis:
+            logger.error("❌ Safety Monitor needs Redis (audit stream); running health checks only")
+            await self.monitor_loop()
+            return
+        # A restart replays the last 24h of acked fills before reading new ones
+        self.consumer = AuditStreamConsumer(self.broker.redis, "safety", self.on_batch, block_ms=self.block_ms,
+                                            history_ms=int(DAY * 1000), replay_on_restart=True)
+        await asyncio.gather(self.consumer.run(), self.monitor_loop())
+
+    async def on_batch(self, entries: list):
+        for entry in entries:
+            self.aggregates.apply(entry)
+        await self.check_loss()
+
+    async def check_loss(self):
+        loss = self.total_loss_24h
+        if loss > self.max_loss_threshold and not self.killed:
+            await self.trigger_kill_switch(f"Daily Loss Limit Exceeded: {loss:.2f}")
 
     async def monitor_loop(self):
         while self.running:
             # Check for critical system health
-            # 1. Redis connectivity
             if not await self.check_redis():
                 await self.trigger_kill_switch("Redis Disconnected")
-            
-            # 2. Daily Loss Limit (Mocked logic)
-            if self.total_loss_24h > self.max_loss_threshold:
-                 await self.trigger_kill_switch(f"Daily Loss Limit Exceeded: {self.total_loss_24h}")
-
             await asyncio.sleep(5)
 
     async def check_redis(self) -> bool:
@@ -44,16 +68,24 @@ class SafetyMonitor:
 
     async def trigger_kill_switch(self, reason: str):
         logger.critical(f"🚨 KILL SWITCH TRIGGERED: {reason}")
+        self.killed = True
         # Publish a high-priority 'kill' message that all agents subscribe to
-        await self.broker.redis.publish("system.control", "KILL")
-        
-        # Also could forcibly cancel all orders via Manager
-        await self.broker.log_audit({
-            "action": "KILL_SWITCH",
-            "component": "SafetyMonitor",
-            "details": {"reason": reason},
-            "level": "CRITICAL"
-        })
+        try:
+            await self.broker.redis.publish("system.control", "KILL")
+            # Also could forcibly cancel all orders via Manager
+            await self.broker.log_audit(AuditLogEntry(
+                action="KILL_SWITCH",
+                component="SafetyMonitor",
+                details={"reason": reason, "loss_24h": self.aggregates.loss_24h()},
+                level="CRITICAL"
+            ))
+        except Exception as e:
+            logger.error(f"Kill switch broadcast failed: {e}")
+
+    def stop(self):
+        self.running = False
+        if self.consumer:
+            self.consumer.stop()
 
 if __name__ == "__main__":
      monitor = SafetyMonitor()
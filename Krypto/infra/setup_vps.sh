@@ -47,14 +47,13 @@ sudo systemctl daemon-reload
 sudo systemctl enable krypto-manager.service
 sudo systemctl enable krypto-janitor.service
 
-# Enable specific agents
-sudo systemctl enable krypto-agent@orb.service
-sudo systemctl enable krypto-agent@grid.service
-# Add more agents as needed:
+# Enable the agent host (one process, one Redis connection for all agents).
+# Pick agents with KRYPTO_AGENTS in krypto-agents.service, e.g. "orb grid dca mm".
+sudo systemctl enable krypto-agents.service
+# Per-agent processes remain available for isolation/debugging:
 # sudo systemctl enable krypto-agent@dca.service
 
 echo "--- 🏁 Setup Complete! ---"
 echo "To start everything:"
 echo "sudo systemctl start krypto-manager"
-echo "sudo systemctl start krypto-agent@orb"
-echo "..."
+echo "sudo systemctl start krypto-agents"
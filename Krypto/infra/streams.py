@@ -0,0 +1,222 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+
+from shared.broker import AUDIT_STREAM
+
+logger = logging.getLogger("AuditStream")
+
+DEAD_LETTER_STREAM = f"{AUDIT_STREAM}.dead"
+
+
+def _text(value) -> str:
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def decode_entry(message_id, fields: dict) -> dict:
+    """
+    Audit entry dict from one stream message. `ts` is the stream id's
+    millisecond clock (Redis server time at XADD), so it never goes backwards.
+    """
+    message_id = _text(message_id)
+    raw = fields.get(b"entry", fields.get("entry"))
+    entry = json.loads(raw) if raw is not None else {_text(k): _text(v) for k, v in fields.items()}
+    entry["ts"] = int(message_id.split("-", 1)[0]) / 1000.0
+    entry["stream_id"] = message_id
+    return entry
+
+
+class AuditStreamConsumer:
+    """
+    Consumer-group reader over `system.audit_log`.
+
+    - Large XREADGROUP batches; the handler gets the whole decoded batch and
+      the ids are XACKed together once it returns.
+    - On start the consumer first drains its own pending entries (delivered
+      before a crash, never acked), then periodically XAUTOCLAIMs entries
+      other consumers left idle for `claim_idle_ms`.
+    - A batch whose handler raises is retried; after `max_attempts` its
+      entries go to the dead-letter stream and are acked, so one poison entry
+      cannot wedge the group.
+
+    A new group starts at the beginning of the retained stream. When the
+    group already exists (a restart) and `replay_on_restart` is set, the
+    entries it had acked are replayed to the handler first (XRANGE over the
+    last `history_ms`, or the whole retained stream), so consumers holding
+    in-memory aggregates rebuild them on every start. Consumers with side
+    effects per entry (archival) leave it off.
+    """
+
+    replay_on_restart = False
+
+    def __init__(self, redis, group: str, handler, consumer: str = None, stream: str = AUDIT_STREAM,
+                 count: int = 500, block_ms: int = 1000, claim_idle_ms: int = 60000, max_attempts: int = 5,
+                 history_ms: int = None, replay_on_restart: bool = None):
+        self.redis = redis
+        self.group = group
+        self.handler = handler
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.stream = stream
+        self.count = count
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_attempts = max_attempts
+        self.history_ms = history_ms
+        if replay_on_restart is not None:
+            self.replay_on_restart = replay_on_restart
+        self.running = False
+        self._attempts = {}  # message id -> failed deliveries
+        self.delivered = 0
+        self.acked = 0
+        self.dead = 0
+        self.batches = 0
+        self.replayed = 0
+
+    async def ensure_group(self) -> bool:
+        """Creates the group at the start of the stream; False if it already existed."""
+        try:
+            await self.redis.xgroup_create(self.stream, self.group, id="0", mkstream=True)
+            logger.info(f"📚 Created consumer group {self.group} on {self.stream}")
+            return True
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+            return False
+
+    async def run(self):
+        if not await self.ensure_group() and self.replay_on_restart:
+            await self.replay_history()
+        self.running = True
+        await self.recover_pending()
+        reads = 0
+        while self.running:
+            try:
+                if reads % 60 == 0:
+                    await self.claim_stale()
+                reads += 1
+                response = await self.redis.xreadgroup(self.group, self.consumer, {self.stream: ">"},
+                                                       count=self.count, block=self.block_ms)
+                for _, messages in response or []:
+                    await self.process(messages)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ {self.group} read failed: {e}")
+                await asyncio.sleep(1)
+
+    def stop(self):
+        self.running = False
+
+    async def replay_history(self) -> int:
+        """
+        Feeds the handler what this group already acked, up to its
+        last-delivered id, without acking anything. Entries still pending in
+        the group are skipped: recover_pending/claim_stale deliver those, so
+        nothing is counted twice.
+        """
+        last_id = None
+        for info in await self.redis.xinfo_groups(self.stream):
+            if _text(info.get("name")) == self.group:
+                last_id = _text(info.get("last-delivered-id"))
+        if last_id in (None, "0-0"):
+            return 0
+        pending = {_text(p["message_id"]) for p in
+                   await self.redis.xpending_range(self.stream, self.group, min="-", max=last_id, count=1_000_000)}
+        start = "-" if self.history_ms is None else f"{int(time.time() * 1000) - self.history_ms}-0"
+        replayed = 0
+        while True:
+            messages = await self.redis.xrange(self.stream, min=start, max=last_id, count=self.count)
+            entries = []
+            for message_id, fields in messages:
+                if not fields or _text(message_id) in pending:
+                    continue
+                try:
+                    entries.append(decode_entry(message_id, fields))
+                except Exception:
+                    continue  # dead-lettered when it was first delivered
+            if entries:
+                await self.handler(entries)
+                replayed += len(entries)
+            if len(messages) < self.count:
+                break
+            start = "(" + _text(messages[-1][0])
+        self.replayed += replayed
+        logger.info(f"♻️ {self.group}: replayed {replayed} acked entries up to {last_id}")
+        return replayed
+
+    async def recover_pending(self):
+        """Re-reads this consumer's own unacked entries (id "0" = our PEL, from the start)."""
+        recovered = 0
+        last_id = "0"
+        while True:
+            response = await self.redis.xreadgroup(self.group, self.consumer, {self.stream: last_id}, count=self.count)
+            messages = response[0][1] if response else []
+            messages = [m for m in messages if m[1]]  # trimmed entries come back with no fields
+            if not messages:
+                break
+            last_id = _text(messages[-1][0])
+            recovered += len(messages)
+            await self.process(messages)
+        if recovered:
+            logger.info(f"♻️ {self.group}: reprocessed {recovered} pending entries")
+
+    async def claim_stale(self):
+        """Takes over entries another (dead) consumer of the group left unacked."""
+        start = "0-0"
+        while True:
+            response = await self.redis.xautoclaim(self.stream, self.group, self.consumer,
+                                                   min_idle_time=self.claim_idle_ms, start_id=start, count=self.count)
+            start, messages = _text(response[0]), [m for m in response[1] if m[1]]
+            if messages:
+                logger.info(f"♻️ {self.group}: claimed {len(messages)} stale entries")
+                await self.process(messages)
+            if start == "0-0":
+                break
+
+    async def process(self, messages):
+        ids, entries, undecodable = [], [], set()
+        for message_id, fields in messages:
+            ids.append(message_id)
+            try:
+                entries.append(decode_entry(message_id, fields))
+            except Exception as e:
+                logger.error(f"Undecodable audit entry {_text(message_id)}: {e}")
+                await self._dead_letter(message_id, fields, str(e))
+                undecodable.add(message_id)
+        self.delivered += len(messages)
+        try:
+            await self.handler(entries)
+        except Exception as e:
+            logger.error(f"❌ {self.group} handler failed on {len(entries)} entries: {e}")
+            # Left pending for redelivery (recover_pending/claim_stale) until max_attempts
+            ids = list(undecodable)
+            for message_id, fields in messages:
+                if message_id in undecodable:
+                    continue
+                attempts = self._attempts.get(message_id, 0) + 1
+                if attempts < self.max_attempts:
+                    self._attempts[message_id] = attempts
+                    continue
+                self._attempts.pop(message_id, None)
+                await self._dead_letter(message_id, fields, str(e))
+                ids.append(message_id)
+            if not ids:
+                return
+        else:
+            for message_id in ids:
+                self._attempts.pop(message_id, None)
+            self.batches += 1
+        await self.redis.xack(self.stream, self.group, *ids)
+        self.acked += len(ids)
+
+    async def _dead_letter(self, message_id, fields: dict, error: str):
+        self.dead += 1
+        await self.redis.xadd(DEAD_LETTER_STREAM, {**fields, "source_id": message_id, "group": self.group,
+                                                   "error": error[:500]})
+
+    def stats(self) -> dict:
+        return {"group": self.group, "delivered": self.delivered, "acked": self.acked,
+                "dead_lettered": self.dead, "batches": self.batches}
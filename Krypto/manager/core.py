@@ -8,21 +8,61 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from credentials_manager import get_secret
 
 from shared.broker import MessageBroker
-from shared.schemas import TradeSignal, MarketData, AuditLogEntry
+from shared.schemas import TradeSignal, MarketData, AuditLogEntry, OrderSide, OrderType
+from order_book import KrakenBookFeed
 import ccxt
-from .ratelimit import DecayingTokenBucket
+from .ratelimit import DecayingTokenBucket, RateScheduler, RateLimitTimeout, Priority
 from .normalization import Normalizer
+from .workers import ExchangeWorkerPool, ExchangeTimeout, SymbolLanes, install_nonce
 import time
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("ExecutionManager")
 
+EXIT_WORDS = ("stop", "exit", "close", "liquidat", "take profit", "take_profit")
+FILL_POLLS = 3  # fetch_order read-backs while a market order is still settling
+FILL_POLL_DELAY = 0.5  # seconds, growing linearly per read-back
+
+
+def signal_priority(signal: TradeSignal) -> Priority:
+    """Exits before entries before grid housekeeping."""
+    reason = signal.reason.lower()
+    if signal.order_type in (OrderType.STOP_LOSS, OrderType.TAKE_PROFIT) or any(w in reason for w in EXIT_WORDS):
+        return Priority.EXIT
+    if "grid" in signal.strategy_id or "grid" in reason:
+        return Priority.GRID
+    return Priority.ENTRY
+
+
+def _parse_weights(raw: str) -> dict:
+    """KRYPTO_STRATEGY_WEIGHTS="augmented_orb_v1=2,geometric_grid_v1=0.5" """
+    weights = {}
+    for part in filter(None, (p.strip() for p in (raw or "").split(","))):
+        name, _, value = part.partition("=")
+        try:
+            weights[name.strip()] = float(value)
+        except ValueError:
+            logger.warning(f"Ignoring bad strategy weight {part!r}")
+    return weights
+
 class ExecutionManager:
     def __init__(self):
         self.broker = MessageBroker()
         self.rate_limiter = DecayingTokenBucket(capacity=20, decay_rate=0.5)
+        # Bursts queue by priority/fair share instead of being deflected
+        self.scheduler = RateScheduler(self.rate_limiter, weights=_parse_weights(os.getenv("KRYPTO_STRATEGY_WEIGHTS")))
         self.running = False
         self.exchange = None
+        # Blocking ccxt calls run here so the loop never stalls on Kraken
+        self.workers = ExchangeWorkerPool(
+            max_workers=int(os.getenv("KRYPTO_EXCHANGE_WORKERS", "4")),
+            private_limit=int(os.getenv("KRYPTO_PRIVATE_CALLS", "2")),
+            default_timeout=float(os.getenv("KRYPTO_EXCHANGE_TIMEOUT", "10")),
+        )
+        # One FIFO lane per symbol: signals for different symbols run concurrently
+        self.lanes = SymbolLanes()
+        # Local L2 book (Kraken WS); spread audits read it instead of REST depth
+        self.book_feed = KrakenBookFeed()
         self.api_key = get_secret("KRAKEN_API_KEY")
         self.api_secret = get_secret("KRAKEN_SECRET")
         self.live_mode = get_secret("KRYPTO_LIVE").lower() == "true" if get_secret("KRYPTO_LIVE") else False
@@ -34,14 +74,22 @@ class ExecutionManager:
                 'apiKey': self.api_key,
                 'secret': self.api_secret,
                 'enableRateLimit': True,
+                'timeout': int(self.workers.default_timeout * 1000),
             })
+            install_nonce(self.exchange)
 
     async def start(self):
         logger.info(f"Starting Execution Manager (LIVE={self.live_mode})...")
         await self.broker.connect()
+        self.book_feed.start()
         self.running = True
         await self.process_signals()
 
+    async def stop(self):
+        self.running = False
+        await self.lanes.join()
+        self.workers.shutdown()
+
     async def process_signals(self):
         logger.info("Listening for trade signals...")
         while self.running:
@@ -54,21 +102,45 @@ class ExecutionManager:
             try:
                 signal = await self.broker.consume_signals()
                 logger.info(f"Received signal from {signal.strategy_id}: {signal.side} {signal.symbol}")
-                normalized_amount = Normalizer.normalize_amount(signal.symbol, signal.amount)
-                if await self.rate_limiter.consume(cost=1):
-                    # Hardened Spread Audit Check (0.05% Threshold)
-                    if self.check_spread_audit(signal.symbol):
-                         signal.amount = normalized_amount
-                         await self.execute_trade(signal)
-                    else:
-                         logger.warning(f"SPREAD ABORT: Excessive spread for {signal.symbol}. Trade skipped.")
-                         await self._log_execution(signal, "aborted_high_spread")
-                else:
-                    logger.warning(f"Rate limit hit! Deflecting signal {signal.signal_id}")
+                # Hand off and go straight back to the queue; the lane keeps per-symbol order
+                self.dispatch(signal)
             except Exception as e:
                 logger.error(f"Error in signal loop: {e}")
                 await asyncio.sleep(1)
 
+    def dispatch(self, signal: TradeSignal) -> asyncio.Future:
+        """Queues the signal in its symbol's lane: rate limit, then spread audit and execution."""
+        return self.lanes.submit(signal.symbol, lambda: self.handle_signal(signal),
+                                 admit=lambda: self.admit(signal))
+
+    async def admit(self, signal: TradeSignal) -> bool:
+        """
+        Waits for the signal's rate-limit token. Runs in lane order but
+        outside a lane-concurrency slot; exits are served ahead of other
+        symbols' entries and grid work by the scheduler, never ahead of
+        their own symbol's earlier signals.
+        """
+        try:
+            waited = await self.scheduler.acquire(signal.strategy_id, signal_priority(signal), cost=1)
+        except RateLimitTimeout as e:
+            logger.warning(f"Rate limit: dropping stale signal {signal.signal_id} ({e})")
+            await self._log_execution(signal, "rate_limited")
+            return False
+        if waited > 1:
+            logger.info(f"Signal {signal.signal_id} queued {waited:.1f}s for rate limit")
+        return True
+
+    async def handle_signal(self, signal: TradeSignal):
+        """Spread audit -> execute, for one admitted signal inside its symbol lane."""
+        normalized_amount = Normalizer.normalize_amount(signal.symbol, signal.amount)
+        # Hardened Spread Audit Check (0.05% Threshold)
+        if await self.check_spread_audit(signal.symbol):
+             signal.amount = normalized_amount
+             await self.execute_trade(signal)
+        else:
+             logger.warning(f"SPREAD ABORT: Excessive spread for {signal.symbol}. Trade skipped.")
+             await self._log_execution(signal, "aborted_high_spread")
+
     async def execute_trade(self, signal: TradeSignal):
         logger.info(f"ACTION: {signal.side.upper()} {signal.amount} {signal.symbol}")
         if not self.live_mode:
@@ -80,12 +152,14 @@ class ExecutionManager:
             return
         try:
             side = signal.side.value
-            # Synchronous call since aiohttp is broken in this environment
-            response = self.exchange.create_order(
+            # Sync ccxt (aiohttp is broken in this environment), run on the worker pool
+            response = await self.workers.call(
+                self.exchange.create_order,
                 symbol=signal.symbol,
                 type='market',
                 side=side,
-                amount=signal.amount
+                amount=signal.amount,
+                private=True
             )
             logger.info(f"SUCCESS: Kraken ID {response['id']}")
             
@@ -93,29 +167,82 @@ class ExecutionManager:
             if signal.stop_loss:
                 await self.submit_stop_loss(signal, response['id'])
                 
-            await self._log_execution(signal, "success", response['id'])
+            fill = await self._executed_fill(signal, response)
+            await self._log_execution(signal, "success", response['id'], fill=fill)
+        except ExchangeTimeout as e:
+            # The order may or may not exist on Kraken: never blindly retry, flag for reconciliation
+            logger.error(f"EXECUTION TIMEOUT: {e}")
+            await self._log_execution(signal, "unknown", str(e))
         except Exception as e:
             logger.error(f"EXECUTION FAILED: {e}")
             await self._log_execution(signal, "failed", str(e))
 
-    async def _log_execution(self, signal: TradeSignal, status: str, order_id: str = "-"):
+    async def _executed_fill(self, signal: TradeSignal, response: dict) -> dict:
+        """
+        The executed order for a placement. Kraken's AddOrder only returns the
+        txid (no filled/average/fee), so the fill is read back with fetch_order,
+        falling back to the order's trades from fetch_my_trades.
+        """
+        if response.get('filled') and response.get('average'):
+            return response
+        order_id = response['id']
+        for attempt in range(FILL_POLLS):
+            try:
+                await self.scheduler.acquire(signal.strategy_id, Priority.EXIT, cost=1)
+                order = await self.workers.call(self.exchange.fetch_order, order_id, signal.symbol, private=True)
+            except Exception as e:
+                logger.warning(f"Fill read-back failed for {order_id}: {e}")
+                break
+            if order.get('filled') and (order.get('average') or order.get('price')):
+                return order
+            await asyncio.sleep(FILL_POLL_DELAY * (attempt + 1))
+        try:
+            await self.scheduler.acquire(signal.strategy_id, Priority.EXIT, cost=1)
+            trades = await self.workers.call(self.exchange.fetch_my_trades, signal.symbol, private=True)
+        except Exception as e:
+            logger.warning(f"Trade read-back failed for {order_id}: {e}")
+            return response
+        trades = [t for t in trades or [] if t.get('order') == order_id]
+        filled = sum(float(t['amount']) for t in trades)
+        if not filled:
+            logger.warning(f"No executions found for {order_id}; fill not booked")
+            return response
+        return dict(response, filled=filled,
+                    average=sum(float(t['amount']) * float(t['price']) for t in trades) / filled,
+                    fee={'cost': sum(float((t.get('fee') or {}).get('cost') or 0.0) for t in trades)})
+
+    async def _log_execution(self, signal: TradeSignal, status: str, order_id: str = "-", fill: dict = None):
+        details = {"signal_id": signal.signal_id, "symbol": signal.symbol, "status": status, "order_id": order_id}
+        if fill:
+            # Fill price/size/fee let stream consumers (safety, drift) book P&L without REST lookups
+            price = fill.get('average') or fill.get('price')
+            if price:
+                details.update(side=signal.side.value, amount=fill.get('filled') or signal.amount, price=price,
+                               fee=(fill.get('fee') or {}).get('cost') or 0.0)
         await self.broker.log_audit(AuditLogEntry(
             component="execution_manager",
             action="order_placed" if status == "success" else f"order_{status}",
-            details={"signal_id": signal.signal_id, "symbol": signal.symbol, "status": status, "order_id": order_id},
+            details=details,
             strategy_id=signal.strategy_id
         ))
 
-    def check_spread_audit(self, symbol: str) -> bool:
+    async def check_spread_audit(self, symbol: str) -> bool:
         """
-        Queries Kraken Depth and verifies if spread < 0.05%.
+        Verifies spread < 0.05% against the local WS order book.
+        Falls back to a Kraken Depth REST call until the book is fresh.
         """
         try:
-            order_book = self.exchange.fetch_order_book(symbol)
-            bid = order_book['bids'][0][0] if order_book['bids'] else 0
-            ask = order_book['asks'][0][0] if order_book['asks'] else 0
-            if bid == 0: return False
-            
+            book = self.book_feed.ensure_subscribed(symbol)
+            if book.is_fresh():
+                bid, ask = book.best_bid_ask()
+            else:
+                order_book = await self.workers.call(self.exchange.fetch_order_book, symbol, timeout=5)
+                bid = order_book['bids'][0][0] if order_book['bids'] else 0
+                ask = order_book['asks'][0][0] if order_book['asks'] else 0
+            if bid <= 0 or ask <= bid:
+                logger.warning(f"SPREAD AUDIT for {symbol}: invalid quote {bid}/{ask}")
+                return False
+
             spread_pct = (ask - bid) / bid
             logger.info(f"SPREAD AUDIT for {symbol}: {spread_pct:.5f} (Limit: 0.0005)")
             return spread_pct <= 0.0005
@@ -135,12 +262,15 @@ class ExecutionManager:
             # Using stop-loss-limit for compliance with "Ironclad" spec
             # Price = Trigger, Price2 = Limit (slightly below for sells to ensure fill)
             # For simplicity in this spot-only retail env, we use market stop-loss
-            response = self.exchange.create_order(
+            await self.scheduler.acquire(signal.strategy_id, Priority.EXIT, cost=1)
+            response = await self.workers.call(
+                self.exchange.create_order,
                 symbol=signal.symbol,
                 type='stop-loss',
                 side=sl_side,
                 amount=signal.amount,
-                params={'stopPrice': signal.stop_loss}
+                params={'stopPrice': signal.stop_loss},
+                private=True
             )
             logger.info(f"STOP LOSS ACTIVE: ID {response['id']}")
         except Exception as e:
@@ -1,6 +1,8 @@
 import time
 import asyncio
+import heapq
 import math
+from enum import IntEnum
 from typing import Optional
 
 class DecayingTokenBucket:
@@ -23,45 +25,189 @@ class DecayingTokenBucket:
         self.last_update = time.monotonic()
         self._lock = asyncio.Lock()
 
+    def _decay(self):
+        now = time.monotonic()
+        self.counter = max(0.0, self.counter - (now - self.last_update) * self.decay_rate)
+        self.last_update = now
+
+    def try_consume(self, cost: float = 1) -> bool:
+        """Synchronous consume for callers already serialized on the loop (the scheduler)."""
+        self._decay()
+        if self.counter + cost <= self.capacity:
+            self.counter += cost
+            return True
+        return False
+
+    def time_until(self, cost: float = 1) -> float:
+        """Seconds of decay needed before 'cost' fits (0 if it fits now)."""
+        self._decay()
+        return max(0.0, (self.counter + cost - self.capacity) / self.decay_rate)
+
     async def consume(self, cost: int = 1) -> bool:
         """
         Attempt to consume 'cost' points.
         Returns True if successful (under capacity), False if rate limited.
         """
         async with self._lock:
-            now = time.monotonic()
-            elapsed = now - self.last_update
-            self.last_update = now
-            
-            # Apply Decay (Refill)
-            # Counter decreases by decay_rate * elapsed
-            self.counter = max(0.0, self.counter - (elapsed * self.decay_rate))
-            
-            # Check if we have room
-            if self.counter + cost <= self.capacity:
-                self.counter += cost
-                return True
-            else:
-                return False
+            return self.try_consume(cost)
 
     async def wait_for_token(self, cost: int = 1):
         """
         Blocks until enough decay has happened to allow 'cost'.
+        Sleeps exactly the computed decay time instead of polling.
         """
         while True:
-            if await self.consume(cost):
+            async with self._lock:
+                if self.try_consume(cost):
+                    return
+                wait_time = self.time_until(cost)
+            await asyncio.sleep(wait_time)
+
+
+class Priority(IntEnum):
+    """Service classes, most important first."""
+    EXIT = 0    # stop-losses, take-profits, closes, liquidations
+    ENTRY = 1   # new positions
+    GRID = 2    # grid replenishment / resting-order housekeeping
+
+
+class RateLimitTimeout(Exception):
+    """A queued request waited longer than its class allows (stale signal)."""
+
+
+class _Request:
+    __slots__ = ("strategy_id", "priority", "cost", "finish", "seq", "enqueued", "future")
+
+    def __init__(self, strategy_id, priority, cost, finish, seq, enqueued, future):
+        self.strategy_id = strategy_id
+        self.priority = priority
+        self.cost = cost
+        self.finish = finish
+        self.seq = seq
+        self.enqueued = enqueued
+        self.future = future
+
+    def __lt__(self, other):
+        return (self.finish, self.seq) < (other.finish, other.seq)
+
+
+class RateScheduler:
+    """
+    Queues requests on top of the Kraken decay model instead of rejecting them.
+
+    - Strict priority between classes: every queued EXIT is served before any
+      ENTRY, every ENTRY before any GRID.
+    - Within a class, weighted fair queuing across strategy_ids: each request
+      gets a virtual finish tag max(V, last tag of its strategy) + cost/weight
+      and the smallest tag goes first, so a bursty strategy cannot starve the
+      others and a weight-2 strategy gets twice the share under contention.
+    - One timer, armed for exactly the decay the head request needs; no polling.
+    - Requests older than max_wait[class] fail with RateLimitTimeout (a stale
+      entry is worse than none); exits wait as long as it takes by default.
+    """
+
+    DEFAULT_MAX_WAIT = {Priority.EXIT: None, Priority.ENTRY: 30.0, Priority.GRID: 10.0}
+
+    def __init__(self, bucket: DecayingTokenBucket, weights: dict = None, max_wait: dict = None):
+        self.bucket = bucket
+        self.weights = dict(weights or {})
+        self.max_wait = {**self.DEFAULT_MAX_WAIT, **(max_wait or {})}
+        self._queues = {p: [] for p in Priority}  # heaps of _Request
+        self._virtual = {p: 0.0 for p in Priority}
+        self._last_finish = {}  # (priority, strategy_id) -> finish tag
+        self._seq = 0
+        self._timer = None
+        # Metrics
+        self.granted = {p: 0 for p in Priority}
+        self.expired = {p: 0 for p in Priority}
+        self.wait_total = {p: 0.0 for p in Priority}
+        self.wait_max = {p: 0.0 for p in Priority}
+        self.wakeups = 0
+
+    async def acquire(self, strategy_id: str, priority: Priority = Priority.ENTRY, cost: float = 1):
+        """Waits for a token; returns the seconds spent queued."""
+        priority = Priority(priority)
+        loop = asyncio.get_running_loop()
+        now = time.monotonic()
+        if not any(self._queues.values()) and self.bucket.try_consume(cost):
+            self._record(priority, 0.0)
+            return 0.0
+        weight = float(self.weights.get(strategy_id, 1.0))
+        key = (priority, strategy_id)
+        finish = max(self._virtual[priority], self._last_finish.get(key, 0.0)) + cost / weight
+        self._last_finish[key] = finish
+        self._seq += 1
+        request = _Request(strategy_id, priority, cost, finish, self._seq, now, loop.create_future())
+        heapq.heappush(self._queues[priority], request)
+        self._dispatch()
+        try:
+            return await asyncio.wait_for(asyncio.shield(request.future), self.max_wait[priority])
+        except asyncio.TimeoutError:
+            self.expired[priority] += 1
+            raise RateLimitTimeout(f"{strategy_id} {priority.name} request waited > {self.max_wait[priority]}s")
+        finally:
+            if not request.future.done():
+                request.future.cancel()  # Dropped from the heap when it reaches the head
+                self._dispatch()
+
+    def _head(self):
+        for priority in Priority:
+            queue = self._queues[priority]
+            while queue and queue[0].future.done():
+                heapq.heappop(queue)
+            if queue:
+                return queue[0]
+        return None
+
+    def _dispatch(self):
+        """Grants every head request that fits, then sleeps exactly until the next one does."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while True:
+            head = self._head()
+            if head is None:
                 return
-            
-            # Calculate wait time
-            # We need to decay enough to fit 'cost'
-            # current_counter - (wait * decay) + cost <= capacity
-            # wait >= (current_counter + cost - capacity) / decay
-            async with self._lock: # Peek at counter
-                needed = (self.counter + cost - self.capacity)
-            
-            if needed > 0:
-                 wait_time = needed / self.decay_rate
-                 await asyncio.sleep(min(wait_time, 0.1)) # Sleep but check frequently
-            else:
-                 await asyncio.sleep(0.1)
+            if not self.bucket.try_consume(head.cost):
+                break
+            heapq.heappop(self._queues[head.priority])
+            self._virtual[head.priority] = head.finish
+            waited = time.monotonic() - head.enqueued
+            self._record(head.priority, waited)
+            head.future.set_result(waited)
+        delay = self.bucket.time_until(head.cost)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self):
+        self._timer = None
+        self.wakeups += 1
+        self._dispatch()
+
+    def _record(self, priority: Priority, waited: float):
+        self.granted[priority] += 1
+        self.wait_total[priority] += waited
+        self.wait_max[priority] = max(self.wait_max[priority], waited)
+
+    def depth(self) -> dict:
+        """Queued requests per class and per strategy_id."""
+        out = {}
+        for priority, queue in self._queues.items():
+            live = [r for r in queue if not r.future.done()]
+            per_strategy = {}
+            for r in live:
+                per_strategy[r.strategy_id] = per_strategy.get(r.strategy_id, 0) + 1
+            out[priority.name] = {"total": len(live), "by_strategy": per_strategy}
+        return out
 
+    def stats(self) -> dict:
+        return {
+            priority.name: {
+                "queued": sum(1 for r in self._queues[priority] if not r.future.done()),
+                "granted": self.granted[priority],
+                "expired": self.expired[priority],
+                "avg_wait_ms": round(self.wait_total[priority] / self.granted[priority] * 1000, 1)
+                if self.granted[priority] else 0.0,
+                "max_wait_ms": round(self.wait_max[priority] * 1000, 1),
+            }
+            for priority in Priority
+        } | {"wakeups": self.wakeups, "counter": round(self.bucket.counter, 3)}
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+logger = logging.getLogger("ExchangeWorkers")
+
+
+class ExchangeTimeout(Exception):
+    """A blocking exchange call overran its deadline (its outcome is unknown)."""
+
+
+class ExchangeWorkerPool:
+    """
+    Runs blocking ccxt calls in a bounded thread pool so the event loop
+    (signal intake, market data, audits) keeps running during slow Kraken
+    round trips.
+
+    - Every call has a deadline; on expiry the awaiting coroutine gets
+      ExchangeTimeout. The thread itself cannot be killed, so the worker slot
+      stays occupied until ccxt's own HTTP timeout returns it.
+    - Private (signed) calls are additionally capped by `private_limit`:
+      Kraken rejects nonces that arrive out of order, so only a few run at
+      once, each with a strictly increasing nonce (see install_nonce).
+    """
+
+    def __init__(self, max_workers: int = 4, private_limit: int = 2, default_timeout: float = 10.0):
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ccxt")
+        self._slots = asyncio.Semaphore(max_workers)
+        self._private = asyncio.Semaphore(max(1, private_limit))
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.total_latency = 0.0
+
+    async def call(self, fn, *args, timeout: float = None, private: bool = False, **kwargs):
+        """`await pool.call(exchange.create_order, ...)` — fn(*args, **kwargs) on a worker thread."""
+        timeout = self.default_timeout if timeout is None else timeout
+        name = getattr(fn, "__name__", repr(fn))
+        if private:
+            async with self._private:
+                return await self._run(fn, name, timeout, args, kwargs)
+        return await self._run(fn, name, timeout, args, kwargs)
+
+    async def _run(self, fn, name, timeout, args, kwargs):
+        loop = asyncio.get_running_loop()
+        await self._slots.acquire()
+        self.calls += 1
+        self.in_flight += 1
+        started = time.monotonic()
+        future = loop.run_in_executor(self._executor, partial(fn, *args, **kwargs))
+        # The slot frees when the thread actually finishes, not when we stop waiting
+        future.add_done_callback(lambda _: self._release(started))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.error(f"⏱️ {name} exceeded {timeout:g}s; outcome unknown")
+            raise ExchangeTimeout(f"{name} timed out after {timeout:g}s")
+        except Exception:
+            self.errors += 1
+            raise
+
+    def _release(self, started: float):
+        self.in_flight -= 1
+        self.total_latency += time.monotonic() - started
+        self._slots.release()
+
+    def stats(self) -> dict:
+        done = self.calls - self.in_flight
+        return {
+            "calls": self.calls,
+            "in_flight": self.in_flight,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "avg_latency_ms": round(self.total_latency / done * 1000, 1) if done else 0.0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def install_nonce(exchange):
+    """
+    Replaces the exchange's nonce with a thread-safe, strictly increasing
+    microsecond counter, so concurrent signed calls never reuse a nonce.
+    """
+    lock = threading.Lock()
+    last = [0]
+
+    def nonce():
+        with lock:
+            value = max(int(time.time() * 1_000_000), last[0] + 1)
+            last[0] = value
+            return value
+
+    exchange.nonce = nonce
+    return exchange
+
+
+class SymbolLanes:
+    """
+    Per-symbol FIFO lanes: jobs for one symbol run strictly one after another
+    (a stop-loss never races its own entry), different symbols run
+    concurrently. A job's `admit` step (e.g. a rate-limit token wait) runs
+    in lane order but without a concurrency slot, so a lane parked on it
+    never blocks other symbols. Lanes are created on first use and retire
+    when idle.
+    """
+
+    def __init__(self, max_concurrent: int = 8):
+        self._lanes = {}  # symbol -> asyncio.Queue of (admit, job, future)
+        self._workers = {}
+        self._concurrency = asyncio.Semaphore(max_concurrent)
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def submit(self, symbol: str, job, admit=None) -> asyncio.Future:
+        """
+        Queues `await job()` behind earlier jobs for the same symbol; returns
+        immediately with a future for the job's result (None if it raised,
+        the error is logged, or `await admit()` returned False).
+        """
+        queue = self._lanes.get(symbol)
+        if queue is None:
+            queue = self._lanes[symbol] = asyncio.Queue()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((admit, job, future))
+        if symbol not in self._workers:
+            self._workers[symbol] = asyncio.create_task(self._drain(symbol, queue))
+        return future
+
+    async def _drain(self, symbol: str, queue: asyncio.Queue):
+        while True:
+            try:
+                admit, job, future = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            result = None
+            try:
+                admitted = admit is None or await admit()
+            except Exception as e:
+                admitted = False
+                logger.error(f"Lane {symbol} admission failed: {e}")
+            if not admitted:
+                self.skipped += 1
+            else:
+                async with self._concurrency:
+                    try:
+                        result = await job()
+                        self.processed += 1
+                    except Exception as e:
+                        self.failed += 1
+                        logger.error(f"Lane {symbol} job failed: {e}")
+            if not future.done():
+                future.set_result(result)
+        # No await since the empty check, so nothing can slip in before retiring
+        self._workers.pop(symbol, None)
+        self._lanes.pop(symbol, None)
+
+    def depth(self) -> dict:
+        return {symbol: queue.qsize() for symbol, queue in self._lanes.items()}
+
+    async def join(self):
+        """Waits until every lane is idle."""
+        while self._workers:
+            await asyncio.gather(*list(self._workers.values()), return_exceptions=True)
+
+    async def cancel(self):
+        tasks = list(self._workers.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._workers.clear()
+        self._lanes.clear()
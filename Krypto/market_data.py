@@ -3,24 +3,29 @@ import threading
 import time
 import websocket
 import pandas as pd
-from datetime import datetime
 import logging
 import app_config
 from normalizer import DataNormalizer
+from candle_store import CandleRingBuffer
+from order_book import to_ws_pair
 
 class KrakenWebSocketData:
     """
     Manages WebSocket connection to Kraken for real-time OHLC data.
+    Candles live in per-pair NumPy ring buffers (see candle_store.py).
     """
-    def __init__(self, pairs=app_config.TRADING_PAIRS):
+    def __init__(self, pairs=None, capacity=2000):
+        # Resolved at call time: a config without TRADING_PAIRS must not break the import
+        pairs = pairs if pairs is not None else app_config.TRADING_PAIRS
         self.pairs = pairs
         self.ws_url = "wss://ws.kraken.com"
         self.ws = None
-        self.data_buffer = {pair: [] for pair in pairs}  # Buffer to store raw OHLC
-        self.df_buffer = {pair: pd.DataFrame() for pair in pairs} # DF
+        self.candles = {pair: CandleRingBuffer(capacity) for pair in pairs}
+        # Pair mapping resolved once: Config pair <-> WS pair (XXBTZGBP <-> XBT/GBP)
+        self.ws_pairs = {pair: to_ws_pair(pair) for pair in pairs}
+        self.ws_to_config = {ws_pair: pair for pair, ws_pair in self.ws_pairs.items()}
         self.logger = logging.getLogger('system_logger')
         self.normalizer = DataNormalizer()
-        self.lock = threading.Lock()
         self.running = False
 
     def on_message(self, ws, message):
@@ -31,101 +36,59 @@ class KrakenWebSocketData:
             if isinstance(msg, dict) and msg.get("event") == "heartbeat":
                 return
 
-            # OHLC Update
             # OHLC Update
             if isinstance(msg, list):
                 # Msg format: [channelID, [time, etime, open, high, low, close, vwap, vol, count], channelName, pair]
                 if len(msg) >= 4 and "ohlc" in str(msg[2]):
-                    data = msg[1]
-                    ws_pair = msg[3]
-                    
-                    # Map WS Pair to Config Pair
-                    ws_map = {
-                        "XBT/GBP": "XXBTZGBP",
-                        "ETH/GBP": "XETHZGBP",
-                        "SOL/GBP": "SOLGBP"
-                    }
-                    
-                    config_pair = ws_map.get(ws_pair, ws_pair)
-                    
-                    if config_pair in self.data_buffer:
-                        self.process_ohlc_update(config_pair, data)
+                    config_pair = self.ws_to_config.get(msg[3])
+                    if config_pair is not None:
+                        self.process_ohlc_update(config_pair, msg[1])
                     else:
-                        self.logger.warning(f"Received data for unconfigured pair: {ws_pair}")
+                        self.logger.warning(f"Received data for unconfigured pair: {msg[3]}")
 
         except Exception as e:
             self.logger.error(f"WS Message Error: {e}")
 
     def process_ohlc_update(self, pair, data):
         """
-        Updates the local DataFrame with new candle data.
+        Writes the candle into the pair's ring buffer (in place if still forming).
         Data: [time, etime, open, high, low, close, vwap, volume, count]
         """
-        # Close is index 5
-        # We need to build a proper candle row
-        timestamp = float(data[1]) # End time
-        open_p = float(data[2])
-        high_p = float(data[3])
-        low_p = float(data[4])
-        close_p = float(data[5])
-        volume = float(data[7])
+        timestamp = float(data[1]) # End time, UTC epoch (local time only in get_dataframe)
 
         # Normalize logic (Pence Bug Guard)
-        # Note: We don't know the exact symbol format from WS here easily without mapping
-        # so we pass the pair string.
-        close_p = self.normalizer.normalize_price(close_p, pair, "kraken")
-        high_p = self.normalizer.normalize_price(high_p, pair, "kraken")
-        low_p = self.normalizer.normalize_price(low_p, pair, "kraken")
-        open_p = self.normalizer.normalize_price(open_p, pair, "kraken")
-
-        row = {
-            'timestamp': datetime.fromtimestamp(timestamp),
-            'open': open_p,
-            'high': high_p,
-            'low': low_p,
-            'close': close_p,
-            'volume': volume
-        }
+        normalize = self.normalizer.normalize_price
+        self.candles[pair].upsert(
+            timestamp,
+            normalize(float(data[2]), pair, "kraken"),
+            normalize(float(data[3]), pair, "kraken"),
+            normalize(float(data[4]), pair, "kraken"),
+            normalize(float(data[5]), pair, "kraken"),
+            float(data[7]),
+        )
 
-        with self.lock:
-            buffer_list = self.data_buffer[pair]
-            
-            # Prevent duplicate 5m candles by timestamp comparison
-            if buffer_list and buffer_list[-1]['timestamp'] == row['timestamp']:
-                buffer_list[-1] = row # Update latest candle
-            else:
-                buffer_list.append(row) # Append new candle
-            
-            # Keep buffer size manageable (example: 2000 candles)
-            if len(self.data_buffer[pair]) > 2000:
-                self.data_buffer[pair].pop(0)
+    def _resolve_pair(self, pair):
+        """Accepts a config pair (XXBTZGBP) or WS pair (XBT/GBP)."""
+        if pair in self.candles:
+            return pair
+        return self.ws_to_config.get(pair, self.ws_to_config.get(to_ws_pair(pair)))
 
     def get_dataframe(self, pair):
-        """Returns a Pandas DataFrame of the pair's data."""
-        with self.lock:
-            # Check if we have data
-            # Map Config pair to WS pair if needed.
-            # Config: XXBTZGBP -> WS: XBT/GBP. 
-            # Simple heuristic mapping:
-            target_key = pair
-            if pair == "XXBTZGBP": target_key = "XBT/GBP"
-            if pair == "XETHZGBP": target_key = "ETH/GBP"
-            # SOLGBP might be SOL/GBP
-            
-            # Fallback search
-            if target_key not in self.data_buffer:
-                # Try finding it
-                for k in self.data_buffer.keys():
-                    if pair in k or k in pair: 
-                        target_key = k
-                        break
-            
-            data = self.data_buffer.get(target_key, [])
-            if not data:
-                return pd.DataFrame()
-                
-            df = pd.DataFrame(data)
-            return df
+        """
+        Returns a Pandas DataFrame of the pair's data.
+        The frame is cached until the next candle update; copy before mutating.
+        """
+        store = self.candles.get(self._resolve_pair(pair))
+        if store is None:
+            return pd.DataFrame()
+        return store.to_dataframe()
+
+    def get_candles(self, pair):
+        """Read-only structured array (timestamp/open/high/low/close/volume), oldest first; UTC epochs."""
+        store = self.candles.get(self._resolve_pair(pair))
+        if store is None:
+            return CandleRingBuffer(1).view()
+        return store.view()
 
     def on_error(self, ws, error):
         self.logger.error(f"WS Error: {error}")
@@ -137,12 +100,7 @@ class KrakenWebSocketData:
         self.logger.info("WS Opened")
         # Subscribe
         # Map config pairs to WS pairs
-        ws_pairs = []
-        for p in self.pairs:
-            if p == "XXBTZGBP": ws_pairs.append("XBT/GBP")
-            elif p == "XETHZGBP": ws_pairs.append("ETH/GBP")
-            elif p == "SOLGBP": ws_pairs.append("SOL/GBP")
-            else: ws_pairs.append(p)
+        ws_pairs = list(self.ws_pairs.values())
 
         sub_msg = {
             "event": "subscribe",
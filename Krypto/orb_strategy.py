@@ -2,7 +2,7 @@ import pandas as pd
 from datetime import datetime
 import logging
 import time
-from indicators import TechnicalIndicators
+from indicators import IndicatorEngine
 from smart_money import SmartMoneyConcepts
 import app_config
 import math
@@ -19,6 +19,8 @@ class ORBStrategy:
         self.range_low = None
         self.range_formed = False
         self.signal_fired = False  # Prevent multiple signals per session
+        # Streaming indicators: only new/revised candles are processed per call
+        self.indicators = IndicatorEngine(vwap_anchor='D')
     
     def reset_daily_state(self):
         self.range_high = None
@@ -44,11 +46,8 @@ class ORBStrategy:
         # Most recent closed candle
         last_candle = df_5m.iloc[-1]
         
-        # Enrich with Indicators
-        df_indic = TechnicalIndicators.add_all_indicators(df_5m.copy())
-        if df_indic.empty:
-            return None
-        current_indic = df_indic.iloc[-1]
+        # Enrich with Indicators (incremental: O(1) per new candle)
+        current_indic = self.indicators.sync(df_5m)
         
         signal = None
         
@@ -71,7 +70,7 @@ class ORBStrategy:
                 atr_current = current_indic['atr']
                 if not math.isnan(atr_current):
                     # Compare with rolling mean
-                    atr_mean = df_indic['atr'].rolling(20).mean().iloc[-1]
+                    atr_mean = current_indic['atr_mean_20']
                     if not math.isnan(atr_mean) and atr_current < (atr_mean * 1.0):
                          self.logger.info(f"[{self.session_name}] GATE BLOCKED: Low Volatility (ATR {atr_current:.2f} < Avg {atr_mean:.2f})")
                          return None
@@ -86,7 +85,8 @@ class ORBStrategy:
             # Gate D: Smart Money (Displacement + FVG)
             if app_config.FVG_FILTER_ENABLED:
                 # Check if breakout candle shows institutional displacement
-                if not SmartMoneyConcepts.is_displacement_candle(df_5m, index=-1, magnitude_factor=2.0):
+                if not SmartMoneyConcepts.is_displacement_candle(df_5m, index=-1, magnitude_factor=2.0,
+                                                                 avg_body=current_indic['body_mean_20']):
                     self.logger.info(f"[{self.session_name}] GATE BLOCKED: No Displacement on breakout candle")
                     return None
                 
@@ -0,0 +1,364 @@
+"""
+Local Order Book — L2 book maintained from the Kraken WebSocket `book` channel.
+==============================================================================
+Replaces the per-signal REST depth call (`fetch_order_book` / `Ticker`,
+~200ms each) in the spread audits with a memory read.
+
+- Snapshot + delta application with depth truncation (Kraken only streams
+  the subscribed depth, so levels that fall off the edge must be dropped).
+- CRC32 checksum validation on every update; a mismatch or a crossed
+  top of book (ask <= bid) invalidates the book and triggers a resubscribe
+  for a fresh snapshot.
+- Sorted price levels (bisect) so best bid/ask are O(1) reads.
+
+Usage:
+    feed = KrakenBookFeed(["BTC/USD"])
+    feed.start()
+    book = feed.get_book("BTC/USD")
+    if book and book.is_fresh():
+        bid, ask = book.best_bid_ask()
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+import zlib
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import websocket
+    WEBSOCKET_AVAILABLE = True
+except ImportError:
+    WEBSOCKET_AVAILABLE = False
+
+logger = logging.getLogger("OrderBook")
+
+# Kraken WS v1 uses legacy asset codes for a few bases
+_WS_BASE_ALIASES = {"BTC": "XBT", "DOGE": "XDG"}
+# REST pair names used by the legacy ExecutionEngine
+_REST_PAIR_ALIASES = {"XXBTZGBP": "XBT/GBP", "XETHZGBP": "ETH/GBP", "SOLGBP": "SOL/GBP",
+                      "XXBTZUSD": "XBT/USD", "XETHZUSD": "ETH/USD"}
+
+CHECKSUM_LEVELS = 10
+
+
+def to_ws_pair(symbol: str) -> str:
+    """Maps a ccxt symbol ('BTC/USD') or REST pair ('XXBTZGBP') to a WS v1 pair ('XBT/USD')."""
+    if symbol in _REST_PAIR_ALIASES:
+        return _REST_PAIR_ALIASES[symbol]
+    if "/" in symbol:
+        base, quote = symbol.split("/", 1)
+        return f"{_WS_BASE_ALIASES.get(base, base)}/{quote}"
+    return symbol
+
+
+def _checksum_field(value: str) -> str:
+    return value.replace(".", "").lstrip("0")
+
+
+class LocalOrderBook:
+    """
+    One symbol's L2 book. Mutated by the feed thread, read by trading code.
+    Prices are kept as floats in sorted lists; the exchange's original
+    strings are kept alongside because the checksum is computed over them.
+    """
+
+    def __init__(self, symbol: str, depth: int = 10, max_age: float = 10.0):
+        self.symbol = symbol
+        self.depth = depth
+        self.max_age = max_age
+        # price -> (price_str, volume_str, volume)
+        self._bids: Dict[float, Tuple[str, str, float]] = {}
+        self._asks: Dict[float, Tuple[str, str, float]] = {}
+        # Ascending price lists: best ask = _ask_prices[0], best bid = _bid_prices[-1]
+        self._bid_prices: List[float] = []
+        self._ask_prices: List[float] = []
+        self._lock = threading.Lock()
+        self.valid = False
+        self.last_update = 0.0
+        self.checksum_failures = 0
+        self.crossed_books = 0
+
+    # --- WRITERS (feed thread) ---
+    def apply_snapshot(self, asks: list, bids: list) -> bool:
+        """Replaces the book. Returns False (book stays invalid) if it is crossed."""
+        with self._lock:
+            self._bids.clear()
+            self._asks.clear()
+            self._bid_prices = []
+            self._ask_prices = []
+            for level in asks:
+                self._set_level(self._asks, self._ask_prices, level)
+            for level in bids:
+                self._set_level(self._bids, self._bid_prices, level)
+            self._truncate()
+            self.last_update = time.time()
+            self.valid = not self._crossed()
+            if not self.valid:
+                self.crossed_books += 1
+            return self.valid
+
+    def apply_update(self, asks: list, bids: list, checksum: Optional[str] = None) -> bool:
+        """
+        Applies a delta. Returns False (and invalidates the book) if the
+        resulting top-of-book does not match Kraken's checksum or is crossed.
+        """
+        with self._lock:
+            if not self.valid:
+                return False
+            for level in asks:
+                self._set_level(self._asks, self._ask_prices, level)
+            for level in bids:
+                self._set_level(self._bids, self._bid_prices, level)
+            self._truncate()
+            self.last_update = time.time()
+
+            if checksum is not None and self._checksum() != int(checksum):
+                self.valid = False
+                self.checksum_failures += 1
+                return False
+            if self._crossed():
+                self.valid = False
+                self.crossed_books += 1
+                return False
+            return True
+
+    def invalidate(self):
+        with self._lock:
+            self.valid = False
+
+    def _set_level(self, side: dict, prices: list, level: list):
+        price_str, volume_str = level[0], level[1]
+        price = float(price_str)
+        volume = float(volume_str)
+        if volume == 0.0:
+            if side.pop(price, None) is not None:
+                idx = bisect.bisect_left(prices, price)
+                if idx < len(prices) and prices[idx] == price:
+                    prices.pop(idx)
+            return
+        if price not in side:
+            bisect.insort(prices, price)
+        side[price] = (price_str, volume_str, volume)
+
+    def _truncate(self):
+        # Asks: drop the highest; bids: drop the lowest
+        while len(self._ask_prices) > self.depth:
+            self._asks.pop(self._ask_prices.pop())
+        while len(self._bid_prices) > self.depth:
+            self._bids.pop(self._bid_prices.pop(0))
+
+    def _crossed(self) -> bool:
+        return bool(self._bid_prices and self._ask_prices) and self._ask_prices[0] <= self._bid_prices[-1]
+
+    def _checksum(self) -> int:
+        parts = []
+        for price in self._ask_prices[:CHECKSUM_LEVELS]:
+            price_str, volume_str, _ = self._asks[price]
+            parts.append(_checksum_field(price_str) + _checksum_field(volume_str))
+        for price in reversed(self._bid_prices[-CHECKSUM_LEVELS:]):
+            price_str, volume_str, _ = self._bids[price]
+            parts.append(_checksum_field(price_str) + _checksum_field(volume_str))
+        return zlib.crc32("".join(parts).encode()) & 0xFFFFFFFF
+
+    # --- READERS (trading code) ---
+    def is_fresh(self) -> bool:
+        """Valid, uncrossed snapshot received and updated within max_age seconds."""
+        return self.valid and (time.time() - self.last_update) <= self.max_age and not self._crossed()
+
+    def best_bid_ask(self) -> Tuple[float, float]:
+        """(best_bid, best_ask); 0.0 for an empty side."""
+        with self._lock:
+            bid = self._bid_prices[-1] if self._bid_prices else 0.0
+            ask = self._ask_prices[0] if self._ask_prices else 0.0
+        return bid, ask
+
+    def spread_pct(self) -> Optional[float]:
+        """(ask - bid) / bid, or None if either side is empty."""
+        bid, ask = self.best_bid_ask()
+        if bid <= 0 or ask <= 0:
+            return None
+        return (ask - bid) / bid
+
+    def mid_price(self) -> Optional[float]:
+        bid, ask = self.best_bid_ask()
+        if bid <= 0 or ask <= 0:
+            return None
+        return (bid + ask) / 2
+
+    def levels(self, n: int = 10) -> Dict[str, List[Tuple[float, float]]]:
+        """Top-n levels per side as (price, volume), best first."""
+        with self._lock:
+            bids = [(p, self._bids[p][2]) for p in reversed(self._bid_prices[-n:])]
+            asks = [(p, self._asks[p][2]) for p in self._ask_prices[:n]]
+        return {"bids": bids, "asks": asks}
+
+
+class KrakenBookFeed:
+    """
+    WebSocket client for the Kraken v1 `book` channel.
+    Keeps one LocalOrderBook per subscribed symbol, keyed by the caller's
+    symbol format (ccxt or REST pair); the WS pair mapping is done once here.
+    """
+
+    def __init__(self, symbols: Optional[List[str]] = None, depth: int = 10,
+                 ws_url: str = "wss://ws.kraken.com"):
+        self.depth = depth
+        self.ws_url = ws_url
+        self.ws = None
+        self.thread = None
+        self.running = False
+        self._connected = threading.Event()
+        self._books: Dict[str, LocalOrderBook] = {}
+        self._by_ws_pair: Dict[str, LocalOrderBook] = {}
+        self._resubscribing = set()  # ws pairs awaiting a fresh snapshot after an invalidation
+        for symbol in symbols or []:
+            self._add_book(symbol)
+
+    def _add_book(self, symbol: str) -> LocalOrderBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = LocalOrderBook(symbol, depth=self.depth)
+            self._books[symbol] = book
+            self._by_ws_pair[to_ws_pair(symbol)] = book
+        return book
+
+    def get_book(self, symbol: str) -> Optional[LocalOrderBook]:
+        return self._books.get(symbol)
+
+    def ensure_subscribed(self, symbol: str) -> LocalOrderBook:
+        """Adds a symbol at runtime; its book becomes fresh once the snapshot lands."""
+        if symbol in self._books:
+            return self._books[symbol]
+        book = self._add_book(symbol)
+        if self._connected.is_set():
+            self._subscribe([to_ws_pair(symbol)])
+        return book
+
+    # --- WS CALLBACKS ---
+    def on_open(self, ws):
+        self._connected.set()
+        self._resubscribing.clear()
+        logger.info(f"Book feed connected; subscribing {list(self._by_ws_pair)}")
+        if self._by_ws_pair:
+            self._subscribe(list(self._by_ws_pair))
+
+    def on_message(self, ws, message):
+        try:
+            self.handle_message(json.loads(message))
+        except Exception as e:
+            logger.error(f"Book message error: {e}")
+
+    def on_error(self, ws, error):
+        logger.error(f"Book feed error: {error}")
+
+    def on_close(self, ws, close_status_code, close_msg):
+        self._connected.clear()
+        for book in self._books.values():
+            book.invalidate()
+        logger.warning("Book feed closed")
+
+    def handle_message(self, msg):
+        """Routes a decoded WS message (split out for replay/testing)."""
+        # Events (heartbeat, subscriptionStatus, systemStatus) are dicts
+        if not isinstance(msg, list) or len(msg) < 4:
+            return
+        channel, ws_pair = msg[-2], msg[-1]
+        if not str(channel).startswith("book"):
+            return
+        book = self._by_ws_pair.get(ws_pair)
+        if book is None:
+            return
+
+        # [chanID, {"as": [...], "bs": [...]}, "book-10", pair]  (snapshot)
+        # [chanID, {"a": [...]}, {"b": [...], "c": "..."}, "book-10", pair]  (update)
+        payloads = msg[1:-2]
+        first = payloads[0]
+        if "as" in first or "bs" in first:
+            self._resubscribing.discard(ws_pair)
+            if not book.apply_snapshot(first.get("as", []), first.get("bs", [])):
+                self._request_snapshot(ws_pair, "Crossed snapshot")
+            return
+
+        asks, bids, checksum = [], [], None
+        for payload in payloads:
+            asks.extend(payload.get("a", []))
+            bids.extend(payload.get("b", []))
+            checksum = payload.get("c", checksum)
+
+        if not book.apply_update(asks, bids, checksum):
+            self._request_snapshot(ws_pair, "Checksum mismatch or crossed book")
+
+    def _request_snapshot(self, ws_pair: str, reason: str):
+        """Resubscribes once per invalidation; deltas until the snapshot lands are dropped."""
+        if ws_pair in self._resubscribing:
+            return
+        self._resubscribing.add(ws_pair)
+        logger.warning(f"{reason} for {ws_pair}; resubscribing")
+        self._resubscribe(ws_pair)
+
+    def _subscribe(self, ws_pairs: List[str], event: str = "subscribe"):
+        if self.ws is None:
+            return
+        self.ws.send(json.dumps({
+            "event": event,
+            "pair": ws_pairs,
+            "subscription": {"name": "book", "depth": self.depth},
+        }))
+
+    def _resubscribe(self, ws_pair: str):
+        try:
+            self._subscribe([ws_pair], event="unsubscribe")
+            self._subscribe([ws_pair])
+        except Exception as e:
+            logger.error(f"Resubscribe failed for {ws_pair}: {e}")
+
+    def start(self) -> bool:
+        """Starts the feed thread (reconnects automatically). False if websocket-client is missing."""
+        if not WEBSOCKET_AVAILABLE:
+            logger.warning("websocket-client not installed; local order book disabled")
+            return False
+        if self.running:
+            return True
+        self.running = True
+        self.ws = websocket.WebSocketApp(
+            self.ws_url,
+            on_open=self.on_open,
+            on_message=self.on_message,
+            on_error=self.on_error,
+            on_close=self.on_close
+        )
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        return True
+
+    def _run(self):
+        while self.running:
+            self.ws.run_forever(ping_interval=30, ping_timeout=10)
+            if self.running:
+                time.sleep(2)
+
+    def stop(self):
+        self.running = False
+        if self.ws is not None:
+            self.ws.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    feed = KrakenBookFeed(["BTC/USD", "ETH/USD"])
+    feed.start()
+    try:
+        while True:
+            time.sleep(2)
+            for sym in ("BTC/USD", "ETH/USD"):
+                book = feed.get_book(sym)
+                if book.is_fresh():
+                    bid, ask = book.best_bid_ask()
+                    print(f"{sym}: {bid} / {ask}  spread {book.spread_pct():.5%}")
+                else:
+                    print(f"{sym}: waiting for snapshot...")
+    except KeyboardInterrupt:
+        feed.stop()
@@ -3,13 +3,12 @@ Sentiment Gate — Cross-project alternative data filter for Krypto.
 Reads sentiment_snapshot.json produced by alt_data_engine.py (Sovereign-Sentinel).
 Blocks trades during Extreme Fear / unfavourable market conditions.
 """
-import os
-import sys
-import json
 import logging
-from datetime import datetime, timedelta
 from pathlib import Path
 
+from shared.snapshot_reader import SnapshotReader, SnapshotView, EMPTY
+from shared.signal_store import SignalStore
+
 logger = logging.getLogger("SentimentGate")
 
 # ─── Snapshot Paths ───
@@ -20,6 +19,13 @@ SNAPSHOT_PATHS = [
     Path(__file__).parent.parent / "Sovereign-Sentinel" / "data" / "sentiment_snapshot.json",
 ]
 
+# Per-signal history written by the same engine, next to the snapshot
+SIGNAL_DB_PATHS = [
+    Path("/home/ubuntu/Sovereign-Sentinel/data/alt_signals.db"),       # VPS
+    Path(r"C:\Users\steve\Sovereign-Sentinel\data\alt_signals.db"),    # Windows dev
+    Path(__file__).parent.parent / "Sovereign-Sentinel" / "data" / "alt_signals.db",
+]
+
 # ─── Thresholds ───
 # Fear & Greed: 0-100, where 0=Extreme Fear, 100=Extreme Greed
 # Below FEAR_THRESHOLD → block trades (market panic)
@@ -30,49 +36,59 @@ GREED_THRESHOLD = 80      # Reduce position size by 25% (overextended)
 MAX_SNAPSHOT_AGE_HOURS = 4
 
 
+# Parsed once per file version; gate checks on the execution path are dict reads
+_reader = SnapshotReader(SNAPSHOT_PATHS)
+
+
+def _snapshot_view() -> SnapshotView:
+    """Latest snapshot, or EMPTY when stale (stale data = no gate, fail open)."""
+    view = _reader.read()
+    # The engine rewrites the file whenever any source lands: judge the F&G reading itself
+    if view.is_stale(MAX_SNAPSHOT_AGE_HOURS, source="fear_and_greed"):
+        view.memo("stale_warned", lambda: logger.warning(
+            f"Sentiment snapshot is {view.age_hours(source='fear_and_greed'):.1f}h old (stale)"))
+        return EMPTY
+    return view
+
+
 def _load_snapshot() -> dict:
     """Load the most recent sentiment snapshot."""
-    for path in SNAPSHOT_PATHS:
-        if path.exists():
-            try:
-                with open(path, 'r') as f:
-                    snapshot = json.load(f)
-                # Check freshness
-                ts = snapshot.get("timestamp", "")
-                if ts:
-                    age = datetime.now() - datetime.fromisoformat(ts)
-                    if age > timedelta(hours=MAX_SNAPSHOT_AGE_HOURS):
-                        logger.warning(f"Sentiment snapshot is {age.total_seconds()/3600:.1f}h old (stale)")
-                        return {}  # Stale data = no gate (fail open)
-                return snapshot.get("data", {})
-            except Exception as e:
-                logger.error(f"Failed to read snapshot from {path}: {e}")
-    logger.warning("No sentiment snapshot found — sentiment gate disabled (fail open)")
-    return {}
+    return _snapshot_view().data
 
 
 def get_fear_greed_value() -> int:
     """Returns the crypto Fear & Greed index value (0-100), or -1 if unavailable."""
-    data = _load_snapshot()
-    fg = data.get("fear_and_greed", {})
-    if fg and fg.get("value") is not None:
-        try:
-            return int(fg["value"])
-        except (ValueError, TypeError):
-            pass
-    return -1
+    return _snapshot_view().fear_greed
 
 
 def get_crypto_headlines() -> list:
     """Returns latest CryptoPanic headlines for LLM context."""
-    data = _load_snapshot()
-    return data.get("cryptopanic", [])
+    return _load_snapshot().get("cryptopanic", [])
 
 
 def get_breaking_news() -> list:
     """Returns RSS breaking headlines for LLM context."""
-    data = _load_snapshot()
-    return data.get("rss_breaking", [])
+    return _load_snapshot().get("rss_breaking", [])
+
+
+_store = None
+
+
+def get_fear_greed_trend() -> dict:
+    """
+    Latest F&G sample with its rolling z-score and 24h change, from the
+    signal store (one indexed read). Empty if the store is unavailable.
+    """
+    global _store
+    if _store is None:
+        path = next((p for p in SIGNAL_DB_PATHS if p.exists()), None)
+        if path is None:
+            return {}
+        _store = SignalStore(path, readonly=True)
+    latest = _store.latest("fear_greed")
+    if latest is None:
+        return {}
+    return {"value": latest.value, "z": round(latest.z, 3), "change_24h": _store.change("fear_greed", 86400)}
 
 
 def check_sentiment_gate() -> dict:
@@ -82,11 +98,27 @@ def check_sentiment_gate() -> dict:
         "allowed": True/False,
         "position_scale": 1.0 (normal) / 0.5 (caution) / 0.75 (greed) / 0.0 (blocked),
         "fear_greed": 45,
+        "fear_greed_trend": {"value": 45.0, "z": -1.2, "change_24h": -8.0},
         "reason": "..."
     }
     """
-    fg_value = get_fear_greed_value()
-    
+    view = _snapshot_view()
+    # Decided (and logged) once per snapshot version; callers get their own copy
+    return dict(view.memo("gate", lambda: _evaluate_gate(view.fear_greed)))
+
+
+def _evaluate_gate(fg_value: int) -> dict:
+    """Gate decision for one Fear & Greed reading, with its trend for context."""
+    result = _gate_decision(fg_value)
+    if fg_value >= 0:
+        try:
+            result["fear_greed_trend"] = get_fear_greed_trend()
+        except Exception as e:
+            logger.warning(f"Signal store unavailable: {e}")
+    return result
+
+
+def _gate_decision(fg_value: int) -> dict:
     # No data → fail open (allow trade, don't block because data engine is down)
     if fg_value < 0:
         return {
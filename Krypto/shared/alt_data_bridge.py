@@ -3,12 +3,12 @@ Alt Data Bridge — Cross-project alternative data consumer.
 Reads sentiment_snapshot.json produced by alt_data_engine.py.
 Provides normalized signals for any project (Sentinel, Krypto, etc.).
 """
-import os
 import json
 import logging
-from datetime import datetime, timedelta
 from pathlib import Path
 
+from .snapshot_reader import SnapshotReader, SnapshotView, EMPTY
+
 logger = logging.getLogger("AltDataBridge")
 
 # Snapshot location (relative to Sovereign-Sentinel root)
@@ -20,37 +20,53 @@ SNAPSHOT_PATHS = [
 ]
 
 
-def _load_snapshot() -> dict:
-    """Load the most recent sentiment snapshot from SQLite."""
+# Legacy store: the orchestrator's sentiment_snapshots table (used when no JSON snapshot exists)
+AUDIT_DB_PATHS = [
+    Path(r"C:\Users\steve\Sovereign-Sentinel\shared\data\audit_trail.db"),
+    Path(__file__).parent.parent.parent / "Sovereign-Sentinel" / "shared" / "data" / "audit_trail.db",
+]
+MAX_SNAPSHOT_AGE_HOURS = 2
+
+# Parsed once per file version; accessors below are dict reads
+_reader = SnapshotReader(SNAPSHOT_PATHS)
+_db_cache = {"key": None, "view": EMPTY}
+
+
+def _sqlite_view() -> SnapshotView:
+    """Latest sentiment_snapshots row, re-queried only when the DB file changes."""
     import sqlite3
-    # Look for the DB in the main Sovereign-Sentinel project since this is a shared script that might run elsewhere
-    db_path = Path(r"C:\Users\steve\Sovereign-Sentinel\shared\data\audit_trail.db")
-    if not db_path.exists():
-        # Fallback to relative path if not found, though unlikely given hardcoded paths above
-        db_path = Path(__file__).parent.parent.parent / "Sovereign-Sentinel" / "shared" / "data" / "audit_trail.db"
-        if not db_path.exists():
-            logger.warning(f"No audit_trail.db found at {db_path}")
-            return {}
-            
+    db_path = next((p for p in AUDIT_DB_PATHS if p.exists()), None)
+    if db_path is None:
+        return EMPTY
+    st = db_path.stat()
+    key = (str(db_path), st.st_ino, st.st_mtime_ns, st.st_size)
+    if key == _db_cache["key"]:
+        return _db_cache["view"]
     try:
         conn = sqlite3.connect(db_path)
-        c = conn.cursor()
-        row = c.execute("SELECT timestamp, data FROM sentiment_snapshots ORDER BY id DESC LIMIT 1").fetchone()
+        row = conn.execute("SELECT timestamp, data FROM sentiment_snapshots ORDER BY id DESC LIMIT 1").fetchone()
         conn.close()
-        
-        if row:
-            ts, data_str = row
-            # Check freshness (< 2 hours old)
-            if ts:
-                age = datetime.now() - datetime.fromisoformat(ts)
-                if age > timedelta(hours=2):
-                    logger.warning(f"Snapshot is {age.total_seconds()/3600:.1f}h old (stale)")
-            return json.loads(data_str)
     except Exception as e:
         logger.error(f"Failed to read snapshot from SQLite {db_path}: {e}")
-        
-    logger.warning("No sentiment snapshot found in database")
-    return {}
+        return EMPTY
+    view = SnapshotView(json.loads(row[1]), row[0] or "", db_path) if row else EMPTY
+    _db_cache.update(key=key, view=view)
+    return view
+
+
+def _snapshot_view() -> SnapshotView:
+    view = _reader.read()
+    if view is EMPTY:
+        view = _sqlite_view()
+    if view.is_stale(MAX_SNAPSHOT_AGE_HOURS):
+        # Once per snapshot version, not on every accessor call
+        view.memo("stale_warned", lambda: logger.warning(f"Snapshot is {view.age_hours():.1f}h old (stale)"))
+    return view
+
+
+def _load_snapshot() -> dict:
+    """Load the most recent sentiment snapshot (JSON file, else the SQLite store)."""
+    return _snapshot_view().data
 
 
 def get_crypto_fear_greed() -> dict:
@@ -77,34 +93,7 @@ def get_market_sentiment_score() -> float:
     0.0 = Extreme Fear, 1.0 = Extreme Greed.
     Falls back to 0.5 (neutral) if no data available.
     """
-    data = _load_snapshot()
-    if not data:
-        return 0.5
-
-    score = 0.5
-    signals = 0
-
-    # Fear & Greed (0-100 scale -> 0.0-1.0)
-    fg = data.get("fear_and_greed", {})
-    if fg and fg.get("value") is not None:
-        try:
-            score = int(fg["value"]) / 100.0
-            signals += 1
-        except (ValueError, TypeError):
-            pass
-
-    # Google Trends: "market crash" searches inversely correlate with sentiment
-    trends = data.get("pytrends", {})
-    if trends and isinstance(trends, dict):
-        crash_interest = trends.get("market crash", 0)
-        dip_interest = trends.get("buy the dip", 0)
-        if crash_interest > 0 or dip_interest > 0:
-            # High "market crash" = fear, high "buy the dip" = greed
-            trend_score = dip_interest / max(crash_interest + dip_interest, 1)
-            score = (score * signals + trend_score) / (signals + 1)
-            signals += 1
-
-    return round(min(max(score, 0.0), 1.0), 3)
+    return _snapshot_view().score
 
 
 def get_macro_fed_rate() -> dict:
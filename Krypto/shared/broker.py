@@ -6,9 +6,13 @@ import sys
 import os
 from typing import Callable, Awaitable
 from .schemas import TradeSignal, MarketData, AuditLogEntry
+from .codec import get_codec, decode_market_data, decode_signal
 
 logger = logging.getLogger(__name__)
 
+AUDIT_STREAM = "system.audit_log"
+AUDIT_STREAM_MAXLEN = int(os.getenv("KRYPTO_AUDIT_MAXLEN", "200000"))
+
 # Dual-write: also log to centralized orchestrator audit trail
 _CENTRAL_AVAILABLE = False
 try:
@@ -35,31 +39,82 @@ except Exception as e:
     _CENTRAL_AVAILABLE = False
 
 class MessageBroker:
-    def __init__(self, host='localhost', port=6379, db=0):
+    def __init__(self, host='localhost', port=6379, db=0, codec: str = None, trusted_market_data: bool = True):
         self.redis_url = f"redis://{host}:{port}/{db}"
         self.redis = None
         self.pubsub = None
         self._queue = None
         self._subscribers = {}
+        # Wire format for outgoing frames; consumers detect the format per frame
+        self.codec = get_codec(codec or os.getenv("KRYPTO_BUS_CODEC", "struct"))
+        # Internal producers are trusted: market data skips pydantic validation on decode
+        self.trusted_market_data = trusted_market_data
+        # Pipelined publishing (off until enable_batching)
+        self.batch_size = 1
+        self.flush_interval = 0.0
+        self._batch = []
+        self._flush_task = None
+        self._flush_lock = asyncio.Lock()
         # Init central audit logger if available
         self._central = CentralAuditLogger("krypto") if _CENTRAL_AVAILABLE else None
 
     async def connect(self):
         try:
-            self.redis = redis.from_url(self.redis_url, encoding="utf-8", decode_responses=True)
+            # Binary frames (struct/msgpack), so no response decoding
+            self.redis = redis.from_url(self.redis_url, decode_responses=False)
             await self.redis.ping()
             self.pubsub = self.redis.pubsub()
-            logger.info(f"✅ Connected to Redis at {self.redis_url}")
+            logger.info(f"✅ Connected to Redis at {self.redis_url} (codec={self.codec.name})")
         except Exception as e:
             logger.warning(f"⚠️ Redis connection failed: {e}. Falling back to in-memory broker.")
             self.redis = None
             self._queue = asyncio.Queue()
             self._subscribers = {} # channel -> [callbacks]
 
+    def enable_batching(self, max_messages: int = 256, max_delay_ms: float = 5.0):
+        """
+        Pipelines publishes: buffered frames go out in one round trip every
+        `max_messages` frames or `max_delay_ms` after the first buffered one.
+        Signals always flush immediately (behind any buffered ticks, in order).
+        """
+        self.batch_size = max(1, int(max_messages))
+        self.flush_interval = max_delay_ms / 1000.0
+
+    async def _enqueue(self, command: str, key: str, payload: bytes, urgent: bool = False):
+        self._batch.append((command, key, payload))
+        if urgent or len(self._batch) >= self.batch_size:
+            await self.flush()
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        try:
+            await asyncio.sleep(self.flush_interval)
+            self._flush_task = None
+            await self.flush()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Batched publish failed: {e}")
+
+    async def flush(self):
+        """Sends every buffered frame in one pipeline round trip."""
+        if self._flush_task is not None and self._flush_task is not asyncio.current_task():
+            self._flush_task.cancel()
+            self._flush_task = None
+        async with self._flush_lock:
+            batch, self._batch = self._batch, []
+            if not batch or not self.redis:
+                return
+            pipe = self.redis.pipeline(transaction=False)
+            for command, key, payload in batch:
+                getattr(pipe, command)(key, payload)
+            await pipe.execute()
+
     async def publish_signal(self, signal: TradeSignal):
         """Publish a trade signal to the execution queue."""
         if self.redis:
-            await self.redis.rpush("orders.new", signal.model_dump_json())
+            await self._enqueue("rpush", "orders.new", self.codec.encode_model(signal), urgent=True)
         else:
             await self._queue.put(signal.model_dump_json())
         logger.debug(f"Published signal: {signal.signal_id}")
@@ -68,17 +123,39 @@ class MessageBroker:
         """Publish market data to a specific topic."""
         channel = f"market_data.{data.symbol}"
         if self.redis:
-            await self.redis.publish(channel, data.model_dump_json())
+            payload = self.codec.encode_market_data(data)
+            if self.batch_size > 1:
+                await self._enqueue("publish", channel, payload)
+            else:
+                await self.redis.publish(channel, payload)
         else:
             if channel in self._subscribers:
                 for cb in self._subscribers[channel]:
                     await cb(data)
 
+    async def publish_market_data_many(self, items: list[MarketData]):
+        """Publishes a burst of ticks (e.g. one WS frame's worth) in a single pipeline."""
+        if not self.redis:
+            for data in items:
+                await self.publish_market_data(data)
+            return
+        encode = self.codec.encode_market_data
+        self._batch.extend(("publish", f"market_data.{d.symbol}", encode(d)) for d in items)
+        await self.flush()
+
     async def log_audit(self, entry: AuditLogEntry):
         """Log an audit entry to the central log stream."""
+        if isinstance(entry, dict):
+            entry = AuditLogEntry(**entry)
         # 1. Redis Stream (for Krypto internal durability)
         if self.redis:
-            await self.redis.xadd("system.audit_log", entry.model_dump())
+            # Stream fields are flat strings: the entry travels as one JSON field,
+            # action/strategy are duplicated so XRANGE readers can filter cheaply
+            await self.redis.xadd(AUDIT_STREAM, {
+                "entry": entry.model_dump_json(),
+                "action": entry.action,
+                "strategy_id": entry.strategy_id or "",
+            }, maxlen=AUDIT_STREAM_MAXLEN, approximate=True)
         
         # 2. Central SQLite (for orchestrator forensics)
         if self._central:
@@ -89,7 +166,7 @@ class MessageBroker:
                     action=entry.action,
                     target=entry.component,
                     details=json.dumps(entry.details),
-                    severity=entry.level
+                    status=entry.level
                 )
             except Exception as e:
                 logger.warning(f"Failed to write to central audit log: {e}")
@@ -106,7 +183,7 @@ class MessageBroker:
             async for message in self.pubsub.listen():
                 if message['type'] == 'message':
                     try:
-                        data = MarketData.model_validate_json(message['data'])
+                        data = decode_market_data(message['data'], self.trusted_market_data)
                         await callback(data)
                     except Exception as e:
                         logger.error(f"Error processing market data: {e}")
@@ -128,4 +205,4 @@ class MessageBroker:
             _, data = await self.redis.blpop("orders.new")
         else:
             data = await self._queue.get()
-        return TradeSignal.model_validate_json(data)
+        return decode_signal(data)
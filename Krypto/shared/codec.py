@@ -0,0 +1,174 @@
+"""
+Wire codecs for the Krypto message bus.
+
+Frames are self-describing by their first byte, so producers can switch
+codec without a coordinated restart of every consumer:
+
+    b'{'   JSON (pydantic model_dump_json, the original format)
+    0xc1   fixed struct layout for MarketData (0xc1 is never valid msgpack)
+    else   msgpack
+
+MarketData (the hot fan-out path) has a compact positional encoding in
+both binary codecs, and trusted decoding skips pydantic validation.
+TradeSignals are rare and always validated.
+"""
+import logging
+import struct
+import sys
+from datetime import datetime, timezone
+
+from .schemas import MarketData, TradeSignal
+
+try:
+    import msgpack
+except ImportError:  # optional: struct and json still work
+    msgpack = None
+
+logger = logging.getLogger(__name__)
+
+STRUCT_TAG = 0xC1
+_JSON_TAG = ord("{")
+# tag, price, volume, epoch seconds, len(symbol), len(source), then the two utf-8 strings
+_HEADER = struct.Struct("<BdddBB")
+_EPOCH = datetime(1970, 1, 1)
+_UTC = timezone.utc
+
+
+def _to_epoch(ts: datetime) -> float:
+    """Naive timestamps are UTC, as produced by the schema's utcnow default."""
+    if ts.tzinfo is not None:
+        ts = ts.astimezone(_UTC).replace(tzinfo=None)
+    return (ts - _EPOCH).total_seconds()
+
+
+if sys.version_info < (3, 12):
+    _from_epoch = datetime.utcfromtimestamp  # naive UTC, several times cheaper than the tz path
+else:  # deprecated from 3.12
+    def _from_epoch(secs: float) -> datetime:
+        return datetime.fromtimestamp(secs, _UTC).replace(tzinfo=None)
+
+
+_names = {}
+
+
+def _name(raw: bytes) -> str:
+    """Symbols/sources repeat endlessly; decode each distinct one once."""
+    name = _names.get(raw)
+    if name is None:
+        name = _names[raw] = raw.decode()
+    return name
+
+
+_new = object.__new__
+_set = object.__setattr__
+_MARKET_FIELDS = frozenset(MarketData.model_fields)
+
+
+def _trusted_market_data(fields: dict) -> MarketData:
+    """
+    Builds the model without validation. model_construct re-applies defaults
+    in Python and is slower than validating; this sets the instance state
+    pydantic itself would (all five fields are always present here).
+    """
+    obj = _new(MarketData)
+    _set(obj, "__dict__", fields)
+    _set(obj, "__pydantic_fields_set__", _MARKET_FIELDS)
+    _set(obj, "__pydantic_extra__", None)
+    _set(obj, "__pydantic_private__", None)
+    return obj
+
+
+class JsonCodec:
+    name = "json"
+
+    def encode_market_data(self, data: MarketData) -> bytes:
+        return data.model_dump_json().encode()
+
+    def encode_model(self, model) -> bytes:
+        return model.model_dump_json().encode()
+
+
+class MsgpackCodec:
+    name = "msgpack"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack is not installed")
+
+    def encode_market_data(self, data: MarketData) -> bytes:
+        return msgpack.packb((data.symbol, data.price, data.volume, _to_epoch(data.timestamp), data.source))
+
+    def encode_model(self, model) -> bytes:
+        return msgpack.packb(model.model_dump(mode="json"))
+
+
+class StructCodec:
+    """Fixed layout for MarketData; other models fall back to msgpack (or JSON without it)."""
+    name = "struct"
+
+    def __init__(self):
+        self._models = MsgpackCodec() if msgpack is not None else JsonCodec()
+
+    def encode_market_data(self, data: MarketData) -> bytes:
+        symbol, source = data.symbol.encode(), data.source.encode()
+        return _HEADER.pack(STRUCT_TAG, data.price, data.volume, _to_epoch(data.timestamp),
+                            len(symbol), len(source)) + symbol + source
+
+    def encode_model(self, model) -> bytes:
+        return self._models.encode_model(model)
+
+
+CODECS = {"json": JsonCodec, "msgpack": MsgpackCodec, "struct": StructCodec}
+
+
+def get_codec(name: str = "json"):
+    """Builds a codec by name; an unavailable binary codec degrades to JSON."""
+    try:
+        return CODECS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown codec {name!r}; choose from {sorted(CODECS)}")
+    except ImportError as e:
+        logger.warning(f"⚠️ Codec {name} unavailable ({e}); using json")
+        return JsonCodec()
+
+
+def decode_market_data(payload, trusted: bool = True) -> MarketData:
+    """
+    Decodes any MarketData frame. `trusted` skips pydantic validation and is
+    meant for internal producers (the manager's feed); untrusted frames are
+    validated field by field as before.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode()
+    tag = payload[0]
+    if tag == _JSON_TAG:
+        # pydantic-core's JSON parser beats json.loads + fromisoformat, so always validate
+        return MarketData.model_validate_json(payload)
+    if tag == STRUCT_TAG:
+        _, price, volume, secs, n_sym, n_src = _HEADER.unpack_from(payload)
+        offset = _HEADER.size
+        symbol = _name(payload[offset:offset + n_sym])
+        source = _name(payload[offset + n_sym:offset + n_sym + n_src])
+    else:
+        if msgpack is None:
+            raise ValueError("msgpack frame received but msgpack is not installed")
+        symbol, price, volume, secs, source = msgpack.unpackb(payload)
+    fields = {"symbol": symbol, "price": price, "volume": volume, "timestamp": _from_epoch(secs), "source": source}
+    if trusted:
+        return _trusted_market_data(fields)
+    return MarketData.model_validate(fields)
+
+
+def decode_model(cls, payload):
+    """Validated decode of a JSON or msgpack frame into `cls` (e.g. TradeSignal)."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    if payload[0] == _JSON_TAG:
+        return cls.model_validate_json(payload)
+    if msgpack is None:
+        raise ValueError("msgpack frame received but msgpack is not installed")
+    return cls.model_validate(msgpack.unpackb(payload))
+
+
+def decode_signal(payload) -> TradeSignal:
+    return decode_model(TradeSignal, payload)
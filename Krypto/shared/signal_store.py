@@ -0,0 +1,270 @@
+"""
+Signal Store — Append-only time series of normalized alt-data signals.
+alt_data_engine appends one sample per signal whenever its source
+publishes a new reading; consumers query a single series (latest, last-N,
+time range) instead of parsing the whole snapshot. Each sample is stored
+with its rolling z-score, maintained incrementally at append time, so
+readers get trend context from one indexed row.
+
+A reading is new when the source's own timestamp moves on (Fear & Greed,
+macro data) or, for sources without one, when the value changes. Polling
+an unchanged value again therefore adds nothing, and z-score windows are
+sized per signal in readings rather than in poll intervals.
+
+Usage:
+    from shared.signal_store import SignalStore, extract_signals
+
+    store = SignalStore()                       # data/alt_signals.db
+    payload = {"value": "24", "timestamp": "1700006400"}
+    store.append_many(extract_signals("fear_and_greed", payload), source_timestamp("fear_and_greed", payload))
+    store.latest("fear_greed")                  # Sample(ts, value, z)
+    store.last("fear_greed", 12)                # oldest -> newest
+"""
+import math
+import re
+import sqlite3
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+
+DB_PATH = Path(__file__).parent.parent / "data" / "alt_signals.db"
+DEFAULT_WINDOW = 96  # readings in the z-score window for signals not listed below
+SIGNAL_WINDOWS = {
+    "fear_greed": 30,       # published daily: a month
+    "macro.fed_funds": 12,  # published monthly: a year
+}
+
+Sample = namedtuple("Sample", "ts value z")
+
+_CASHTAG = re.compile(r"\$([A-Z]{1,5})\b")
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def extract_signals(source: str, value) -> dict:
+    """
+    Normalizes one source's raw payload into {signal name: float}.
+    Unknown sources and unusable values yield nothing.
+    """
+    signals = {}
+    if source == "fear_and_greed" and isinstance(value, dict):
+        signals["fear_greed"] = _number(value.get("value"))
+    elif source == "pytrends" and isinstance(value, dict):
+        for keyword, interest in value.items():
+            if keyword != "isPartial":
+                signals[f"trend.{keyword.replace(' ', '_')}"] = _number(interest)
+    elif source in ("rss_breaking", "cryptopanic", "newsdata") and isinstance(value, list):
+        signals[f"headlines.{source}"] = float(len(value))
+    elif source == "reddit" and isinstance(value, list):
+        mentions = {}
+        for title in value:
+            for ticker in _CASHTAG.findall(str(title)):
+                mentions[ticker] = mentions.get(ticker, 0) + 1
+        signals["reddit.posts"] = float(len(value))
+        signals["reddit.mentions"] = float(sum(mentions.values()))
+        for ticker, count in mentions.items():
+            signals[f"reddit.mentions.{ticker}"] = float(count)
+    elif source == "finnhub" and isinstance(value, dict):
+        sentiment = value.get("sentiment") or {}
+        buzz = value.get("buzz") or {}
+        signals["finnhub.bullish_pct"] = _number(sentiment.get("bullishPercent"))
+        signals["finnhub.news_score"] = _number(value.get("companyNewsScore"))
+        signals["finnhub.buzz"] = _number(buzz.get("buzz"))
+    elif source == "macro_data" and isinstance(value, dict):
+        signals["macro.fed_funds"] = _number(value.get("value"))
+    return {name: v for name, v in signals.items() if v is not None}
+
+
+def source_timestamp(source: str, value):
+    """
+    The time the source published this reading (epoch seconds), or None if
+    its payload does not carry one.
+    """
+    if not isinstance(value, dict):
+        return None
+    if source == "fear_and_greed":
+        return _number(value.get("timestamp"))
+    if source == "macro_data":
+        try:
+            return datetime.strptime(value.get("date", ""), "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+class RollingStats:
+    """Mean/stdev over the last `window` values; O(1) per push."""
+    __slots__ = ("window", "values", "total", "total_sq")
+
+    def __init__(self, window: int = DEFAULT_WINDOW, values=()):
+        self.window = window
+        self.values = deque()
+        self.total = 0.0
+        self.total_sq = 0.0
+        for value in values:
+            self.push(value)
+
+    def push(self, value: float) -> float:
+        """Adds a value and returns its z-score against the window (including it)."""
+        self.values.append(value)
+        self.total += value
+        self.total_sq += value * value
+        if len(self.values) > self.window:
+            old = self.values.popleft()
+            self.total -= old
+            self.total_sq -= old * old
+        return self.zscore(value)
+
+    def zscore(self, value: float) -> float:
+        n = len(self.values)
+        if n < 2:
+            return 0.0
+        mean = self.total / n
+        var = max(self.total_sq / n - mean * mean, 0.0)
+        if var <= 1e-12 * max(1.0, mean * mean):
+            return 0.0
+        return (value - mean) / math.sqrt(var)
+
+
+class SignalStore:
+    """
+    SQLite-backed, append-only. Samples are clustered by (signal, ts)
+    (WITHOUT ROWID), so latest/last-N/range are contiguous index reads.
+    Open with readonly=True from consumers; only the engine appends.
+    `window` forces one z-score window on every signal (default: SIGNAL_WINDOWS).
+    """
+
+    def __init__(self, path=DB_PATH, window: int = None, readonly: bool = False):
+        self.path = Path(path)
+        self.window = window
+        self.readonly = readonly
+        if readonly:
+            self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS signals (
+                    id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS samples (
+                    signal_id INTEGER NOT NULL,
+                    ts REAL NOT NULL,
+                    value REAL NOT NULL,
+                    z REAL NOT NULL,
+                    PRIMARY KEY (signal_id, ts)
+                ) WITHOUT ROWID;
+            """)
+            self.conn.commit()
+        self._ids = {}
+        self._stats = {}  # signal id -> RollingStats (writer only, rebuilt lazily)
+        self._newest = {}  # signal id -> (ts, value) of the newest sample (writer only)
+
+    def _signal_id(self, name: str, create: bool = False):
+        signal_id = self._ids.get(name)
+        if signal_id is None:
+            row = self.conn.execute("SELECT id FROM signals WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                if not create:
+                    return None
+                signal_id = self.conn.execute("INSERT INTO signals (name) VALUES (?)", (name,)).lastrowid
+            else:
+                signal_id = row[0]
+            self._ids[name] = signal_id
+        return signal_id
+
+    def window_for(self, name: str) -> int:
+        return self.window or SIGNAL_WINDOWS.get(name, DEFAULT_WINDOW)
+
+    def _rolling(self, signal_id: int, name: str) -> RollingStats:
+        stats = self._stats.get(signal_id)
+        if stats is None:
+            rows = self.conn.execute(
+                "SELECT ts, value FROM samples WHERE signal_id = ? ORDER BY ts DESC LIMIT ?",
+                (signal_id, self.window_for(name))).fetchall()
+            stats = self._stats[signal_id] = RollingStats(self.window_for(name), (r[1] for r in reversed(rows)))
+            self._newest[signal_id] = rows[0] if rows else None
+        return stats
+
+    def append_many(self, samples: dict, ts: float = None) -> dict:
+        """
+        Appends {signal: value} at one timestamp in one transaction; returns
+        {signal: z} for the samples written. `ts` is the source's own
+        timestamp: a signal already holding a sample at or after it is
+        skipped. Without one the samples are stamped now and a signal whose
+        value has not changed since its newest sample is skipped.
+        """
+        from_source = ts is not None
+        ts = time.time() if ts is None else ts
+        rows, scores = [], {}
+        for name, value in samples.items():
+            value = float(value)
+            signal_id = self._signal_id(name, create=True)
+            stats = self._rolling(signal_id, name)
+            newest = self._newest[signal_id]
+            if newest is not None and (ts <= newest[0] if from_source else value == newest[1]):
+                continue
+            z = stats.push(value)
+            self._newest[signal_id] = (ts, value)
+            rows.append((signal_id, ts, value, z))
+            scores[name] = z
+        if rows:
+            self.conn.executemany("INSERT OR IGNORE INTO samples VALUES (?, ?, ?, ?)", rows)
+            self.conn.commit()
+        return scores
+
+    def append(self, name: str, value: float, ts: float = None):
+        """Appends one sample; returns its z-score, or None if it was not new."""
+        return self.append_many({name: value}, ts).get(name)
+
+    def latest(self, name: str):
+        """Newest Sample of a series, or None."""
+        rows = self.last(name, 1)
+        return rows[0] if rows else None
+
+    def last(self, name: str, n: int) -> list:
+        """Last `n` samples, oldest first."""
+        signal_id = self._signal_id(name)
+        if signal_id is None:
+            return []
+        rows = self.conn.execute(
+            "SELECT ts, value, z FROM samples WHERE signal_id = ? ORDER BY ts DESC LIMIT ?",
+            (signal_id, n)).fetchall()
+        return [Sample(*r) for r in reversed(rows)]
+
+    def range(self, name: str, start: float, end: float = None) -> list:
+        """Samples with start <= ts <= end (default: now), oldest first."""
+        signal_id = self._signal_id(name)
+        if signal_id is None:
+            return []
+        end = time.time() if end is None else end
+        rows = self.conn.execute(
+            "SELECT ts, value, z FROM samples WHERE signal_id = ? AND ts BETWEEN ? AND ? ORDER BY ts",
+            (signal_id, start, end)).fetchall()
+        return [Sample(*r) for r in rows]
+
+    def change(self, name: str, seconds: float):
+        """Latest value minus the value `seconds` ago (nearest sample at or before), or None."""
+        latest = self.latest(name)
+        if latest is None:
+            return None
+        signal_id = self._signal_id(name)
+        row = self.conn.execute(
+            "SELECT value FROM samples WHERE signal_id = ? AND ts <= ? ORDER BY ts DESC LIMIT 1",
+            (signal_id, latest.ts - seconds)).fetchone()
+        return None if row is None else latest.value - row[0]
+
+    def signals(self) -> list:
+        return [r[0] for r in self.conn.execute("SELECT name FROM signals ORDER BY name")]
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,182 @@
+"""
+Snapshot Reader — Cached access to alt_data_engine's sentiment_snapshot.json.
+The path is resolved once and the parsed snapshot is reused until the file
+changes (inode, mtime, size), so accessor calls on the execution path are
+attribute/dict reads. Derived fields (fear & greed, synthesized score,
+write time) are computed once per file version.
+
+Usage:
+    from shared.snapshot_reader import SnapshotReader
+
+    reader = SnapshotReader(SNAPSHOT_PATHS)
+    view = reader.read()
+    if not view.is_stale(4):
+        print(view.fear_greed, view.score, view.data.get("rss_breaking", []))
+"""
+import json
+import logging
+import os
+import time
+from datetime import datetime
+
+logger = logging.getLogger("SnapshotReader")
+
+
+def fear_greed_value(data: dict) -> int:
+    """Crypto Fear & Greed index (0-100), or -1 if unavailable."""
+    fg = data.get("fear_and_greed") or {}
+    if isinstance(fg, dict) and fg.get("value") is not None:
+        try:
+            return int(fg["value"])
+        except (ValueError, TypeError):
+            pass
+    return -1
+
+
+def sentiment_score(data: dict) -> float:
+    """
+    Synthesizes a 0.0–1.0 sentiment score from available alt data.
+    0.0 = Extreme Fear, 1.0 = Extreme Greed; 0.5 (neutral) without data.
+    """
+    if not data:
+        return 0.5
+
+    score = 0.5
+    signals = 0
+
+    # Fear & Greed (0-100 scale -> 0.0-1.0)
+    fg = fear_greed_value(data)
+    if fg >= 0:
+        score = fg / 100.0
+        signals += 1
+
+    # Google Trends: "market crash" searches inversely correlate with sentiment
+    trends = data.get("pytrends", {})
+    if trends and isinstance(trends, dict):
+        crash_interest = trends.get("market crash", 0)
+        dip_interest = trends.get("buy the dip", 0)
+        if crash_interest > 0 or dip_interest > 0:
+            # High "market crash" = fear, high "buy the dip" = greed
+            trend_score = dip_interest / max(crash_interest + dip_interest, 1)
+            score = (score * signals + trend_score) / (signals + 1)
+            signals += 1
+
+    return round(min(max(score, 0.0), 1.0), 3)
+
+
+def _epoch(timestamp):
+    try:
+        return datetime.fromisoformat(timestamp).timestamp() if timestamp else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SnapshotView:
+    """One parsed version of the snapshot file, with its derived fields."""
+    __slots__ = ("data", "timestamp", "written_at", "fetched_at", "path", "fear_greed", "score", "_memo")
+
+    def __init__(self, data: dict, timestamp: str = "", path=None, sources: dict = None):
+        self.data = data
+        self.timestamp = timestamp
+        self.path = path
+        self.written_at = _epoch(timestamp)
+        # Per-source fetch times (partial snapshots); absent in older snapshot files
+        self.fetched_at = {name: _epoch((meta or {}).get("fetched_at")) for name, meta in (sources or {}).items()}
+        self.fear_greed = fear_greed_value(data)
+        self.score = sentiment_score(data)
+        self._memo = {}
+
+    def age_hours(self, now: float = None, source: str = None) -> float:
+        """
+        Hours since alt_data_engine wrote this version, or since `source` was
+        last fetched when the snapshot records it (0 when nothing is known).
+        """
+        written = self.fetched_at.get(source, self.written_at) if source else self.written_at
+        if written is None:
+            return 0.0
+        return ((now or time.time()) - written) / 3600.0
+
+    def is_stale(self, max_age_hours: float, source: str = None) -> bool:
+        written = self.fetched_at.get(source, self.written_at) if source else self.written_at
+        return written is not None and time.time() - written > max_age_hours * 3600.0
+
+    def memo(self, key, compute):
+        """Caches compute() on this version; consumers use it for their own derived values."""
+        try:
+            return self._memo[key]
+        except KeyError:
+            value = self._memo[key] = compute()
+            return value
+
+
+EMPTY = SnapshotView({})
+
+
+class SnapshotReader:
+    """
+    Resolves the first existing path once (re-resolving only if it vanishes)
+    and re-parses only when its (inode, mtime, size) changes. Even the stat
+    is skipped within `recheck_interval` seconds of the previous one.
+    A torn or invalid file keeps the previous version and is retried.
+    """
+
+    def __init__(self, paths, recheck_interval: float = 1.0):
+        self.paths = list(paths)
+        self.recheck_interval = recheck_interval
+        self._path = None
+        self._key = None
+        self._view = EMPTY
+        self._next_check = 0.0
+        self._warned_missing = False
+        self.loads = 0
+
+    def _resolve(self):
+        for path in self.paths:
+            if os.path.exists(path):
+                self._path = path
+                self._warned_missing = False
+                return path
+        if not self._warned_missing:
+            logger.warning("No sentiment snapshot found at any known path")
+            self._warned_missing = True
+        return None
+
+    def read(self) -> SnapshotView:
+        now = time.monotonic()
+        if now < self._next_check:
+            return self._view
+        self._next_check = now + self.recheck_interval
+
+        path = self._path or self._resolve()
+        if path is None:
+            self._key, self._view = None, EMPTY
+            return EMPTY
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._path = None
+            path = self._resolve()
+            if path is None:
+                self._key, self._view = None, EMPTY
+                return EMPTY
+            st = os.stat(path)
+
+        key = (st.st_ino, st.st_mtime_ns, st.st_size)
+        if key == self._key:
+            return self._view
+        try:
+            with open(path, "r") as f:
+                snapshot = json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to read snapshot from {path}: {e}")
+            return self._view  # retried after recheck_interval
+        self._key = key
+        self._view = SnapshotView(snapshot.get("data", {}), snapshot.get("timestamp", ""), path,
+                                  snapshot.get("sources"))
+        self.loads += 1
+        return self._view
+
+    def invalidate(self):
+        """Forces the next read() to stat (and re-resolve) immediately."""
+        self._next_check = 0.0
+        self._path = None
@@ -9,10 +9,12 @@ class SmartMoneyConcepts:
     """
 
     @staticmethod
-    def is_displacement_candle(df, index=-1, magnitude_factor=2.0):
+    def is_displacement_candle(df, index=-1, magnitude_factor=2.0, avg_body=None):
         """
         Checks if the candle at 'index' is a displacement candle.
         Displacement = Body size is > X times the average body size of recent history.
+        avg_body: precomputed 20-candle body mean for `index` (e.g. from
+        IndicatorEngine.values['body_mean_20']); skips the rolling recompute.
         """
         if len(df) < 21:
             return False
@@ -20,10 +22,11 @@ class SmartMoneyConcepts:
         current_candle = df.iloc[index]
         body_size = abs(current_candle['close'] - current_candle['open'])
         
-        # Calculate recent average body size (last 20 candles)
-        # Using abs() to get magnitude of bodies
-        recent_bodies = (df['close'] - df['open']).abs().rolling(20).mean()
-        avg_body = recent_bodies.iloc[index]
+        if avg_body is None:
+            # Calculate recent average body size (last 20 candles)
+            # Using abs() to get magnitude of bodies
+            recent_bodies = (df['close'] - df['open']).abs().rolling(20).mean()
+            avg_body = recent_bodies.iloc[index]
 
         return body_size > (avg_body * magnitude_factor)
 
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+
+from agents.base import StrategyAgent
+from agents.host import AgentHost
+from shared.broker import MessageBroker
+from shared.schemas import MarketData, OrderSide
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+class RecordingAgent(StrategyAgent):
+    def __init__(self, strategy_id, symbols, fail_on=None):
+        super().__init__(strategy_id=strategy_id, symbols=symbols)
+        self.seen = []
+        self.fail_on = fail_on
+        self.runs = 0
+
+    async def on_tick(self, data: MarketData):
+        if self.fail_on and data.symbol == self.fail_on:
+            raise ValueError("bad tick")
+        self.seen.append((data.symbol, data.price))
+        if data.price > 100:
+            await self.send_order(data.symbol, OrderSide.BUY, 0.01, "breakout")
+
+    async def run(self):
+        self.runs += 1
+        if self.runs == 1:
+            raise RuntimeError("first run crashes")
+        while self.running:
+            await asyncio.sleep(0.01)
+
+
+def offline_broker():
+    # Nothing listens on port 1: connect() falls back to the in-memory broker
+    return MessageBroker(port=1)
+
+
+async def run_host():
+    btc = RecordingAgent("btc_only", ["BTC/USD"])
+    both = RecordingAgent("both", ["BTC/USD", "ETH/USD"])
+    faulty = RecordingAgent("faulty", ["ETH/USD"], fail_on="ETH/USD")
+    host = AgentHost([btc, both, faulty], broker=offline_broker(), max_errors=3, restart_backoff=0.01)
+    task = asyncio.create_task(host.start())
+    await asyncio.sleep(0.05)
+
+    # One subscription per symbol, shared by every agent
+    broker = host.broker
+    assert all(a.broker is broker for a in (btc, both, faulty))
+    assert sorted(broker._subscribers) == ["market_data.BTC/USD", "market_data.ETH/USD"]
+    assert all(len(cbs) == 1 for cbs in broker._subscribers.values())
+
+    for price in (99.0, 101.0):
+        await broker.publish_market_data(MarketData(symbol="BTC/USD", price=price, volume=1.0))
+    for price in range(5):
+        await broker.publish_market_data(MarketData(symbol="ETH/USD", price=float(price), volume=1.0))
+    await broker.publish_market_data(MarketData(symbol="SOL/USD", price=1.0, volume=1.0))  # nobody
+
+    assert btc.seen == [("BTC/USD", 99.0), ("BTC/USD", 101.0)]
+    assert [s for s, _ in both.seen] == ["BTC/USD"] * 2 + ["ETH/USD"] * 5
+    # Signals from both agents went out through the one shared queue
+    signals = [await broker.consume_signals() for _ in range(2)]
+    assert sorted(s.strategy_id for s in signals) == ["both", "btc_only"]
+
+    stats = host.stats()
+    assert stats["faulty"]["quarantined"] and stats["faulty"]["errors"] == 3  # stopped after 3 in a row
+    assert stats["both"]["errors"] == 0 and stats["both"]["ticks"] == 7
+    # run() crashed once per agent and was restarted
+    assert all(s["restarts"] == 1 for s in stats.values()) and btc.runs == 2
+
+    host.release("faulty")
+    faulty.fail_on = None
+    await broker.publish_market_data(MarketData(symbol="ETH/USD", price=5.0, volume=1.0))
+    assert faulty.seen == [("ETH/USD", 5.0)]
+
+    await host.stop()
+    await task
+    assert not btc.running
+    return host
+
+
+def test_agent_host():
+    host = asyncio.run(run_host())
+    assert host.messages == 8  # SOL/USD has no subscriber, so it never reaches the host
+
+
+if __name__ == "__main__":
+    test_agent_host()
+    print("✅ Agent host tests passed")
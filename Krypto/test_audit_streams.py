@@ -0,0 +1,282 @@
+import asyncio
+import json
+import logging
+import time
+
+from infra.aggregates import FillAggregator, StrategyStats
+from infra.drift import DriftAnalyzer
+from infra.safety import SafetyMonitor
+from infra.streams import AuditStreamConsumer, DEAD_LETTER_STREAM
+from shared.broker import MessageBroker, AUDIT_STREAM
+from shared.schemas import AuditLogEntry
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+class StreamRedis:
+    """In-memory subset of Redis Streams consumer groups (single stream semantics per key)."""
+
+    def __init__(self):
+        self.streams = {}   # key -> [(id, fields)]
+        self.groups = {}    # (key, group) -> {"last": int, "pending": {id: consumer}}
+        self.published = []
+        self._seq = 0
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        self._seq += 1
+        message_id = f"{int(time.time() * 1000)}-{self._seq}".encode()
+        self.streams.setdefault(key, []).append((message_id, {_raw(k): _raw(v) for k, v in fields.items()}))
+        return message_id
+
+    async def xgroup_create(self, key, group, id="$", mkstream=False):
+        if (key, group) in self.groups:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        self.streams.setdefault(key, [])
+        self.groups[(key, group)] = {"last": 0, "pending": {}}
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        (key, start), = streams.items()
+        state, entries = self.groups[(key, group)], self.streams[key]
+        if start == ">":
+            fresh = entries[state["last"]:state["last"] + (count or len(entries))]
+            state["last"] += len(fresh)
+            for message_id, _ in fresh:
+                state["pending"][message_id] = consumer
+            if not fresh and block:
+                await asyncio.sleep(0)
+            return [(key.encode(), fresh)] if fresh else []
+        after = start.encode() if isinstance(start, str) else start
+        mine = [(i, f) for i, f in entries if state["pending"].get(i) == consumer and _after(i, after)]
+        return [(key.encode(), mine[:count])]
+
+    async def xack(self, key, group, *ids):
+        pending = self.groups[(key, group)]["pending"]
+        return sum(pending.pop(i, None) is not None for i in ids)
+
+    async def xautoclaim(self, key, group, consumer, min_idle_time=0, start_id="0-0", count=100):
+        pending = self.groups[(key, group)]["pending"]
+        claimed = [(i, f) for i, f in self.streams[key] if i in pending and pending[i] != consumer][:count]
+        for message_id, _ in claimed:
+            pending[message_id] = consumer
+        return [b"0-0", claimed, []]
+
+    async def xinfo_groups(self, key):
+        infos = []
+        for (stream, group), state in self.groups.items():
+            if stream == key:
+                last = self.streams[key][state["last"] - 1][0] if state["last"] else b"0-0"
+                infos.append({"name": group.encode(), "last-delivered-id": last, "pending": len(state["pending"])})
+        return infos
+
+    async def xpending_range(self, key, group, min="-", max="+", count=100):
+        pending = self.groups[(key, group)]["pending"]
+        return [{"message_id": i, "consumer": pending[i].encode()} for i, _ in self.streams[key]
+                if i in pending][:count]
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        def inside(message_id):
+            ident = _id(message_id)
+            if min.startswith("("):
+                low_ok = ident > _id(min[1:])
+            else:
+                low_ok = min == "-" or ident >= _id(min)
+            return low_ok and (max == "+" or ident <= _id(max))
+        return [(i, f) for i, f in self.streams.get(key, []) if inside(i)][:count]
+
+    async def publish(self, channel, payload):
+        self.published.append((channel, payload))
+
+    async def ping(self):
+        return True
+
+
+def _raw(value) -> bytes:
+    return value if isinstance(value, bytes) else str(value).encode()
+
+
+def _id(value):
+    return tuple(int(x) for x in (value.decode() if isinstance(value, bytes) else value).split("-"))
+
+
+def _after(message_id, start):
+    return start in (b"0", "0") or _id(message_id) > _id(start)
+
+
+def fill(strategy, side, amount, price, fee=0.0, symbol="BTC/USD"):
+    return AuditLogEntry(component="execution_manager", action="order_placed", strategy_id=strategy,
+                         details={"signal_id": "s", "symbol": symbol, "status": "success", "order_id": "o",
+                                  "side": side, "amount": amount, "price": price, "fee": fee})
+
+
+def broker_with(redis):
+    broker = MessageBroker(port=1)
+    broker.redis = redis
+    return broker
+
+
+def test_strategy_stats():
+    stats = StrategyStats("orb")
+    assert stats.apply_fill(0, "BTC/USD", "buy", 1.0, 100.0) == 0.0
+    stats.apply_fill(1, "BTC/USD", "buy", 1.0, 110.0)          # avg 105
+    assert stats.apply_fill(2, "BTC/USD", "sell", 1.0, 115.0, fee=1.0) == 9.0
+    assert stats.apply_fill(3, "BTC/USD", "sell", 2.0, 100.0) == -5.0   # closes 1 @105, flips short 1 @100
+    assert stats.positions["BTC/USD"] == [-1.0, 100.0]
+    assert stats.apply_fill(4, "BTC/USD", "buy", 1.0, 90.0) == 10.0
+    assert stats.closed == 3 and stats.wins == 2 and abs(stats.realized - 14.0) < 1e-9
+
+    # The 24h window forgets old trades without rescanning
+    stats.apply_fill(90000, "BTC/USD", "buy", 1.0, 100.0)
+    stats.apply_fill(90001, "BTC/USD", "sell", 1.0, 97.0)
+    snap = stats.snapshot(now=90001)
+    assert snap["pnl_24h"] == -3.0 and abs(snap["realized_pnl"] - 11.0) < 1e-9 and not snap["positions"]
+
+
+async def run_consumer_group():
+    redis = StreamRedis()
+    broker = broker_with(redis)
+    # Dict entries (as DriftAnalyzer/SafetyMonitor used to send) are accepted too
+    await broker.log_audit({"action": "BOOT", "component": "test", "details": {}})
+    for entry in (fill("orb", "buy", 1.0, 100.0), fill("orb", "sell", 1.0, 90.0), fill("grid", "buy", 2.0, 50.0)):
+        await broker.log_audit(entry)
+    fields = redis.streams[AUDIT_STREAM][1][1]
+    assert json.loads(fields[b"entry"])["details"]["price"] == 100.0 and fields[b"strategy_id"] == b"orb"
+
+    aggregates = FillAggregator()
+    batches = []
+
+    async def handler(entries):
+        batches.append(len(entries))
+        for entry in entries:
+            aggregates.apply(entry)
+
+    consumer = AuditStreamConsumer(redis, "drift", handler, consumer="a", count=100)
+    await consumer.ensure_group()
+    await consumer.ensure_group()  # BUSYGROUP is not an error
+    response = await redis.xreadgroup("drift", "a", {AUDIT_STREAM: ">"}, count=100)
+    await consumer.process(response[0][1])
+    assert batches == [4] and not redis.groups[(AUDIT_STREAM, "drift")]["pending"]
+    assert aggregates.strategies["orb"].realized == -10.0 and aggregates.loss_24h() == 10.0
+
+    # A crashed consumer's unacked entries are claimed by a live one
+    await broker.log_audit(fill("grid", "sell", 2.0, 55.0))
+    await redis.xreadgroup("drift", "dead", {AUDIT_STREAM: ">"}, count=100)
+    await consumer.claim_stale()
+    assert aggregates.strategies["grid"].realized == 10.0 and consumer.acked == 5
+
+    # A poison batch is retried, then dead-lettered and acked
+    poisoned = AuditStreamConsumer(redis, "poison", lambda entries: _boom(), consumer="p", max_attempts=2)
+    await poisoned.ensure_group()
+    response = await redis.xreadgroup("poison", "p", {AUDIT_STREAM: ">"}, count=100)
+    await poisoned.process(response[0][1])
+    assert len(redis.groups[(AUDIT_STREAM, "poison")]["pending"]) == 5   # retry later
+    await poisoned.recover_pending()
+    assert not redis.groups[(AUDIT_STREAM, "poison")]["pending"] and len(redis.streams[DEAD_LETTER_STREAM]) == 5
+
+
+async def _boom():
+    raise RuntimeError("handler bug")
+
+
+async def run_kill_switch():
+    redis = StreamRedis()
+    broker = broker_with(redis)
+    monitor = SafetyMonitor(broker=broker, max_loss_threshold=50.0)
+    monitor.consumer = consumer = AuditStreamConsumer(redis, "safety", monitor.on_batch, consumer="s")
+    await consumer.ensure_group()
+
+    await broker.log_audit(fill("orb", "buy", 1.0, 1000.0))
+    await broker.log_audit(fill("orb", "sell", 1.0, 960.0))
+    await consumer.process((await redis.xreadgroup("safety", "s", {AUDIT_STREAM: ">"}))[0][1])
+    assert not monitor.killed and monitor.aggregates.loss_24h() == 40.0
+
+    await broker.log_audit(fill("grid", "buy", 1.0, 200.0))
+    await broker.log_audit(fill("grid", "sell", 1.0, 185.0))
+    # The batch containing the breaching fill trips the switch
+    await consumer.process((await redis.xreadgroup("safety", "s", {AUDIT_STREAM: ">"}))[0][1])
+    assert monitor.killed and redis.published == [("system.control", "KILL")]
+    kill = json.loads(redis.streams[AUDIT_STREAM][-1][1][b"entry"])
+    assert kill["action"] == "KILL_SWITCH" and kill["details"]["loss_24h"] == 55.0
+
+    # Drift reads the same stream through its own group
+    analyzer = DriftAnalyzer(broker=broker)
+    analyzer.consumer = AuditStreamConsumer(redis, "drift", analyzer.on_batch, consumer="d")
+    await analyzer.consumer.ensure_group()
+    await analyzer.consumer.process((await redis.xreadgroup("drift", "d", {AUDIT_STREAM: ">"}))[0][1])
+    report = await analyzer.analyze_strategy("orb", lookback_days=7)
+    assert report.total_trades == 1 and report.win_rate == 0.0 and report.profit_loss == -40.0
+
+
+async def run_restart_replays_history():
+    redis = StreamRedis()
+    broker = broker_with(redis)
+    first = SafetyMonitor(broker=broker, max_loss_threshold=50.0)
+    first.consumer = AuditStreamConsumer(redis, "safety", first.on_batch, consumer="s", history_ms=86400000)
+    await first.consumer.ensure_group()
+    for entry in (fill("orb", "buy", 1.0, 1000.0), fill("orb", "sell", 1.0, 960.0), fill("grid", "buy", 1.0, 200.0)):
+        await broker.log_audit(entry)
+    await first.consumer.process((await redis.xreadgroup("safety", "s", {AUDIT_STREAM: ">"}, count=2))[0][1])
+    await redis.xreadgroup("safety", "s", {AUDIT_STREAM: ">"})  # delivered, crash before ack
+    assert first.aggregates.loss_24h() == 40.0
+
+    # Restart: BUSYGROUP, yet the acked loss is replayed and the pending fill is delivered once
+    restarted = SafetyMonitor(broker=broker, max_loss_threshold=50.0)
+    consumer = restarted.consumer = AuditStreamConsumer(redis, "safety", restarted.on_batch, consumer="s",
+                                                        history_ms=86400000)
+    assert not await consumer.ensure_group()
+    assert await consumer.replay_history() == 2 and restarted.total_loss_24h == 40.0
+    await consumer.recover_pending()
+    await broker.log_audit(fill("grid", "sell", 1.0, 185.0))
+    await consumer.process((await redis.xreadgroup("safety", "s", {AUDIT_STREAM: ">"}))[0][1])
+    assert restarted.total_loss_24h == 55.0 and restarted.killed
+
+    # Entries older than the history window are not replayed
+    late = AuditStreamConsumer(redis, "safety", restarted.on_batch, consumer="s", history_ms=-60000)
+    assert await late.replay_history() == 0
+
+    # run() replays on a restart only for consumers that opt in (not the archiving janitor)
+    archived = []
+
+    async def archive(entries):
+        archived.extend(entries)
+
+    class Started(Exception):
+        pass
+
+    async def started():
+        raise Started
+
+    janitor = AuditStreamConsumer(redis, "janitor", archive, consumer="j")
+    await janitor.ensure_group()
+    await janitor.process((await redis.xreadgroup("janitor", "j", {AUDIT_STREAM: ">"}))[0][1])
+    archived.clear()
+    for consumer in (AuditStreamConsumer(redis, "janitor", archive, consumer="j"),
+                     AuditStreamConsumer(redis, "janitor", archive, consumer="j", replay_on_restart=True)):
+        consumer.recover_pending = started
+        try:
+            await consumer.run()
+        except Started:
+            pass
+        if not consumer.replay_on_restart:
+            assert archived == []
+    assert len(archived) == 5
+
+
+def test_consumer_group():
+    asyncio.run(run_consumer_group())
+
+
+def test_kill_switch():
+    asyncio.run(run_kill_switch())
+
+
+def test_restart_replays_history():
+    asyncio.run(run_restart_replays_history())
+
+
+if __name__ == "__main__":
+    test_strategy_stats()
+    test_consumer_group()
+    test_kill_switch()
+    test_restart_replays_history()
+    print("✅ Audit stream tests passed")
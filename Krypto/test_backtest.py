@@ -0,0 +1,161 @@
+import logging
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+import pytest
+
+from backtest import (TickTape, BacktestEngine, BacktestAuditLogger, SimulatedExecution, VirtualClock, FeeModel,
+                      SlippageModel, LatencyModel, offline_audit)
+from shared.schemas import TradeSignal, OrderSide, OrderType
+from agents.orb import AugmentedORBAgent
+from agents.dca import DCAAgent
+from agents.arb import SpotFuturesArbAgent
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+DAY = "2025-01-07"  # NY = UTC-5, so the 09:30 open is 14:30 UTC
+
+
+def orb_ticks():
+    """10s BTC prints: flat pre-market, 99-101 opening range, one breakout print, then a slide."""
+    idx = pd.date_range(f"{DAY} 13:00", f"{DAY} 16:00", freq="10s", tz="UTC", inclusive="left")
+    price = np.full(len(idx), 100.0)
+    minutes = (idx - idx[0]) / pd.Timedelta(minutes=1)
+    in_range = (minutes >= 90) & (minutes < 105)
+    price[in_range] = np.where(np.arange(in_range.sum()) % 2, 101.0, 99.0)
+    breakout = np.flatnonzero(idx == pd.Timestamp(f"{DAY} 15:00", tz="UTC"))[0]
+    price[breakout] = 102.0
+    price[breakout + 1:] = 100.5
+    price[minutes >= 150] = 99.5
+    return pd.DataFrame({"timestamp": idx, "price": price, "volume": 1.0})
+
+
+def ts(hhmmss):
+    return datetime.fromisoformat(f"{DAY}T{hhmmss}+00:00").timestamp()
+
+
+def test_orb_agent_on_virtual_clock():
+    tape = TickTape.from_ticks(orb_ticks(), symbol="BTC/USD")
+    engine = BacktestEngine(tape, FeeModel(taker_bps=26), SlippageModel(bps=10), LatencyModel(mean_ms=500))
+    with offline_audit():
+        engine.add_agent(AugmentedORBAgent())
+    report = engine.run()
+
+    buy, stop = report["fills"]
+    # Signal on the 15:00:00 breakout print; 500ms latency means the next print fills it
+    assert buy["side"] == "buy" and buy["submitted"] == ts("15:00:00") and buy["time"] == ts("15:00:10")
+    assert np.isclose(buy["price"], 100.5 * 1.001)
+    # Midpoint stop (100) rides with the entry and fires on the 15:30 slide
+    assert stop["side"] == "sell" and stop["kind"] == "stop" and stop["time"] == ts("15:30:00")
+    assert np.isclose(stop["price"], 99.5 * 0.999)
+
+    stats = report["agents"]["augmented_orb_v1"]
+    assert stats["fills"] == 2 and stats["round_trips"] == 1 and stats["win_rate"] == 0.0
+    assert np.isclose(stats["realized_pnl"], (stop["price"] - buy["price"]) * 0.01)
+    assert np.isclose(stats["fees"], (buy["price"] + stop["price"]) * 0.01 * 0.0026)
+    assert stats["positions"] == {} and stats["errors"] == 0 and stats["ticks"] == len(tape)
+
+    # Agent modules see the real clock again
+    import agents.orb
+    assert agents.orb.datetime is datetime
+
+
+def test_execution_limits_and_oco():
+    clock = VirtualClock(1000.0)
+    ex = SimulatedExecution(clock, FeeModel(taker_bps=20, maker_bps=10), SlippageModel(bps=0),
+                            LatencyModel(mean_ms=1000))
+
+    def signal(**kw):
+        base = dict(strategy_id="s1", symbol="BTC/USD", reason="test", order_type=OrderType.MARKET)
+        return TradeSignal(**{**base, **kw})
+
+    ex.submit(signal(side=OrderSide.BUY, order_type=OrderType.LIMIT, amount=1.0, price=99.0))
+    ex.on_tick("BTC/USD", 1000.5, 98.0, 5.0)  # through the limit, but not live yet
+    assert ex.fills == []
+    ex.on_tick("BTC/USD", 1001.0, 99.5, 5.0)
+    assert ex.fills == []
+    ex.on_tick("BTC/USD", 1002.0, 98.5, 5.0)
+    assert ex.fills[-1]["price"] == 98.5 and np.isclose(ex.fills[-1]["fee"], 98.5 * 0.001)
+
+    # Market entry with a stop and take-profit: the take-profit fills, the stop is cancelled
+    clock.t = 1010.0
+    ex.submit(signal(side=OrderSide.BUY, amount=1.0, stop_loss=95.0, take_profit=105.0))
+    ex.on_tick("BTC/USD", 1011.0, 100.0, 5.0)
+    assert len(ex.open_orders("s1")) == 2
+    ex.on_tick("BTC/USD", 1012.0, 106.0, 5.0)
+    assert ex.fills[-1]["kind"] == "take_profit" and ex.fills[-1]["price"] == 106.0
+    assert ex.open_orders("s1") == []
+
+    stats = ex.ledger("s1").stats(ex.last_price)
+    assert stats["positions"] == {"BTC/USD": {"qty": 1.0, "avg_price": 99.25}}
+    assert np.isclose(stats["realized_pnl"], 6.75) and stats["win_rate"] == 1.0
+
+    # Zero-size after normalization is rejected, like the live manager's amount rounding
+    ex.submit(signal(symbol="DOGE/USD", side=OrderSide.BUY, amount=0.4))
+    assert ex.ledger("s1").rejected == 1
+
+
+def test_backtest_stays_off_production_audit(tmp_path, monkeypatch):
+    import shared.audit_trail
+    import shared.broker
+    monkeypatch.chdir(tmp_path)  # AuditLogger writes data/audit_log.csv relative to the cwd
+    no_db = lambda *args, **kwargs: pytest.fail("central audit DB opened")
+    monkeypatch.setattr(shared.audit_trail, "CentralAuditLogger", no_db)
+    monkeypatch.setattr(shared.broker, "CentralAuditLogger", no_db, raising=False)
+    stdout = sys.stdout
+
+    tape = TickTape.from_ticks(orb_ticks(), symbol="BTC/USD")
+    engine = BacktestEngine(tape, latency=LatencyModel(mean_ms=0))
+    with offline_audit():
+        built = AugmentedORBAgent()
+    assert isinstance(built.audit, BacktestAuditLogger) and built.broker._central is None
+    agent = engine.add_agent(built)
+    engine.run()
+
+    assert ("TRIGGER_BUY", "BTC/USD") in [row[:2] for row in agent.audit.rows]
+    assert not (tmp_path / "data").exists() and sys.stdout is stdout
+    import agents.orb
+    assert agents.orb.AuditLogger is not BacktestAuditLogger  # patches undone
+
+
+def test_many_agents_timers_and_throughput():
+    n = 200_000
+    rng = np.random.default_rng(1)
+    t0 = ts("00:00:00")
+    spot = pd.DataFrame({"timestamp": t0 + np.arange(n) * 0.5, "symbol": "BTC/USD",
+                         "price": 100 * np.exp(np.cumsum(rng.normal(0, 1e-4, n))), "volume": 0.1})
+    perp = spot.iloc[::10].assign(symbol="BTC/USD:USD", price=lambda d: d.price * 1.001)
+    tape = TickTape.merge([TickTape.from_ticks(spot), TickTape.from_ticks(perp)])
+    assert tape.symbols == ["BTC/USD", "BTC/USD:USD"] and np.all(np.diff(tape.ts) >= 0)
+
+    engine = BacktestEngine(tape, latency=LatencyModel(mean_ms=0))
+    with offline_audit():
+        dca, arb = DCAAgent(), SpotFuturesArbAgent()
+    engine.add_agent(dca)
+    engine.add_agent(arb)
+    engine.add_timer(60, arb.check_funding, arb)
+    report = engine.run()
+
+    arb_fills = [f for f in report["fills"] if f["strategy_id"] == arb.strategy_id]
+    # Funding check runs at exactly t0 + 60s of virtual time and fills both legs there
+    assert [f["symbol"] for f in arb_fills] == ["BTC/USD", "BTC/USD:USD"]
+    assert all(f["submitted"] == t0 + 60 for f in arb_fills)
+
+    agents = report["agents"]
+    assert agents[dca.strategy_id]["ticks"] == n
+    assert agents[arb.strategy_id]["ticks"] == len(tape)
+    assert agents[arb.strategy_id]["positions"]["BTC/USD:USD"]["qty"] == -0.5
+    assert agents[dca.strategy_id]["fills"] == agents[dca.strategy_id]["signals"] >= 1
+    logger.info(f"Backtest throughput: {report['ticks_per_sec']:,} ticks/s")
+    assert report["ticks_per_sec"] > 50_000
+
+
+if __name__ == "__main__":
+    test_orb_agent_on_virtual_clock()
+    test_execution_limits_and_oco()
+    test_many_agents_timers_and_throughput()
+    print("✅ All backtest tests passed")
@@ -0,0 +1,126 @@
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+import pytest
+from pydantic import ValidationError
+
+from shared.broker import MessageBroker
+from shared.codec import CODECS, get_codec, decode_market_data, decode_signal, STRUCT_TAG
+from shared.schemas import MarketData, TradeSignal, OrderSide, OrderType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+class RecordingRedis:
+    """Just enough of redis.asyncio to observe round trips."""
+
+    def __init__(self):
+        self.round_trips = []
+
+    def pipeline(self, transaction=False):
+        redis = self
+
+        class Pipe:
+            def __init__(self):
+                self.commands = []
+
+            def publish(self, channel, payload):
+                self.commands.append(("publish", channel, payload))
+
+            def rpush(self, key, payload):
+                self.commands.append(("rpush", key, payload))
+
+            async def execute(self):
+                redis.round_trips.append(self.commands)
+
+        return Pipe()
+
+    async def publish(self, channel, payload):
+        self.round_trips.append([("publish", channel, payload)])
+
+
+def tick(symbol="BTC/USD", price=50123.5, **kw):
+    kw.setdefault("timestamp", datetime(2025, 3, 1, 12, 0, 0, 123456))
+    return MarketData(symbol=symbol, price=price, volume=0.25, **kw)
+
+
+def test_market_data_roundtrip_every_codec():
+    data = tick(source="kraken")
+    frames = {name: get_codec(name).encode_market_data(data) for name in CODECS}
+    assert frames["struct"][0] == STRUCT_TAG and frames["json"][:1] == b"{"
+    assert len(frames["struct"]) < len(frames["json"]) / 2
+    # Any consumer decodes any producer's frames, trusted or validated
+    for frame in frames.values():
+        for trusted in (True, False):
+            decoded = decode_market_data(frame, trusted)
+            assert decoded == data and isinstance(decoded, MarketData)
+            assert decoded.model_dump_json() == data.model_dump_json()
+
+    # Aware timestamps go over the wire as naive UTC
+    aware = tick(timestamp=datetime(2025, 3, 1, 13, 0, tzinfo=timezone.utc))
+    assert decode_market_data(get_codec("struct").encode_market_data(aware)).timestamp == datetime(2025, 3, 1, 13, 0)
+
+
+def test_untrusted_frames_are_validated():
+    bad = get_codec("msgpack").encode_market_data(tick()).replace(b"BTC/USD", b"BTC/US\xff")
+    with pytest.raises(Exception):
+        decode_market_data(bad, trusted=False)
+    with pytest.raises(ValidationError):
+        decode_market_data(b'{"symbol": "BTC/USD", "price": "not a number", "volume": 1}', trusted=False)
+
+
+def test_signal_roundtrip():
+    signal = TradeSignal(strategy_id="orb", symbol="BTC/USD", side=OrderSide.SELL, order_type=OrderType.MARKET,
+                         amount=0.01, stop_loss=49000.0, reason="test")
+    for name in CODECS:
+        decoded = decode_signal(get_codec(name).encode_model(signal))
+        assert decoded == signal and decoded.side is OrderSide.SELL  # enums survive (manager uses .value)
+
+
+async def run_batching():
+    broker = MessageBroker(codec="struct")
+    broker.redis = redis = RecordingRedis()
+
+    # Unbatched: one round trip per tick, as before
+    await broker.publish_market_data(tick())
+    assert len(redis.round_trips) == 1
+
+    broker.enable_batching(max_messages=3, max_delay_ms=20)
+    await broker.publish_market_data(tick(price=1.0))
+    await broker.publish_market_data(tick(price=2.0))
+    assert len(redis.round_trips) == 1              # buffered
+    await asyncio.sleep(0.05)
+    assert [len(rt) for rt in redis.round_trips] == [1, 2]  # timer flush
+
+    for p in (3.0, 4.0, 5.0):
+        await broker.publish_market_data(tick(price=p))
+    assert [len(rt) for rt in redis.round_trips] == [1, 2, 3]  # size flush
+
+    # A signal never waits: it flushes immediately, behind the ticks already buffered
+    await broker.publish_market_data(tick(price=6.0))
+    signal = TradeSignal(strategy_id="orb", symbol="BTC/USD", side=OrderSide.BUY, order_type=OrderType.MARKET,
+                         amount=0.01, reason="test")
+    await broker.publish_signal(signal)
+    last = redis.round_trips[-1]
+    assert [c[0] for c in last] == ["publish", "rpush"]
+    assert decode_market_data(last[0][2]).price == 6.0 and decode_signal(last[1][2]) == signal
+    await asyncio.sleep(0.05)
+    assert len(redis.round_trips) == 4  # the cancelled timer did not send an empty pipeline
+
+    await broker.publish_market_data_many([tick(symbol=s) for s in ("BTC/USD", "ETH/USD", "SOL/USD")])
+    assert [c[1] for c in redis.round_trips[-1]] == ["market_data.BTC/USD", "market_data.ETH/USD",
+                                                     "market_data.SOL/USD"]
+
+
+def test_pipelined_publish():
+    asyncio.run(run_batching())
+
+
+if __name__ == "__main__":
+    test_market_data_roundtrip_every_codec()
+    test_untrusted_frames_are_validated()
+    test_signal_roundtrip()
+    test_pipelined_publish()
+    print("✅ All bus codec tests passed")
@@ -0,0 +1,116 @@
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from candle_store import CandleRingBuffer
+
+
+def fill(buffer, start, count, step=300.0):
+    for i in range(count):
+        ts = start + i * step
+        buffer.upsert(ts, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0 + i)
+
+
+def test_wraparound_keeps_newest_contiguous():
+    buffer = CandleRingBuffer(capacity=4)
+    fill(buffer, 1000.0, 6)
+    view = buffer.view()
+    assert len(buffer) == 4 and buffer.last_timestamp() == 2500.0
+    assert list(view["timestamp"]) == [1600.0, 1900.0, 2200.0, 2500.0]
+    assert list(view["close"]) == [102.5, 103.5, 104.5, 105.5]
+    # A snapshot taken under the lock: later writes do not show through
+    fill(buffer, 2800.0, 1)
+    assert view["timestamp"][-1] == 2500.0 and buffer.view()["timestamp"][-1] == 2800.0
+
+
+def test_forming_candle_update_right_after_wrap():
+    buffer = CandleRingBuffer(capacity=3)
+    fill(buffer, 0.0, 3)
+    assert buffer._head == 0  # the newest row sits in slot capacity - 1
+    version = buffer.version
+    assert buffer.upsert(600.0, 102.0, 110.0, 95.0, 108.0, 99.0)
+    assert buffer.version == version + 1 and len(buffer) == 3
+    view = buffer.view()
+    assert view[-1]["high"] == 110.0 and view[-1]["close"] == 108.0
+    # Both copies of the row were rewritten, so the next wrap still reads the update
+    assert buffer._data[2]["close"] == buffer._data[5]["close"] == 108.0
+    fill(buffer, 900.0, 1)
+    assert list(buffer.view()["timestamp"]) == [300.0, 600.0, 900.0]
+    assert buffer.view()[1]["close"] == 108.0
+
+
+def test_stale_timestamps_ignored():
+    buffer = CandleRingBuffer(capacity=4)
+    fill(buffer, 1000.0, 3)
+    version = buffer.version
+    assert not buffer.upsert(1300.0, 1, 1, 1, 1, 1)
+    assert not buffer.upsert(500.0, 1, 1, 1, 1, 1)
+    assert buffer.version == version and list(buffer.view()["open"]) == [100.0, 101.0, 102.0]
+
+
+def test_view_is_read_only():
+    buffer = CandleRingBuffer(capacity=4)
+    assert len(buffer.view()) == 0 and buffer.last_timestamp() == float("-inf")
+    fill(buffer, 0.0, 2)
+    view = buffer.view()
+    with pytest.raises(ValueError):
+        view["close"][0] = 0.0
+    assert np.all(buffer.view()["close"] == [100.5, 101.5])
+
+
+def test_dataframe_cached_per_version():
+    buffer = CandleRingBuffer(capacity=4)
+    assert buffer.to_dataframe().empty
+    fill(buffer, 0.0, 2)
+    frame = buffer.to_dataframe()
+    assert buffer.to_dataframe() is frame and list(frame["close"]) == [100.5, 101.5]
+    assert frame["timestamp"].iloc[1] == pd.Timestamp(datetime.fromtimestamp(300.0))  # local time for display
+    buffer.upsert(300.0, 101.0, 120.0, 100.0, 119.0, 5.0)  # forming candle changes
+    updated = buffer.to_dataframe()
+    assert updated is not frame and updated["high"].iloc[-1] == 120.0 and len(updated) == 2
+    assert not buffer.upsert(0.0, 1, 1, 1, 1, 1) and buffer.to_dataframe() is updated
+
+
+def test_websocket_candles_go_through_buffer():
+    pytest.importorskip("websocket")
+    from market_data import KrakenWebSocketData
+    feed = KrakenWebSocketData(pairs=["XXBTZUSD"], capacity=3)
+    for i, etime in enumerate((1700000300, 1700000600, 1700000600, 1700000900, 1700001200)):
+        data = [str(etime - 300), str(etime), "100", str(110 + i), "90", str(105 + i), "101", "2.5", 7]
+        feed.on_message(None, f'[42, {data}, "ohlc-5", "XBT/USD"]'.replace("'", '"'))
+    store = feed.candles["XXBTZUSD"]
+    assert len(feed.get_candles("XBT/USD")) == 3 and len(store) == 3
+    assert list(feed.get_candles("XXBTZUSD")["high"]) == [112.0, 113.0, 114.0]
+    assert feed.get_dataframe("XBT/USD") is store.to_dataframe()
+    assert len(feed.get_candles("ETH/USD")) == 0
+
+
+def test_websocket_candles_survive_dst_fall_back():
+    pytest.importorskip("websocket")
+    from market_data import KrakenWebSocketData
+    saved = os.environ.get("TZ")
+    os.environ["TZ"] = "Europe/London"
+    time.tzset()
+    try:
+        feed = KrakenWebSocketData(pairs=["XXBTZUSD"], capacity=50)
+        # 2024-10-27 01:00 UTC: BST -> GMT, local clocks repeat 01:00-02:00
+        start = int(datetime.fromisoformat("2024-10-27T00:30:00+00:00").timestamp())
+        for i in range(25):
+            etime = start + i * 300
+            data = [str(etime - 300), str(etime), "100", "101", "99", "100", "100", "1.0", 3]
+            feed.on_message(None, f'[42, {data}, "ohlc-5", "XBT/USD"]'.replace("'", '"'))
+        candles = feed.get_candles("XBT/USD")
+        assert len(candles) == 25 and candles["timestamp"][-1] == start + 24 * 300
+        frame = feed.get_dataframe("XBT/USD")
+        assert str(frame["timestamp"].iloc[0]) == "2024-10-27 01:30:00"  # BST
+        assert str(frame["timestamp"].iloc[-1]) == "2024-10-27 02:30:00"  # GMT, two hours of candles later
+    finally:
+        if saved is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = saved
+        time.tzset()
@@ -8,7 +8,7 @@ from manager.ratelimit import DecayingTokenBucket
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("Test")
 
-async def test_normalization():
+async def run_normalization():
     logger.info("--- Testing Normalization ---")
     
     # Test 1: BTC/USD Amount (8 decimals)
@@ -31,7 +31,7 @@ async def test_normalization():
     
     logger.info("✅ Normalization Tests Passed")
 
-async def test_rate_limit():
+async def run_rate_limit():
     logger.info("--- Testing Rate Limit Decay ---")
     
     # Tiny bucket: Capacity 2, Decay 1/sec
@@ -56,6 +56,12 @@ async def test_rate_limit():
     
     logger.info("✅ Rate Limit Tests Passed")
 
+def test_normalization():
+    asyncio.run(run_normalization())
+
+def test_rate_limit():
+    asyncio.run(run_rate_limit())
+
 if __name__ == "__main__":
     if sys.platform == 'win32':
         asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
@@ -63,7 +69,7 @@ if __name__ == "__main__":
     try:
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(test_normalization())
-        loop.run_until_complete(test_rate_limit())
+        loop.run_until_complete(run_normalization())
+        loop.run_until_complete(run_rate_limit())
     except KeyboardInterrupt:
         pass
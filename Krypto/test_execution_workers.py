@@ -0,0 +1,280 @@
+import asyncio
+import logging
+import threading
+import time
+
+import pytest
+
+from infra.aggregates import parse_fill
+from manager import core
+from manager.core import ExecutionManager
+from manager.workers import ExchangeWorkerPool, ExchangeTimeout, SymbolLanes, install_nonce
+from shared.schemas import TradeSignal, OrderSide, OrderType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+class SlowExchange:
+    """Blocking ccxt-style exchange: every call sleeps on the calling thread."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.calls = []
+        self._lock = threading.Lock()
+        self._ids = 0
+
+    def create_order(self, symbol, type, side, amount, params=None):
+        started = time.monotonic()
+        time.sleep(self.delay)
+        with self._lock:
+            self._ids += 1
+            self.calls.append((symbol, type, side, started, time.monotonic()))
+            return {"id": f"K{self._ids}"}
+
+    def fetch_order(self, order_id, symbol=None, params=None):
+        return {"id": order_id, "status": "closed", "filled": 0.01, "average": 100.0}
+
+    def fetch_order_book(self, symbol):
+        time.sleep(self.delay / 4)
+        return {"bids": [[100.0, 1]], "asks": [[100.01, 1]]}
+
+
+def signal(symbol, side, stop_loss=None, strategy_id="orb", reason="test"):
+    return TradeSignal(strategy_id=strategy_id, symbol=symbol, side=side, order_type=OrderType.MARKET,
+                       amount=0.01, stop_loss=stop_loss, reason=reason)
+
+
+async def heartbeat(counter, stop):
+    while not stop.is_set():
+        counter[0] += 1
+        await asyncio.sleep(0.01)
+
+
+async def run_pool_checks():
+    pool = ExchangeWorkerPool(max_workers=2, default_timeout=1.0)
+    beats, stop = [0], asyncio.Event()
+    hb = asyncio.create_task(heartbeat(beats, stop))
+    assert await pool.call(time.sleep, 0.3) is None
+    stop.set()
+    await hb
+    assert beats[0] >= 15  # the loop kept ticking while the call blocked a worker thread
+
+    with pytest.raises(ExchangeTimeout):
+        await pool.call(time.sleep, 0.3, timeout=0.05)
+    assert pool.stats()["timeouts"] == 1 and pool.stats()["in_flight"] == 1  # thread still running
+    await asyncio.sleep(0.35)
+    assert pool.stats()["in_flight"] == 0
+    pool.shutdown()
+
+
+def test_pool_keeps_loop_responsive():
+    asyncio.run(run_pool_checks())
+
+
+def test_nonce_strictly_increasing_across_threads():
+    exchange = install_nonce(type("Ex", (), {})())
+    seen = []
+    threads = [threading.Thread(target=lambda: seen.extend(exchange.nonce() for _ in range(500))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(seen)) == 2000
+
+
+async def run_manager():
+    manager = ExecutionManager()
+    manager.exchange = SlowExchange(delay=0.2)
+    manager.live_mode = True
+    manager.rate_limiter.capacity = 100
+    # No live book in the test: the REST fallback runs on the pool too
+
+    jobs = [signal("BTC/USD", OrderSide.BUY, stop_loss=95.0), signal("ETH/USD", OrderSide.BUY),
+            signal("BTC/USD", OrderSide.SELL)]
+    started = time.monotonic()
+    for sig in jobs:
+        manager.dispatch(sig)
+    await manager.lanes.join()
+    elapsed = time.monotonic() - started
+    await manager.stop()
+    return manager.exchange.calls, elapsed
+
+
+def test_signals_concurrent_across_symbols_ordered_within():
+    calls, elapsed = asyncio.run(run_manager())
+    btc = [(c[1], c[2]) for c in calls if c[0] == "BTC/USD"]
+    assert btc == [("market", "buy"), ("stop-loss", "sell"), ("market", "sell")]
+    btc_times = [(c[3], c[4]) for c in calls if c[0] == "BTC/USD"]
+    assert all(prev_end <= start for (_, prev_end), (start, _) in zip(btc_times, btc_times[1:]))
+    eth = next(c for c in calls if c[0] == "ETH/USD")
+    assert eth[3] < btc_times[0][1]  # ETH entry started while the BTC entry was still in flight
+    # 3 sequential BTC calls (+ audits) bound the run, the ETH lane overlaps them
+    assert elapsed < 4 * 0.2 + 3 * 0.05 + 0.3
+
+
+async def run_exit_behind_grid_burst():
+    manager = ExecutionManager()
+    manager.exchange = SlowExchange(delay=0.05)
+    manager.live_mode = True
+    manager.lanes = SymbolLanes(max_concurrent=2)
+    manager.rate_limiter.capacity = 1
+    manager.rate_limiter.decay_rate = 20.0  # one token every 50ms
+
+    grid = [signal("BTC/USD", OrderSide.BUY, strategy_id="geometric_grid_v1") for _ in range(6)]
+    entries = [signal(sym, OrderSide.BUY) for sym in ("ETH/USD", "ADA/USD", "DOT/USD", "XRP/USD")]
+    for sig in grid + entries:
+        manager.dispatch(sig)
+    await asyncio.sleep(0.01)  # the burst is parked at the scheduler
+    manager.dispatch(signal("BTC/USD", OrderSide.SELL, reason="Stop loss hit"))
+    manager.dispatch(signal("SOL/USD", OrderSide.SELL, reason="take profit"))
+    await manager.lanes.join()
+    await manager.stop()
+    return [(c[0], c[2]) for c in manager.exchange.calls]
+
+
+def test_exits_jump_other_symbols_never_their_own():
+    calls = asyncio.run(run_exit_behind_grid_burst())
+    assert len(calls) == 12
+    # Only the grid order granted before the exits arrived runs first; the SOL exit beats every parked order
+    assert calls[0] == ("BTC/USD", "buy") and calls[1] == ("SOL/USD", "sell")
+    # The BTC exit stays behind its own symbol's earlier grid orders
+    btc = [side for sym, side in calls if sym == "BTC/USD"]
+    assert btc == ["buy"] * 6 + ["sell"]
+
+
+async def run_exit_after_own_entry():
+    manager = ExecutionManager()
+    manager.exchange = SlowExchange(delay=0.01)
+    manager.live_mode = True
+    manager.rate_limiter.capacity = 1
+    manager.rate_limiter.decay_rate = 20.0
+
+    manager.dispatch(signal("ETH/USD", OrderSide.BUY))  # takes the only token
+    manager.dispatch(signal("BTC/USD", OrderSide.BUY, strategy_id="geometric_grid_v1"))
+    await asyncio.sleep(0.01)  # the BTC grid entry is parked at the scheduler
+    manager.dispatch(signal("BTC/USD", OrderSide.SELL, reason="Stop loss hit"))
+    await manager.lanes.join()
+    await manager.stop()
+    return [(c[0], c[2]) for c in manager.exchange.calls]
+
+
+def test_exit_never_overtakes_its_own_entry():
+    calls = asyncio.run(run_exit_after_own_entry())
+    assert [c for c in calls if c[0] == "BTC/USD"] == [("BTC/USD", "buy"), ("BTC/USD", "sell")]
+
+
+async def run_lane_order():
+    lanes, order = SymbolLanes(max_concurrent=1), []
+    release = asyncio.Event()
+
+    async def job(name):
+        await asyncio.sleep(0.01)
+        order.append(name)
+        return name
+
+    async def parked():
+        await release.wait()
+        return True
+
+    # BTC waits for its token holding no slot, so ETH runs meanwhile
+    btc = [lanes.submit("BTC/USD", lambda: job("btc entry"), admit=parked),
+           lanes.submit("BTC/USD", lambda: job("btc exit")),
+           lanes.submit("BTC/USD", lambda: job("btc dropped"), admit=lambda: asyncio.sleep(0, False))]
+    eth = lanes.submit("ETH/USD", lambda: job("eth entry"))
+    assert await eth == "eth entry" and not btc[0].done()
+    release.set()
+    assert [await f for f in btc] == ["btc entry", "btc exit", None]
+    assert lanes.skipped == 1
+    return order
+
+
+def test_lanes_fifo_and_admission_outside_slots():
+    assert asyncio.run(run_lane_order()) == ["eth entry", "btc entry", "btc exit"]
+
+
+class KrakenExchange:
+    """ccxt kraken shapes: AddOrder returns only the txid; QueryOrders/TradesHistory carry the fill."""
+
+    def __init__(self, settle_polls=1, query_orders=True):
+        self.settle_polls = settle_polls
+        self.query_orders = query_orders
+        self.polls = 0
+
+    def create_order(self, symbol, type, side, amount, params=None):
+        return {"id": "OQCLML-BW3P3-BUCMWZ", "clientOrderId": None, "timestamp": None, "status": None,
+                "symbol": symbol, "type": type, "side": side, "price": None, "amount": amount, "cost": None,
+                "filled": None, "average": None, "remaining": None, "fee": None, "trades": [], "fees": [],
+                "info": {"txid": ["OQCLML-BW3P3-BUCMWZ"], "descr": {"order": f"{side} {amount} XBTUSD @ market"}}}
+
+    def fetch_order(self, order_id, symbol=None, params=None):
+        if not self.query_orders:
+            raise RuntimeError("EOrder:Unknown order")
+        self.polls += 1
+        if self.polls <= self.settle_polls:
+            return {"id": order_id, "status": "open", "filled": 0.0, "average": None, "price": None,
+                    "fee": {"cost": 0.0, "currency": "USD"}}
+        return {"id": order_id, "status": "closed", "symbol": symbol, "side": "buy", "amount": 0.01,
+                "filled": 0.01, "average": 65012.3, "price": 65012.3, "cost": 650.123,
+                "fee": {"cost": 1.69, "currency": "USD"}}
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params=None):
+        return [{"id": "T1", "order": "OQCLML-BW3P3-BUCMWZ", "symbol": symbol, "side": "buy", "amount": 0.004,
+                 "price": 65000.0, "fee": {"cost": 0.7, "currency": "USD"}},
+                {"id": "T2", "order": "OQCLML-BW3P3-BUCMWZ", "symbol": symbol, "side": "buy", "amount": 0.006,
+                 "price": 65020.0, "fee": {"cost": 1.0, "currency": "USD"}},
+                {"id": "T3", "order": "OTHER", "symbol": symbol, "side": "sell", "amount": 1.0, "price": 1.0}]
+
+
+async def run_spread_audit(rest_book):
+    manager = ExecutionManager()
+    manager.exchange = SlowExchange(delay=0.0)
+    manager.exchange.fetch_order_book = lambda symbol: rest_book
+    # The WS book is crossed, so it is not fresh and the audit goes to REST
+    book = manager.book_feed.ensure_subscribed("BTC/USD")
+    book.apply_snapshot([["100.00", "1", "0"]], [["100.02", "1", "0"]])
+    assert not book.is_fresh()
+    try:
+        return await manager.check_spread_audit("BTC/USD")
+    finally:
+        manager.workers.shutdown()
+
+
+def test_spread_audit_rejects_crossed_quotes():
+    assert asyncio.run(run_spread_audit({"bids": [[100.0, 1]], "asks": [[100.01, 1]]}))
+    assert not asyncio.run(run_spread_audit({"bids": [[100.02, 1]], "asks": [[100.0, 1]]}))
+    assert not asyncio.run(run_spread_audit({"bids": [[100.0, 1]], "asks": [[100.0, 1]]}))
+
+
+async def run_live_fill(exchange):
+    manager = ExecutionManager()
+    manager.exchange = exchange
+    manager.live_mode = True
+    logged = []
+
+    async def log_audit(entry):
+        logged.append(entry.model_dump(mode="json"))
+
+    manager.broker.log_audit = log_audit
+    await manager.execute_trade(signal("BTC/USD", OrderSide.BUY))
+    await manager.stop()
+    entry = dict(logged[-1], ts=time.time())
+    return entry, parse_fill(entry)
+
+
+def test_live_fill_read_back_from_kraken(monkeypatch):
+    monkeypatch.setattr(core, "FILL_POLL_DELAY", 0.0)
+    entry, fill = asyncio.run(run_live_fill(KrakenExchange(settle_polls=1)))
+    assert entry["action"] == "order_placed" and entry["details"]["order_id"] == "OQCLML-BW3P3-BUCMWZ"
+    assert fill[2:] == ("BTC/USD", "buy", 0.01, 65012.3, 1.69)
+
+    # QueryOrders unavailable: the order's own trades are summed
+    entry, fill = asyncio.run(run_live_fill(KrakenExchange(query_orders=False)))
+    assert fill[2:5] == ("BTC/USD", "buy", 0.01) and fill[5] == pytest.approx(65012.0) and fill[6] == pytest.approx(1.7)
+
+
+if __name__ == "__main__":
+    test_pool_keeps_loop_responsive()
+    test_nonce_strictly_increasing_across_threads()
+    test_signals_concurrent_across_symbols_ordered_within()
+    print("✅ Execution worker tests passed")
@@ -0,0 +1,113 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from indicators import (TechnicalIndicators, IndicatorEngine, StreamingEMA, StreamingRSI,
+                        StreamingATR, StreamingVWAP, StreamingSMA)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+def make_candles(n=600, seed=7):
+    """Random-walk 5m candles spanning a few UTC days."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, n))
+    open_p = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_p, close) + rng.uniform(0, 0.3, n)
+    low = np.minimum(open_p, close) - rng.uniform(0, 0.3, n)
+    volume = rng.uniform(1, 50, n)
+    # A few flat candles exercise the 0/0 and gain/0 RSI branches
+    close[100:120] = close[99]
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01 20:00", periods=n, freq="5min"),
+        "open": open_p, "high": high, "low": low, "close": close, "volume": volume,
+    })
+
+
+def assert_same(streamed, expected, name):
+    expected = np.asarray(expected, dtype=float)
+    streamed = np.asarray(streamed, dtype=float)
+    assert np.array_equal(np.isnan(streamed), np.isnan(expected)), f"{name}: NaN pattern differs"
+    mask = ~np.isnan(expected)
+    assert np.allclose(streamed[mask], expected[mask], rtol=1e-9, atol=1e-9), f"{name}: values differ"
+
+
+def test_streaming_matches_pandas():
+    df = make_candles()
+    ema20, ema50 = StreamingEMA(20), StreamingEMA(50)
+    rsi, rsi_w, atr = StreamingRSI(14), StreamingRSI(14, wilder=True), StreamingATR(14)
+    vwap, vwap_d = StreamingVWAP(), StreamingVWAP(anchor='D')
+    body = StreamingSMA(20)
+
+    out = {k: [] for k in ("ema_20", "ema_50", "rsi", "rsi_w", "atr", "vwap", "vwap_d", "body")}
+    for row in df.itertuples():
+        out["ema_20"].append(ema20.update(row.close))
+        out["ema_50"].append(ema50.update(row.close))
+        out["rsi"].append(rsi.update(row.close))
+        out["rsi_w"].append(rsi_w.update(row.close))
+        out["atr"].append(atr.update(row.high, row.low, row.close))
+        out["vwap"].append(vwap.update(row.timestamp, row.high, row.low, row.close, row.volume))
+        out["vwap_d"].append(vwap_d.update(row.timestamp, row.high, row.low, row.close, row.volume))
+        out["body"].append(body.update(abs(row.close - row.open)))
+
+    ref = TechnicalIndicators.add_all_indicators(df.copy())
+    assert_same(out["ema_20"], ref["ema_20"], "ema_20")
+    assert_same(out["ema_50"], ref["ema_50"], "ema_50")
+    assert_same(out["rsi"], ref["rsi"], "rsi")
+    assert_same(out["atr"], ref["atr"], "atr")
+    assert_same(out["vwap"], ref["vwap"], "vwap")
+    assert_same(out["rsi_w"], TechnicalIndicators.calculate_rsi_wilder(df), "rsi_wilder")
+    assert_same(out["vwap_d"], TechnicalIndicators.calculate_vwap(df, anchor='D'), "vwap_session")
+    assert_same(out["body"], (df["close"] - df["open"]).abs().rolling(20).mean(), "body_mean")
+    logger.info("✅ Streaming indicators match pandas")
+
+
+def test_forming_candle_revisions():
+    """Feeding intermediate states of each candle must end where the final candles do."""
+    df = make_candles(300)
+    rng = np.random.default_rng(1)
+    engine = IndicatorEngine(vwap_anchor='D')
+    for row in df.itertuples():
+        # Two noisy partial updates, then the final candle values
+        for _ in range(2):
+            engine.update(row.timestamp, row.open, row.high + rng.uniform(0, 1),
+                          row.low - rng.uniform(0, 1), row.close + rng.normal(), row.volume * rng.uniform())
+        engine.update(row.timestamp, row.open, row.high, row.low, row.close, row.volume)
+
+    ref = TechnicalIndicators.add_all_indicators(df.copy())
+    atr_mean = ref["atr"].rolling(20).mean()
+    vwap_d = TechnicalIndicators.calculate_vwap(df, anchor='D')
+    last = engine.values
+    assert np.isclose(last["ema_20"], ref["ema_20"].iloc[-1])
+    assert np.isclose(last["ema_50"], ref["ema_50"].iloc[-1])
+    assert np.isclose(last["rsi"], ref["rsi"].iloc[-1])
+    assert np.isclose(last["atr"], ref["atr"].iloc[-1])
+    assert np.isclose(last["atr_mean_20"], atr_mean.iloc[-1])
+    assert np.isclose(last["vwap"], vwap_d.iloc[-1])
+    assert engine.count == len(df)
+    logger.info("✅ Forming-candle revisions are exact")
+
+
+def test_engine_sync_is_incremental():
+    df = make_candles(200)
+    engine = IndicatorEngine(vwap_anchor=None)
+    engine.sync(df.iloc[:150])
+    values = engine.sync(df)
+    assert engine.count == len(df)
+
+    ref = TechnicalIndicators.add_all_indicators(df.copy())
+    for col in ("ema_20", "ema_50", "rsi", "atr", "vwap"):
+        assert np.isclose(values[col], ref[col].iloc[-1]), col
+
+    # A frame that no longer contains the last candle triggers a rebuild
+    values = engine.sync(df.iloc[:50])
+    assert engine.count == 50
+    assert np.isclose(values["ema_20"], ref["ema_20"].iloc[49])
+
+
+if __name__ == "__main__":
+    test_streaming_matches_pandas()
+    test_forming_candle_revisions()
+    test_engine_sync_is_incremental()
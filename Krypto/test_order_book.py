@@ -0,0 +1,141 @@
+import json
+import logging
+import zlib
+
+from order_book import KrakenBookFeed, LocalOrderBook, to_ws_pair
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+ASKS = [["5541.30000", "2.50700000", "1534614248.123678"],
+        ["5541.80000", "0.33000000", "1534614098.345543"],
+        ["5542.70000", "0.64700000", "1534614244.654432"]]
+BIDS = [["5541.20000", "1.52900000", "1534614248.765567"],
+        ["5539.90000", "0.30000000", "1534614241.769870"],
+        ["5539.50000", "5.00000000", "1534613831.243486"]]
+
+
+def kraken_checksum(asks, bids):
+    """Reference implementation straight from the Kraken spec."""
+    strip = lambda v: v.replace(".", "").lstrip("0")
+    text = "".join(strip(p) + strip(v) for p, v, *_ in asks)
+    text += "".join(strip(p) + strip(v) for p, v, *_ in bids)
+    return str(zlib.crc32(text.encode()) & 0xFFFFFFFF)
+
+
+def test_pair_mapping():
+    assert to_ws_pair("BTC/USD") == "XBT/USD"
+    assert to_ws_pair("XXBTZGBP") == "XBT/GBP"
+    assert to_ws_pair("SOL/USD") == "SOL/USD"
+
+
+def test_snapshot_and_best_levels():
+    book = LocalOrderBook("BTC/USD")
+    book.apply_snapshot(ASKS, BIDS)
+    assert book.best_bid_ask() == (5541.2, 5541.3)
+    assert abs(book.spread_pct() - (0.1 / 5541.2)) < 1e-12
+    assert book.is_fresh()
+
+
+def test_delta_with_checksum():
+    book = LocalOrderBook("BTC/USD")
+    book.apply_snapshot(ASKS, BIDS)
+
+    # Remove the best ask, add a better bid
+    new_asks = ASKS[1:]
+    new_bids = [["5541.25000", "0.10000000", "1534614249.0"]] + BIDS
+    checksum = kraken_checksum(new_asks, new_bids)
+    ok = book.apply_update([["5541.30000", "0.00000000", "1534614249.0"]],
+                           [["5541.25000", "0.10000000", "1534614249.0"]], checksum)
+    assert ok
+    assert book.best_bid_ask() == (5541.25, 5541.8)
+
+
+def test_checksum_mismatch_invalidates():
+    book = LocalOrderBook("BTC/USD")
+    book.apply_snapshot(ASKS, BIDS)
+    ok = book.apply_update([["5541.40000", "1.00000000", "1534614249.0"]], [], "12345")
+    assert not ok
+    assert not book.valid and not book.is_fresh()
+    assert book.checksum_failures == 1
+
+
+def test_depth_truncation():
+    book = LocalOrderBook("BTC/USD", depth=2)
+    book.apply_snapshot(ASKS, BIDS)
+    levels = book.levels()
+    assert [p for p, _ in levels["asks"]] == [5541.3, 5541.8]
+    assert [p for p, _ in levels["bids"]] == [5541.2, 5539.9]
+
+
+def test_feed_routes_ws_messages():
+    feed = KrakenBookFeed(["BTC/USD"], depth=10)
+    feed.handle_message([336, {"as": ASKS, "bs": BIDS}, "book-10", "XBT/USD"])
+    new_asks = [["5541.25000", "1.00000000", "1534614250.0"]] + ASKS
+    checksum = kraken_checksum(new_asks, BIDS)
+    # Split update: asks and bids in separate dicts, checksum on the last
+    feed.handle_message([336, {"a": [["5541.25000", "1.00000000", "1534614250.0"]]},
+                         {"b": [], "c": checksum}, "book-10", "XBT/USD"])
+    book = feed.get_book("BTC/USD")
+    assert book.is_fresh()
+    assert book.best_bid_ask() == (5541.2, 5541.25)
+
+
+class RecordingWS:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message)["event"])
+
+
+def test_resubscribes_once_per_invalidation():
+    feed = KrakenBookFeed(["BTC/USD"], depth=10)
+    feed.ws = RecordingWS()
+    feed.handle_message([336, {"as": ASKS, "bs": BIDS}, "book-10", "XBT/USD"])
+    feed.handle_message([336, {"a": [["5541.40000", "1.00000000", "1534614249.0"]], "c": "12345"},
+                         "book-10", "XBT/USD"])
+    # Deltas keep arriving until the new snapshot: they are dropped without further requests
+    for i in range(6):
+        feed.handle_message([336, {"b": [["5539.00000", "1.00000000", f"15346142{50 + i}.0"]], "c": "1"},
+                             "book-10", "XBT/USD"])
+    assert feed.ws.sent == ["unsubscribe", "subscribe"]
+
+    feed.handle_message([336, {"as": ASKS, "bs": BIDS}, "book-10", "XBT/USD"])
+    assert feed.get_book("BTC/USD").is_fresh()
+    feed.handle_message([336, {"a": [["5541.40000", "1.00000000", "1534614260.0"]], "c": "12345"},
+                         "book-10", "XBT/USD"])
+    assert feed.ws.sent == ["unsubscribe", "subscribe"] * 2  # a new invalidation asks again
+
+
+def test_crossed_book_invalidates_and_resubscribes():
+    feed = KrakenBookFeed(["BTC/USD"], depth=10)
+    feed.ws = RecordingWS()
+    feed.handle_message([336, {"as": ASKS, "bs": BIDS}, "book-10", "XBT/USD"])
+    book = feed.get_book("BTC/USD")
+
+    # An ask through the best bid, even with a matching checksum, is not a usable book
+    new_asks = [["5541.10000", "1.00000000", "1534614250.0"]] + ASKS
+    feed.handle_message([336, {"a": [["5541.10000", "1.00000000", "1534614250.0"]]},
+                         {"b": [], "c": kraken_checksum(new_asks, BIDS)}, "book-10", "XBT/USD"])
+    assert not book.valid and not book.is_fresh() and book.crossed_books == 1
+    assert feed.ws.sent == ["unsubscribe", "subscribe"]
+
+    # A crossed snapshot is rejected the same way; a clean one restores the book
+    feed.handle_message([336, {"as": ASKS, "bs": [["5541.30000", "1.0", "1534614251.0"]] + BIDS},
+                         "book-10", "XBT/USD"])
+    assert not book.is_fresh() and book.crossed_books == 2 and len(feed.ws.sent) == 4
+    feed.handle_message([336, {"as": ASKS, "bs": BIDS}, "book-10", "XBT/USD"])
+    assert book.is_fresh() and book.best_bid_ask() == (5541.2, 5541.3)
+    logger.info("✅ Order Book Tests Passed")
+
+
+if __name__ == "__main__":
+    test_pair_mapping()
+    test_snapshot_and_best_levels()
+    test_delta_with_checksum()
+    test_checksum_mismatch_invalidates()
+    test_depth_truncation()
+    test_feed_routes_ws_messages()
+    test_resubscribes_once_per_invalidation()
+    test_crossed_book_invalidates_and_resubscribes()
@@ -0,0 +1,103 @@
+import asyncio
+import logging
+import time
+
+import pytest
+
+from manager.ratelimit import DecayingTokenBucket, RateScheduler, RateLimitTimeout, Priority
+from manager.core import signal_priority
+from shared.schemas import TradeSignal, OrderSide, OrderType
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+TOKEN = 0.05  # decay 20 points/s: one token every 50ms
+
+
+async def grant_log(scheduler, requests):
+    """Submits (strategy, priority) requests at once; returns them in grant order with grant times."""
+    granted = []
+    t0 = time.monotonic()
+
+    async def one(i, strategy, priority):
+        await scheduler.acquire(strategy, priority)
+        granted.append((i, strategy, priority, time.monotonic() - t0))
+
+    await asyncio.gather(*(one(i, s, p) for i, (s, p) in enumerate(requests)))
+    return granted
+
+
+async def run_priorities():
+    scheduler = RateScheduler(DecayingTokenBucket(capacity=2, decay_rate=1 / TOKEN))
+    requests = [("grid", Priority.GRID), ("orb", Priority.ENTRY), ("grid", Priority.GRID),
+                ("orb", Priority.EXIT), ("dca", Priority.ENTRY), ("orb", Priority.EXIT)]
+    return scheduler, await grant_log(scheduler, requests)
+
+
+def test_priority_order_and_exact_wakeups():
+    scheduler, granted = asyncio.run(run_priorities())
+    # The first two fit the empty bucket; the queue then drains exits, entries, grid
+    assert [g[0] for g in granted] == [0, 1, 3, 5, 4, 2]
+    waits = [g[3] for g in granted[2:]]
+    for k, t in enumerate(waits, start=1):
+        assert k * TOKEN - 0.005 <= t < k * TOKEN + 0.03, (k, t)
+    # One timer per queued grant, never a polling loop
+    assert scheduler.wakeups == 4
+    stats = scheduler.stats()
+    assert stats["EXIT"]["granted"] == 2 and stats["GRID"]["max_wait_ms"] >= 3 * TOKEN * 1000
+    assert all(v["queued"] == 0 for k, v in stats.items() if k in Priority.__members__)
+
+
+async def run_fairness():
+    scheduler = RateScheduler(DecayingTokenBucket(capacity=1, decay_rate=1 / 0.01), weights={"b": 2.0})
+    await scheduler.acquire("warmup")  # fill the bucket so everything below queues
+    requests = [("a", Priority.ENTRY)] * 6 + [("b", Priority.ENTRY)] * 6
+    return await grant_log(scheduler, requests)
+
+
+def test_weighted_fair_share():
+    granted = asyncio.run(run_fairness())
+    first_six = [g[1] for g in granted[:6]]
+    # Weight 2 gets twice the share while both are backlogged, although "a" queued first
+    assert first_six.count("b") == 4 and first_six.count("a") == 2
+    assert [g[1] for g in granted].count("a") == 6  # and "a" is never starved
+
+
+async def run_expiry():
+    scheduler = RateScheduler(DecayingTokenBucket(capacity=1, decay_rate=1.0),
+                              max_wait={Priority.ENTRY: 0.05})
+    await scheduler.acquire("orb", Priority.ENTRY)
+    with pytest.raises(RateLimitTimeout):
+        await scheduler.acquire("orb", Priority.ENTRY)
+    assert scheduler.depth()["ENTRY"]["total"] == 0
+    # An exit still queues behind the decay rather than expiring
+    exit_task = asyncio.create_task(scheduler.acquire("orb", Priority.EXIT))
+    await asyncio.sleep(0.05)
+    assert scheduler.depth()["EXIT"] == {"total": 1, "by_strategy": {"orb": 1}}
+    exit_task.cancel()
+    await asyncio.gather(exit_task, return_exceptions=True)
+    assert scheduler.depth()["EXIT"]["total"] == 0
+    return scheduler
+
+
+def test_stale_entries_expire():
+    scheduler = asyncio.run(run_expiry())
+    assert scheduler.stats()["ENTRY"]["expired"] == 1
+
+
+def test_signal_classification():
+    def sig(strategy, reason, order_type=OrderType.MARKET):
+        return TradeSignal(strategy_id=strategy, symbol="BTC/USD", side=OrderSide.SELL, order_type=order_type,
+                           amount=1, reason=reason)
+    assert signal_priority(sig("spot_futures_arb_v1", "Close Spot Leg")) is Priority.EXIT
+    assert signal_priority(sig("augmented_orb_v1", "x", OrderType.STOP_LOSS)) is Priority.EXIT
+    assert signal_priority(sig("augmented_orb_v1", "ORB+VWAP Breakout High")) is Priority.ENTRY
+    assert signal_priority(sig("geometric_grid_v1", "replenish level 3")) is Priority.GRID
+
+
+if __name__ == "__main__":
+    test_priority_order_and_exact_wakeups()
+    test_weighted_fair_share()
+    test_stale_entries_expire()
+    test_signal_classification()
+    print("✅ Rate scheduler tests passed")
@@ -0,0 +1,76 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from antigravity_bot import right_align, rolling_mean, swing_low_mask, find_trap_doors
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("Test")
+
+
+def loop_swing_lows(lows):
+    """The original nested-loop swing detection, over each ticker's own bars."""
+    found = set()
+    for i in range(len(lows) - 4, 14, -1):
+        if all(lows[i - j] > lows[i] and lows[i + j] > lows[i] for j in range(1, 4)):
+            found.add(i)
+    return found
+
+
+def test_swing_mask_matches_loop():
+    rng = np.random.default_rng(3)
+    series = [100 + np.cumsum(rng.normal(0, 1, n)) for n in (60, 45, 60, 30)]
+    lows = right_align(series)
+    mask = swing_low_mask(lows)
+
+    for k, s in enumerate(series):
+        pad = len(lows) - len(s)
+        vectorized = {i - pad for i in np.flatnonzero(mask[:, k]) if 14 < i - pad <= len(s) - 4}
+        assert vectorized == loop_swing_lows(s), f"ticker {k}"
+    logger.info("✅ Swing lows match the loop")
+
+
+def test_rolling_mean_matches_pandas():
+    rng = np.random.default_rng(5)
+    x = right_align([rng.normal(size=40), rng.normal(size=25)])
+    expected = pd.DataFrame(x).rolling(14).mean().to_numpy()
+    out = rolling_mean(x, 14)
+    assert np.array_equal(np.isnan(out), np.isnan(expected))
+    assert np.allclose(out[~np.isnan(out)], expected[~np.isnan(expected)])
+
+
+def test_short_history_is_ignored():
+    close = right_align([np.linspace(100, 110, 10)])
+    assert find_trap_doors(close + 1, close - 1, close) == {}
+
+
+def trap_door_bars(sweep_low):
+    """40 4H bars drifting down, a swing low at 101, a later wick to `sweep_low`, then a reclaim."""
+    close = np.concatenate([np.linspace(120, 105, 30), [102, 104, 104, 104, 103, 103.5, 103.5, 103.5, 103, 103.2]])
+    low, high = close - 1, close + 1
+    low[30], low[34] = 101, sweep_low
+    return high, low, close
+
+
+def test_sweep_below_strike_zone_signals():
+    bars = [trap_door_bars(98.0), trap_door_bars(102.0)]
+    # Third ticker: the same trap door with less history, so it sits under NaN padding
+    bars.append(tuple(b[5:] for b in trap_door_bars(98.0)))
+    high, low, close = (right_align(cols) for cols in zip(*bars))
+
+    signals = find_trap_doors(high, low, close)
+    assert sorted(signals) == [0, 2], signals
+    for k in (0, 2):
+        assert signals[k]["baseline"] == 101
+        assert signals[k]["sweep_low"] == 98
+        assert signals[k]["current_price"] == 103.2
+        assert 103 < signals[k]["sma20"]
+    logger.info("✅ Trap door found; a shallow dip above the Strike Zone is not")
+
+
+if __name__ == "__main__":
+    test_swing_mask_matches_loop()
+    test_rolling_mean_matches_pandas()
+    test_short_history_is_ignored()
+    test_sweep_below_strike_zone_signals()
@@ -7,7 +7,7 @@ import pandas as pd
 import math
 import logging
 from datetime import datetime
-from indicators import TechnicalIndicators
+from indicators import IndicatorEngine
 import app_config
 
 class VWAPPullbackStrategy:
@@ -15,6 +15,8 @@ class VWAPPullbackStrategy:
         self.logger = logging.getLogger('trade_logger')
         self.trend_bias = None  # 'BULLISH' or 'BEARISH' — set by ORB result
         self.active = False
+        # Streaming indicators: only new/revised candles are processed per call
+        self.indicators = IndicatorEngine(vwap_anchor='D')
     
     def set_trend_bias(self, bias: str):
         """
@@ -51,24 +53,20 @@ class VWAPPullbackStrategy:
         if self.trend_bias != "BULLISH":
             return None
         
-        # Enrich with indicators
-        df_indic = TechnicalIndicators.add_all_indicators(df_5m.copy())
-        if df_indic.empty:
-            return None
+        # Enrich with indicators (incremental: O(1) per new candle)
+        indic = self.indicators.sync(df_5m)
         
-        current = df_indic.iloc[-1]
-        vwap = current.get('vwap', float('nan'))
-        rsi = current.get('rsi', float('nan'))
-        atr = current.get('atr', float('nan'))
+        current = df_5m.iloc[-1]
+        vwap = indic.get('vwap', float('nan'))
+        rsi = indic.get('rsi', float('nan'))
+        atr = indic.get('atr', float('nan'))
         
         if math.isnan(vwap) or math.isnan(rsi) or math.isnan(atr):
             return None
         
         # Condition 1: Price was trending above VWAP (3 of last 5 candles)
-        recent = df_indic.tail(5)
-        above_vwap_count = sum(1 for _, r in recent.iterrows() 
-                               if not math.isnan(r.get('vwap', float('nan'))) 
-                               and r['close'] > r['vwap'])
+        above_vwap_count = sum(1 for close, v in self.indicators.recent
+                               if not math.isnan(v) and close > v)
         
         if above_vwap_count < 3:
             return None  # No clear uptrend relative to VWAP
@@ -2,23 +2,30 @@ import os
 import time
 import json
 import logging
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 from bs4 import BeautifulSoup
-from pytrends.request import TrendReq
-import finnhub
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("alt_data_engine.log"),
-        logging.StreamHandler()
-    ]
-)
+from shared.lazy_import import lazy_import
+from shared.signal_store import SignalStore, extract_signals, source_timestamp
+
+pytrends_request = lazy_import("pytrends.request")
+finnhub = lazy_import("finnhub")
+
 logger = logging.getLogger("AltDataEngine")
 
+
+def configure_logging():
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler("alt_data_engine.log"),
+            logging.StreamHandler()
+        ]
+    )
+
 # Configuration
 NEWSDATA_API_KEY = os.getenv("NEWSDATA_API_KEY")
 FINNHUB_API_KEY = os.getenv("FINNHUB_API_KEY")
@@ -38,7 +45,8 @@ def fetch_fear_and_greed():
             data = response.json().get('data', [])[0]
             return {
                 "value": data.get('value'),
-                "sentiment": data.get('value_classification')
+                "sentiment": data.get('value_classification'),
+                "timestamp": data.get('timestamp')  # publication time: one reading per day
             }
     except Exception as e:
         logger.error(f"Error fetching Fear & Greed: {e}")
@@ -63,7 +71,7 @@ def fetch_macro_data():
 def fetch_pytrends(keywords=["market crash", "recession", "bull market", "buy the dip"]):
     """Fetches Google Trends interest over time."""
     try:
-        pytrends = TrendReq(hl='en-US', tz=360)
+        pytrends = pytrends_request.TrendReq(hl='en-US', tz=360)
         pytrends.build_payload(keywords, cat=0, timeframe='now 1-H', geo='', gprop='')
         data = pytrends.interest_over_time()
         if not data.empty:
@@ -133,87 +141,272 @@ def fetch_cryptopanic():
     return []
 
 
+class RedditBrowser:
+    """
+    One headless Chromium kept alive across collection cycles (launching it
+    costs seconds per scrape). Playwright's sync API is bound to the thread
+    that started it, so every call must come from the same thread: the
+    collector gives Reddit its own single-thread executor.
+    """
+    USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+    def __init__(self):
+        self._playwright = None
+        self._browser = None
+        self._context = None
+
+    def _ensure(self):
+        if self._context is None:
+            from playwright.sync_api import sync_playwright
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=True)
+            # Reddit requires User-Agent to avoid blocking sometimes
+            self._context = self._browser.new_context(user_agent=self.USER_AGENT)
+        return self._context
+
+    def page_content(self, url: str, selector: str, timeout_ms: int = 10000) -> str:
+        page = self._ensure().new_page()
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+            page.wait_for_selector(selector, timeout=timeout_ms)
+            return page.content()
+        except Exception:
+            # A wedged browser is relaunched on the next call
+            if not self._browser or not self._browser.is_connected():
+                self.close()
+            raise
+        finally:
+            try:
+                page.close()
+            except Exception:
+                pass
+
+    def close(self):
+        for closer in (self._context, self._browser):
+            try:
+                if closer:
+                    closer.close()
+            except Exception:
+                pass
+        if self._playwright:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+        self._playwright = self._browser = self._context = None
+
+
+_reddit_browser = threading.local()
+
+
 def scrape_reddit_hot(subreddit="wallstreetbets"):
     """Scrapes Hot page of a subreddit using BeautifulSoup and Playwright."""
-    from playwright.sync_api import sync_playwright
-    import logging
-    
     logger = logging.getLogger("RedditScraper")
     titles = []
-    
+
+    browser = getattr(_reddit_browser, "browser", None)
+    if browser is None:
+        browser = _reddit_browser.browser = RedditBrowser()
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            page = browser.new_page()
-            # Reddit requires User-Agent to avoid blocking sometimes, though Playwright handles it well usually
-            page.set_extra_http_headers({"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"})
-            
-            url = f"https://www.reddit.com/r/{subreddit}/hot/"
-            logger.info(f"Navigating to {url}...")
-            page.goto(url, wait_until="domcontentloaded")
-            
-            # Wait for content to load - Reddit is heavy JS
-            page.wait_for_selector('shreddit-post', timeout=10000) 
-            
-            content = page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-            
-            # Select post titles (Reddit's DOM changes often, using loose selector or specific attribute)
-            # Modern Reddit uses <shreddit-post> tags with 'post-title' attribute
-            posts = soup.find_all('shreddit-post')
-            for post in posts[:10]: # Top 10
-                title = post.get('post-title')
-                if title:
-                    titles.append(title)
-            
-            browser.close()
-            return titles
-            
+        url = f"https://www.reddit.com/r/{subreddit}/hot/"
+        logger.info(f"Navigating to {url}...")
+        # Wait for content to load - Reddit is heavy JS
+        content = browser.page_content(url, 'shreddit-post', timeout_ms=10000)
+        soup = BeautifulSoup(content, 'html.parser')
+
+        # Select post titles (Reddit's DOM changes often, using loose selector or specific attribute)
+        # Modern Reddit uses <shreddit-post> tags with 'post-title' attribute
+        posts = soup.find_all('shreddit-post')
+        for post in posts[:10]: # Top 10
+            title = post.get('post-title')
+            if title:
+                titles.append(title)
+        return titles
+
     except Exception as e:
         logger.error(f"Error scraping Reddit: {e}")
         return []
 
-def save_snapshot(data):
-    """Saves the aggregated data to a JSON file."""
+
+def close_reddit_browser():
+    """Closes this thread's persistent browser (call on the scraping thread)."""
+    browser = getattr(_reddit_browser, "browser", None)
+    if browser is not None:
+        browser.close()
+        _reddit_browser.browser = None
+
+
+def save_snapshot(data, sources=None):
+    """Saves the aggregated data (and per-source freshness) to a JSON file."""
     snapshot = {
         "timestamp": datetime.now().isoformat(),
         "data": data
     }
+    if sources is not None:
+        snapshot["sources"] = sources
     try:
-        with open(DATA_FILE, 'w') as f:
+        # Write-then-rename: readers never see a half-written file, and the
+        # new inode tells their caches (shared/snapshot_reader) to reload
+        tmp = f"{DATA_FILE}.tmp"
+        with open(tmp, 'w') as f:
             json.dump(snapshot, f, indent=4)
-        logger.info(f"Saved sentiment snapshot to {DATA_FILE}")
+        os.replace(tmp, DATA_FILE)
+        logger.debug(f"Saved sentiment snapshot to {DATA_FILE}")
     except Exception as e:
         logger.error(f"Error saving snapshot: {e}")
 
-def main():
-    logger.info("Starting Alternative Data Engine...")
-    
-    while True:
+
+# name -> (fetcher, refresh interval s, deadline s). Deadlines bound how long a
+# source may hold its slot before it is reported as timed out; they never delay
+# other sources, since every completion is written straight to the snapshot.
+SOURCES = {
+    "fear_and_greed": (fetch_fear_and_greed, 300, 15),
+    "rss_breaking": (fetch_rss_news, 300, 25),
+    "cryptopanic": (fetch_cryptopanic, 300, 15),
+    "finnhub": (fetch_finnhub, 600, 15),
+    "newsdata": (fetch_newsdata, 900, 15),  # free tier: 200 credits/day
+    "pytrends": (fetch_pytrends, 900, 30),  # Google throttles aggressive polling
+    "reddit": (scrape_reddit_hot, 600, 45),
+    "macro_data": (fetch_macro_data, 3600, 15),  # monthly series
+}
+
+
+class AltDataCollector:
+    """
+    Runs every source concurrently on its own cadence and deadline, and
+    rewrites the snapshot as each one completes, so consumers see fast
+    sources within seconds instead of after the slowest one. A failed or
+    timed-out source keeps its last good value; `sources` in the snapshot
+    records when each value was fetched.
+    """
+
+    def __init__(self, sources: dict = None, tick: float = 1.0, max_workers: int = 8, store: SignalStore = None):
+        self.sources = dict(SOURCES if sources is None else sources)
+        self.tick = tick
+        # Normalized per-signal history (the snapshot only holds the latest values)
+        self.store = store
+        self.data = {}
+        self.meta = {name: {"fetched_at": None, "ok": False, "error": None, "latency_ms": None}
+                     for name in self.sources}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="altdata")
+        # Playwright is thread-bound: Reddit always runs on the same thread
+        self._browser_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="altdata-browser")
+        self._next_due = {name: 0.0 for name in self.sources}
+        self._in_flight = {}  # future -> (name, started)
+        self._timed_out = set()
+        self.running = False
+
+    def load_previous(self, path: str = DATA_FILE):
+        """Seeds values from the last snapshot so a restart does not blank slow sources."""
         try:
-            logger.info("Fetching data...")
-            aggregated_data = {
-                "fear_and_greed": fetch_fear_and_greed(),
-                "macro_data": fetch_macro_data(),
-                "rss_breaking": fetch_rss_news(),
-                "pytrends": fetch_pytrends(),
-                "newsdata": fetch_newsdata(),
-                "finnhub": fetch_finnhub(),
-                "cryptopanic": fetch_cryptopanic(),
-                "reddit": scrape_reddit_hot() 
-            }
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.data.update({k: v for k, v in snapshot.get("data", {}).items() if k in self.sources})
+        for name, meta in (snapshot.get("sources") or {}).items():
+            if name in self.meta:
+                self.meta[name].update(meta)
+
+    def submit_due(self, now: float):
+        busy = {name for name, _ in self._in_flight.values()}
+        for name, (fetcher, interval, _) in self.sources.items():
+            if name in busy or now < self._next_due[name]:
+                continue
+            pool = self._browser_pool if name == "reddit" else self._pool
+            self._in_flight[pool.submit(fetcher)] = (name, now)
+            self._next_due[name] = now + interval
+
+    def collect(self, done, now: float) -> bool:
+        changed = False
+        for future in done:
+            name, started = self._in_flight.pop(future)
+            self._timed_out.discard(name)
+            meta = self.meta[name]
+            meta["latency_ms"] = round((now - started) * 1000)
+            try:
+                value = future.result()
+            except Exception as e:
+                meta.update(ok=False, error=str(e)[:200])
+                logger.error(f"Source {name} failed: {e}")
+                changed = True
+                continue
+            if value in ({}, [], None) and self.data.get(name):
+                # Fetchers swallow their own errors and return empty: keep the last good value
+                meta.update(ok=False, error="empty result")
+            else:
+                self.data[name] = value
+                meta.update(ok=True, error=None, fetched_at=datetime.now().isoformat())
+                self.record_signals(name, value)
+            changed = True
+        return changed
 
+    def record_signals(self, name: str, value):
+        if self.store is None:
+            return
+        try:
+            self.store.append_many(extract_signals(name, value), source_timestamp(name, value))
+        except Exception as e:
+            logger.error(f"Failed to append {name} signals: {e}")
+
+    def check_deadlines(self, now: float) -> bool:
+        changed = False
+        for name, started in self._in_flight.values():
+            if name not in self._timed_out and now - started > self.sources[name][2]:
+                # The thread cannot be interrupted; its late result is still accepted
+                self._timed_out.add(name)
+                self.meta[name].update(ok=False, error=f"deadline {self.sources[name][2]}s exceeded")
+                logger.warning(f"Source {name} exceeded its {self.sources[name][2]}s deadline")
+                changed = True
+        return changed
 
-            save_snapshot(aggregated_data)
+    def step(self, timeout: float = None) -> bool:
+        """One scheduling round; returns True if the snapshot was rewritten."""
+        self.submit_due(time.monotonic())
+        if self._in_flight:
+            done, _ = wait(list(self._in_flight), timeout=self.tick if timeout is None else timeout,
+                           return_when=FIRST_COMPLETED)
+        else:
+            time.sleep(self.tick if timeout is None else timeout)
+            done = ()
+        now = time.monotonic()
+        changed = self.collect(done, now)
+        changed = self.check_deadlines(now) or changed
+        if changed:
+            save_snapshot(self.data, self.meta)
+        return changed
 
-            
-            # Sleep for 60 minutes
-            logger.info("Sleeping for 60 minutes...")
-            time.sleep(3600)
-            
+    def run(self):
+        self.running = True
+        self.load_previous()
+        while self.running:
+            try:
+                self.step()
+            except Exception as e:
+                logger.error(f"Unexpected error in collector loop: {e}")
+                time.sleep(5)
+
+    def shutdown(self):
+        self.running = False
+        try:
+            self._browser_pool.submit(close_reddit_browser).result(timeout=30)
         except Exception as e:
-            logger.error(f"Unexpected error in main loop: {e}")
-            time.sleep(60)
+            logger.warning(f"Browser did not close cleanly: {e}")
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._browser_pool.shutdown(wait=False, cancel_futures=True)
+        if self.store is not None:
+            self.store.close()
+
+
+def main():
+    configure_logging()
+    logger.info("Starting Alternative Data Engine...")
+    os.makedirs(os.path.dirname(DATA_FILE), exist_ok=True)
+    collector = AltDataCollector(store=SignalStore())
+    try:
+        collector.run()
+    finally:
+        collector.shutdown()
 
 if __name__ == '__main__':
     main()
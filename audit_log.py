@@ -6,29 +6,46 @@ import time
 from datetime import datetime
 from typing import Optional
 
-# Dual-write: also log to centralized orchestrator audit trail
-_CENTRAL_AVAILABLE = False
-try:
-    # 1. Try local dev path
-    sys.path.append(r"C:\Users\steve\.gemini\antigravity\orchestrator")
-    from audit_trail import CentralAuditLogger
-    _CENTRAL_AVAILABLE = True
-except ImportError:
-    # 2. Try relative import (VPS / Production)
+# Dual-write: also log to centralized orchestrator audit trail.
+# Resolved on first use so importing this module stays free of SQLite I/O.
+_CENTRAL_CLASS = None
+_CENTRAL_RESOLVED = False
+
+def _load_central_logger_class():
+    """Locates CentralAuditLogger once per process (None if unavailable)."""
+    global _CENTRAL_CLASS, _CENTRAL_RESOLVED
+    if _CENTRAL_RESOLVED:
+        return _CENTRAL_CLASS
+    _CENTRAL_RESOLVED = True
     try:
-        from shared.audit_trail import CentralAuditLogger
-        _CENTRAL_AVAILABLE = True
-    except ImportError as e:
-        print(f"⚠️ Central Audit Logger Unavailable: {e}")
-        _CENTRAL_AVAILABLE = False
+        # 1. Try local dev path
+        sys.path.append(r"C:\Users\steve\.gemini\antigravity\orchestrator")
+        from audit_trail import CentralAuditLogger
+        _CENTRAL_CLASS = CentralAuditLogger
+    except ImportError:
+        # 2. Try relative import (VPS / Production)
+        try:
+            from shared.audit_trail import CentralAuditLogger
+            _CENTRAL_CLASS = CentralAuditLogger
+        except ImportError as e:
+            print(f"⚠️ Central Audit Logger Unavailable: {e}")
+            _CENTRAL_CLASS = None
+    return _CENTRAL_CLASS
 
-# Force UTF-8 for standard output (Windows AND VPS Linux locale issues)
-try:
-    if hasattr(sys.stdout, 'buffer'):
-        sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-        sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
-except Exception:
-    pass  # Already wrapped or running in non-standard environment
+_STDIO_WRAPPED = False
+
+def _force_utf8_stdio():
+    """Force UTF-8 for standard output (Windows AND VPS Linux locale issues)."""
+    global _STDIO_WRAPPED
+    if _STDIO_WRAPPED:
+        return
+    _STDIO_WRAPPED = True
+    try:
+        if hasattr(sys.stdout, 'buffer'):
+            sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+            sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+    except Exception:
+        pass  # Already wrapped or running in non-standard environment
 
 class AuditLogger:
     """
@@ -39,12 +56,25 @@ class AuditLogger:
     """
     
     def __init__(self, process_name: str = "Unknown"):
+        _force_utf8_stdio()
         self.process_name = process_name
         self.log_dir = "data"
         self.log_file = os.path.join(self.log_dir, "audit_log.csv")
         self._ensure_log_exists()
-        # Central audit logger (dual-write)
-        self._central = CentralAuditLogger("sovereign-sentinel") if _CENTRAL_AVAILABLE else None
+        # Central audit logger (dual-write), created on the first log() call
+        self._central = None
+        self._central_ready = False
+
+    def _get_central(self):
+        """Lazily binds the central SQLite logger (never raises)."""
+        if not self._central_ready:
+            self._central_ready = True
+            try:
+                central_cls = _load_central_logger_class()
+                self._central = central_cls("sovereign-sentinel") if central_cls else None
+            except Exception:
+                self._central = None
+        return self._central
         
     def _ensure_log_exists(self):
         """Creates the log file with headers if it doesn't exist."""
@@ -106,9 +136,10 @@ class AuditLogger:
             print(f"⚠️ Critical Audit Failure: {e}")
 
         # Dual-write to central audit trail (fire-and-forget, never blocks)
-        if self._central:
+        central = self._get_central()
+        if central:
             try:
-                self._central.log(action, target, details, status)
+                central.log(action, target, details, status)
             except Exception:
                 pass  # Central write failure must never affect Sentinel
 
@@ -10,13 +10,12 @@ import sys
 from datetime import datetime
 from typing import Dict, Any, Tuple
 import os
+from shared.lazy_import import lazy_import, is_available
 
-# Optional AI fact-checking
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+# Optional AI fact-checking (deferred: the SDK costs seconds to import)
+genai = lazy_import("google.generativeai")
+GEMINI_AVAILABLE = is_available("google.generativeai")
+if not GEMINI_AVAILABLE:
     print("⚠️  google-generativeai not installed, fact-checking disabled")
 
 
@@ -126,6 +125,11 @@ class TradingAuditor:
         
         Returns: (is_blocked, fact_dict)
         """
+        # Earnings dates are preloaded by the pre-market warm-up: no LLM needed
+        from premarket_warmup import get_warm_cache
+        if get_warm_cache().earnings_today(ticker):
+            return True, {"earnings_today": True, "source": "warm_cache"}
+
         # Skip fact-checking if Gemini unavailable
         if not self.gemini_available:
             print(f"⚠️  Gemini unavailable, skipping fact-check for {ticker}")
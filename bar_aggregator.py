@@ -0,0 +1,324 @@
+"""
+Bar Aggregator — Multi-timeframe bars from a single 1-minute feed.
+==================================================================
+Components used to fetch the same tape at different granularities (1m
+Sniper scans, 15m Morning Brief, 4h Antigravity, 1d volatility guard), each
+as its own remote request. The aggregator ingests 1m bars once and keeps
+5m/15m/1h/4h/1d bars current in memory.
+
+Session alignment:
+  - equity: America/New_York; intraday buckets anchored to the 09:30 open
+    (so 1h = 09:30-10:30, 4h = 09:30-13:30), 1d = NY calendar day.
+  - crypto: UTC; buckets anchored to midnight, 1d = UTC day.
+
+Forming-bar semantics: the newest bar of each timeframe is "forming" until
+a 1m bar lands in a later bucket or its end time passes. Re-sending the
+last 1m bar (same timestamp) revises it, and every timeframe is corrected.
+
+Usage:
+    from bar_aggregator import get_aggregator
+    agg = get_aggregator("equity")
+    agg.ingest("NVDA", ts, o, h, l, c, v)        # 1m bar start, epoch seconds
+    df_15m = agg.to_dataframe("NVDA", "15m")
+"""
+
+import collections
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+TIMEFRAMES = {"1m": 1, "5m": 5, "15m": 15, "1h": 60, "4h": 240, "1d": 1440}
+
+# profile -> (timezone, intraday anchor in minutes after local midnight)
+SESSION_PROFILES = {
+    "equity": ("America/New_York", 9 * 60 + 30),
+    "crypto": ("UTC", 0),
+}
+
+DEFAULT_HISTORY = {"1m": 2000, "5m": 2000, "15m": 1000, "1h": 1000, "4h": 500, "1d": 400}
+
+
+def _epoch_seconds(index):
+    """Epoch seconds for a DatetimeIndex (naive = UTC), independent of its resolution."""
+    import pandas as pd
+    if index.tz is None:
+        index = index.tz_localize("UTC")
+    return ((index - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).to_numpy()
+
+
+class Bar:
+    __slots__ = ("start", "end", "open", "high", "low", "close", "volume")
+
+    def __init__(self, start, end, open_p, high, low, close, volume):
+        self.start = start
+        self.end = end
+        self.open = open_p
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def copy(self) -> "Bar":
+        return Bar(self.start, self.end, self.open, self.high, self.low, self.close, self.volume)
+
+    def as_dict(self) -> dict:
+        return {"start": self.start, "end": self.end, "open": self.open, "high": self.high,
+                "low": self.low, "close": self.close, "volume": self.volume}
+
+    def __repr__(self):
+        return f"Bar({self.start}, O={self.open} H={self.high} L={self.low} C={self.close} V={self.volume})"
+
+
+class _Series:
+    """Closed history + forming bar for one (symbol, timeframe)."""
+    __slots__ = ("closed", "forming", "undo")
+
+    def __init__(self, maxlen):
+        self.closed = collections.deque(maxlen=maxlen)
+        self.forming: Optional[Bar] = None
+        # State before the last 1m bar was applied: (forming_copy, rolled, evicted)
+        self.undo = None
+
+
+class BarAggregator:
+    """Incrementally builds every timeframe from 1m bars. Thread-safe."""
+
+    def __init__(self, profile: str = "equity", timeframes=None, history=None):
+        tz_name, anchor = SESSION_PROFILES[profile]
+        self.profile = profile
+        self.tz = ZoneInfo(tz_name)
+        self.anchor_minutes = anchor
+        self.timeframes = list(timeframes or TIMEFRAMES)
+        self.history = dict(DEFAULT_HISTORY, **(history or {}))
+        self._series: Dict[str, Dict[str, _Series]] = {}
+        self._last_ts: Dict[str, int] = {}
+        self._day_cache = (None, None, None, None)   # (local date, midnight, anchor, next midnight)
+        self._lock = threading.Lock()
+
+    # --- BUCKETING ---
+    def _day_bounds(self, ts: int):
+        """
+        Epochs of local midnight, the session anchor and the next midnight for
+        ts's local day. Built from wall-clock times, so DST days stay aligned.
+        """
+        day = datetime.fromtimestamp(ts, self.tz).date()
+        cache = self._day_cache
+        if cache[0] != day:
+            start = datetime(day.year, day.month, day.day, tzinfo=self.tz)
+            anchor = start + timedelta(minutes=self.anchor_minutes)
+            nxt = day + timedelta(days=1)
+            end = datetime(nxt.year, nxt.month, nxt.day, tzinfo=self.tz)
+            cache = self._day_cache = (day, int(start.timestamp()), int(anchor.timestamp()),
+                                       int(end.timestamp()))
+        return cache[1], cache[2], cache[3]
+
+    def bucket(self, ts: int, tf: str):
+        """(start, end) epoch seconds of the `tf` bucket containing ts."""
+        minutes = TIMEFRAMES[tf]
+        day_start, anchor, day_end = self._day_bounds(ts)
+        if minutes == 1440:
+            return day_start, day_end
+        step = minutes * 60
+        start = anchor + ((ts - anchor) // step) * step
+        return start, start + step
+
+    # --- INGEST ---
+    def ingest(self, symbol: str, ts, open_p: float, high: float, low: float,
+               close: float, volume: float) -> bool:
+        """
+        Applies one 1m bar (ts = bar start, epoch seconds). A repeat of the
+        last timestamp revises it; older bars are ignored. True if applied.
+        """
+        ts = int(ts)
+        with self._lock:
+            last = self._last_ts.get(symbol)
+            if last is not None and ts < last:
+                return False
+            series = self._series.get(symbol)
+            if series is None:
+                series = {tf: _Series(self.history.get(tf, 1000)) for tf in self.timeframes}
+                self._series[symbol] = series
+            revise = ts == last
+
+            for tf, s in series.items():
+                if revise and s.undo is not None:
+                    self._undo(s)
+                start, end = self.bucket(ts, tf)
+                forming = s.forming
+                if forming is not None and forming.start == start:
+                    s.undo = (forming.copy(), False, None)
+                    forming.high = max(forming.high, high)
+                    forming.low = min(forming.low, low)
+                    forming.close = close
+                    forming.volume += volume
+                else:
+                    evicted = None
+                    if forming is not None:
+                        if len(s.closed) == s.closed.maxlen:
+                            evicted = s.closed[0]
+                        s.closed.append(forming)
+                    s.undo = (None, forming is not None, evicted)
+                    s.forming = Bar(start, end, open_p, high, low, close, volume)
+            self._last_ts[symbol] = ts
+            return True
+
+    @staticmethod
+    def _undo(s: _Series):
+        forming_copy, rolled, evicted = s.undo
+        if rolled:
+            s.forming = s.closed.pop()
+            if evicted is not None:
+                s.closed.appendleft(evicted)
+        elif forming_copy is not None:
+            s.forming = forming_copy
+        else:
+            s.forming = None
+        s.undo = None
+
+    def ingest_frame(self, symbol: str, frame) -> int:
+        """
+        Feeds a yfinance-style 1m OHLCV DataFrame (DatetimeIndex of bar starts).
+        Only rows at or after the last ingested bar are applied. Returns rows applied.
+        """
+        if frame is None or frame.empty:
+            return 0
+        frame = frame[["Open", "High", "Low", "Close", "Volume"]].dropna(subset=["Close"])
+        if frame.empty:
+            return 0
+        epochs = _epoch_seconds(frame.index)
+        values = frame.to_numpy(dtype=float)
+        last = self._last_ts.get(symbol)
+        applied = 0
+        for ts, (o, h, l, c, v) in zip(epochs, values):
+            if last is not None and ts < last:
+                continue
+            if self.ingest(symbol, ts, o, h, l, c, 0.0 if v != v else v):
+                applied += 1
+        return applied
+
+    def ingest_download(self, data, tickers: List[str]) -> int:
+        """Feeds a batched `yf.download(..., interval='1m')` result (any group_by layout)."""
+        if data is None or data.empty:
+            return 0
+        applied = 0
+        multi = hasattr(data.columns, "levels")
+        for ticker in tickers:
+            try:
+                if not multi:
+                    frame = data
+                elif ticker in data.columns.get_level_values(0):
+                    frame = data[ticker]
+                else:
+                    frame = data.xs(ticker, axis=1, level=1)
+            except (KeyError, ValueError):
+                continue
+            applied += self.ingest_frame(ticker, frame)
+        return applied
+
+    def seed(self, symbol: str, tf: str, frame) -> int:
+        """
+        Preloads closed history for one timeframe from a yfinance frame (e.g. 1d
+        bars for a 20-day ATR) so consumers don't wait for it to build up.
+        """
+        if frame is None or frame.empty:
+            return 0
+        with self._lock:
+            series = self._series.setdefault(
+                symbol, {t: _Series(self.history.get(t, 1000)) for t in self.timeframes})
+            s = series[tf]
+            cutoff = s.forming.start if s.forming else None
+            added = 0
+            existing = {b.start for b in s.closed}
+            bars = []
+            for ts, row in zip(_epoch_seconds(frame.index),
+                               frame[["Open", "High", "Low", "Close", "Volume"]].to_numpy(dtype=float)):
+                start, end = self.bucket(int(ts), tf)
+                if (cutoff is not None and start >= cutoff) or start in existing or row[3] != row[3]:
+                    continue
+                bars.append(Bar(start, end, *row))
+                added += 1
+            merged = sorted(list(s.closed) + bars, key=lambda b: b.start)
+            s.closed.clear()
+            s.closed.extend(merged)
+            return added
+
+    # --- READERS ---
+    def forming(self, symbol: str, tf: str) -> Optional[Bar]:
+        s = self._series.get(symbol, {}).get(tf)
+        return s.forming if s else None
+
+    def bars(self, symbol: str, tf: str, include_forming: bool = True, now: Optional[float] = None) -> List[Bar]:
+        """
+        Bars oldest first. With now=epoch, a forming bar whose end has passed
+        is reported as closed (it is complete even if no later 1m bar arrived).
+        """
+        with self._lock:
+            s = self._series.get(symbol, {}).get(tf)
+            if s is None:
+                return []
+            out = list(s.closed)
+            if s.forming is not None and (include_forming or (now is not None and now >= s.forming.end)):
+                out.append(s.forming)
+            return out
+
+    def bar_at(self, symbol: str, tf: str, start) -> Optional[Bar]:
+        """The bar whose bucket starts at `start` (epoch or aware datetime), if held."""
+        if hasattr(start, "timestamp"):
+            start = start.timestamp()
+        start = int(start)
+        with self._lock:
+            s = self._series.get(symbol, {}).get(tf)
+            if s is None:
+                return None
+            if s.forming is not None and s.forming.start == start:
+                return s.forming
+            for bar in reversed(s.closed):
+                if bar.start == start:
+                    return bar
+                if bar.start < start:
+                    break
+        return None
+
+    def session_open(self, day=None) -> datetime:
+        """Aware datetime of the session anchor (09:30 NY / 00:00 UTC) for a local date."""
+        day = day or datetime.now(self.tz).date()
+        midnight = datetime(day.year, day.month, day.day, tzinfo=self.tz)
+        return midnight + timedelta(minutes=self.anchor_minutes)
+
+    def last_timestamp(self, symbol: str) -> Optional[int]:
+        return self._last_ts.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self._series)
+
+    def to_dataframe(self, symbol: str, tf: str, include_forming: bool = True):
+        """yfinance-shaped frame (Open/High/Low/Close/Volume, index in session tz)."""
+        import pandas as pd
+        rows = self.bars(symbol, tf, include_forming)
+        if not rows:
+            return pd.DataFrame(columns=["Open", "High", "Low", "Close", "Volume"])
+        index = pd.to_datetime([b.start for b in rows], unit="s", utc=True).tz_convert(self.tz)
+        return pd.DataFrame({
+            "Open": [b.open for b in rows],
+            "High": [b.high for b in rows],
+            "Low": [b.low for b in rows],
+            "Close": [b.close for b in rows],
+            "Volume": [b.volume for b in rows],
+        }, index=index)
+
+
+# --- PROCESS-WIDE INSTANCES ---
+_AGGREGATORS: Dict[str, BarAggregator] = {}
+_AGGREGATORS_LOCK = threading.Lock()
+
+
+def get_aggregator(profile: str = "equity") -> BarAggregator:
+    """Shared aggregator per session profile ('equity' or 'crypto')."""
+    agg = _AGGREGATORS.get(profile)
+    if agg is None:
+        with _AGGREGATORS_LOCK:
+            agg = _AGGREGATORS.get(profile)
+            if agg is None:
+                agg = _AGGREGATORS[profile] = BarAggregator(profile)
+    return agg
@@ -0,0 +1,181 @@
+"""
+Bench — Offline speed benchmarks with stored baselines.
+=======================================================
+Times the hot paths of both trees (scan, gauntlet gates, Morning Brief
+levels, indicators, Trap Door, SMC, instrument resolution, audit logging,
+Trading212Client round-trips against t212_mock_server)
+from recorded fixtures, and compares each case with benchmarks/baselines.json.
+
+Each case is compared on its best round (the least noisy statistic on a
+shared VPS core), normalised by a fixed calibration workload measured just
+before that case, so a baseline recorded on one machine is usable on another.
+
+Usage:
+    python bench.py                      # run everything, report vs baseline
+    python bench.py --only sentinel.scan # cases by name prefix
+    python bench.py --check              # exit 1 on a regression beyond tolerance
+    python bench.py --update-baseline    # store this run as the baseline
+    python bench.py --record             # refresh fixtures from live APIs
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, Any, List
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(ROOT_DIR, "benchmarks", "baselines.json")
+
+# Module search path per tree (first entry wins for same-named flat modules)
+TREE_PATHS = {
+    "sentinel": [ROOT_DIR],
+    "krypto": [os.path.join(ROOT_DIR, "Krypto"), ROOT_DIR],
+}
+
+
+def run_tree(tree: str, only: List[str] = None, quick: bool = False, timeout: float = 600) -> Dict[str, Any]:
+    """Runs one tree's cases in a fresh interpreter inside a scratch directory."""
+    with tempfile.TemporaryDirectory(prefix=f"bench_{tree}_") as workdir:
+        out = os.path.join(workdir, "results.json")
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(TREE_PATHS[tree]), PYTHONIOENCODING="utf-8")
+        cmd = [sys.executable, "-m", "benchmarks.suite", "--tree", tree, "--out", out]
+        if only:
+            cmd += ["--only", *only]
+        if quick:
+            cmd.append("--quick")
+        proc = subprocess.run(cmd, cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout)
+        if proc.returncode != 0 or not os.path.exists(out):
+            raise RuntimeError(f"{tree} worker failed ({proc.returncode}):\n{proc.stderr[-2000:]}")
+        with open(out) as f:
+            return json.load(f)
+
+
+def run_all(only: List[str] = None, quick: bool = False) -> Dict[str, Any]:
+    """{"calibration_ms": {tree: ms}, "cases": {name: result + tree}}"""
+    results = {"calibration_ms": {}, "cases": {}}
+    for tree in TREE_PATHS:
+        if only and not any(o.startswith(tree) or tree.startswith(o) for o in only):
+            continue
+        payload = run_tree(tree, only, quick)
+        results["calibration_ms"][tree] = payload["calibration_ms"]
+        for name, result in payload["cases"].items():
+            results["cases"][name] = dict(result, tree=tree)
+    return results
+
+
+def load_baselines(path: str = BASELINE_FILE) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {"calibration_ms": {}, "cases": {}}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(results: Dict[str, Any], path: str = BASELINE_FILE, merge: bool = True):
+    """Stores medians (and the calibration they were taken against); merge keeps cases not run."""
+    baselines = load_baselines(path) if merge else {"calibration_ms": {}, "cases": {}}
+    for tree, ms in results["calibration_ms"].items():
+        baselines["calibration_ms"][tree] = ms
+    for name, result in results["cases"].items():
+        if "error" not in result:
+            baselines["cases"][name] = {"min_ms": result["min_ms"], "median_ms": result["median_ms"],
+                                        "tree": result["tree"],
+                                        "calibration_ms": result.get("calibration_ms")
+                                        or results["calibration_ms"][result["tree"]]}
+    with open(path, "w") as f:
+        json.dump(baselines, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(results: Dict[str, Any], baselines: Dict[str, Any], tolerance: float = None) -> List[Dict[str, Any]]:
+    """
+    One row per case: ratio = (best round / calibration) now vs at baseline time.
+    status: OK, FASTER (ratio < 1 - tol), REGRESSION (ratio > 1 + tol), NEW, ERROR.
+    """
+    from benchmarks import DEFAULT_TOLERANCE
+    rows = []
+    for name, result in sorted(results["cases"].items()):
+        row = {"name": name, "min_ms": result.get("min_ms"), "baseline_ms": None, "ratio": None}
+        base = baselines.get("cases", {}).get(name)
+        tol = tolerance if tolerance is not None else (result.get("tolerance") or DEFAULT_TOLERANCE)
+        row["tolerance"] = tol
+        if "error" in result:
+            row["status"] = "ERROR"
+            row["error"] = result["error"]
+        elif base is None:
+            row["status"] = "NEW"
+        else:
+            now_cal = result.get("calibration_ms") or results["calibration_ms"].get(result["tree"]) or 1.0
+            base_cal = base.get("calibration_ms") or now_cal
+            ratio = (result["min_ms"] / now_cal) / (base["min_ms"] / base_cal)
+            row.update(baseline_ms=base["min_ms"], ratio=round(ratio, 3))
+            row["status"] = "REGRESSION" if ratio > 1 + tol else "FASTER" if ratio < 1 - tol else "OK"
+        rows.append(row)
+    return rows
+
+
+def _normalised(result: Dict[str, Any], calibration: float) -> float:
+    return result["min_ms"] / (result.get("calibration_ms") or calibration or 1.0)
+
+
+def confirm(results: Dict[str, Any], rerun: Dict[str, Any]):
+    """Keeps, per re-timed case, whichever run was faster after calibration."""
+    for name, result in rerun["cases"].items():
+        current = results["cases"].get(name)
+        if "error" in result or current is None:
+            continue
+        tree_cal = results["calibration_ms"].get(result["tree"])
+        if "error" in current or _normalised(result, tree_cal) < _normalised(current, tree_cal):
+            results["cases"][name] = result
+
+
+def format_report(rows: List[Dict[str, Any]]) -> str:
+    icons = {"OK": "✅", "FASTER": "🚀", "REGRESSION": "🔴", "NEW": "🆕", "ERROR": "❌"}
+    lines = [f"{'case':<32} {'best':>11} {'baseline':>11} {'ratio':>7}"]
+    for r in rows:
+        best = f"{r['min_ms']:.2f}ms" if r["min_ms"] is not None else "-"
+        base = f"{r['baseline_ms']:.2f}ms" if r["baseline_ms"] is not None else "-"
+        ratio = f"{r['ratio']:.2f}x" if r["ratio"] is not None else "-"
+        lines.append(f"{icons[r['status']]} {r['name']:<30} {best:>11} {base:>11} {ratio:>7}")
+        if r["status"] == "ERROR":
+            lines.append(f"     {r['error']}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--only", nargs="*", help="Case name prefixes (e.g. sentinel.scan krypto.)")
+    parser.add_argument("--check", action="store_true", help="Exit 1 on regressions or errors")
+    parser.add_argument("--tolerance", type=float, help="Override per-case tolerance (e.g. 0.3)")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--quick", action="store_true", help="One call per case (smoke run)")
+    parser.add_argument("--record", action="store_true", help="Capture fixtures from live APIs")
+    parser.add_argument("--json", action="store_true", help="Print raw results as JSON")
+    args = parser.parse_args()
+
+    sys.path.insert(0, ROOT_DIR)
+    if args.record:
+        from benchmarks.fixtures import record
+        record()
+        return
+
+    results = run_all(args.only, args.quick)
+    baselines = load_baselines()
+    rows = compare(results, baselines, args.tolerance)
+    flagged = [r["name"] for r in rows if r["status"] == "REGRESSION"]
+    if args.check and flagged:
+        # A regression has to reproduce: re-time the flagged cases once, keep the better run
+        confirm(results, run_all(flagged, args.quick))
+        rows = compare(results, baselines, args.tolerance)
+    print(json.dumps(results, indent=2) if args.json else format_report(rows))
+
+    if args.update_baseline:
+        save_baselines(results)
+        print(f"💾 Baseline updated: {os.path.relpath(BASELINE_FILE, ROOT_DIR)}")
+    if args.check and any(r["status"] in ("REGRESSION", "ERROR") for r in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Sentinel Benchmarks
+===================
+Offline speed benchmarks for the hot paths of both trees, fed from
+recorded fixtures (see benchmarks/fixtures.py) and compared against stored
+baselines by bench.py.
+
+Cases register themselves with @bench. A case is a setup function that
+receives the sandbox working directory and returns the zero-argument
+callable to time:
+
+    @bench("sentinel.scan_market", tree="sentinel")
+    def scan_market(workdir):
+        strategy = ...
+        return strategy.scan_market
+
+Trees are benchmarked in separate interpreters (Sentinel modules from the
+repo root, Krypto modules from Krypto/) because both ship flat modules of
+the same name (auditor, strategy_engine, trading212_client, ...).
+"""
+from collections import namedtuple
+
+TREES = ("sentinel", "krypto")
+DEFAULT_TOLERANCE = 0.3  # allowed slowdown vs baseline (fraction) before --check fails
+
+Case = namedtuple("Case", "name tree setup number repeat tolerance")
+
+CASES = {}
+
+
+def bench(name: str, tree: str, number: int = 1, repeat: int = 5, tolerance: float = None):
+    """Registers a benchmark case. `number` calls per timed round, `repeat` rounds."""
+    if tree not in TREES:
+        raise ValueError(f"Unknown tree {tree!r}")
+
+    def register(setup):
+        CASES[name] = Case(name, tree, setup, number, repeat, tolerance)
+        return setup
+    return register
@@ -0,0 +1,262 @@
+"""
+Benchmark fixtures: market and broker data for offline runs.
+
+Every loader prefers a recorded file in benchmarks/fixtures/ (written by
+`python bench.py --record`, which needs network/API keys) and otherwise
+builds a seeded synthetic equivalent, so a run never touches the network
+and the same inputs are timed on every machine.
+
+    equity_1m.csv.gz      yf.download(..., interval="1m") for the watchlist, long format
+    equity_4h.csv.gz      yf.download(..., interval="4h", period="10d"), long format
+    kraken_ohlc.json      Kraken /0/public/OHLC result rows per pair
+    t212_portfolio.json   /equity/portfolio
+    t212_summary.json     /equity/account/summary
+    t212_instruments.json /equity/metadata/instruments
+
+The 1m tape is shifted to end just after 'now' so time-of-day logic (the
+zombie check, the opening 15m bar) sees live-looking data.
+"""
+import json
+import os
+import types
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+NY = ZoneInfo("America/New_York")
+
+WATCHLIST = ["NVDA", "TSLA", "AMD", "AAPL", "MSFT", "META", "AMZN", "GOOGL", "AVGO", "MSTR",
+             "COIN", "PLTR", "NFLX", "SMCI", "ARM", "MU", "INTC", "QCOM", "UBER", "SHOP",
+             "CRWD", "SNOW", "PANW", "ORCL", "CRM", "ADBE", "PYPL", "SQ", "SOFI", "HOOD",
+             "RIVN", "LCID", "NIO", "BABA", "JPM", "GS", "BAC", "XOM", "CVX", "LLY"]
+KRAKEN_PAIRS = ["XBTUSD", "ETHUSD", "SOLUSD", "XRPUSD"]
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+MINUTE_BARS = 390  # one regular session
+
+
+def _path(name):
+    return os.path.join(FIXTURE_DIR, name)
+
+
+def session_open_utc(day=None) -> datetime:
+    """Today's 09:30 New York open as an aware UTC datetime."""
+    day = day or datetime.now(NY).date()
+    return datetime(day.year, day.month, day.day, 9, 30, tzinfo=NY).astimezone(timezone.utc)
+
+
+def _random_walk(rng, n, start=100.0, vol=0.002):
+    close = start * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    open_p = np.r_[start, close[:-1]]
+    spread = np.abs(rng.normal(0, vol, n)) * close
+    high = np.maximum(open_p, close) + spread
+    low = np.minimum(open_p, close) - spread
+    volume = rng.integers(1_000, 200_000, n).astype(float)
+    return open_p, high, low, close, volume
+
+
+def _long_to_wide(long, group_by):
+    """Long rows (ticker, ts, Open..Volume) -> yfinance batch layout."""
+    wide = long.pivot(index="ts", columns="ticker", values=FIELDS)
+    wide.index.name = "Datetime"
+    if group_by == "ticker":
+        wide = wide.swaplevel(0, 1, axis=1).sort_index(axis=1, level=0, sort_remaining=False)
+    return wide
+
+
+def _synthetic_long(tickers, start, bars, step, seed):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=bars, freq=step, tz="UTC")
+    frames = []
+    for k, ticker in enumerate(tickers):
+        o, h, l, c, v = _random_walk(rng, bars, start=20 + 15 * k)
+        frames.append(pd.DataFrame({"ticker": ticker, "ts": index, "Open": o, "High": h, "Low": l,
+                                    "Close": c, "Volume": v}))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _recorded_long(name, rebase_to=None):
+    path = _path(name)
+    if not os.path.exists(path):
+        return None
+    long = pd.read_csv(path, parse_dates=["ts"])
+    long["ts"] = pd.to_datetime(long["ts"], utc=True)
+    if rebase_to is not None:
+        first = long["ts"].min()
+        long["ts"] = long["ts"] + (rebase_to - first.to_pydatetime())
+    return long
+
+
+def minute_tape_start(bars=MINUTE_BARS) -> datetime:
+    """
+    First bar of the 1m tape: 15m-aligned (so it opens a 15m bucket) and
+    placed so the last bar is 15-29 minutes after 'now', keeping the zombie
+    check passing for the whole run. The tape length is fixed, so timings do
+    not drift with the clock.
+    """
+    now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+    next_bucket = now - timedelta(minutes=now.minute % 15) + timedelta(minutes=15)
+    return next_bucket - timedelta(minutes=bars - 15)
+
+
+def equity_minute_long(tickers=None, bars=MINUTE_BARS) -> pd.DataFrame:
+    tickers = tickers or WATCHLIST
+    start = minute_tape_start(bars)
+    recorded = _recorded_long("equity_1m.csv.gz", rebase_to=start)
+    if recorded is not None:
+        return recorded[recorded["ticker"].isin(tickers)]
+    return _synthetic_long(tickers, start, bars, "1min", seed=11)
+
+
+def equity_4h_long(tickers=None) -> pd.DataFrame:
+    tickers = tickers or WATCHLIST
+    recorded = _recorded_long("equity_4h.csv.gz")
+    if recorded is not None:
+        return recorded[recorded["ticker"].isin(tickers)]
+    start = session_open_utc() - timedelta(days=10)
+    return _synthetic_long(tickers, start, 60, "4h", seed=23)
+
+
+def equity_daily_long(tickers=None) -> pd.DataFrame:
+    tickers = tickers or WATCHLIST
+    start = session_open_utc() - timedelta(days=45)
+    return _synthetic_long(tickers, start.replace(hour=0, minute=0), 30, "1D", seed=31)
+
+
+def kraken_candles(pair="XBTUSD", n=720) -> pd.DataFrame:
+    """Kraken OHLC rows as the Krypto candle frame (timestamp/open/high/low/close/volume)."""
+    path = _path("kraken_ohlc.json")
+    if os.path.exists(path):
+        with open(path) as f:
+            rows = json.load(f)[pair][-n:]
+        arr = np.asarray(rows, dtype=float)
+        return pd.DataFrame({"timestamp": pd.to_datetime(arr[:, 0], unit="s"), "open": arr[:, 1],
+                             "high": arr[:, 2], "low": arr[:, 3], "close": arr[:, 4], "volume": arr[:, 6]})
+    rng = np.random.default_rng(KRAKEN_PAIRS.index(pair) if pair in KRAKEN_PAIRS else 0)
+    o, h, l, c, v = _random_walk(rng, n, start=60_000.0, vol=0.004)
+    return pd.DataFrame({"timestamp": pd.date_range("2025-01-01", periods=n, freq="5min"),
+                         "open": o, "high": h, "low": l, "close": c, "volume": v / 1e4})
+
+
+def _json_or(name, build):
+    path = _path(name)
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return build()
+
+
+def t212_instruments(n=6000):
+    """metadata/instruments list: the watchlist plus filler US/UK listings."""
+    def build():
+        items = []
+        for ticker in WATCHLIST:
+            items.append({"ticker": f"{ticker}_US_EQ", "shortName": ticker, "currencyCode": "USD",
+                          "type": "STOCK", "minTradeQuantity": 0.01})
+        for i in range(n - len(items)):
+            short = f"X{i:04d}"
+            uk = i % 5 == 0
+            items.append({"ticker": f"{short}l_EQ" if uk else f"{short}_US_EQ", "shortName": short,
+                          "currencyCode": "GBX" if uk else "USD", "type": "STOCK", "minTradeQuantity": 0.1})
+        return items
+    return _json_or("t212_instruments.json", build)
+
+
+def t212_portfolio():
+    def build():
+        rng = np.random.default_rng(5)
+        return [{"ticker": f"{t}_US_EQ", "quantity": float(rng.integers(1, 50)),
+                 "averagePrice": float(50 + 10 * k), "currentPrice": float(50 + 10 * k + rng.normal(0, 3)),
+                 "ppl": float(rng.normal(0, 20))} for k, t in enumerate(WATCHLIST[:25])]
+    return _json_or("t212_portfolio.json", build)
+
+
+def t212_summary():
+    return _json_or("t212_summary.json", lambda: {
+        "id": 1, "currency": "GBP", "totalValue": 25000.0,
+        "cash": {"availableToTrade": 4000.0, "reservedForOrders": 0.0, "inPies": 0.0},
+        "investments": {"currentValue": 21000.0, "totalCost": 19500.0, "realizedProfitLoss": 1200.0,
+                        "unrealizedProfitLoss": 1500.0}})
+
+
+class FixtureYF(types.ModuleType):
+    """
+    Stand-in `yfinance` module serving the fixtures: download() for 1m, 4h
+    and 1d bars in the layout callers request, Ticker().info with quotes.
+    """
+
+    def __init__(self):
+        super().__init__("yfinance")
+        self._long = {}
+        self.calls = 0
+
+    def _frames(self, interval):
+        if interval not in self._long:
+            loader = {"1m": equity_minute_long, "4h": equity_4h_long}.get(interval, equity_daily_long)
+            self._long[interval] = loader()
+        return self._long[interval]
+
+    def download(self, tickers, period=None, interval="1d", group_by="column", **kwargs):
+        self.calls += 1
+        single = isinstance(tickers, str) and " " not in tickers.strip()
+        names = [tickers] if single else (tickers.split() if isinstance(tickers, str) else list(tickers))
+        long = self._frames(interval)
+        long = long[long["ticker"].isin(names)]
+        if long.empty:
+            return pd.DataFrame()
+        if single:
+            frame = long.set_index("ts")[FIELDS]
+            frame.index.name = "Datetime"
+            return frame
+        return _long_to_wide(long, group_by)
+
+    def Ticker(self, symbol):
+        last = self._frames("1m")
+        last = last[last["ticker"] == symbol]
+        price = float(last["Close"].iloc[-1]) if len(last) else 100.0
+        info = {"averageVolume": 2_500_000, "bid": round(price * 0.9998, 2), "ask": round(price * 1.0002, 2),
+                "currentPrice": price, "sector": "Technology"}
+        return types.SimpleNamespace(info=info, history=lambda **kw: self.download(symbol, interval="1d"))
+
+
+def record(tickers=None, pairs=None):
+    """Captures live fixtures (network + T212 keys). Overwrites benchmarks/fixtures/*."""
+    import requests
+    import yfinance as yf
+
+    tickers = tickers or WATCHLIST
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for name, period, interval in (("equity_1m.csv.gz", "1d", "1m"), ("equity_4h.csv.gz", "10d", "4h")):
+        data = yf.download(tickers, period=period, interval=interval, group_by="column", progress=False)
+        long = data.stack(level=1, future_stack=True).reset_index()
+        long.columns = ["ts", "ticker"] + list(long.columns[2:])
+        long[["ticker", "ts"] + FIELDS].dropna(subset=["Close"]).to_csv(_path(name), index=False)
+        print(f"📼 {name}: {len(long)} rows")
+
+    ohlc = {}
+    for pair in pairs or KRAKEN_PAIRS:
+        res = requests.get("https://api.kraken.com/0/public/OHLC", params={"pair": pair, "interval": 5}, timeout=10)
+        result = res.json().get("result", {})
+        ohlc[pair] = next((v for k, v in result.items() if k != "last"), [])
+    with open(_path("kraken_ohlc.json"), "w") as f:
+        json.dump(ohlc, f)
+    print(f"📼 kraken_ohlc.json: {sum(len(v) for v in ohlc.values())} candles")
+
+    from trading212_client import Trading212Client
+    client = Trading212Client()
+    for name, fetch in (("t212_portfolio.json", client.get_positions),
+                        ("t212_summary.json", client.get_account_info)):
+        data = fetch()
+        if isinstance(data, dict) and data.get("status") == "FAILED":
+            print(f"⚠️ {name}: {data.get('error')} (keeping synthetic)")
+            continue
+        with open(_path(name), "w") as f:
+            json.dump(data, f)
+        print(f"📼 {name}")
+    res = requests.get(f"{client.base_url}/equity/metadata/instruments", headers=client.headers, timeout=30)
+    if res.ok:
+        with open(_path("t212_instruments.json"), "w") as f:
+            json.dump(res.json(), f)
+        print("📼 t212_instruments.json")
@@ -0,0 +1,73 @@
+"""
+Krypto benchmark cases. Imported by the worker with Krypto/ first on
+sys.path (its flat modules shadow the Sentinel ones of the same name).
+"""
+import os
+import sys
+
+from benchmarks import bench
+from benchmarks.fixtures import FixtureYF, KRAKEN_PAIRS, WATCHLIST, kraken_candles
+
+
+class NullLogger:
+    def log(self, *args, **kwargs):
+        pass
+
+
+@bench("krypto.indicators", tree="krypto", number=5)
+def indicators(workdir):
+    """TechnicalIndicators.add_all_indicators on 720 5m Kraken candles per pair."""
+    from indicators import TechnicalIndicators
+    frames = [kraken_candles(pair) for pair in KRAKEN_PAIRS]
+
+    def run():
+        for df in frames:
+            TechnicalIndicators.add_all_indicators(df.copy())
+    return run
+
+
+@bench("krypto.smart_money", tree="krypto", number=2)
+def smart_money(workdir):
+    """SmartMoneyConcepts displacement + FVG checks, evaluated at each of the last 200 candles."""
+    from smart_money import SmartMoneyConcepts
+    df = kraken_candles("XBTUSD")
+
+    def run():
+        for index in range(-200, 0):
+            SmartMoneyConcepts.is_displacement_candle(df, index=index)
+            SmartMoneyConcepts.detect_fvg(df, index=index)
+    return run
+
+
+@bench("krypto.trap_door", tree="krypto", number=5)
+def trap_door(workdir):
+    """AntigravityBot universe scan (batched 4H fetch + vectorised sweep) and the single-ticker wrapper."""
+    import antigravity_bot
+    antigravity_bot.yf = FixtureYF()
+    bot = antigravity_bot.AntigravityBot.__new__(antigravity_bot.AntigravityBot)  # no broker/alerts
+    bot.logger = NullLogger()
+
+    def run():
+        bot.scan_universe_for_trap_doors(WATCHLIST)
+        bot.scan_for_trap_door("NVDA")
+    return run
+
+
+@bench("krypto.auditor_gates", tree="krypto", number=2)
+def auditor_gates(workdir):
+    """Gauntlet gates main_bot runs per trigger: volume, spread, VWAP, volatility (ATR), active risk."""
+    os.environ["GOOGLE_API_KEY"] = ""
+    yf = FixtureYF()
+    sys.modules["yfinance"] = yf
+    from auditor import TradingAuditor
+    auditor = TradingAuditor()
+    quotes = [(t, yf.Ticker(t).info) for t in WATCHLIST[:10]]
+
+    def run():
+        for ticker, info in quotes:
+            auditor.check_volume_filter(ticker, info["averageVolume"])
+            auditor.check_spread_guard(ticker, info["bid"], info["ask"])
+            auditor.check_vwap_gate(ticker, info["currentPrice"])
+            auditor.check_volatility_guard(ticker)
+            auditor.calculate_active_risk(0.01, 120.0, -30.0)
+    return run
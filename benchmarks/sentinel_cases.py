@@ -0,0 +1,173 @@
+"""
+Sentinel (repo root) benchmark cases. Imported by the worker with the repo
+root first on sys.path and a scratch directory as the working directory.
+"""
+import json
+import os
+import sys
+
+from benchmarks import bench
+from benchmarks.fixtures import (FixtureYF, WATCHLIST, t212_instruments, t212_portfolio, t212_summary)
+
+
+class FixtureBroker:
+    """Trading212Client read methods served from the T212 fixtures."""
+
+    def __init__(self):
+        self.portfolio = t212_portfolio()
+        self.summary = t212_summary()
+
+    def get_positions(self):
+        return self.portfolio
+
+    def get_account_info(self):
+        return self.summary
+
+
+def _write_json(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+
+
+def _fresh_aggregator(session_open=None):
+    """Empty equity BarAggregator registered as the shared one (per timed call)."""
+    import bar_aggregator
+    agg = bar_aggregator.BarAggregator("equity")
+    if session_open is not None:
+        agg.session_open = lambda day=None: session_open
+    bar_aggregator._AGGREGATORS["equity"] = agg
+    return agg
+
+
+def _yf(module_names=()):
+    """Installs one FixtureYF as `yfinance` and as the `yf` global of the given modules."""
+    yf = FixtureYF()
+    sys.modules["yfinance"] = yf
+    for name in module_names:
+        setattr(sys.modules[name], "yf", yf)
+    return yf
+
+
+@bench("sentinel.scan_market", tree="sentinel", number=2)
+def scan_market(workdir):
+    """SniperStrategy.scan_market over the 40-ticker watchlist: batched 1m download, aggregator ingest, triggers."""
+    import strategy_engine
+    yf = _yf(["strategy_engine"])
+    last = yf._frames("1m").groupby("ticker")["Close"].last()
+    # Half the targets trigger, half do not
+    targets = [{"ticker": t, "trigger_price": round(float(p) * (0.99 if k % 2 else 1.01), 2),
+                "stop_loss": round(float(p) * 0.97, 2), "quantity": 5} for k, (t, p) in enumerate(last.items())]
+    _write_json("data/targets.json", targets)
+    strategy = strategy_engine.SniperStrategy(FixtureBroker())
+
+    def run():
+        _fresh_aggregator()
+        strategy.triggered_today.clear()
+        triggers = strategy.scan_market()
+        assert len(triggers) == len(targets) // 2, len(triggers)
+    return run
+
+
+@bench("sentinel.auditor_gates", tree="sentinel", number=50)
+def auditor_gates(workdir):
+    """Spread guard, volume filter and run_gauntlet (fact-check off) for every watchlist quote."""
+    os.environ["GOOGLE_API_KEY"] = ""
+    _write_json("data/eod_balance.json", {"realized_profit": 250.0})
+    from auditor import TradingAuditor
+    auditor = TradingAuditor()
+    yf = _yf()
+    quotes = [(t, yf.Ticker(t).info) for t in WATCHLIST]
+
+    def run():
+        for ticker, info in quotes:
+            auditor.check_spread_guard(ticker, info["bid"], info["ask"])
+            auditor.check_volume_filter(ticker, info["averageVolume"])
+            auditor.run_gauntlet(ticker, info["ask"], 500.0, 25000.0, -50.0)
+    return run
+
+
+@bench("sentinel.live_state", tree="sentinel", number=50)
+def live_state(workdir):
+    """TradingAuditor.generate_live_state from the T212 portfolio/summary fixtures."""
+    from auditor import TradingAuditor
+    auditor = TradingAuditor()
+    auditor.client = FixtureBroker()
+    return auditor.generate_live_state
+
+
+@bench("sentinel.morning_brief_levels", tree="sentinel", number=2)
+def morning_brief_levels(workdir):
+    """MorningBrief.compute_levels: one batched 1m fetch, 15m opening-range levels per ticker."""
+    from strategic_moat import MorningBrief
+    from benchmarks.fixtures import minute_tape_start
+    _yf()
+    brief = MorningBrief.__new__(MorningBrief)  # levels need no broker/alerts/mapper
+    opened = minute_tape_start()
+
+    def run():
+        _fresh_aggregator(session_open=opened)
+        targets, _ = brief.compute_levels(WATCHLIST)
+        assert len(targets) > len(WATCHLIST) // 2, len(targets)
+    return run
+
+
+@bench("sentinel.instrument_load", tree="sentinel", number=3)
+def instrument_load(workdir):
+    """Trading212Client construction: indexing the master instrument list."""
+    _write_json("data/master_instruments.json", t212_instruments())
+    from trading212_client import Trading212Client
+    return Trading212Client
+
+
+@bench("sentinel.resolve_ticker", tree="sentinel", number=50)
+def resolve_ticker(workdir):
+    """Trading212Client.resolve_ticker over exact, bare, .L and unknown inputs."""
+    _write_json("data/master_instruments.json", t212_instruments())
+    from trading212_client import Trading212Client
+    client = Trading212Client()
+    inputs = []
+    for i in range(250):
+        inputs += [f"X{i:04d}_US_EQ", f"X{i + 1000:04d}", f"X{i * 5:04d}.L", f"NOPE{i}"]
+    inputs += WATCHLIST
+
+    def run():
+        for symbol in inputs:
+            client.resolve_ticker(symbol)
+    return run
+
+
+@bench("sentinel.audit_logger", tree="sentinel", number=1, tolerance=0.5)
+def audit_logger(workdir):
+    """AuditLogger.log x200: CSV append + fsync, dual-written to the central SQLite trail."""
+    import audit_log
+    from shared import audit_trail
+    from pathlib import Path
+    audit_trail.DB_DIR = Path(workdir) / "central"
+    audit_trail.DB_PATH = audit_trail.DB_DIR / "audit_trail.db"
+    audit_trail._DB_READY = False
+    logger = audit_log.AuditLogger("SS000-Bench")
+
+    def run():
+        for i in range(200):
+            logger.log("BENCH_EVENT", WATCHLIST[i % len(WATCHLIST)], f"iteration {i}", "INFO")
+    return run
+
+
+@bench("sentinel.t212_roundtrip", tree="sentinel", number=1, tolerance=0.5)
+def t212_roundtrip(workdir):
+    """Trading212Client over loopback HTTP against t212_mock_server (no latency/limits): 20 read+order cycles."""
+    from t212_mock_server import T212MockServer
+    mock = T212MockServer(latency="0", rate_limits={}, cash=1e9, seed=1).start()
+    _write_json("data/master_instruments.json", mock._instruments({}))
+    os.environ.setdefault("TRADING212_API_KEY", "bench")
+    from trading212_client import Trading212Client
+    client = Trading212Client(base_url=mock.base_url)
+
+    def run():
+        for _ in range(20):
+            client.get_account_info()
+            client.get_positions()
+            client.place_limit_order("NVDA", 1, 200.0)
+            client.get_open_orders()
+    return run
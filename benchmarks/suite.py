@@ -0,0 +1,79 @@
+"""
+Benchmark worker: times one tree's cases in this interpreter.
+
+bench.py runs it as `python -m benchmarks.suite --tree <tree> --out <json>`
+from a scratch working directory with the tree first on PYTHONPATH.
+"""
+import argparse
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+import traceback
+
+from benchmarks import CASES
+
+CASE_MODULES = {"sentinel": "benchmarks.sentinel_cases", "krypto": "benchmarks.krypto_cases"}
+
+
+def calibrate(rounds: int = 7) -> float:
+    """Best-of-N milliseconds for a fixed interpreter workload; baselines are scaled by it across machines."""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        total = 0
+        for i in range(200_000):
+            total += i * i % 7
+        sorted(str(i) for i in range(20_000))
+        samples.append((time.perf_counter() - start) * 1000)
+    return min(samples)
+
+
+def time_case(case, workdir: str, quick: bool = False) -> dict:
+    fn = case.setup(workdir)
+    number, repeat = (1, 1) if quick else (case.number, case.repeat)
+    fn()  # warm-up: imports, caches, first-touch I/O
+    # Calibrated right before the case: a shared core's speed drifts during a run
+    calibration = calibrate(3)
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        rounds.append((time.perf_counter() - start) * 1000 / number)
+    return {"median_ms": round(statistics.median(rounds), 4), "min_ms": round(min(rounds), 4),
+            "rounds": repeat, "number": number, "tolerance": case.tolerance, "calibration_ms": calibration}
+
+
+def run_tree(tree: str, only=None, quick: bool = False) -> dict:
+    importlib.import_module(CASE_MODULES[tree])
+    workdir = os.getcwd()
+    results = {}
+    for name, case in sorted(CASES.items()):
+        if case.tree != tree or (only and not any(name.startswith(o) for o in only)):
+            continue
+        try:
+            results[name] = time_case(case, workdir, quick)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}", "trace": traceback.format_exc()}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tree", choices=sorted(CASE_MODULES), required=True)
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--only", nargs="*")
+    parser.add_argument("--quick", action="store_true")
+    args = parser.parse_args()
+
+    payload = {"calibration_ms": calibrate(), "python": sys.version.split()[0]}
+    payload["cases"] = run_tree(args.tree, args.only, args.quick)
+    with open(args.out, "w") as f:
+        json.dump(payload, f)
+
+
+if __name__ == "__main__":
+    main()
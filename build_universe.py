@@ -13,168 +13,180 @@ import json
 import os
 from datetime import datetime
 
+from security_metadata import get_security_metadata
+
 # MASTER UNIVERSE: The 100+ Tier 1 Stocks
 # Defined by Cluster and Intraday Profile for the Sovereign Sentinel
+# (sector/industry are filled in from the security metadata cache at build time)
 MASTER_UNIVERSE = [
     # --- THE TRINITY (Benchmarks) ---
-    {"ticker": "NVDA", "company": "NVIDIA Corporation", "cluster": "Trinity", "sector": "Semiconductors", "profile": "Gamma Sovereign; 3-4% daily range", "isa": True},
-    {"ticker": "TSLA", "company": "Tesla Inc", "cluster": "Trinity", "sector": "Autos/AI", "profile": "Retail Sentiment; Beta > 2.0", "isa": True},
-    {"ticker": "MSTR", "company": "MicroStrategy", "cluster": "Trinity", "sector": "Software/Crypto", "profile": "Leveraged Bitcoin proxy; opening gaps", "isa": True},
+    {"ticker": "NVDA", "company": "NVIDIA Corporation", "cluster": "Trinity", "profile": "Gamma Sovereign; 3-4% daily range", "isa": True},
+    {"ticker": "TSLA", "company": "Tesla Inc", "cluster": "Trinity", "profile": "Retail Sentiment; Beta > 2.0", "isa": True},
+    {"ticker": "MSTR", "company": "MicroStrategy", "cluster": "Trinity", "profile": "Leveraged Bitcoin proxy; opening gaps", "isa": True},
 
     # --- CLUSTER A: SEMICONDUCTOR SUPPLY CHAIN ---
-    {"ticker": "AMD", "company": "Advanced Micro Devices", "cluster": "Cluster A", "sector": "Semiconductors", "profile": "High Beta; Sympathy play to NVDA", "isa": True},
-    {"ticker": "AVGO", "company": "Broadcom", "cluster": "Cluster A", "sector": "Networking/AI", "profile": "High unit price; reliable trend", "isa": True},
-    {"ticker": "MU", "company": "Micron Technology", "cluster": "Cluster A", "sector": "Memory", "profile": "Cyclical; sensitive to memory prices", "isa": True},
-    {"ticker": "TSM", "company": "Taiwan Semiconductor", "cluster": "Cluster A", "sector": "Foundry", "profile": "Geopolitical risk; prone to gaps", "isa": True},
-    {"ticker": "QCOM", "company": "Qualcomm", "cluster": "Cluster A", "sector": "Mobile", "profile": "Liquid; moderate volatility", "isa": True},
-    {"ticker": "INTC", "company": "Intel Corporation", "cluster": "Cluster A", "sector": "IDM", "profile": "Turnaround play; high volume", "isa": True},
-    {"ticker": "AMAT", "company": "Applied Materials", "cluster": "Cluster A", "sector": "Equipment", "profile": "Trend following; deep liquidity", "isa": True},
-    {"ticker": "LRCX", "company": "Lam Research", "cluster": "Cluster A", "sector": "Equipment", "profile": "Wide range; clean trends", "isa": True},
-    {"ticker": "KLAC", "company": "KLA Corp", "cluster": "Cluster A", "sector": "Metrology", "profile": "Low liquidity/high spread warning", "isa": True},
-    {"ticker": "MRVL", "company": "Marvell Technology", "cluster": "Cluster A", "sector": "Data Center", "profile": "High Beta to AI theme", "isa": True},
-    {"ticker": "ADI", "company": "Analog Devices", "cluster": "Cluster A", "sector": "Analog", "profile": "Lower volatility; defensive", "isa": True},
-    {"ticker": "TXN", "company": "Texas Instruments", "cluster": "Cluster A", "sector": "Analog", "profile": "Low Beta; mean reversion", "isa": True},
-    {"ticker": "ON", "company": "ON Semiconductor", "cluster": "Cluster A", "sector": "Power/Auto", "profile": "High EV correlation", "isa": True},
-    {"ticker": "MCHP", "company": "Microchip Technology", "cluster": "Cluster A", "sector": "Microcontrollers", "profile": "Cyclical/Industrial", "isa": True},
-    {"ticker": "NXPI", "company": "NXP Semiconductors", "cluster": "Cluster A", "sector": "Auto", "profile": "EV supply chain proxy", "isa": True},
-    {"ticker": "TER", "company": "Teradyne", "cluster": "Cluster A", "sector": "Testing/Robotics", "profile": "Automation theme", "isa": True},
-    {"ticker": "SWKS", "company": "Skyworks Solutions", "cluster": "Cluster A", "sector": "RF/Mobile", "profile": "Apple supplier correlation", "isa": True},
-    {"ticker": "MPWR", "company": "Monolithic Power", "cluster": "Cluster A", "sector": "Power Mgmt", "profile": "High volatility; low float", "isa": True},
-    {"ticker": "STM", "company": "STMicroelectronics", "cluster": "Cluster A", "sector": "Ind/Auto", "profile": "Euro-Zone correlation", "isa": True},
-    {"ticker": "GFS", "company": "GlobalFoundries", "cluster": "Cluster A", "sector": "Foundry", "profile": "Value/Cyclical", "isa": True},
-    {"ticker": "ARM", "company": "Arm Holdings", "cluster": "Cluster A", "sector": "Chip Design", "profile": "Massive volatility; float-driven", "isa": True},
-    {"ticker": "SMCI", "company": "Super Micro Computer", "cluster": "Cluster A", "sector": "Server/AI", "profile": "Extreme volatility; Monitor listing status", "isa": False},
+    {"ticker": "AMD", "company": "Advanced Micro Devices", "cluster": "Cluster A", "profile": "High Beta; Sympathy play to NVDA", "isa": True},
+    {"ticker": "AVGO", "company": "Broadcom", "cluster": "Cluster A", "profile": "High unit price; reliable trend", "isa": True},
+    {"ticker": "MU", "company": "Micron Technology", "cluster": "Cluster A", "profile": "Cyclical; sensitive to memory prices", "isa": True},
+    {"ticker": "TSM", "company": "Taiwan Semiconductor", "cluster": "Cluster A", "profile": "Geopolitical risk; prone to gaps", "isa": True},
+    {"ticker": "QCOM", "company": "Qualcomm", "cluster": "Cluster A", "profile": "Liquid; moderate volatility", "isa": True},
+    {"ticker": "INTC", "company": "Intel Corporation", "cluster": "Cluster A", "profile": "Turnaround play; high volume", "isa": True},
+    {"ticker": "AMAT", "company": "Applied Materials", "cluster": "Cluster A", "profile": "Trend following; deep liquidity", "isa": True},
+    {"ticker": "LRCX", "company": "Lam Research", "cluster": "Cluster A", "profile": "Wide range; clean trends", "isa": True},
+    {"ticker": "KLAC", "company": "KLA Corp", "cluster": "Cluster A", "profile": "Low liquidity/high spread warning", "isa": True},
+    {"ticker": "MRVL", "company": "Marvell Technology", "cluster": "Cluster A", "profile": "High Beta to AI theme", "isa": True},
+    {"ticker": "ADI", "company": "Analog Devices", "cluster": "Cluster A", "profile": "Lower volatility; defensive", "isa": True},
+    {"ticker": "TXN", "company": "Texas Instruments", "cluster": "Cluster A", "profile": "Low Beta; mean reversion", "isa": True},
+    {"ticker": "ON", "company": "ON Semiconductor", "cluster": "Cluster A", "profile": "High EV correlation", "isa": True},
+    {"ticker": "MCHP", "company": "Microchip Technology", "cluster": "Cluster A", "profile": "Cyclical/Industrial", "isa": True},
+    {"ticker": "NXPI", "company": "NXP Semiconductors", "cluster": "Cluster A", "profile": "EV supply chain proxy", "isa": True},
+    {"ticker": "TER", "company": "Teradyne", "cluster": "Cluster A", "profile": "Automation theme", "isa": True},
+    {"ticker": "SWKS", "company": "Skyworks Solutions", "cluster": "Cluster A", "profile": "Apple supplier correlation", "isa": True},
+    {"ticker": "MPWR", "company": "Monolithic Power", "cluster": "Cluster A", "profile": "High volatility; low float", "isa": True},
+    {"ticker": "STM", "company": "STMicroelectronics", "cluster": "Cluster A", "profile": "Euro-Zone correlation", "isa": True},
+    {"ticker": "GFS", "company": "GlobalFoundries", "cluster": "Cluster A", "profile": "Value/Cyclical", "isa": True},
+    {"ticker": "ARM", "company": "Arm Holdings", "cluster": "Cluster A", "profile": "Massive volatility; float-driven", "isa": True},
+    {"ticker": "SMCI", "company": "Super Micro Computer", "cluster": "Cluster A", "profile": "Extreme volatility; Monitor listing status", "isa": False},
 
     # --- CLUSTER B: HIGH-VELOCITY SOFTWARE ---
-    {"ticker": "PLTR", "company": "Palantir Technologies", "cluster": "Cluster B", "sector": "Big Data/AI", "profile": "Extreme liquidity; Retail favorite", "isa": True},
-    {"ticker": "APP", "company": "AppLovin", "cluster": "Cluster B", "sector": "AdTech/AI", "profile": "Top momentum; RVOL > 2.0", "isa": True},
-    {"ticker": "CRM", "company": "Salesforce", "cluster": "Cluster B", "sector": "SaaS", "profile": "Large cap anchor", "isa": True},
-    {"ticker": "ADBE", "company": "Adobe", "cluster": "Cluster B", "sector": "Creative SaaS", "profile": "High price; AI theme", "isa": True},
-    {"ticker": "ORCL", "company": "Oracle", "cluster": "Cluster B", "sector": "Cloud", "profile": "Breakout/Trend", "isa": True},
-    {"ticker": "INTU", "company": "Intuit", "cluster": "Cluster B", "sector": "FinTech SaaS", "profile": "Defensive growth", "isa": True},
-    {"ticker": "NOW", "company": "ServiceNow", "cluster": "Cluster B", "sector": "Workflow", "profile": "Institutional accumulation", "isa": True},
-    {"ticker": "PANW", "company": "Palo Alto Networks", "cluster": "Cluster B", "sector": "Cyber", "profile": "Sector leader; news-sensitive", "isa": True},
-    {"ticker": "CRWD", "company": "CrowdStrike", "cluster": "Cluster B", "sector": "Cyber", "profile": "Crisis volatility", "isa": True},
-    {"ticker": "FTNT", "company": "Fortinet", "cluster": "Cluster B", "sector": "Cyber", "profile": "Value/Growth hybrid", "isa": True},
-    {"ticker": "SNPS", "company": "Synopsys", "cluster": "Cluster B", "sector": "EDA", "profile": "Chip design; low volatility", "isa": True},
-    {"ticker": "CDNS", "company": "Cadence Design", "cluster": "Cluster B", "sector": "EDA", "profile": "Chip design", "isa": True},
-    {"ticker": "ZS", "company": "Zscaler", "cluster": "Cluster B", "sector": "Cyber", "profile": "High Beta growth", "isa": True},
-    {"ticker": "NET", "company": "Cloudflare", "cluster": "Cluster B", "sector": "Edge Cloud", "profile": "Retail favorite; volatile", "isa": True},
-    {"ticker": "DDOG", "company": "Datadog", "cluster": "Cluster B", "sector": "Observability", "profile": "Cloud usage proxy", "isa": True},
-    {"ticker": "MDB", "company": "MongoDB", "cluster": "Cluster B", "sector": "Database", "profile": "Extreme ATR; wide spreads", "isa": True},
-    {"ticker": "TEAM", "company": "Atlassian", "cluster": "Cluster B", "sector": "Collaboration", "profile": "Growth/Volatile", "isa": True},
-    {"ticker": "ADSK", "company": "Autodesk", "cluster": "Cluster B", "sector": "Design", "profile": "Industrial/Housing proxy", "isa": True},
-    {"ticker": "U", "company": "Unity Software", "cluster": "Cluster B", "sector": "Gaming Engine", "profile": "Speculative; high Beta", "isa": True},
-    {"ticker": "RBLX", "company": "Roblox", "cluster": "Cluster B", "sector": "Metaverse", "profile": "Youth demographic; high volatility", "isa": True},
-    {"ticker": "TTWO", "company": "Take-Two Interactive", "cluster": "Cluster B", "sector": "Gaming", "profile": "Event-driven (GTA VI)", "isa": True},
-    {"ticker": "EA", "company": "Electronic Arts", "cluster": "Cluster B", "sector": "Gaming", "profile": "Steady; lower Beta", "isa": True},
-    {"ticker": "HUBS", "company": "HubSpot", "cluster": "Cluster B", "sector": "Marketing", "profile": "Mid-cap growth", "isa": True},
-    {"ticker": "TYL", "company": "Tyler Technologies", "cluster": "Cluster B", "sector": "GovTech", "profile": "Defensive; low volatility", "isa": True},
-    {"ticker": "PTC", "company": "PTC Inc", "cluster": "Cluster B", "sector": "IoT/Industrial", "profile": "Industrial software", "isa": True},
-    {"ticker": "SNOW", "company": "Snowflake", "cluster": "Cluster B", "sector": "Cloud Infra", "profile": "Frequent 5-10% earnings gaps", "isa": True},
+    {"ticker": "PLTR", "company": "Palantir Technologies", "cluster": "Cluster B", "profile": "Extreme liquidity; Retail favorite", "isa": True},
+    {"ticker": "APP", "company": "AppLovin", "cluster": "Cluster B", "profile": "Top momentum; RVOL > 2.0", "isa": True},
+    {"ticker": "CRM", "company": "Salesforce", "cluster": "Cluster B", "profile": "Large cap anchor", "isa": True},
+    {"ticker": "ADBE", "company": "Adobe", "cluster": "Cluster B", "profile": "High price; AI theme", "isa": True},
+    {"ticker": "ORCL", "company": "Oracle", "cluster": "Cluster B", "profile": "Breakout/Trend", "isa": True},
+    {"ticker": "INTU", "company": "Intuit", "cluster": "Cluster B", "profile": "Defensive growth", "isa": True},
+    {"ticker": "NOW", "company": "ServiceNow", "cluster": "Cluster B", "profile": "Institutional accumulation", "isa": True},
+    {"ticker": "PANW", "company": "Palo Alto Networks", "cluster": "Cluster B", "profile": "Sector leader; news-sensitive", "isa": True},
+    {"ticker": "CRWD", "company": "CrowdStrike", "cluster": "Cluster B", "profile": "Crisis volatility", "isa": True},
+    {"ticker": "FTNT", "company": "Fortinet", "cluster": "Cluster B", "profile": "Value/Growth hybrid", "isa": True},
+    {"ticker": "SNPS", "company": "Synopsys", "cluster": "Cluster B", "profile": "Chip design; low volatility", "isa": True},
+    {"ticker": "CDNS", "company": "Cadence Design", "cluster": "Cluster B", "profile": "Chip design", "isa": True},
+    {"ticker": "ZS", "company": "Zscaler", "cluster": "Cluster B", "profile": "High Beta growth", "isa": True},
+    {"ticker": "NET", "company": "Cloudflare", "cluster": "Cluster B", "profile": "Retail favorite; volatile", "isa": True},
+    {"ticker": "DDOG", "company": "Datadog", "cluster": "Cluster B", "profile": "Cloud usage proxy", "isa": True},
+    {"ticker": "MDB", "company": "MongoDB", "cluster": "Cluster B", "profile": "Extreme ATR; wide spreads", "isa": True},
+    {"ticker": "TEAM", "company": "Atlassian", "cluster": "Cluster B", "profile": "Growth/Volatile", "isa": True},
+    {"ticker": "ADSK", "company": "Autodesk", "cluster": "Cluster B", "profile": "Industrial/Housing proxy", "isa": True},
+    {"ticker": "U", "company": "Unity Software", "cluster": "Cluster B", "profile": "Speculative; high Beta", "isa": True},
+    {"ticker": "RBLX", "company": "Roblox", "cluster": "Cluster B", "profile": "Youth demographic; high volatility", "isa": True},
+    {"ticker": "TTWO", "company": "Take-Two Interactive", "cluster": "Cluster B", "profile": "Event-driven (GTA VI)", "isa": True},
+    {"ticker": "EA", "company": "Electronic Arts", "cluster": "Cluster B", "profile": "Steady; lower Beta", "isa": True},
+    {"ticker": "HUBS", "company": "HubSpot", "cluster": "Cluster B", "profile": "Mid-cap growth", "isa": True},
+    {"ticker": "TYL", "company": "Tyler Technologies", "cluster": "Cluster B", "profile": "Defensive; low volatility", "isa": True},
+    {"ticker": "PTC", "company": "PTC Inc", "cluster": "Cluster B", "profile": "Industrial software", "isa": True},
+    {"ticker": "SNOW", "company": "Snowflake", "cluster": "Cluster B", "profile": "Frequent 5-10% earnings gaps", "isa": True},
 
     # --- CLUSTER C: CRYPTO & FINTECH ---
-    {"ticker": "COIN", "company": "Coinbase Global", "cluster": "Cluster C", "sector": "Exchange", "profile": "Max volatility; crypto proxy", "isa": True},
-    {"ticker": "MARA", "company": "MARA Holdings", "cluster": "Cluster C", "sector": "BTC Mining", "profile": "Extreme Beta", "isa": True},
-    {"ticker": "RIOT", "company": "Riot Platforms", "cluster": "Cluster C", "sector": "BTC Mining", "profile": "High correlation to MARA", "isa": True},
-    {"ticker": "CLSK", "company": "CleanSpark", "cluster": "Cluster C", "sector": "BTC Mining", "profile": "Green mining; high Beta", "isa": True},
-    {"ticker": "HOOD", "company": "Robinhood Markets", "cluster": "Cluster C", "sector": "Brokerage", "profile": "Retail/Crypto flow", "isa": True},
-    {"ticker": "SQ", "company": "Block", "cluster": "Cluster C", "sector": "Payments", "profile": "High growth; BTC correlation", "isa": True},
-    {"ticker": "PYPL", "company": "PayPal", "cluster": "Cluster C", "sector": "Payments", "profile": "Turnaround; lower Beta", "isa": True},
-    {"ticker": "SOFI", "company": "SoFi Technologies", "cluster": "Cluster C", "sector": "Neobank", "profile": "Retail heavy; high volume", "isa": True},
-    {"ticker": "AFRM", "company": "Affirm", "cluster": "Cluster C", "sector": "BNPL", "profile": "Interest rate sensitivity", "isa": True},
-    {"ticker": "V", "company": "Visa", "cluster": "Cluster C", "sector": "Network", "profile": "Low volatility; defensive", "isa": True},
-    {"ticker": "MA", "company": "Mastercard", "cluster": "Cluster C", "sector": "Network", "profile": "Low volatility; defensive", "isa": True},
-    {"ticker": "FIS", "company": "Fidelity National", "cluster": "Cluster C", "sector": "Processor", "profile": "Value", "isa": True},
-    {"ticker": "FISV", "company": "Fiserv", "cluster": "Cluster C", "sector": "Processor", "profile": "Value", "isa": True},
-    {"ticker": "GPN", "company": "Global Payments", "cluster": "Cluster C", "sector": "Processor", "profile": "Value", "isa": True},
-    {"ticker": "TOST", "company": "Toast", "cluster": "Cluster C", "sector": "Restaurant Tech", "profile": "High Beta growth", "isa": True},
+    {"ticker": "COIN", "company": "Coinbase Global", "cluster": "Cluster C", "profile": "Max volatility; crypto proxy", "isa": True},
+    {"ticker": "MARA", "company": "MARA Holdings", "cluster": "Cluster C", "profile": "Extreme Beta", "isa": True},
+    {"ticker": "RIOT", "company": "Riot Platforms", "cluster": "Cluster C", "profile": "High correlation to MARA", "isa": True},
+    {"ticker": "CLSK", "company": "CleanSpark", "cluster": "Cluster C", "profile": "Green mining; high Beta", "isa": True},
+    {"ticker": "HOOD", "company": "Robinhood Markets", "cluster": "Cluster C", "profile": "Retail/Crypto flow", "isa": True},
+    {"ticker": "SQ", "company": "Block", "cluster": "Cluster C", "profile": "High growth; BTC correlation", "isa": True},
+    {"ticker": "PYPL", "company": "PayPal", "cluster": "Cluster C", "profile": "Turnaround; lower Beta", "isa": True},
+    {"ticker": "SOFI", "company": "SoFi Technologies", "cluster": "Cluster C", "profile": "Retail heavy; high volume", "isa": True},
+    {"ticker": "AFRM", "company": "Affirm", "cluster": "Cluster C", "profile": "Interest rate sensitivity", "isa": True},
+    {"ticker": "V", "company": "Visa", "cluster": "Cluster C", "profile": "Low volatility; defensive", "isa": True},
+    {"ticker": "MA", "company": "Mastercard", "cluster": "Cluster C", "profile": "Low volatility; defensive", "isa": True},
+    {"ticker": "FIS", "company": "Fidelity National", "cluster": "Cluster C", "profile": "Value", "isa": True},
+    {"ticker": "FISV", "company": "Fiserv", "cluster": "Cluster C", "profile": "Value", "isa": True},
+    {"ticker": "GPN", "company": "Global Payments", "cluster": "Cluster C", "profile": "Value", "isa": True},
+    {"ticker": "TOST", "company": "Toast", "cluster": "Cluster C", "profile": "High Beta growth", "isa": True},
 
     # --- CLUSTER D: BIOTECH & PHARMA ---
-    {"ticker": "MRNA", "company": "Moderna", "cluster": "Cluster D", "sector": "mRNA", "profile": "High volatility; news driven", "isa": True},
-    {"ticker": "CRSP", "company": "CRISPR Therapeutics", "cluster": "Cluster D", "sector": "Gene Editing", "profile": "Speculative; massive volatility", "isa": True},
-    {"ticker": "VRTX", "company": "Vertex Pharmaceuticals", "cluster": "Cluster D", "sector": "CF/Pain", "profile": "Structural growth", "isa": True},
-    {"ticker": "REGN", "company": "Regeneron", "cluster": "Cluster D", "sector": "Oncology", "profile": "High unit price", "isa": True},
-    {"ticker": "GILD", "company": "Gilead Sciences", "cluster": "Cluster D", "sector": "Virology", "profile": "Value/Yield", "isa": True},
-    {"ticker": "AMGN", "company": "Amgen", "cluster": "Cluster D", "sector": "Pharma", "profile": "Dow defensive", "isa": True},
-    {"ticker": "BIIB", "company": "Biogen", "cluster": "Cluster D", "sector": "Neuro", "profile": "Binary event risk", "isa": True},
-    {"ticker": "ILMN", "company": "Illumina", "cluster": "Cluster D", "sector": "Genomics", "profile": "Turnaround volatility", "isa": True},
-    {"ticker": "LLY", "company": "Eli Lilly", "cluster": "Cluster D", "sector": "Pharma", "profile": "GLP-1 momentum", "isa": True},
-    {"ticker": "ALNY", "company": "Alnylam", "cluster": "Cluster D", "sector": "RNAi", "profile": "High Beta", "isa": True},
-    {"ticker": "INSM", "company": "Insmed", "cluster": "Cluster D", "sector": "Rare Disease", "profile": "Mid-cap volatility", "isa": True},
-    {"ticker": "NTRA", "company": "Natera", "cluster": "Cluster D", "sector": "Diagnostics", "profile": "Growth/Volatile", "isa": True},
+    {"ticker": "MRNA", "company": "Moderna", "cluster": "Cluster D", "profile": "High volatility; news driven", "isa": True},
+    {"ticker": "CRSP", "company": "CRISPR Therapeutics", "cluster": "Cluster D", "profile": "Speculative; massive volatility", "isa": True},
+    {"ticker": "VRTX", "company": "Vertex Pharmaceuticals", "cluster": "Cluster D", "profile": "Structural growth", "isa": True},
+    {"ticker": "REGN", "company": "Regeneron", "cluster": "Cluster D", "profile": "High unit price", "isa": True},
+    {"ticker": "GILD", "company": "Gilead Sciences", "cluster": "Cluster D", "profile": "Value/Yield", "isa": True},
+    {"ticker": "AMGN", "company": "Amgen", "cluster": "Cluster D", "profile": "Dow defensive", "isa": True},
+    {"ticker": "BIIB", "company": "Biogen", "cluster": "Cluster D", "profile": "Binary event risk", "isa": True},
+    {"ticker": "ILMN", "company": "Illumina", "cluster": "Cluster D", "profile": "Turnaround volatility", "isa": True},
+    {"ticker": "LLY", "company": "Eli Lilly", "cluster": "Cluster D", "profile": "GLP-1 momentum", "isa": True},
+    {"ticker": "ALNY", "company": "Alnylam", "cluster": "Cluster D", "profile": "High Beta", "isa": True},
+    {"ticker": "INSM", "company": "Insmed", "cluster": "Cluster D", "profile": "Mid-cap volatility", "isa": True},
+    {"ticker": "NTRA", "company": "Natera", "cluster": "Cluster D", "profile": "Growth/Volatile", "isa": True},
 
     # --- CLUSTER E: CLEAN ENERGY & EVS ---
-    {"ticker": "ENPH", "company": "Enphase Energy", "cluster": "Cluster E", "sector": "Solar", "profile": "Extreme ATR; squeeze potential", "isa": True},
-    {"ticker": "SEDG", "company": "SolarEdge", "cluster": "Cluster E", "sector": "Solar", "profile": "Max volatility; distressed", "isa": True},
-    {"ticker": "FSLR", "company": "First Solar", "cluster": "Cluster E", "sector": "Panels", "profile": "Tariff play", "isa": True},
-    {"ticker": "RUN", "company": "Sunrun", "cluster": "Cluster E", "sector": "Resi Solar", "profile": "Rate sensitive; leveraged", "isa": True},
-    {"ticker": "RIVN", "company": "Rivian", "cluster": "Cluster E", "sector": "EV", "profile": "Retail speculation", "isa": True},
-    {"ticker": "LCID", "company": "Lucid Group", "cluster": "Cluster E", "sector": "EV", "profile": "Short squeeze candidate", "isa": True},
-    {"ticker": "ALB", "company": "Albemarle", "cluster": "Cluster E", "sector": "Lithium", "profile": "Commodity cycle", "isa": True},
-    {"ticker": "PLUG", "company": "Plug Power", "cluster": "Cluster E", "sector": "Hydrogen", "profile": "Penny volatility", "isa": True},
-    {"ticker": "BE", "company": "Bloom Energy", "cluster": "Cluster E", "sector": "Hydrogen", "profile": "High Beta", "isa": True},
-    {"ticker": "NEM", "company": "Newmont", "cluster": "Cluster E", "sector": "Gold Mining", "profile": "High Beta to gold", "isa": True},
+    {"ticker": "ENPH", "company": "Enphase Energy", "cluster": "Cluster E", "profile": "Extreme ATR; squeeze potential", "isa": True},
+    {"ticker": "SEDG", "company": "SolarEdge", "cluster": "Cluster E", "profile": "Max volatility; distressed", "isa": True},
+    {"ticker": "FSLR", "company": "First Solar", "cluster": "Cluster E", "profile": "Tariff play", "isa": True},
+    {"ticker": "RUN", "company": "Sunrun", "cluster": "Cluster E", "profile": "Rate sensitive; leveraged", "isa": True},
+    {"ticker": "RIVN", "company": "Rivian", "cluster": "Cluster E", "profile": "Retail speculation", "isa": True},
+    {"ticker": "LCID", "company": "Lucid Group", "cluster": "Cluster E", "profile": "Short squeeze candidate", "isa": True},
+    {"ticker": "ALB", "company": "Albemarle", "cluster": "Cluster E", "profile": "Commodity cycle", "isa": True},
+    {"ticker": "PLUG", "company": "Plug Power", "cluster": "Cluster E", "profile": "Penny volatility", "isa": True},
+    {"ticker": "BE", "company": "Bloom Energy", "cluster": "Cluster E", "profile": "High Beta", "isa": True},
+    {"ticker": "NEM", "company": "Newmont", "cluster": "Cluster E", "profile": "High Beta to gold", "isa": True},
 
     # --- CLUSTER F: CHINA ADRS ---
-    {"ticker": "BABA", "company": "Alibaba Group", "cluster": "Cluster F", "sector": "E-Comm", "profile": "Liquid; Amazon of China", "isa": True},
-    {"ticker": "PDD", "company": "PDD Holdings", "cluster": "Cluster F", "sector": "E-Comm", "profile": "Extreme volatility", "isa": True},
-    {"ticker": "JD", "company": "JD.com", "cluster": "Cluster F", "sector": "E-Comm", "profile": "Consumer proxy", "isa": True},
-    {"ticker": "BIDU", "company": "Baidu", "cluster": "Cluster F", "sector": "AI/Search", "profile": "AI theme sympathy", "isa": True},
-    {"ticker": "NIO", "company": "NIO Inc", "cluster": "Cluster F", "sector": "EV", "profile": "Tesla of China; retail favorite", "isa": True},
-    {"ticker": "XPEV", "company": "XPeng", "cluster": "Cluster F", "sector": "EV", "profile": "High Beta EV", "isa": True},
-    {"ticker": "LI", "company": "Li Auto", "cluster": "Cluster F", "sector": "EV", "profile": "Quality growth EV", "isa": True},
-    {"ticker": "TCOM", "company": "Trip.com", "cluster": "Cluster F", "sector": "Travel", "profile": "Reopening play", "isa": True},
-    {"ticker": "BILI", "company": "Bilibili", "cluster": "Cluster F", "sector": "Media", "profile": "Volatile; YouTube of China", "isa": True},
-    {"ticker": "FUTU", "company": "Futu Holdings", "cluster": "Cluster F", "sector": "FinTech", "profile": "Brokerage; high volatility", "isa": True},
-    {"ticker": "TCEHY", "company": "Tencent Holdings", "cluster": "Cluster F", "sector": "Tech", "profile": "OTC Listing", "isa": False},
+    {"ticker": "BABA", "company": "Alibaba Group", "cluster": "Cluster F", "profile": "Liquid; Amazon of China", "isa": True},
+    {"ticker": "PDD", "company": "PDD Holdings", "cluster": "Cluster F", "profile": "Extreme volatility", "isa": True},
+    {"ticker": "JD", "company": "JD.com", "cluster": "Cluster F", "profile": "Consumer proxy", "isa": True},
+    {"ticker": "BIDU", "company": "Baidu", "cluster": "Cluster F", "profile": "AI theme sympathy", "isa": True},
+    {"ticker": "NIO", "company": "NIO Inc", "cluster": "Cluster F", "profile": "Tesla of China; retail favorite", "isa": True},
+    {"ticker": "XPEV", "company": "XPeng", "cluster": "Cluster F", "profile": "High Beta EV", "isa": True},
+    {"ticker": "LI", "company": "Li Auto", "cluster": "Cluster F", "profile": "Quality growth EV", "isa": True},
+    {"ticker": "TCOM", "company": "Trip.com", "cluster": "Cluster F", "profile": "Reopening play", "isa": True},
+    {"ticker": "BILI", "company": "Bilibili", "cluster": "Cluster F", "profile": "Volatile; YouTube of China", "isa": True},
+    {"ticker": "FUTU", "company": "Futu Holdings", "cluster": "Cluster F", "profile": "Brokerage; high volatility", "isa": True},
+    {"ticker": "TCEHY", "company": "Tencent Holdings", "cluster": "Cluster F", "profile": "OTC Listing", "isa": False},
 
     # --- CLUSTER G: CONSUMER & REAL ECONOMY ---
-    {"ticker": "AMZN", "company": "Amazon.com", "cluster": "Cluster G", "sector": "E-Comm", "profile": "Mag 7; Cloud leader", "isa": True},
-    {"ticker": "GOOGL", "company": "Alphabet", "cluster": "Cluster G", "sector": "Search", "profile": "AI lag trade", "isa": True},
-    {"ticker": "META", "company": "Meta Platforms", "cluster": "Cluster G", "sector": "Social", "profile": "High price/range", "isa": True},
-    {"ticker": "MSFT", "company": "Microsoft", "cluster": "Cluster G", "sector": "Cloud", "profile": "Low volatility", "isa": True},
-    {"ticker": "NFLX", "company": "Netflix", "cluster": "Cluster G", "sector": "Media", "profile": "Subscriber driven", "isa": True},
-    {"ticker": "DIS", "company": "Walt Disney", "cluster": "Cluster G", "sector": "Media", "profile": "Turnaround; liquid", "isa": True},
-    {"ticker": "WBD", "company": "Warner Bros Discovery", "cluster": "Cluster G", "sector": "Media", "profile": "Debt/Leverage volatility", "isa": True},
-    {"ticker": "ROKU", "company": "Roku", "cluster": "Cluster G", "sector": "Media", "profile": "High Beta; ad revenue", "isa": True},
-    {"ticker": "CMG", "company": "Chipotle Mexican Grill", "cluster": "Cluster G", "sector": "Restaurant", "profile": "High growth", "isa": True},
-    {"ticker": "SBUX", "company": "Starbucks", "cluster": "Cluster G", "sector": "Restaurant", "profile": "Management change volatility", "isa": True},
-    {"ticker": "LULU", "company": "Lululemon", "cluster": "Cluster G", "sector": "Apparel", "profile": "Growth concerns", "isa": True},
-    {"ticker": "NKE", "company": "Nike", "cluster": "Cluster G", "sector": "Apparel", "profile": "Turnaround play", "isa": True},
-    {"ticker": "DKNG", "company": "DraftKings", "cluster": "Cluster G", "sector": "Gaming", "profile": "Sports seasonality", "isa": True},
-    {"ticker": "UBER", "company": "Uber Technologies", "cluster": "Cluster G", "sector": "Transport", "profile": "Steady growth", "isa": True},
-    {"ticker": "ABNB", "company": "Airbnb", "cluster": "Cluster G", "sector": "Travel", "profile": "Volatile earnings", "isa": True},
-    {"ticker": "BKNG", "company": "Booking Holdings", "cluster": "Cluster G", "sector": "Travel", "profile": "Highest unit price; huge spreads", "isa": True},
-    {"ticker": "COST", "company": "Costco", "cluster": "Cluster G", "sector": "Retail", "profile": "Stability; defensive", "isa": True},
-    {"ticker": "WMT", "company": "Walmart", "cluster": "Cluster G", "sector": "Retail", "profile": "Defensive", "isa": True},
-    {"ticker": "TGT", "company": "Target", "cluster": "Cluster G", "sector": "Retail", "profile": "Consumer health proxy", "isa": True},
-    {"ticker": "HD", "company": "Home Depot", "cluster": "Cluster G", "sector": "Retail", "profile": "Housing proxy", "isa": True},
-    {"ticker": "LOW", "company": "Lowe's", "cluster": "Cluster G", "sector": "Retail", "profile": "Housing proxy", "isa": True},
-    {"ticker": "CAT", "company": "Caterpillar", "cluster": "Cluster G", "sector": "Industrial", "profile": "Global economy proxy", "isa": True},
-    {"ticker": "DE", "company": "Deere & Co", "cluster": "Cluster G", "sector": "Ag/Ind", "profile": "Agriculture cycle", "isa": True},
-    {"ticker": "BA", "company": "Boeing", "cluster": "Cluster G", "sector": "Aero", "profile": "Crisis volatility", "isa": True},
-    {"ticker": "GE", "company": "GE Aerospace", "cluster": "Cluster G", "sector": "Aero", "profile": "Breakout trend", "isa": True},
-    {"ticker": "JPM", "company": "JPMorgan Chase", "cluster": "Cluster G", "sector": "Bank", "profile": "Rate proxy", "isa": True},
-    {"ticker": "GS", "company": "Goldman Sachs", "cluster": "Cluster G", "sector": "Bank", "profile": "Market proxy", "isa": True},
-    {"ticker": "CVX", "company": "Chevron", "cluster": "Cluster G", "sector": "Energy", "profile": "Oil Beta", "isa": True},
-    {"ticker": "XOM", "company": "Exxon Mobil", "cluster": "Cluster G", "sector": "Energy", "profile": "Oil Beta", "isa": True},
-    {"ticker": "SLB", "company": "Schlumberger", "cluster": "Cluster G", "sector": "Energy Svc", "profile": "High Beta energy", "isa": True},
+    {"ticker": "AMZN", "company": "Amazon.com", "cluster": "Cluster G", "profile": "Mag 7; Cloud leader", "isa": True},
+    {"ticker": "GOOGL", "company": "Alphabet", "cluster": "Cluster G", "profile": "AI lag trade", "isa": True},
+    {"ticker": "META", "company": "Meta Platforms", "cluster": "Cluster G", "profile": "High price/range", "isa": True},
+    {"ticker": "MSFT", "company": "Microsoft", "cluster": "Cluster G", "profile": "Low volatility", "isa": True},
+    {"ticker": "NFLX", "company": "Netflix", "cluster": "Cluster G", "profile": "Subscriber driven", "isa": True},
+    {"ticker": "DIS", "company": "Walt Disney", "cluster": "Cluster G", "profile": "Turnaround; liquid", "isa": True},
+    {"ticker": "WBD", "company": "Warner Bros Discovery", "cluster": "Cluster G", "profile": "Debt/Leverage volatility", "isa": True},
+    {"ticker": "ROKU", "company": "Roku", "cluster": "Cluster G", "profile": "High Beta; ad revenue", "isa": True},
+    {"ticker": "CMG", "company": "Chipotle Mexican Grill", "cluster": "Cluster G", "profile": "High growth", "isa": True},
+    {"ticker": "SBUX", "company": "Starbucks", "cluster": "Cluster G", "profile": "Management change volatility", "isa": True},
+    {"ticker": "LULU", "company": "Lululemon", "cluster": "Cluster G", "profile": "Growth concerns", "isa": True},
+    {"ticker": "NKE", "company": "Nike", "cluster": "Cluster G", "profile": "Turnaround play", "isa": True},
+    {"ticker": "DKNG", "company": "DraftKings", "cluster": "Cluster G", "profile": "Sports seasonality", "isa": True},
+    {"ticker": "UBER", "company": "Uber Technologies", "cluster": "Cluster G", "profile": "Steady growth", "isa": True},
+    {"ticker": "ABNB", "company": "Airbnb", "cluster": "Cluster G", "profile": "Volatile earnings", "isa": True},
+    {"ticker": "BKNG", "company": "Booking Holdings", "cluster": "Cluster G", "profile": "Highest unit price; huge spreads", "isa": True},
+    {"ticker": "COST", "company": "Costco", "cluster": "Cluster G", "profile": "Stability; defensive", "isa": True},
+    {"ticker": "WMT", "company": "Walmart", "cluster": "Cluster G", "profile": "Defensive", "isa": True},
+    {"ticker": "TGT", "company": "Target", "cluster": "Cluster G", "profile": "Consumer health proxy", "isa": True},
+    {"ticker": "HD", "company": "Home Depot", "cluster": "Cluster G", "profile": "Housing proxy", "isa": True},
+    {"ticker": "LOW", "company": "Lowe's", "cluster": "Cluster G", "profile": "Housing proxy", "isa": True},
+    {"ticker": "CAT", "company": "Caterpillar", "cluster": "Cluster G", "profile": "Global economy proxy", "isa": True},
+    {"ticker": "DE", "company": "Deere & Co", "cluster": "Cluster G", "profile": "Agriculture cycle", "isa": True},
+    {"ticker": "BA", "company": "Boeing", "cluster": "Cluster G", "profile": "Crisis volatility", "isa": True},
+    {"ticker": "GE", "company": "GE Aerospace", "cluster": "Cluster G", "profile": "Breakout trend", "isa": True},
+    {"ticker": "JPM", "company": "JPMorgan Chase", "cluster": "Cluster G", "profile": "Rate proxy", "isa": True},
+    {"ticker": "GS", "company": "Goldman Sachs", "cluster": "Cluster G", "profile": "Market proxy", "isa": True},
+    {"ticker": "CVX", "company": "Chevron", "cluster": "Cluster G", "profile": "Oil Beta", "isa": True},
+    {"ticker": "XOM", "company": "Exxon Mobil", "cluster": "Cluster G", "profile": "Oil Beta", "isa": True},
+    {"ticker": "SLB", "company": "Schlumberger", "cluster": "Cluster G", "profile": "High Beta energy", "isa": True},
 
     # --- CLUSTER H: UK SOVEREIGN (LSE) ---
-    {"ticker": "RR.L", "company": "Rolls-Royce Holdings", "cluster": "Cluster H", "sector": "Aero/Defense", "profile": "Turnaround; high beta", "isa": True},
-    {"ticker": "AZN.L", "company": "AstraZeneca", "cluster": "Cluster H", "sector": "Pharma", "profile": "Defensive growth", "isa": True},
-    {"ticker": "SHEL.L", "company": "Shell", "cluster": "Cluster H", "sector": "Energy", "profile": "Oil Beta; yield", "isa": True},
-    {"ticker": "BP.L", "company": "BP", "cluster": "Cluster H", "sector": "Energy", "profile": "Oil Beta; yield", "isa": True},
-    {"ticker": "HSBA.L", "company": "HSBC Holdings", "cluster": "Cluster H", "sector": "Bank", "profile": "Rate proxy", "isa": True},
-    {"ticker": "LLOY.L", "company": "Lloyds Banking Group", "cluster": "Cluster H", "sector": "Bank", "profile": "Domestic cycle", "isa": True},
-    {"ticker": "BARC.L", "company": "Barclays", "cluster": "Cluster H", "sector": "Bank", "profile": "Volatility", "isa": True},
-    {"ticker": "NG.L", "company": "National Grid", "cluster": "Cluster H", "sector": "Utility", "profile": "Defensive; yield", "isa": True},
-    {"ticker": "VOD.L", "company": "Vodafone Group", "cluster": "Cluster H", "sector": "Telecom", "profile": "Value trap/turnaround", "isa": True},
-    {"ticker": "TSCO.L", "company": "Tesco", "cluster": "Cluster H", "sector": "Retail", "profile": "Defensive staple", "isa": True}
+    {"ticker": "RR.L", "company": "Rolls-Royce Holdings", "cluster": "Cluster H", "profile": "Turnaround; high beta", "isa": True},
+    {"ticker": "AZN.L", "company": "AstraZeneca", "cluster": "Cluster H", "profile": "Defensive growth", "isa": True},
+    {"ticker": "SHEL.L", "company": "Shell", "cluster": "Cluster H", "profile": "Oil Beta; yield", "isa": True},
+    {"ticker": "BP.L", "company": "BP", "cluster": "Cluster H", "profile": "Oil Beta; yield", "isa": True},
+    {"ticker": "HSBA.L", "company": "HSBC Holdings", "cluster": "Cluster H", "profile": "Rate proxy", "isa": True},
+    {"ticker": "LLOY.L", "company": "Lloyds Banking Group", "cluster": "Cluster H", "profile": "Domestic cycle", "isa": True},
+    {"ticker": "BARC.L", "company": "Barclays", "cluster": "Cluster H", "profile": "Volatility", "isa": True},
+    {"ticker": "NG.L", "company": "National Grid", "cluster": "Cluster H", "profile": "Defensive; yield", "isa": True},
+    {"ticker": "VOD.L", "company": "Vodafone Group", "cluster": "Cluster H", "profile": "Value trap/turnaround", "isa": True},
+    {"ticker": "TSCO.L", "company": "Tesco", "cluster": "Cluster H", "profile": "Defensive staple", "isa": True}
 ]
 
 
+def attach_metadata(instruments):
+    """Sets each instrument's sector/industry from the security metadata cache (prefetching what has expired)."""
+    meta = get_security_metadata()
+    meta.prefetch([inst['ticker'] for inst in instruments])
+    for inst in instruments:
+        inst['sector'] = meta.sector(inst['ticker'])
+        inst['industry'] = meta.get(inst['ticker'], 'industry', 'Unknown')
+
+
 def generate_dual_ledger():
     """
     v1.9.4 DUAL-LEDGER SYSTEM
@@ -195,6 +207,7 @@ def generate_dual_ledger():
     os.makedirs("data", exist_ok=True)
 
     # LEDGER 1: Master Universe (Job C Only)
+    attach_metadata(MASTER_UNIVERSE)
     master_data = {
         "metadata": {
             "version": "1.9.4",
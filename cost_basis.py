@@ -0,0 +1,278 @@
+"""
+Cost Basis Ledger (cost_basis.py)
+=================================
+Lot engine for Trading212 fills: keeps per-ticker open lots and realized
+P&L in an indexed SQLite store, so a sync only applies the fills it has
+not seen before.
+
+Methods:
+    fifo     sells consume the oldest open lots first
+    average  one pooled cost per ticker (UK Section 104 style)
+
+Realized P&L is net of fees (buy-side fees are part of lot cost, sell-side
+fees reduce proceeds). Quantities are in shares; values in account currency.
+"""
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+logger = logging.getLogger("CostBasis")
+
+DB_PATH = Path("data") / "cost_basis.db"
+EPSILON = 1e-9
+# Still working: their fill can grow, so they are booked once final (any final
+# status with a fill counts, e.g. CANCELLED after a partial fill)
+OPEN_STATUSES = ("NEW", "LOCAL", "UNCONFIRMED", "CONFIRMED", "WORKING", "PARTIALLY_FILLED", "PENDING",
+                 "REPLACING", "CANCELLING")
+
+
+def _ms(timestamp) -> int:
+    if timestamp is None:
+        return 0
+    if isinstance(timestamp, (int, float)):
+        return int(timestamp)
+    return int(datetime.fromisoformat(str(timestamp).replace("Z", "+00:00")).timestamp() * 1000)
+
+
+def is_working(item: dict) -> bool:
+    """True while a history item's order can still fill (it is booked once final)."""
+    return str(item.get("order", item).get("status", "FILLED")).upper() in OPEN_STATUSES
+
+
+def normalize_order(item: dict):
+    """
+    Flattens a /equity/history/orders item into a fill dict, or None if
+    nothing was filled (or the order is still working). Accepts the flat v0 shape and the {"order", "fill"}
+    shape; sells are negative quantities (T212 convention) or side/type SELL.
+    """
+    order = item.get("order", item)
+    fill = item.get("fill") or {}
+    status = str(order.get("status", "FILLED")).upper()
+    quantity = fill.get("quantity", order.get("filledQuantity"))
+    price = fill.get("price", order.get("fillPrice"))
+    if status in OPEN_STATUSES or not quantity or price is None:
+        return None
+    quantity = float(quantity)
+    side = str(order.get("side") or order.get("type") or "").upper()
+    if side == "SELL" and quantity > 0:
+        quantity = -quantity
+    taxes = (fill.get("walletImpact") or {}).get("taxes") or order.get("taxes") or []
+    fees = sum(abs(float(t.get("quantity", 0) or 0)) for t in taxes)
+    executed = fill.get("filledAt") or order.get("dateExecuted") or order.get("dateModified") or order.get("dateCreated")
+    return {
+        "id": str(order.get("id") or fill.get("id")),
+        "ticker": order.get("ticker"),
+        "quantity": quantity,
+        "price": float(price),
+        "fees": fees,
+        "executed_ms": _ms(executed),
+    }
+
+
+class CostBasisLedger:
+    """
+    SQLite-backed lot engine. Every order id is applied at most once;
+    apply_orders() takes fills in any order and books them chronologically.
+    Changing `method` on an existing store replays its stored fills.
+    """
+
+    def __init__(self, path=DB_PATH, method: str = "fifo"):
+        if method not in ("fifo", "average"):
+            raise ValueError(f"Unknown cost basis method {method!r}")
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fills (
+                id TEXT PRIMARY KEY,
+                ticker TEXT NOT NULL,
+                quantity REAL NOT NULL,
+                price REAL NOT NULL,
+                fees REAL NOT NULL DEFAULT 0,
+                executed_ms INTEGER NOT NULL,
+                applied INTEGER NOT NULL DEFAULT 0,
+                raw TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_fills_pending ON fills(applied, executed_ms);
+            CREATE TABLE IF NOT EXISTS lots (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                ticker TEXT NOT NULL,
+                order_id TEXT NOT NULL,
+                opened_ms INTEGER NOT NULL,
+                quantity REAL NOT NULL,
+                unit_cost REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_lots_ticker ON lots(ticker, id);
+            CREATE TABLE IF NOT EXISTS positions (
+                ticker TEXT PRIMARY KEY,
+                quantity REAL NOT NULL DEFAULT 0,
+                cost REAL NOT NULL DEFAULT 0,
+                realized REAL NOT NULL DEFAULT 0
+            );
+            CREATE TABLE IF NOT EXISTS realizations (
+                order_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                closed_ms INTEGER NOT NULL,
+                quantity REAL NOT NULL,
+                proceeds REAL NOT NULL,
+                cost REAL NOT NULL,
+                pnl REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_realizations_closed ON realizations(closed_ms);
+            CREATE TABLE IF NOT EXISTS sync_state (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        """)
+        self.conn.commit()
+        self.method = method
+        if self.get_state("method", method) != method:
+            logger.info(f"Cost basis method changed to {method}: replaying stored fills")
+            self.rebuild()
+        self.set_state("method", method)
+
+    # ── checkpoint state ──
+    def get_state(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_state(self, key: str, value, commit: bool = True):
+        self.conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+        if commit:
+            self.conn.commit()
+
+    # ── ingestion ──
+    def has_order(self, order_id) -> bool:
+        return self.conn.execute("SELECT 1 FROM fills WHERE id = ?", (str(order_id),)).fetchone() is not None
+
+    def stage(self, items) -> int:
+        """Stores raw history items (filled ones only) without booking them; returns how many were new."""
+        new = 0
+        for item in items:
+            fill = normalize_order(item)
+            if fill is None or not fill["ticker"]:
+                continue
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO fills (id, ticker, quantity, price, fees, executed_ms, raw) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (fill["id"], fill["ticker"], fill["quantity"], fill["price"], fill["fees"], fill["executed_ms"],
+                 json.dumps(item)))
+            new += cursor.rowcount
+        return new
+
+    def apply_pending(self) -> int:
+        """
+        Books every staged, unapplied fill in execution order; one transaction.
+        Returns how many were new. A ticker whose new fills predate fills it has
+        already booked (an order that was still working at the last sync) is
+        replayed from its first fill so its lots stay chronological.
+        """
+        new = self.conn.execute("SELECT COUNT(*) FROM fills WHERE applied = 0").fetchone()[0]
+        late = self.conn.execute(
+            "SELECT ticker FROM fills AS staged WHERE applied = 0 GROUP BY ticker HAVING MIN(executed_ms) < "
+            "(SELECT MAX(executed_ms) FROM fills WHERE applied = 1 AND ticker = staged.ticker)").fetchall()
+        for (ticker,) in late:
+            logger.info(f"{ticker}: late fill predates booked fills; replaying its history")
+            for table in ("lots", "positions", "realizations"):
+                self.conn.execute(f"DELETE FROM {table} WHERE ticker = ?", (ticker,))
+            self.conn.execute("UPDATE fills SET applied = 0 WHERE ticker = ?", (ticker,))
+        rows = self.conn.execute(
+            "SELECT id, ticker, quantity, price, fees, executed_ms FROM fills WHERE applied = 0 "
+            "ORDER BY executed_ms, id").fetchall()
+        for row in rows:
+            self._book(*row)
+        self.conn.execute("UPDATE fills SET applied = 1 WHERE applied = 0")
+        self.conn.commit()
+        return new
+
+    def apply_orders(self, items) -> int:
+        """stage() + apply_pending()."""
+        self.stage(items)
+        return self.apply_pending()
+
+    def _book(self, order_id, ticker, quantity, price, fees, executed_ms):
+        position = self.conn.execute("SELECT quantity, cost, realized FROM positions WHERE ticker = ?",
+                                     (ticker,)).fetchone() or (0.0, 0.0, 0.0)
+        held, cost, realized = position
+        if quantity > 0:
+            total = quantity * price + fees
+            if self.method == "fifo":
+                self.conn.execute(
+                    "INSERT INTO lots (ticker, order_id, opened_ms, quantity, unit_cost) VALUES (?, ?, ?, ?, ?)",
+                    (ticker, order_id, executed_ms, quantity, total / quantity))
+            held, cost = held + quantity, cost + total
+        else:
+            sold = -quantity
+            matched_cost = self._consume(ticker, sold, held, cost)
+            matched = min(sold, max(held, 0.0))
+            if sold - matched > EPSILON:
+                logger.warning(f"{ticker}: sell {order_id} exceeds known holdings by {sold - matched:g} "
+                               f"(history incomplete?); unmatched shares booked at zero P&L")
+            proceeds = matched * price - fees * (matched / sold)
+            pnl = proceeds - matched_cost
+            realized += pnl
+            held, cost = held - matched, cost - matched_cost
+            if held <= EPSILON:
+                held, cost = 0.0, 0.0
+            self.conn.execute(
+                "INSERT INTO realizations (order_id, ticker, closed_ms, quantity, proceeds, cost, pnl) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", (order_id, ticker, executed_ms, matched, proceeds, matched_cost, pnl))
+        self.conn.execute("INSERT OR REPLACE INTO positions (ticker, quantity, cost, realized) VALUES (?, ?, ?, ?)",
+                          (ticker, held, cost, realized))
+
+    def _consume(self, ticker: str, sold: float, held: float, cost: float) -> float:
+        """Cost of the shares a sell removes (and, for FIFO, shrinks/deletes those lots)."""
+        if held <= EPSILON:
+            return 0.0
+        if self.method == "average":
+            return cost * min(sold, held) / held
+        remaining, matched_cost = sold, 0.0
+        for lot_id, lot_qty, unit_cost in self.conn.execute(
+                "SELECT id, quantity, unit_cost FROM lots WHERE ticker = ? ORDER BY id", (ticker,)).fetchall():
+            take = min(lot_qty, remaining)
+            matched_cost += take * unit_cost
+            remaining -= take
+            if lot_qty - take <= EPSILON:
+                self.conn.execute("DELETE FROM lots WHERE id = ?", (lot_id,))
+            else:
+                self.conn.execute("UPDATE lots SET quantity = ? WHERE id = ?", (lot_qty - take, lot_id))
+            if remaining <= EPSILON:
+                break
+        return matched_cost
+
+    def rebuild(self):
+        """Recomputes lots/positions/realizations from the stored fills."""
+        self.conn.executescript("DELETE FROM lots; DELETE FROM positions; DELETE FROM realizations; "
+                                "UPDATE fills SET applied = 0;")
+        self.apply_pending()
+
+    # ── queries ──
+    def realized_total(self, since_ms: int = None) -> float:
+        if since_ms is None:
+            row = self.conn.execute("SELECT COALESCE(SUM(realized), 0) FROM positions").fetchone()
+        else:
+            row = self.conn.execute("SELECT COALESCE(SUM(pnl), 0) FROM realizations WHERE closed_ms >= ?",
+                                    (since_ms,)).fetchone()
+        return round(row[0], 2)
+
+    def position(self, ticker: str) -> dict:
+        row = self.conn.execute("SELECT quantity, cost, realized FROM positions WHERE ticker = ?",
+                                (ticker,)).fetchone()
+        if row is None:
+            return {"quantity": 0.0, "avg_cost": 0.0, "realized": 0.0}
+        quantity, cost, realized = row
+        return {"quantity": quantity, "avg_cost": cost / quantity if quantity > EPSILON else 0.0,
+                "realized": realized}
+
+    def open_lots(self, ticker: str) -> list:
+        """FIFO lots still open, oldest first: [(order_id, opened_ms, quantity, unit_cost)]."""
+        return self.conn.execute("SELECT order_id, opened_ms, quantity, unit_cost FROM lots WHERE ticker = ? "
+                                 "ORDER BY id", (ticker,)).fetchall()
+
+    def fill_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM fills").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
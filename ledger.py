@@ -6,72 +6,145 @@ from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger("SessionLedger")
 
+COMPACT_EVERY = 200  # journal entries folded into the snapshot at a time
+
+
 class SessionLedger:
     """
     The 'Ground Truth' ledger for Job C (Sniper/Sentinel) trades.
     Ensures that the 5% process only manages assets it explicitly purchased.
+
+    Storage is a compacted snapshot (`filepath`) plus an append-only JSON-lines
+    journal (`filepath + '.journal'`): a record appends one line, and every
+    COMPACT_EVERY records the journal is folded into the snapshot. Running
+    (session, ticker) quantity/cost aggregates are kept alongside the trades,
+    so session lookups never scan the history.
     """
-    def __init__(self, filepath='data/session_ledger.json'):
+    def __init__(self, filepath='data/session_ledger.json', compact_every: int = COMPACT_EVERY):
         self.filepath = filepath
+        self.journal_path = filepath + ".journal"
+        self.compact_every = compact_every
         self.data = self._load_ledger()
+        self._journal_entries = 0
+        self._replay_journal()
 
     def _load_ledger(self) -> Dict[str, Any]:
-        """Loads the ledger from disk, ensuring it exists."""
-        os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
+        """Loads the snapshot from disk, ensuring it exists."""
+        os.makedirs(os.path.dirname(self.filepath) or ".", exist_ok=True)
+        empty = {"date": datetime.utcnow().strftime('%Y-%m-%d'), "seq": 0, "trades": {}, "positions": {}}
         if not os.path.exists(self.filepath):
-            return {"date": datetime.utcnow().strftime('%Y-%m-%d'), "trades": {}}
-        
+            return empty
+
         try:
             with open(self.filepath, 'r') as f:
                 data = json.load(f)
                 # We do NOT auto-reset here. We want a persistent audit trail.
                 # But Job C logic might only care about trades from 'today'.
-                return data
         except Exception as e:
             logger.error(f"Ledger Load Error: {e}")
-            return {"date": datetime.utcnow().strftime('%Y-%m-%d'), "trades": {}}
+            return empty
+
+        data.setdefault("seq", 0)
+        data.setdefault("trades", {})
+        if "positions" not in data:
+            # Pre-journal ledger: derive the aggregates once
+            data["positions"] = {}
+            for ticker, trades in data["trades"].items():
+                for trade in trades:
+                    self._apply(data["positions"], ticker, trade)
+        return data
+
+    def _replay_journal(self):
+        """Applies journal entries newer than the snapshot (seq guards a crash mid-compaction)."""
+        if not os.path.exists(self.journal_path):
+            return
+        with open(self.journal_path, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    logger.warning("Ledger journal: skipping torn line")
+                    continue
+                self._journal_entries += 1
+                if entry.get("seq", 0) > self.data["seq"]:
+                    self._ingest(entry)
+
+    @staticmethod
+    def _apply(positions: Dict[str, Any], ticker: str, trade: Dict[str, Any]):
+        """
+        Folds one trade into the (session, ticker) [quantity, cost] aggregate
+        (average cost on sells). The quantity is the signed running sum, as
+        the trade-scan used to compute it: an oversell is carried forward and
+        only clamped when read, so BUY 10 / SELL 15 / BUY 10 holds 5. Cost
+        covers only the shares above zero.
+        """
+        session = positions.setdefault(trade["session_date"], {})
+        quantity, cost = session.get(ticker, (0.0, 0.0))
+        if trade["side"] == "BUY":
+            new_quantity = quantity + trade["quantity"]
+            cost += (max(0.0, new_quantity) - max(0.0, quantity)) * trade["price"]
+        else:
+            new_quantity = quantity - trade["quantity"]
+            cost = cost * max(0.0, new_quantity) / quantity if quantity > 0 else 0.0
+        session[ticker] = [new_quantity, cost]
+
+    def _ingest(self, entry: Dict[str, Any]):
+        ticker = entry.pop("ticker")
+        self.data["seq"] = entry["seq"]
+        self.data["trades"].setdefault(ticker, []).append(entry)
+        self._apply(self.data["positions"], ticker, entry)
 
     def _save_ledger(self):
-        """Atomic write to prevent corruption."""
+        """Compacts: atomic snapshot write, then the journal is emptied."""
         temp_path = self.filepath + ".tmp"
         try:
             with open(temp_path, 'w') as f:
-                json.dump(self.data, f, indent=2)
+                json.dump(self.data, f)
             os.replace(temp_path, self.filepath)
+            open(self.journal_path, 'w').close()
+            self._journal_entries = 0
         except Exception as e:
             logger.error(f"Ledger Save Error: {e}")
 
+    def _append_journal(self, ticker: str, entry: Dict[str, Any]):
+        try:
+            with open(self.journal_path, 'a') as f:
+                f.write(json.dumps({"ticker": ticker, **entry}) + "\n")
+            self._journal_entries += 1
+        except Exception as e:
+            logger.error(f"Ledger Journal Error: {e}")
+        if self._journal_entries >= self.compact_every:
+            self._save_ledger()
+
     def record_purchase(self, ticker: str, quantity: float, price: float, side: str = "BUY"):
         """Records a new entry in the session ledger."""
-        if ticker not in self.data["trades"]:
-            self.data["trades"][ticker] = []
-        
+        now = datetime.utcnow()
         entry = {
-            "timestamp": datetime.utcnow().isoformat(),
+            "seq": self.data["seq"] + 1,
+            "timestamp": now.isoformat(),
             "side": side,
             "quantity": quantity,
             "price": price,
-            "session_date": datetime.utcnow().strftime('%Y-%m-%d')
+            "session_date": now.strftime('%Y-%m-%d')
         }
-        
-        self.data["trades"][ticker].append(entry)
-        self._save_ledger()
+
+        self._ingest({"ticker": ticker, **entry})
+        self._append_journal(ticker, entry)
         logger.info(f"LEDGER: Recorded {side} for {ticker}: {quantity} @ {price}")
 
+    def record_sale(self, ticker: str, quantity: float, price: float):
+        self.record_purchase(ticker, quantity, price, side="SELL")
+
+    def get_session_position(self, ticker: str, session_date: Optional[str] = None) -> Dict[str, float]:
+        """Quantity and average cost Job C holds in a ticker for a session (default: today)."""
+        session_date = session_date or datetime.utcnow().strftime('%Y-%m-%d')
+        quantity, cost = self.data["positions"].get(session_date, {}).get(ticker, (0.0, 0.0))
+        quantity = max(0.0, quantity)
+        return {"quantity": quantity, "avg_price": cost / quantity if quantity > 0 else 0.0}
+
     def get_session_quantity(self, ticker: str) -> float:
         """Returns the total quantity of a ticker purchased in the CURRENT session."""
-        today = datetime.utcnow().strftime('%Y-%m-%d')
-        total = 0.0
-        
-        if ticker in self.data["trades"]:
-            for trade in self.data["trades"][ticker]:
-                if trade["session_date"] == today:
-                    if trade["side"] == "BUY":
-                        total += trade["quantity"]
-                    else:
-                        total -= trade["quantity"]
-        
-        return max(0.0, total)
+        return self.get_session_position(ticker)["quantity"]
 
     def is_job_c_holding(self, ticker: str) -> bool:
         """Checks if Job C has ANY active quantity in this ticker for the session."""
@@ -12,11 +12,12 @@ import sys
 from datetime import datetime, timedelta
 from typing import Dict, Tuple
 
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
+# Deferred: the SDK is only needed once MacroClock actually queries Gemini
+from shared.lazy_import import lazy_import, is_available
+
+genai = lazy_import("google.generativeai")
+GEMINI_AVAILABLE = is_available("google.generativeai")
+if not GEMINI_AVAILABLE:
     print("⚠️  google.generativeai not installed, using fallback mode")
 
 # LLM Council (A2A: ask_others pattern)
@@ -8,12 +8,15 @@ from strategy_engine import SniperStrategy
 from telegram_bot import SovereignAlerts
 from audit_log import AuditLogger
 from session_manager import SessionManager
+from perf_metrics import PERF, serve_metrics
+from premarket_warmup import get_warm_cache, warm_up
 import json
 
 # --- HARD TIME LOCK ---
 # US Market Hours (UTC): 14:25 to 21:05
 START = dtime(14, 25)
 END = dtime(21, 5)
+WARMUP = dtime(14, 0)  # pre-market warm-up of per-ticker reference data
 
 def send_eod_report(alerts: SovereignAlerts, logger: AuditLogger):
     """Sends the End-of-Day summary report with P&L."""
@@ -70,11 +73,18 @@ def run_sniper():
         client = Trading212Client()
         from auditor import TradingAuditor # Lazy import
         auditor = TradingAuditor()
-        strategy = SniperStrategy(client)
-        alerts = SovereignAlerts()
         # v2.3 SESSION MANAGER (Emergency Fix)
         session_manager = SessionManager()
+        strategy = SniperStrategy(client, session_manager)
+        alerts = SovereignAlerts()
+        # v3.3 WARM CACHE: a restart mid-session reuses today's warm-up (daily bars re-seeded)
+        warm_cache = get_warm_cache()
+        warm_cache.seed_aggregator()
         logger.log("INIT_SUCCESS", "System", "All services loaded (Session Isolation Active)", "SUCCESS")
+        # Local /metrics endpoint for phase timings (SENTINEL_METRICS_PORT=0 disables)
+        metrics_port = int(os.getenv('SENTINEL_METRICS_PORT', '9108'))
+        if metrics_port:
+            serve_metrics(metrics_port)
     except Exception as e:
         logger.log("INIT_FAILURE", "System", str(e), "CRITICAL")
         print(f"CRITICAL STARTUP ERROR: {e}")
@@ -84,6 +94,7 @@ def run_sniper():
     last_pulse_time = 0
     last_keepalive_time = 0
     open_brief_failures = 0  # v3.1: Track failures to prevent infinite retry
+    warmup_failures = {}  # trading day -> failed warm-up attempts
 
     # SAFETY: Check for Emergency Lock (Circuit Breaker)
     if os.path.exists('data/emergency.lock'):
@@ -95,6 +106,7 @@ def run_sniper():
 
     while True:
         try:
+            loop_start = time.monotonic()
             now_dt = datetime.utcnow()
             now_time = now_dt.time()
             now_ts = time.time()
@@ -117,6 +129,21 @@ def run_sniper():
                     # Update heartbeat so we don't spam logs
                     last_keepalive_time = now_ts
 
+            # 0c. PRE-MARKET WARM-UP (v3.3)
+            # 30d volume, ATR means, sectors, earnings, instruments and prior daily
+            # bars for the whole universe, so the open only fetches today's bars
+            if WARMUP <= now_time < END and not warm_cache.is_fresh():
+                day = now_dt.strftime('%Y-%m-%d')
+                if warmup_failures.get(day, 0) < 3:
+                    try:
+                        with PERF.span("phase.warmup"):
+                            summary = warm_up(client=client)
+                        logger.log("WARMUP_COMPLETE", "System",
+                                   f"{summary['daily']}/{summary['tickers']} tickers in {summary['seconds']}s", "SUCCESS")
+                    except Exception as e:
+                        warmup_failures[day] = warmup_failures.get(day, 0) + 1
+                        logger.log("WARMUP_ERROR", "System", f"Attempt {warmup_failures[day]}: {e}", "ERROR")
+
             # 1. TIME WINDOW MANAGEMENT
             if now_time < START:
                 # BEFORE 14:25 UTC - Standby Mode
@@ -160,7 +187,8 @@ def run_sniper():
             if now_time >= dtime(21, 0):
                 print("21:00 UTC CURFEW: Closing SESSION positions.")
                 try:
-                    positions = client.get_positions()
+                    with PERF.span("phase.curfew_positions"):
+                        positions = client.get_positions()
                     if positions:
                         for pos in positions:
                             ticker = pos.get('ticker')
@@ -194,7 +222,8 @@ def run_sniper():
             # 3. THE HUNT (Check Targets)
             # SKIPPED IF VACATION MODE ACTIVE
             if now_time >= dtime(14, 30) and not is_vacation:
-                triggers = strategy.scan_market() 
+                with PERF.span("phase.scan_market"):
+                    triggers = strategy.scan_market()
                 if triggers:
                     # IRON SEED CHECK
                     if not auditor.enforce_iron_seed():
@@ -219,18 +248,22 @@ def run_sniper():
                             
                             # 🛡️ STRATEGIC HOLDINGS GUARD (v2.4)
                             # Prevents Job C from buying tickers managed by Job A
+                            gauntlet_start = time.monotonic()
                             if ticker in strategic_blacklist:
                                 logger.log("STRATEGIC_BLOCK", ticker, "Protected by Job A blacklist", "WARNING")
                                 alerts.send_message(f"⚠️ **CONFLICT DETECTED**\n{ticker} is a strategic holding.\nBlocking Job C entry to protect Job A portfolio.")
                                 continue
                             
                             # VALIDATE TICKER
-                            if not client.validate_ticker(ticker):
+                            with PERF.span("gate.validate_ticker"):
+                                valid = client.validate_ticker(ticker)
+                            if not valid:
                                  logger.log("INVALID_TICKER", ticker, "Skipped invalid ticker", "WARNING")
                                  continue
     
                             # DUPLICATE GUARD
-                            current_positions = client.get_positions()
+                            with PERF.span("gate.duplicate_guard"):
+                                current_positions = client.get_positions()
                             is_held = False
                             if current_positions and isinstance(current_positions, list):
                                 for p in current_positions:
@@ -243,41 +276,56 @@ def run_sniper():
                                 continue
     
                             # APROMS IRONCLAD GAUNTLET (SPEC v2.1)
-                            # 1. Volume Filter
+                            # 1. Volume Filter (30d average from the warm-up; live info only when cold)
                             import yfinance as yf
-                            t_ticker = yf.Ticker(ticker)
-                            t_info = t_ticker.info
-                            
-                            avg_vol = t_info.get('averageVolume', 0)
-                            if not auditor.check_volume_filter(ticker, avg_vol):
+                            t_info = None
+                            avg_vol = warm_cache.get(ticker, 'avg_volume')
+                            if avg_vol is None:
+                                with PERF.span("gate.yf_info"):
+                                    t_info = yf.Ticker(ticker).info
+                                avg_vol = t_info.get('averageVolume', 0)
+                            with PERF.span("gate.volume_filter"):
+                                passed = auditor.check_volume_filter(ticker, avg_vol)
+                            if not passed:
                                 logger.log("VOLUME_FILTER", ticker, f"Vol: {avg_vol}", "INFO")
                                 continue 
                             
-                            # 2. Spread Guard (Tight 0.05%)
+                            # 2. Spread Guard (Tight 0.05%) - needs a live quote
+                            # (.info is the only yfinance source of bid/ask; fast_info has none)
+                            if t_info is None:
+                                with PERF.span("gate.yf_info"):
+                                    t_info = yf.Ticker(ticker).info
                             bid = t_info.get('bid', 0)
                             ask = t_info.get('ask', 0)
                             if not (bid > 0 and ask > 0):
                                 logger.log("DATA_WARNING", ticker, "No Bid/Ask data", "WARNING")
                                 continue
 
-                            if not auditor.check_spread_guard(ticker, bid, ask):
+                            with PERF.span("gate.spread_guard"):
+                                passed = auditor.check_spread_guard(ticker, bid, ask)
+                            if not passed:
                                 logger.log("SPREAD_GUARD", ticker, f"{bid}/{ask}", "INFO")
                                 continue
 
                             # 3. VWAP Gate
-                            if not auditor.check_vwap_gate(ticker, trade['price']):
+                            with PERF.span("gate.vwap_gate"):
+                                passed = auditor.check_vwap_gate(ticker, trade['price'])
+                            if not passed:
                                 logger.log("VWAP_GATE", ticker, "Price < VWAP, skipping Long", "INFO")
                                 continue
 
                             # 4. Volatility Guard (ATR)
-                            if not auditor.check_volatility_guard(ticker):
+                            with PERF.span("gate.volatility_guard"):
+                                passed = auditor.check_volatility_guard(ticker)
+                            if not passed:
                                 logger.log("VOL_GUARD", ticker, "Excessive ATR, skipping", "INFO")
                                 continue
 
                             # 5. Dynamic Risk Calculator (APROMS SPEC)
-                            acct = client.get_account_info()
-                            total_wealth = float(acct.get('totalValue', 0.0))
-                            realized_pnl = auditor.load_balance_state().get("realized_profit", 0.0)
+                            with PERF.span("gate.account_state"):
+                                acct = client.get_account_info()
+                                total_wealth = float(acct.get('totalValue', 0.0))
+                                realized_pnl = auditor.load_balance_state().get("realized_profit", 0.0)
 
                             # 4.5 BI-DIRECTIONAL RISK & GLOBAL CAP (SPEC vFinal.15)
                             # GLOBAL RISK CAP Check
@@ -288,7 +336,8 @@ def run_sniper():
 
                             # Calculate floating P&L for Unrealized Mirror
                             floating_pnl = 0.0
-                            current_positions = client.get_positions() # Refresh for accurate mirror
+                            with PERF.span("gate.floating_pnl"):
+                                current_positions = client.get_positions() # Refresh for accurate mirror
                             if current_positions:
                                 for p in current_positions:
                                     if session_manager.is_whitelisted(p['ticker']):
@@ -309,7 +358,9 @@ def run_sniper():
                             
                             # EXECUTE BUY
                             logger.log("BUY_SIGNAL", ticker, f"Risk: {risk_pct:.2%}, Qty: {qty:.2f}", "SUCCESS")
-                            client.execute_order(ticker, qty, "BUY")
+                            with PERF.span("gate.execute_order"):
+                                client.execute_order(ticker, qty, "BUY")
+                            PERF.record("phase.gauntlet_entry", time.monotonic() - gauntlet_start)
                             
                             # 🧾 PERSISTENT LEDGER RECORD
                             session_manager.add_ticker(ticker, qty, trade['price'])
@@ -338,7 +389,8 @@ def run_sniper():
                     
                     from strategic_moat import MorningBrief
                     brief = MorningBrief()
-                    brief.generate_brief()
+                    with PERF.span("phase.morning_brief"):
+                        brief.generate_brief()
                     
                     with open(open_brief_lock, 'w') as f:
                         f.write(today_str)
@@ -372,10 +424,11 @@ def run_sniper():
                         from strategic_moat import SectorMapper
                         from macro_clock import MacroClock
                         
-                        mapper = SectorMapper()
-                        clock = MacroClock()
-                        phase_data = clock.detect_market_phase()
-                        report = mapper.generate_delta_report()
+                        with PERF.span("phase.aproms_rebalance"):
+                            mapper = SectorMapper()
+                            clock = MacroClock()
+                            phase_data = clock.detect_market_phase()
+                            report = mapper.generate_delta_report()
                         
                         with open(rebalance_lock, 'w') as f:
                             f.write(today_str)
@@ -388,7 +441,8 @@ def run_sniper():
 
             # 6. THE SHIELD (Check Exits)
             try:
-                exits = strategy.check_risk_rules()
+                with PERF.span("phase.shield"):
+                    exits = strategy.check_risk_rules()
                 if exits:
                     for trade in exits:
                         ticker = trade['ticker']
@@ -417,7 +471,8 @@ def run_sniper():
                              tickers = [t['ticker'] for t in t_data]
                              target_list = ", ".join(tickers)
                     
-                    alerts.send_pulse(len(tickers), now_dt.strftime('%H:%M'))
+                    with PERF.span("phase.pulse"):
+                        alerts.send_pulse(len(tickers), now_dt.strftime('%H:%M'))
                     logger.log("PULSE_SENT", "System", f"Targets: {len(tickers)}", "INFO")
                     last_pulse_time = now_ts 
                     
@@ -426,6 +481,8 @@ def run_sniper():
 
             # Loop beat
             # print(f".", end="", flush=True)
+            PERF.record("phase.loop", time.monotonic() - loop_start)
+            PERF.maybe_dump(logger)
             sleep_time.sleep(60)
 
         except KeyboardInterrupt:
@@ -443,4 +500,8 @@ def run_sniper():
 
 if __name__ == "__main__":
     os.makedirs('data', exist_ok=True)
+    # v3.2: Record bars and broker responses for replay_harness.py
+    if os.getenv('SENTINEL_CAPTURE') == '1':
+        from replay_harness import enable_capture
+        enable_capture()
     run_sniper()
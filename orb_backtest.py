@@ -0,0 +1,412 @@
+"""
+ORB Backtest — Vectorized multi-year evaluation of the 15m Opening Range rules.
+===============================================================================
+`orb_strategy.run_recovery`, `MorningBrief` and `SniperStrategy.check_risk_rules`
+hard-code the ORB rules (15m window, range > 0.8% / 0.2%, green candle,
+trigger = high + 0.01, 2R take-profit, 21:00 UTC curfew). This module replays
+them over years of 1m bars for a whole universe at once.
+
+Layout: every ticker-day is one row of a (rows x 390) float32 matrix of the
+09:30-16:00 ET session (row = day * n_tickers + ticker, so rows are
+chronological). One NumPy pass per parameter group finds, for every row, the
+ORB levels, the entry minute, the first stop / target touch and the curfew
+exit. Running max/min tricks replace per-bar loops:
+
+    entry minute   = count(running_max(high[window:]) < trigger) + window
+    stop minute    = count(running_min(low after entry) > stop)
+    target minute  = count(running_max(high after entry) < target)
+
+Work shared between parameters is computed once per group: ORB + entries
+per (window, trigger_offset, entry), exits per (stop_offset, reward_r). The
+filters (min range, green, curfew, last entry, costs) are then just masks.
+Groups run in a process pool over a memory-mapped copy of the arrays.
+
+Fill model:
+  - entry "touch": buy-stop at the trigger; gaps through it fill at the bar open.
+    entry "close":  first 1m close above the trigger (the live Sniper scan), at that close.
+  - stop / target are checked from the bar after entry; a bar touching both
+    counts as a stop (conservative). Gaps fill at the bar open.
+  - curfew: flat at the close of minute `curfew_minute - 1` (390 = 16:00 ET).
+
+Usage:
+    python orb_backtest.py --data data/history/1m --preset wide --workers 8
+    (data: one <TICKER>.csv of 1m OHLCV per ticker, timestamp index)
+"""
+
+import glob
+import itertools
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+SESSION_MINUTES = 390           # 09:30-16:00 ET
+SESSION_OPEN_MINUTE = 9 * 60 + 30
+MARKET_TZ = "America/New_York"
+FIELDS = ("open", "high", "low", "close")
+
+# The rules as they run live today (orb_strategy: 0.8% + green, stop = ORB low;
+# MorningBrief: 0.2%, stop = low - 0.01; both trigger at high + 0.01, 2R target)
+DEFAULT_GRID = {
+    "window": [15],
+    "trigger_offset": [0.01],
+    "entry": ["touch"],
+    "stop_offset": [0.0, 0.01],
+    "reward_r": [2.0],
+    "min_range_pct": [0.8, 0.2],
+    "require_green": [True, False],
+    "curfew_minute": [SESSION_MINUTES],
+    "last_entry_minute": [SESSION_MINUTES],
+    "cost_bps": [0.0],
+}
+
+PRESETS = {
+    "live": DEFAULT_GRID,
+    "wide": dict(DEFAULT_GRID,
+                 window=[5, 15, 30],
+                 entry=["touch", "close"],
+                 reward_r=[1.0, 1.5, 2.0, 2.5, 3.0],
+                 min_range_pct=[round(x, 1) for x in np.arange(0.2, 1.3, 0.1)],
+                 curfew_minute=[360, SESSION_MINUTES]),
+}
+
+GROUP_KEYS = ("window", "trigger_offset", "entry")
+EXIT_KEYS = ("stop_offset", "reward_r")
+
+
+class SessionArrays:
+    """1m session bars for a universe as (rows x 390) float32 matrices."""
+
+    def __init__(self, open_p, high, low, close, tickers: List[str], days: List[str]):
+        self.open, self.high, self.low, self.close = open_p, high, low, close
+        self.tickers = list(tickers)
+        self.days = list(days)
+
+    @property
+    def n_tickers(self) -> int:
+        return len(self.tickers)
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    def row(self, day_idx: int, ticker_idx: int) -> int:
+        return day_idx * self.n_tickers + ticker_idx
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, Any]) -> "SessionArrays":
+        """
+        Builds the matrices from {ticker: 1m OHLCV DataFrame}. Index may be
+        naive (UTC) or tz-aware; bars outside 09:30-16:00 ET are dropped and
+        gaps are forward-filled within each session.
+        """
+        tickers = sorted(frames)
+        located = {}
+        all_days = set()
+        for ticker in tickers:
+            frame = frames[ticker]
+            if frame is None or frame.empty:
+                continue
+            index = frame.index if frame.index.tz is not None else frame.index.tz_localize("UTC")
+            local = index.tz_convert(MARKET_TZ)
+            minute = np.asarray(local.hour * 60 + local.minute) - SESSION_OPEN_MINUTE
+            keep = (minute >= 0) & (minute < SESSION_MINUTES)
+            days = np.asarray(local.strftime("%Y-%m-%d"))[keep]
+            values = frame[["Open", "High", "Low", "Close"]].to_numpy(dtype=np.float32)[keep]
+            located[ticker] = (days, minute[keep], values)
+            all_days.update(days)
+
+        days = sorted(all_days)
+        day_pos = {d: i for i, d in enumerate(days)}
+        n_rows = len(days) * len(tickers)
+        mats = [np.full((n_rows, SESSION_MINUTES), np.nan, dtype=np.float32) for _ in FIELDS]
+        for t_idx, ticker in enumerate(tickers):
+            if ticker not in located:
+                continue
+            d, m, values = located[ticker]
+            rows = np.fromiter((day_pos[x] for x in d), dtype=np.int64, count=len(d)) * len(tickers) + t_idx
+            for k, mat in enumerate(mats):
+                mat[rows, m] = values[:, k]
+        cls._fill_gaps(*mats)
+        return cls(*mats, tickers=tickers, days=days)
+
+    @staticmethod
+    def _fill_gaps(open_p, high, low, close):
+        """Forward-fills missing minutes with a flat bar at the last close (in place)."""
+        valid = ~np.isnan(close)
+        cols = np.where(valid, np.arange(close.shape[1]), -1)
+        np.maximum.accumulate(cols, axis=1, out=cols)
+        filled = np.take_along_axis(close, np.maximum(cols, 0), axis=1)
+        filled[cols < 0] = np.nan   # no trade yet this session
+        for mat in (open_p, high, low):
+            gap = np.isnan(mat)
+            mat[gap] = filled[gap]
+        close[~valid] = filled[~valid]
+
+    @classmethod
+    def from_csv_dir(cls, path: str, tickers: Optional[Iterable[str]] = None) -> "SessionArrays":
+        """Loads <TICKER>.csv 1m files (replay captures use the same layout)."""
+        import pandas as pd
+        frames = {}
+        wanted = set(tickers) if tickers else None
+        for file in sorted(glob.glob(os.path.join(path, "*.csv"))):
+            ticker = os.path.splitext(os.path.basename(file))[0]
+            if wanted and ticker not in wanted:
+                continue
+            frame = pd.read_csv(file, index_col=0)
+            frame.index = pd.to_datetime(frame.index, utc=True)
+            frames[ticker] = frame
+        return cls.from_frames(frames)
+
+    def save(self, path: str):
+        """Writes .npy files that workers memory-map instead of unpickling."""
+        os.makedirs(path, exist_ok=True)
+        for name in FIELDS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "index.txt"), "w") as f:
+            f.write(",".join(self.tickers) + "\n" + ",".join(self.days) + "\n")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "SessionArrays":
+        mode = "r" if mmap else None
+        mats = [np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mode) for name in FIELDS]
+        with open(os.path.join(path, "index.txt"), "r") as f:
+            tickers, days = [line.strip().split(",") if line.strip() else [] for line in f.readlines()[:2]]
+        return cls(*mats, tickers=tickers, days=days)
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """All parameter combinations of a {name: [values]} grid (defaults fill gaps)."""
+    full = {k: list(grid.get(k, DEFAULT_GRID[k][:1])) for k in DEFAULT_GRID}
+    keys = list(full)
+    return [dict(zip(keys, values)) for values in itertools.product(*(full[k] for k in keys))]
+
+
+def _max_drawdown(daily_pnl: np.ndarray) -> float:
+    if daily_pnl.size == 0:
+        return 0.0
+    equity = np.cumsum(daily_pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+    return float(np.max(peak - equity))
+
+
+def evaluate_group(arrays: SessionArrays, window: int, trigger_offset: float, entry: str,
+                   combos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Evaluates every combo sharing (window, trigger_offset, entry) in one pass
+    over all ticker-days. Returns one result dict (params + metrics) per combo.
+    """
+    o, h, l, c = arrays.open, arrays.high, arrays.low, arrays.close
+    n_rows, n_min = c.shape
+    w = int(window)
+
+    # --- Opening range ---
+    orb_high = np.where(np.isnan(h[:, :w]), -np.inf, h[:, :w]).max(axis=1)
+    orb_low = np.where(np.isnan(l[:, :w]), np.inf, l[:, :w]).min(axis=1)
+    first = np.argmax(~np.isnan(o[:, :w]), axis=1)
+    orb_open = o[np.arange(n_rows), first]
+    orb_close = c[:, w - 1]
+    valid = np.isfinite(orb_high) & np.isfinite(orb_low) & (orb_low > 0) & np.isfinite(orb_close)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        range_pct = (orb_high - orb_low) / orb_low * 100.0
+    green = orb_close >= orb_open
+    trigger = orb_high + trigger_offset
+
+    # --- Entries: first minute after the window through the trigger ---
+    if entry == "touch":
+        post = np.where(np.isnan(h[:, w:]), -np.inf, h[:, w:])
+        runmax = np.maximum.accumulate(post, axis=1)
+        offs = (runmax < trigger[:, None]).sum(axis=1)
+    elif entry == "close":
+        post = np.where(np.isnan(c[:, w:]), -np.inf, c[:, w:])
+        runmax = np.maximum.accumulate(post, axis=1)
+        offs = (runmax <= trigger[:, None]).sum(axis=1)
+    else:
+        raise ValueError(f"Unknown entry mode: {entry}")
+    entry_idx = w + offs
+    rows = np.flatnonzero(valid & (entry_idx < n_min))
+    ei = entry_idx[rows]
+    if entry == "touch":
+        entry_px = np.maximum(trigger[rows], o[rows, ei].astype(np.float64))
+    else:
+        entry_px = c[rows, ei].astype(np.float64)
+
+    # --- Running extremes after the entry bar (shared by every exit rule) ---
+    after = np.arange(n_min)[None, :] > ei[:, None]
+    lo = np.where(after, l[rows], np.inf)
+    np.minimum.accumulate(lo, axis=1, out=lo)
+    hi = np.where(after, h[rows], -np.inf)
+    np.maximum.accumulate(hi, axis=1, out=hi)
+    day_of_row = rows // max(arrays.n_tickers, 1)
+    n_days = len(arrays.days)
+
+    results = []
+    exit_groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for combo in combos:
+        exit_groups.setdefault(tuple(combo[k] for k in EXIT_KEYS), []).append(combo)
+
+    for (stop_offset, reward_r), members in exit_groups.items():
+        stop = orb_low[rows].astype(np.float64) - stop_offset
+        risk = entry_px - stop
+        target = entry_px + reward_r * risk
+        stop_idx = (lo > stop[:, None]).sum(axis=1)
+        tgt_idx = (hi < target[:, None]).sum(axis=1)
+        stop_fill = np.minimum(stop, o[rows, np.minimum(stop_idx, n_min - 1)])
+        tgt_fill = np.maximum(target, o[rows, np.minimum(tgt_idx, n_min - 1)])
+
+        for combo in members:
+            curfew = int(min(combo["curfew_minute"], n_min))
+            last_entry = int(min(combo["last_entry_minute"], curfew))
+            sel = (range_pct[rows] >= combo["min_range_pct"]) & (risk > 0) & (ei < last_entry)
+            if combo["require_green"]:
+                sel &= green[rows]
+            s_hit = stop_idx < curfew
+            t_hit = tgt_idx < curfew
+            by_stop = s_hit & (~t_hit | (stop_idx <= tgt_idx))
+            by_target = t_hit & ~by_stop
+            exit_px = np.where(by_stop, stop_fill,
+                               np.where(by_target, tgt_fill, c[rows, curfew - 1]))
+
+            cost = combo["cost_bps"] * 2 / 10000.0
+            ret = (exit_px[sel] / entry_px[sel] - 1.0) - cost
+            r_mult = (exit_px[sel] - entry_px[sel]) / risk[sel]
+            daily = np.bincount(day_of_row[sel], weights=ret, minlength=n_days)
+            gains, losses = ret[ret > 0].sum(), -ret[ret < 0].sum()
+            n = int(sel.sum())
+            results.append(dict(
+                combo,
+                trades=n,
+                hit_rate=float((ret > 0).mean()) if n else 0.0,
+                total_return_pct=float(ret.sum() * 100),
+                avg_return_pct=float(ret.mean() * 100) if n else 0.0,
+                expectancy_r=float(r_mult.mean()) if n else 0.0,
+                profit_factor=float(gains / losses) if losses > 0 else float("inf") if gains > 0 else 0.0,
+                max_drawdown_pct=_max_drawdown(daily) * 100,
+                stops=int(by_stop[sel].sum()),
+                targets=int(by_target[sel].sum()),
+                curfews=int(n - by_stop[sel].sum() - by_target[sel].sum()),
+            ))
+    return results
+
+
+# --- PROCESS POOL ---
+_WORKER_ARRAYS: Dict[str, SessionArrays] = {}
+
+
+def _run_group(path: str, key: tuple, combos: List[Dict[str, Any]]):
+    arrays = _WORKER_ARRAYS.get(path)
+    if arrays is None:
+        arrays = _WORKER_ARRAYS[path] = SessionArrays.load(path, mmap=True)
+    return evaluate_group(arrays, *key, combos)
+
+
+def run_grid(arrays, grid: Optional[Dict[str, List[Any]]] = None, workers: Optional[int] = None):
+    """
+    Runs every combination of `grid` (default: the live rules) and returns a
+    DataFrame of params + metrics, best total return first. `arrays` is a
+    SessionArrays or a directory written by SessionArrays.save().
+    """
+    import pandas as pd
+    combos = expand_grid(grid or DEFAULT_GRID)
+    groups: Dict[tuple, List[Dict[str, Any]]] = {}
+    for combo in combos:
+        groups.setdefault(tuple(combo[k] for k in GROUP_KEYS), []).append(combo)
+
+    workers = workers or os.cpu_count() or 1
+    results: List[Dict[str, Any]] = []
+    if workers <= 1 or len(groups) == 1:
+        if isinstance(arrays, str):
+            arrays = SessionArrays.load(arrays)
+        for key, members in groups.items():
+            results.extend(evaluate_group(arrays, *key, members))
+    else:
+        tmp = None
+        path = arrays
+        if not isinstance(arrays, str):
+            tmp = tempfile.TemporaryDirectory(prefix="orb_bt_")
+            path = tmp.name
+            arrays.save(path)
+        try:
+            # Split big groups so every worker has something to do
+            tasks = []
+            per_task = max(1, -(-len(combos) // (workers * 4)))
+            for key, members in groups.items():
+                by_exit: Dict[tuple, List[Dict[str, Any]]] = {}
+                for m in members:
+                    by_exit.setdefault(tuple(m[k] for k in EXIT_KEYS), []).append(m)
+                chunk: List[Dict[str, Any]] = []
+                for exit_members in by_exit.values():
+                    chunk.extend(exit_members)
+                    if len(chunk) >= per_task:
+                        tasks.append((key, chunk))
+                        chunk = []
+                if chunk:
+                    tasks.append((key, chunk))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_run_group, path, key, chunk) for key, chunk in tasks]
+                for future in futures:
+                    results.extend(future.result())
+        finally:
+            if tmp is not None:
+                tmp.cleanup()
+
+    frame = pd.DataFrame(results)
+    return frame.sort_values("total_return_pct", ascending=False, ignore_index=True)
+
+
+def summary_table(results, value: str = "total_return_pct", index: str = "min_range_pct",
+                  columns: str = "reward_r", agg: str = "max"):
+    """Pivot of one metric over two parameters (best value across the others)."""
+    return results.pivot_table(values=value, index=index, columns=columns, aggfunc=agg)
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(description="Vectorized ORB parameter backtest")
+    parser.add_argument("--data", required=True, help="Folder of <TICKER>.csv 1m bars, or a SessionArrays cache")
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="live")
+    parser.add_argument("--grid", help="JSON file overriding grid values ({param: [values]})")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", help="Save the built arrays here for the next run")
+    parser.add_argument("--out", default="data/orb_backtest.csv")
+    args = parser.parse_args()
+
+    grid = dict(PRESETS[args.preset])
+    if args.grid:
+        with open(args.grid, "r") as f:
+            grid.update(json.load(f))
+
+    t0 = time.perf_counter()
+    if os.path.exists(os.path.join(args.data, "close.npy")):
+        source = args.data
+        rows = SessionArrays.load(source).shape[0]
+    else:
+        source = SessionArrays.from_csv_dir(args.data)
+        rows = source.shape[0]
+        if args.cache:
+            source.save(args.cache)
+    t1 = time.perf_counter()
+    print(f"📦 {rows:,} ticker-days loaded in {t1 - t0:.1f}s")
+
+    results = run_grid(source, grid, args.workers)
+    t2 = time.perf_counter()
+    print(f"⚡ {len(results):,} parameter sets in {t2 - t1:.1f}s")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    results.to_csv(args.out, index=False)
+    cols = ["window", "entry", "min_range_pct", "require_green", "stop_offset", "reward_r", "curfew_minute",
+            "trades", "hit_rate", "total_return_pct", "max_drawdown_pct", "expectancy_r"]
+    print("\n🏆 TOP 10")
+    print(results[cols].head(10).to_string(index=False))
+    print("\n📊 TOTAL RETURN % (best per cell)")
+    print(summary_table(results).round(1).to_string())
+    print("\n📉 MAX DRAWDOWN % (best per cell)")
+    print(summary_table(results, "max_drawdown_pct", agg="min").round(1).to_string())
+    print("\n🎯 HIT RATE")
+    print(summary_table(results, "hit_rate", agg="mean").round(3).to_string())
+    print(f"\n💾 Results saved to {args.out}")
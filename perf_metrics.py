@@ -0,0 +1,245 @@
+"""
+Perf Metrics (perf_metrics.py)
+==============================
+Always-on latency instrumentation for the run_sniper hot path.
+
+    from perf_metrics import PERF
+
+    with PERF.span("phase.scan_market"):
+        triggers = strategy.scan_market()
+
+Each span name owns a fixed-bucket histogram (no per-sample storage) with
+power-of-two nanosecond bounds, so recording is a perf_counter_ns pair, a
+table lookup on elapsed.bit_length() and a few integer adds. Names follow
+"phase.<step>" for loop phases and "gate.<check>" for the per-trigger
+gauntlet.
+
+Readers:
+    PERF.maybe_dump(logger)   periodic PERF_METRICS audit event + data/perf_metrics.json
+    serve_metrics(port)       local HTTP: /metrics (Prometheus text), /metrics.json
+    format_report(snapshot)   text for the Telegram /perf command
+"""
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Bucket bounds are 2**bits ns, 2**17 (0.13 ms) to 2**35 (34 s); a sample lands in
+# the first bucket it is below, indexed by its bit length. The last is open-ended.
+_MIN_BITS, _MAX_BITS = 17, 35
+BUCKETS_MS = tuple(2 ** bits / 1e6 for bits in range(_MIN_BITS, _MAX_BITS + 1))
+_BUCKET_OF_BITS = tuple(min(max(bits - _MIN_BITS, 0), len(BUCKETS_MS)) for bits in range(65))
+_now_ns = time.perf_counter_ns
+
+METRICS_FILE = os.path.join("data", "perf_metrics.json")
+DUMP_INTERVAL = 900  # seconds between audit dumps
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (nanosecond samples)."""
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record_ns(self, elapsed_ns: int):
+        self.counts[_BUCKET_OF_BITS[elapsed_ns.bit_length()]] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def quantile_ms(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (the max for the open bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return BUCKETS_MS[i] if i < len(BUCKETS_MS) else self.max_ns / 1e6
+        return self.max_ns / 1e6
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ns / self.count / 1e6, 3) if self.count else 0.0,
+            "p50_ms": self.quantile_ms(0.50),
+            "p95_ms": self.quantile_ms(0.95),
+            "p99_ms": self.quantile_ms(0.99),
+            "max_ms": round(self.max_ns / 1e6, 3),
+            "total_ns": self.total_ns,
+            "buckets": list(self.counts),
+        }
+
+
+class Span(Histogram):
+    """The histogram for one name, usable as its own timing context. Not re-entrant."""
+    __slots__ = ("start",)
+
+    def __init__(self):
+        super().__init__()
+        self.start = 0
+
+    def __enter__(self):
+        self.start = _now_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # record_ns inlined: a method call is a large share of the budget
+        elapsed = _now_ns() - self.start
+        self.counts[_BUCKET_OF_BITS[elapsed.bit_length()]] += 1
+        self.count += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+        return False
+
+
+class _SpanTable(dict):
+    """name -> Span; a missing name is created under the registry lock."""
+
+    def __init__(self, lock):
+        super().__init__()
+        self._lock = lock
+
+    def __missing__(self, name):
+        with self._lock:
+            return self.setdefault(name, Span())
+
+
+class PerfRegistry:
+    """Named spans (one histogram each); one per process (PERF)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.histograms = _SpanTable(self._lock)
+        # PERF.span(name) is the table's own __getitem__: one C-level dict hit, no method frame
+        self.span = self.histograms.__getitem__
+        self.histogram = self.histograms.__getitem__
+        self.started_at = time.time()
+        self.last_dump = time.monotonic()
+
+    def record(self, name: str, seconds: float):
+        """Records an externally measured duration."""
+        self.histograms[name].record_ns(int(seconds * 1e9))
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            spans = sorted(self.histograms.items())
+        return {
+            "generated_at": time.time(),
+            "since": self.started_at,
+            "buckets_ms": list(BUCKETS_MS),
+            "spans": {name: hist.summary() for name, hist in spans},
+        }
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.started_at = time.time()
+
+    def dump(self, logger=None, path: str = METRICS_FILE) -> dict:
+        """Writes the snapshot for other processes and logs a compact PERF_METRICS event."""
+        snapshot = self.snapshot()
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(snapshot, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Perf metrics write failed: {e}")
+        if logger is not None:
+            compact = {name: [s["count"], s["p50_ms"], s["p95_ms"], s["max_ms"]]
+                       for name, s in snapshot["spans"].items()}
+            logger.log("PERF_METRICS", "System", json.dumps(compact), "INFO")
+        self.last_dump = time.monotonic()
+        return snapshot
+
+    def maybe_dump(self, logger=None, interval: float = DUMP_INTERVAL, path: str = METRICS_FILE):
+        if time.monotonic() - self.last_dump >= interval:
+            return self.dump(logger, path)
+        return None
+
+
+PERF = PerfRegistry()
+
+
+def to_prometheus(snapshot: dict) -> str:
+    """Prometheus text exposition of a snapshot (cumulative buckets, seconds)."""
+    lines = ["# TYPE sentinel_span_seconds histogram"]
+    bounds = snapshot["buckets_ms"]
+    for name, s in snapshot["spans"].items():
+        cumulative = 0
+        for bound, n in zip(bounds + [None], s["buckets"]):
+            cumulative += n
+            le = "+Inf" if bound is None else f"{bound / 1000:g}"
+            lines.append(f'sentinel_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+        lines.append(f'sentinel_span_seconds_sum{{span="{name}"}} {s["total_ns"] / 1e9:.9f}')
+        lines.append(f'sentinel_span_seconds_count{{span="{name}"}} {s["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def format_report(snapshot: dict, prefix: str = None) -> str:
+    """Plain-text table for Telegram: one line per span, slowest p95 first."""
+    spans = snapshot.get("spans", {})
+    if prefix:
+        spans = {name: s for name, s in spans.items() if name.startswith(prefix)}
+    if not spans:
+        return "⏱️ No timing data recorded yet."
+    age = int(time.time() - snapshot.get("generated_at", time.time()))
+    lines = [f"⏱️ PERF (snapshot {age}s old)", "span  n  p50/p95/max ms"]
+    for name, s in sorted(spans.items(), key=lambda kv: kv[1]["p95_ms"], reverse=True):
+        lines.append(f"{name}  {s['count']}  {s['p50_ms']:g}/{s['p95_ms']:g}/{s['max_ms']:g}")
+    return "\n".join(lines)
+
+
+def load_snapshot(path: str = METRICS_FILE):
+    """Last dumped snapshot (for processes other than main_bot), or None."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry = PERF
+
+    def do_GET(self):
+        snapshot = self.registry.snapshot()
+        if self.path.split("?")[0] == "/metrics":
+            body, content_type = to_prometheus(snapshot), "text/plain; version=0.0.4"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body, content_type = json.dumps(snapshot), "application/json"
+        else:
+            self.send_error(404)
+            return
+        payload = body.encode()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass  # keep scrapes out of the bot log
+
+
+def serve_metrics(port: int = 9108, host: str = "127.0.0.1", registry: PerfRegistry = PERF):
+    """Starts the local metrics endpoint on a daemon thread; returns the server (None if the port is taken)."""
+    handler = type("MetricsHandler", (_MetricsHandler,), {"registry": registry})
+    try:
+        server = ThreadingHTTPServer((host, port), handler)
+    except OSError as e:
+        print(f"⚠️ Metrics endpoint unavailable on {host}:{port}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="PerfMetrics", daemon=True).start()
+    return server
@@ -0,0 +1,278 @@
+"""
+Pre-market Warm-up (premarket_warmup.py)
+========================================
+Front-loads per-ticker reference data at ~14:00 UTC so the 14:30 open only
+has to fetch today's opening bars and live quotes.
+
+    summary = warm_up(client=client)         # main_bot, once per trading day
+    cache = get_warm_cache()
+    cache.get("NVDA", "atr20")               # None until warmed / after the day rolls
+
+Per ticker (bare or T212 form, e.g. "NVDA" / "NVDA_US_EQ"):
+    avg_volume    yf averageVolume, else the 30-session mean from the daily bars
+    atr20         mean High-Low of the last 20 sessions (the Volatility Guard's ATR)
+    prev_close / prev_high / prev_low         previous regular session
+    sector        raw yfinance sector
+    earnings_date next/last earnings date (New York, YYYY-MM-DD)
+    instrument    T212 ticker, currency and minimum quantity
+
+Previous sessions' daily bars are also seeded into the shared equity
+BarAggregator. Everything is valid for one New York trading date: once the
+date rolls, reads return their default until the next warm-up. Persisted to
+data/warm_cache.json so a restart during the session does not refetch.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from shared.lazy_import import lazy_import
+
+yf = lazy_import("yfinance")
+
+CACHE_FILE = "data/warm_cache.json"
+UNIVERSE_FILE = "data/master_universe.json"
+NY = ZoneInfo("America/New_York")
+NON_US_SUFFIXES = ('.L', '.DE', '.PA', '.AS', '.TO', '.HK', '.MC', '.MI')  # as the Morning Brief filters
+DAILY_PERIOD = "2mo"    # >= 30 sessions for the volume mean, 20 for ATR
+KEEP_DAILY_BARS = 30    # persisted per ticker for re-seeding after a restart
+INFO_DEADLINE = 120.0   # seconds for all yf.Ticker().info lookups together
+
+
+def trading_day() -> str:
+    """The New York calendar date the cache is valid for."""
+    return datetime.now(NY).date().isoformat()
+
+
+def _key(ticker: str) -> str:
+    return ticker[:-len("_US_EQ")] if ticker.endswith("_US_EQ") else ticker
+
+
+class WarmCache:
+    """Day-scoped per-ticker reference data, in memory with a JSON copy on disk."""
+
+    def __init__(self, path: str = CACHE_FILE):
+        self.path = path
+        self.date = None
+        self.built_at = None
+        self.tickers: Dict[str, Dict[str, Any]] = {}
+        self.bars: Dict[str, List[List[float]]] = {}
+        self._seeded = False
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.date = data.get("date")
+            self.built_at = data.get("built_at")
+            self.tickers = data.get("tickers", {})
+            self.bars = data.get("bars", {})
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Warm cache unreadable, starting cold: {e}")
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'w') as f:
+                json.dump({"date": self.date, "built_at": self.built_at, "tickers": self.tickers,
+                           "bars": self.bars}, f)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Warm cache write failed: {e}")
+
+    def replace(self, tickers: Dict[str, Dict[str, Any]], bars: Dict[str, List[List[float]]], day: str = None):
+        """Swaps in a freshly built day and persists it."""
+        with self._lock:
+            self.date = day or trading_day()
+            self.built_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+            self.tickers = tickers
+            self.bars = bars
+            self._seeded = True  # warm_up seeds the aggregator itself
+        self.save()
+
+    def is_fresh(self) -> bool:
+        return self.date == trading_day()
+
+    def entry(self, ticker: str) -> Dict[str, Any]:
+        if not self.is_fresh():
+            return {}
+        return self.tickers.get(_key(ticker), {})
+
+    def get(self, ticker: str, field: str, default=None):
+        value = self.entry(ticker).get(field)
+        return default if value is None else value
+
+    def earnings_today(self, ticker: str) -> bool:
+        # Cheap comparison first: the gauntlet asks this for every trigger
+        date = self.tickers.get(_key(ticker), {}).get("earnings_date")
+        return date is not None and date == self.date and self.is_fresh()
+
+    def seed_aggregator(self, agg=None) -> int:
+        """Re-seeds persisted daily bars into the equity aggregator (once per process, after a restart)."""
+        if self._seeded or not self.is_fresh() or not self.bars:
+            return 0
+        import pandas as pd
+        if agg is None:
+            from bar_aggregator import get_aggregator
+            agg = get_aggregator("equity")
+        added = 0
+        for ticker, rows in self.bars.items():
+            frame = pd.DataFrame(rows, columns=["ts", "Open", "High", "Low", "Close", "Volume"])
+            frame.index = pd.to_datetime(frame.pop("ts"), unit="s", utc=True)
+            added += agg.seed(ticker, "1d", frame)
+        self._seeded = True
+        return added
+
+
+_CACHE: Optional[WarmCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_warm_cache() -> WarmCache:
+    """Shared cache for this process (loaded from disk on first use)."""
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = WarmCache()
+    return _CACHE
+
+
+def load_universe(path: str = UNIVERSE_FILE) -> List[str]:
+    """US tickers from master_universe.json (the Morning Brief's scan list)."""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+        tickers = [inst['ticker'] for inst in data.get('instruments', [])]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Warm-up universe unavailable: {e}")
+        return []
+    return [t for t in tickers if not t.endswith(NON_US_SUFFIXES)]
+
+
+def _ticker_frame(data, ticker: str):
+    """One ticker's OHLCV from a batched download (any group_by layout, single or multi)."""
+    if not hasattr(data.columns, "levels"):
+        return data
+    if ticker in data.columns.get_level_values(0):
+        return data[ticker]
+    if ticker in data.columns.get_level_values(1):
+        return data.xs(ticker, axis=1, level=1)
+    return None
+
+
+def _daily_stats(frame, today: str) -> Optional[Tuple[Dict[str, Any], Any]]:
+    """(previous-session stats, completed daily bars) from a daily frame; today's partial bar is dropped."""
+    frame = frame.dropna(subset=["Close"])
+    # Naive daily indexes are exchange dates
+    index = frame.index.tz_localize(NY) if frame.index.tz is None else frame.index.tz_convert(NY)
+    frame = frame[index.strftime("%Y-%m-%d") < today]
+    if frame.empty:
+        return None
+    last = frame.iloc[-1]
+    stats = {"prev_close": float(last["Close"]), "prev_high": float(last["High"]), "prev_low": float(last["Low"]),
+             "avg_volume": int(frame["Volume"].tail(30).mean())}
+    if len(frame) >= 20:
+        stats["atr20"] = float((frame["High"] - frame["Low"]).tail(20).mean())
+    return stats, frame
+
+
+def _info_fields(ticker: str) -> Dict[str, Any]:
+    info = yf.Ticker(ticker).info or {}
+    if info:  # the same lookup refreshes the persistent metadata cache
+        from security_metadata import get_security_metadata, metadata_from_info
+        get_security_metadata().store(ticker, metadata_from_info(info))
+    fields = {"sector": info.get("sector")}
+    if info.get("averageVolume"):
+        fields["avg_volume"] = int(info["averageVolume"])
+    stamp = info.get("earningsTimestamp") or info.get("earningsTimestampStart")
+    if stamp:
+        fields["earnings_date"] = datetime.fromtimestamp(int(stamp), tz=NY).date().isoformat()
+    return fields
+
+
+def warm_up(tickers: List[str] = None, client=None, cache: WarmCache = None, workers: int = 8,
+            info_deadline: float = INFO_DEADLINE) -> Dict[str, Any]:
+    """
+    Builds today's cache for the universe: one batched daily download, then
+    yf.Ticker().info lookups on a thread pool bounded by `info_deadline`, then
+    T212 instrument metadata (re-syncing the master list if it is from a
+    previous day). Raises if no daily bars came back so the caller retries.
+    """
+    started = time.monotonic()
+    tickers = tickers or load_universe()
+    cache = cache or get_warm_cache()
+    if not tickers:
+        raise RuntimeError("Empty warm-up universe")
+    today = trading_day()
+    entries: Dict[str, Dict[str, Any]] = {t: {} for t in tickers}
+    bars: Dict[str, List[List[float]]] = {}
+
+    # 1. Previous sessions' daily bars (one request for the universe)
+    from bar_aggregator import get_aggregator, _epoch_seconds
+    agg = get_aggregator("equity")
+    data = yf.download(tickers, period=DAILY_PERIOD, interval="1d", progress=False, group_by='ticker')
+    for ticker in tickers:
+        frame = _ticker_frame(data, ticker) if data is not None and not data.empty else None
+        result = _daily_stats(frame, today) if frame is not None else None
+        if result is None:
+            continue
+        stats, frame = result
+        entries[ticker].update(stats)
+        frame = frame.tail(KEEP_DAILY_BARS)
+        agg.seed(ticker, "1d", frame)
+        bars[ticker] = [[int(epoch), *map(float, row)] for epoch, row in
+                        zip(_epoch_seconds(frame.index), frame[["Open", "High", "Low", "Close", "Volume"]].to_numpy())]
+    if not bars:
+        raise RuntimeError(f"No daily bars for {len(tickers)} tickers")
+
+    # 2. Sector, average volume and earnings date (per-ticker info, concurrently)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="warmup")
+    futures = {pool.submit(_info_fields, t): t for t in tickers}
+    done, pending = wait(futures, timeout=info_deadline)
+    pool.shutdown(wait=False, cancel_futures=True)
+    info_ok = 0
+    for future in done:
+        try:
+            entries[futures[future]].update({k: v for k, v in future.result().items() if v is not None})
+            info_ok += 1
+        except Exception as e:
+            print(f"⚠️ Warm-up info failed for {futures[future]}: {e}")
+
+    # 3. T212 instrument metadata (optional: a broker outage keeps the rest)
+    resolved = 0
+    if client is not None:
+        try:
+            master = 'data/master_instruments.json'
+            if not os.path.exists(master) or \
+                    datetime.fromtimestamp(os.path.getmtime(master), NY).date().isoformat() < today:
+                if client.sync_master_list():
+                    client._load_master_list()
+            for ticker in tickers:
+                real_ticker, inst = client.resolve_ticker(ticker)
+                if real_ticker:
+                    entries[ticker]["instrument"] = {"ticker": real_ticker, "currency": inst.get("currencyCode"),
+                                                     "min_quantity": inst.get("minTradeQuantity")}
+                    resolved += 1
+        except Exception as e:
+            print(f"⚠️ Warm-up instrument metadata skipped: {e}")
+
+    cache.replace({_key(t): e for t, e in entries.items()}, bars, today)
+    summary = {"tickers": len(tickers), "daily": len(bars), "info": info_ok, "info_timeouts": len(pending),
+               "instruments": resolved, "seconds": round(time.monotonic() - started, 1)}
+    print(f"🔥 Warm-up complete: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    from trading212_client import Trading212Client
+    warm_up(client=Trading212Client())
@@ -0,0 +1,1003 @@
+"""
+Replay Harness — Whole-day replays of the Sniper main loop (Job C).
+===================================================================
+Runs the real `main_bot.run_sniper()` loop (brief, scan, gauntlet, shield,
+curfew) against a recorded session instead of the live market and broker:
+
+  - ReplayClock:    virtual time. `datetime.utcnow()/now()`, `time.time()` and
+                    `time.sleep()` read/advance it, so each 60s loop beat is
+                    free and a trading day replays in seconds (100x+).
+  - RecordedMarket: a `yfinance` stand-in serving `download()` / `Ticker()`
+                    from disk, cut at the virtual "now" (no look-ahead). The
+                    forming 1m bar is provisional (its open only).
+  - FakeBroker:     in-process Trading212Client: fills at the recorded price
+                    (+ slippage), positions with live P&L, account values.
+
+Recording (capture mode) wraps the live yfinance/Trading212 calls and writes
+every fetched bar, info snapshot and broker response for the day:
+
+    data/replay/<YYYY-MM-DD>/
+        bars/<interval>/<TICKER>.csv     OHLCV, UTC index
+        info.json                        ticker -> yf.Ticker().info subset
+        broker.jsonl                     {"ts", "method", "args", "response"}
+        files/                           data/*.json snapshot (universe, caches)
+
+Usage:
+    SENTINEL_CAPTURE=1 python main_bot.py           # live session + capture
+    python replay_harness.py --date 2026-10-16      # replay it
+    python replay_harness.py --date 2026-10-16 --start 14:20 --end 21:10 --speed 200
+"""
+
+import atexit
+import csv
+import functools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import types
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from bar_aggregator import _epoch_seconds
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+REPLAY_ROOT = os.path.join("data", "replay")
+
+OHLCV = ["Open", "High", "Low", "Close", "Volume"]
+INTRADAY_MINUTES = {"1m": 1, "2m": 2, "5m": 5, "15m": 15, "30m": 30, "60m": 60, "90m": 90, "1h": 60}
+MARKET_TZ = "America/New_York"
+
+# data/ files copied into the capture and restored into the replay sandbox
+SNAPSHOT_FILES = ("master_universe.json", "master_instruments.json", "instruments.json",
+                  "strategic_holdings.json", "excluded_tickers.json", "sector_map.json",
+                  "macro_phase_cache.json", "eod_balance.json", "session_whitelist.json")
+
+# yf.Ticker().info keys worth keeping (the full dict is ~150 keys per ticker)
+INFO_FIELDS = ("averageVolume", "averageVolume10days", "bid", "ask", "bidSize", "askSize",
+               "sector", "industry", "shortName", "longName", "currency", "exchange",
+               "marketCap", "trailingPE", "forwardPE", "beta", "earningsTimestamp")
+
+BROKER_METHODS = ("get_account_summary", "get_account_info", "get_positions", "get_open_orders",
+                  "execute_order", "place_limit_order", "cancel_order")
+
+# Modules whose `datetime`, `yf` and `Trading212Client` globals are swapped during a replay
+REPLAY_MODULES = ("main_bot", "strategy_engine", "strategic_moat", "session_manager", "auditor",
+                  "macro_clock", "audit_log", "bar_aggregator", "trading212_client", "telegram_bot",
+                  "premarket_warmup", "security_metadata")
+
+_REAL_DATETIME = datetime
+_REAL_TIME = time.time
+_REAL_SLEEP = time.sleep
+
+
+def _safe_name(ticker: str) -> str:
+    return ticker.replace("/", "_").replace("\\", "_")
+
+
+def _split_download(data, tickers: List[str]):
+    """Yields (ticker, OHLCV frame) from a yf.download result (any group_by layout)."""
+    if data is None or data.empty:
+        return
+    if not hasattr(data.columns, "levels"):
+        if len(tickers) == 1:
+            yield tickers[0], data
+        return
+    for ticker in tickers:
+        try:
+            if ticker in data.columns.get_level_values(0):
+                yield ticker, data[ticker]
+            else:
+                yield ticker, data.xs(ticker, axis=1, level=1)
+        except (KeyError, ValueError):
+            continue
+
+
+def _normalise_tickers(tickers) -> List[str]:
+    if isinstance(tickers, str):
+        return tickers.replace(",", " ").split()
+    return list(tickers)
+
+
+def _period_days(period: Optional[str]) -> Optional[float]:
+    """'5d' -> 5, '1mo' -> 30, '1y' -> 365, 'max'/None -> None."""
+    if not period or period in ("max", "ytd"):
+        return None
+    for suffix, days in (("mo", 30), ("wk", 7), ("d", 1), ("y", 365)):
+        if period.endswith(suffix):
+            try:
+                return float(period[:-len(suffix)]) * days
+            except ValueError:
+                return None
+    return None
+
+
+class ReplayComplete(BaseException):
+    """Raised by the clock at the end of the replay window. A BaseException so
+    run_sniper's `except Exception` loop guard does not swallow it."""
+
+
+# --- CLOCK ---
+class ReplayClock:
+    """Virtual wall clock. sleep() advances it; with `speed`, it also sleeps
+    for real (seconds / speed), otherwise replay runs as fast as it can."""
+
+    def __init__(self, start: datetime, end: datetime, speed: Optional[float] = None):
+        self._now = start.timestamp()
+        self.start = start.timestamp()
+        self.end = end.timestamp()
+        self.speed = speed
+        self.sleeps = 0
+
+    def time(self) -> float:
+        return self._now
+
+    def utcnow(self) -> datetime:
+        return _REAL_DATETIME.fromtimestamp(self._now, timezone.utc).replace(tzinfo=None)
+
+    def now(self, tz=None) -> datetime:
+        if tz is None:
+            return _REAL_DATETIME.fromtimestamp(self._now)
+        return _REAL_DATETIME.fromtimestamp(self._now, tz)
+
+    def sleep(self, seconds: float):
+        self.sleeps += 1
+        if self.speed:
+            _REAL_SLEEP(max(seconds, 0) / self.speed)
+        self._now += max(seconds, 0)
+        if self._now >= self.end:
+            raise ReplayComplete()
+
+
+class _DatetimeMeta(type(_REAL_DATETIME)):
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, _REAL_DATETIME)
+
+    def __subclasscheck__(cls, sub):
+        return issubclass(sub, _REAL_DATETIME)
+
+
+def _make_datetime(clock: ReplayClock):
+    """A datetime class whose now()/utcnow()/today() read the replay clock."""
+
+    class ReplayDatetime(_REAL_DATETIME, metaclass=_DatetimeMeta):
+        @classmethod
+        def now(cls, tz=None):
+            return clock.now(tz)
+
+        @classmethod
+        def utcnow(cls):
+            return clock.utcnow()
+
+        @classmethod
+        def today(cls):
+            return clock.now()
+
+    return ReplayDatetime
+
+
+# --- RECORDED SESSION ---
+class RecordedSession:
+    """Read access to one captured day under data/replay/<date>/."""
+
+    def __init__(self, day: str, root: str = REPLAY_ROOT):
+        self.day = day
+        self.path = os.path.join(root, day)
+        if not os.path.isdir(self.path):
+            raise FileNotFoundError(f"No recorded session at {self.path}")
+        self._frames: Dict[tuple, Any] = {}
+        self._info = None
+
+    def intervals(self) -> List[str]:
+        bars = os.path.join(self.path, "bars")
+        return sorted(os.listdir(bars)) if os.path.isdir(bars) else []
+
+    def frame(self, ticker: str, interval: str):
+        """Recorded OHLCV frame (UTC index) or None."""
+        key = (interval, ticker)
+        if key not in self._frames:
+            import pandas as pd
+            path = os.path.join(self.path, "bars", interval, f"{_safe_name(ticker)}.csv")
+            frame = None
+            if os.path.exists(path):
+                frame = pd.read_csv(path, index_col=0)
+                frame.index = pd.to_datetime(frame.index, utc=True)
+                frame = frame[~frame.index.duplicated(keep="last")].sort_index()
+            self._frames[key] = frame
+        return self._frames[key]
+
+    def epochs(self, ticker: str, interval: str):
+        """Bar start epochs of frame(ticker, interval), computed once."""
+        key = ("epochs", interval, ticker)
+        if key not in self._frames:
+            frame = self.frame(ticker, interval)
+            self._frames[key] = None if frame is None else _epoch_seconds(frame.index)
+        return self._frames[key]
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        if self._info is None:
+            try:
+                with open(os.path.join(self.path, "info.json"), "r") as f:
+                    self._info = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._info = {}
+        return dict(self._info.get(ticker, {}))
+
+    def broker_records(self):
+        try:
+            with open(os.path.join(self.path, "broker.jsonl"), "r") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def broker_seed(self) -> Dict[str, Any]:
+        """Opening cash and positions from the first recorded broker responses."""
+        seed: Dict[str, Any] = {}
+        for rec in self.broker_records():
+            resp, method = rec.get("response"), rec.get("method")
+            if "cash" not in seed and isinstance(resp, dict):
+                if method == "get_account_summary" and "free" in resp:
+                    seed["cash"] = float(resp["free"])
+                elif method == "get_account_info" and isinstance(resp.get("cash"), dict):
+                    seed["cash"] = float(resp["cash"].get("availableToTrade", 0.0))
+            if "positions" not in seed and method == "get_positions" and isinstance(resp, list):
+                seed["positions"] = resp
+            if len(seed) == 2:
+                break
+        return seed
+
+    def restore_files(self, data_dir: str):
+        src = os.path.join(self.path, "files")
+        os.makedirs(data_dir, exist_ok=True)
+        if os.path.isdir(src):
+            for name in os.listdir(src):
+                shutil.copy2(os.path.join(src, name), os.path.join(data_dir, name))
+
+
+class _FastInfo(dict):
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class RecordedMarket:
+    """yfinance stand-in over a RecordedSession, cut at the clock's now."""
+
+    def __init__(self, session: RecordedSession, clock: ReplayClock, default_spread: float = 0.0002):
+        self.session = session
+        self.clock = clock
+        self.default_spread = default_spread
+        self.calls = Counter()
+
+    # --- bars ---
+    def _minute_bars(self, ticker: str):
+        """1m bars up to now: closed bars, plus the forming one reduced to its open."""
+        import numpy as np
+        frame = self.session.frame(ticker, "1m")
+        if frame is None or frame.empty:
+            return None
+        epochs = self.session.epochs(ticker, "1m")
+        now = self.clock.time()
+        cut = int(np.searchsorted(epochs, now, side="right"))
+        out = frame.iloc[:cut][OHLCV].copy()
+        if cut and epochs[cut - 1] + 60 > now:
+            first = out.iloc[-1]["Open"]
+            out.iloc[-1, out.columns.get_indexer(["High", "Low", "Close", "Volume"])] = [first, first, first, 0.0]
+        return out
+
+    def _intraday(self, ticker: str, interval: str):
+        bars = self._minute_bars(ticker)
+        if interval != "1m" and (bars is None or bars.empty):
+            recorded = self.session.frame(ticker, interval)
+            if recorded is None:
+                return None
+            # No 1m tape: serve recorded bars that had fully closed by now
+            step = INTRADAY_MINUTES[interval] * 60
+            return recorded[recorded.index + _td(step) <= self._now_ts()][OHLCV]
+        if bars is None or interval == "1m":
+            return bars
+        minutes = INTRADAY_MINUTES[interval]
+        local = bars.tz_convert(MARKET_TZ)
+        # Buckets anchored to the 09:30 open, like yfinance's US intraday bars
+        offset = f"{(9 * 60 + 30) % minutes}min"
+        agg = local.resample(f"{minutes}min", offset=offset).agg(
+            {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"})
+        return agg.dropna(subset=["Close"]).tz_convert("UTC")
+
+    def _daily(self, ticker: str):
+        import pandas as pd
+        now_local = self._now_ts().tz_convert(MARKET_TZ)
+        today = now_local.normalize()
+        recorded = self.session.frame(ticker, "1d")
+        parts = []
+        if recorded is not None and not recorded.empty:
+            local_days = recorded.index.tz_convert(MARKET_TZ).normalize()
+            parts.append(recorded[local_days < today][OHLCV])
+        minutes = self._minute_bars(ticker)
+        if minutes is not None and not minutes.empty:
+            session = minutes[minutes.index.tz_convert(MARKET_TZ).normalize() == today]
+            if not session.empty:
+                parts.append(pd.DataFrame({
+                    "Open": [session["Open"].iloc[0]], "High": [session["High"].max()],
+                    "Low": [session["Low"].min()], "Close": [session["Close"].iloc[-1]],
+                    "Volume": [session["Volume"].sum()],
+                }, index=[today.tz_convert("UTC")]))
+        if not parts:
+            return None
+        return pd.concat(parts)
+
+    def _now_ts(self):
+        import pandas as pd
+        return pd.Timestamp(self.clock.time(), unit="s", tz="UTC")
+
+    def history(self, ticker: str, period: Optional[str] = "1mo", interval: str = "1d", **_):
+        """One ticker's bars as yfinance would have returned them at the virtual now."""
+        import pandas as pd
+        self.calls[f"history:{interval}"] += 1
+        if interval in INTRADAY_MINUTES:
+            frame = self._intraday(ticker, interval)
+        else:
+            frame = self._daily(ticker)
+            if frame is not None and interval in ("1wk", "1mo", "3mo"):
+                rule = {"1wk": "W-MON", "1mo": "MS", "3mo": "QS"}[interval]
+                frame = frame.resample(rule).agg(
+                    {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+                ).dropna(subset=["Close"])
+        if frame is None or frame.empty:
+            return pd.DataFrame(columns=OHLCV)
+
+        days = _period_days(period)
+        local_days = frame.index.tz_convert(MARKET_TZ).normalize()
+        if days is not None:
+            if interval in INTRADAY_MINUTES and period.endswith("d"):
+                keep = sorted(set(local_days))[-int(days):]
+                frame = frame[local_days.isin(keep)]
+            else:
+                frame = frame[frame.index >= self._now_ts() - pd.Timedelta(days=days)]
+        if interval in INTRADAY_MINUTES:
+            return frame.tz_convert(MARKET_TZ)
+        frame = frame.copy()
+        frame.index = frame.index.tz_convert(MARKET_TZ).normalize()
+        return frame
+
+    def download(self, tickers, period: Optional[str] = "1mo", interval: str = "1d",
+                 group_by: str = "column", **kwargs):
+        import pandas as pd
+        self.calls["download"] += 1
+        symbols = _normalise_tickers(tickers)
+        frames = {t: self.history(t, period=period, interval=interval) for t in symbols}
+        frames = {t: f for t, f in frames.items() if not f.empty}
+        if len(symbols) == 1:
+            return frames.get(symbols[0], pd.DataFrame(columns=OHLCV))
+        if not frames:
+            return pd.DataFrame()
+        data = pd.concat(frames, axis=1)
+        if group_by != "ticker":
+            data = data.swaplevel(0, 1, axis=1).sort_index(axis=1)
+        return data
+
+    def last_price(self, ticker: str) -> Optional[float]:
+        bars = self._minute_bars(ticker)
+        if bars is not None and not bars.empty:
+            return float(bars["Close"].iloc[-1])
+        daily = self._daily(ticker)
+        if daily is not None and not daily.empty:
+            return float(daily["Close"].iloc[-1])
+        return None
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        """Recorded info with bid/ask re-centred on the current price (same relative spread)."""
+        self.calls["info"] += 1
+        info = self.session.info(ticker)
+        price = self.last_price(ticker)
+        if price is None:
+            return info
+        bid, ask = info.get("bid") or 0, info.get("ask") or 0
+        spread = (ask - bid) / ((ask + bid) / 2) if bid > 0 and ask > 0 else None
+        if spread is not None:
+            info["bid"] = round(price * (1 - spread / 2), 4)
+            info["ask"] = round(price * (1 + spread / 2), 4)
+        info["currentPrice"] = info["regularMarketPrice"] = price
+        return info
+
+    def ticker(self, symbol: str):
+        market = self
+
+        class _ReplayTicker:
+            def __init__(self):
+                self.ticker = symbol
+
+            @property
+            def info(self):
+                return market.info(symbol)
+
+            @property
+            def fast_info(self):
+                price = market.last_price(symbol)
+                return _FastInfo(last_price=price, lastPrice=price)
+
+            def history(self, period="1mo", interval="1d", **kwargs):
+                return market.history(symbol, period=period, interval=interval, **kwargs)
+
+        return _ReplayTicker()
+
+    def as_module(self):
+        """A module object that can stand in for `yfinance`."""
+        module = types.ModuleType("yfinance")
+        module.download = self.download
+        module.Ticker = self.ticker
+        module.__replay__ = True
+        return module
+
+
+def _td(seconds):
+    import pandas as pd
+    return pd.Timedelta(seconds=seconds)
+
+
+# --- FAKE BROKER ---
+class FakeBroker:
+    """
+    In-process Trading212Client for replays. Market orders fill at the current
+    recorded price +/- slippage; limit orders fill once marketable.
+    """
+
+    def __init__(self, market: RecordedMarket, cash: float = 10000.0, positions=None,
+                 slippage_bps: float = 2.0):
+        self.market = market
+        self.cash = float(cash)
+        self.slippage = slippage_bps / 10000.0
+        self.realized = 0.0
+        self.fills: List[Dict[str, Any]] = []
+        self.orders: Dict[int, Dict[str, Any]] = {}
+        self.messages: List[str] = []
+        self._next_id = 1
+        self._positions: Dict[str, Dict[str, Any]] = {}
+        for pos in positions or []:
+            qty = float(pos.get("quantity", 0))
+            if qty:
+                self._positions[pos["ticker"]] = {
+                    "quantity": qty,
+                    "averagePrice": float(pos.get("averagePrice", pos.get("currentPrice", 0.0))),
+                    "fallback": float(pos.get("currentPrice", pos.get("averagePrice", 0.0))),
+                }
+        # Trading212Client attributes other modules read
+        self.base_url = "replay://trading212"
+        self.bot_token = None
+        self.chat_id = None
+        self.gemini_key = ""
+        self.instrument_map = {}
+        self.shortname_map = {}
+
+    def _price(self, ticker: str) -> float:
+        price = self.market.last_price(ticker)
+        if price is None:
+            held = self._positions.get(ticker)
+            return held["fallback"] if held else 0.0
+        return price
+
+    # --- account ---
+    def get_positions(self):
+        self._match_orders()
+        out = []
+        for ticker, pos in self._positions.items():
+            price = self._price(ticker)
+            out.append({
+                "ticker": ticker,
+                "quantity": pos["quantity"],
+                "averagePrice": pos["averagePrice"],
+                "currentPrice": price,
+                "ppl": (price - pos["averagePrice"]) * pos["quantity"],
+                "value": price * pos["quantity"],
+            })
+        return out
+
+    get_open_positions = get_positions
+
+    def _invested(self):
+        positions = self.get_positions()
+        return sum(p["value"] for p in positions), sum(p["ppl"] for p in positions)
+
+    def get_account_summary(self):
+        value, ppl = self._invested()
+        return {"free": self.cash, "total": self.cash + value, "invested": value - ppl,
+                "ppl": ppl, "result": self.realized, "blocked": 0.0, "pieCash": 0.0}
+
+    def get_account_info(self):
+        value, ppl = self._invested()
+        return {
+            "totalValue": self.cash + value,
+            "cash": {"availableToTrade": self.cash, "reservedForOrders": 0.0, "inPies": 0.0},
+            "investments": {"currentValue": value, "totalCost": value - ppl,
+                            "unrealizedProfitLoss": ppl, "realizedProfitLoss": self.realized},
+        }
+
+    # --- orders ---
+    def _fill(self, ticker: str, quantity: float, side: str, price: float, order_id: int):
+        side = side.upper()
+        held = self._positions.get(ticker)
+        if side == "SELL":
+            quantity = min(quantity, held["quantity"] if held else 0.0)
+            if quantity <= 0:
+                return {"status": "FAILED", "error": "Selling equity not owned"}
+        elif quantity * price > self.cash + 1e-9:
+            return {"status": "FAILED", "error": "Insufficient funds"}
+
+        if side == "BUY":
+            self.cash -= quantity * price
+            if held:
+                total = held["quantity"] + quantity
+                held["averagePrice"] = (held["averagePrice"] * held["quantity"] + price * quantity) / total
+                held["quantity"] = total
+            else:
+                self._positions[ticker] = {"quantity": quantity, "averagePrice": price, "fallback": price}
+        else:
+            self.cash += quantity * price
+            self.realized += (price - held["averagePrice"]) * quantity
+            held["quantity"] -= quantity
+            if held["quantity"] <= 1e-9:
+                del self._positions[ticker]
+
+        fill = {"id": order_id, "ticker": ticker, "side": side, "quantity": quantity, "price": price,
+                "time": self.market.clock.utcnow().isoformat()}
+        self.fills.append(fill)
+        return {"id": order_id, "status": "FILLED", "ticker": ticker,
+                "quantity": quantity if side == "BUY" else -quantity,
+                "filledQuantity": quantity, "fillPrice": price}
+
+    def execute_order(self, ticker, quantity, side="BUY"):
+        price = self._price(ticker)
+        if price <= 0:
+            return {"status": "FAILED", "error": "No price"}
+        sign = 1 if side.upper() == "BUY" else -1
+        order_id = self._next_id
+        self._next_id += 1
+        return self._fill(ticker, abs(float(quantity)), side, price * (1 + sign * self.slippage), order_id)
+
+    def place_limit_order(self, ticker, quantity, limit_price, side="BUY"):
+        order_id = self._next_id
+        self._next_id += 1
+        qty = abs(float(quantity))
+        self.orders[order_id] = {"id": order_id, "ticker": ticker, "quantity": qty if side.upper() == "BUY" else -qty,
+                                 "limitPrice": float(limit_price), "side": side.upper(), "status": "NEW"}
+        filled = self._match_orders(order_id)
+        return filled or dict(self.orders[order_id])
+
+    def _match_orders(self, only: Optional[int] = None):
+        result = None
+        for order_id in [only] if only else list(self.orders):
+            order = self.orders.get(order_id)
+            if not order:
+                continue
+            price = self._price(order["ticker"])
+            marketable = price > 0 and (price <= order["limitPrice"] if order["side"] == "BUY"
+                                        else price >= order["limitPrice"])
+            if marketable:
+                del self.orders[order_id]
+                result = self._fill(order["ticker"], abs(order["quantity"]), order["side"], price, order_id)
+        return result
+
+    def get_open_orders(self):
+        self._match_orders()
+        return [dict(o) for o in self.orders.values()]
+
+    def cancel_order(self, order_id):
+        order = self.orders.pop(int(order_id), None)
+        return {"status": "CANCELLED"} if order else {"status": "FAILED", "error": "Order not found"}
+
+    # --- instruments / misc ---
+    def resolve_ticker(self, input_ticker):
+        return (input_ticker, {}) if self.market.last_price(input_ticker) is not None else (None, None)
+
+    def validate_ticker(self, ticker):
+        return {"ticker": ticker} if self.market.last_price(ticker) is not None else None
+
+    def get_instrument_metadata(self, ticker):
+        return {"ticker": ticker} if self.validate_ticker(ticker) else {}
+
+    def calculate_max_buy(self, ticker, cash, price):
+        if price <= 0: return 0
+        return int(cash / price)
+
+    def gemini_query(self, prompt):
+        return ""
+
+    def send_telegram(self, message, use_krypto_channel=False):
+        self.messages.append(message)
+        return True
+
+
+def _make_alerts(sink: List[Dict[str, Any]], clock: ReplayClock):
+    """SovereignAlerts with delivery replaced by an in-memory sink (formatting stays real)."""
+    from telegram_bot import SovereignAlerts
+
+    class ReplayAlerts(SovereignAlerts):
+        def __init__(self, use_krypto_channel=False):
+            self.client = None
+            self.use_krypto_channel = use_krypto_channel
+
+        def send_message(self, msg):
+            sink.append({"time": clock.utcnow().isoformat(), "text": msg})
+
+    return ReplayAlerts
+
+
+# --- PATCHING ---
+class _Patches:
+    """Attribute swaps applied for the duration of a replay, restored in reverse."""
+
+    def __init__(self):
+        self._saved = []
+
+    def set(self, obj, name, value):
+        missing = not hasattr(obj, name)
+        self._saved.append((obj, name, None if missing else getattr(obj, name), missing))
+        setattr(obj, name, value)
+
+    def set_item(self, mapping, key, value):
+        self._saved.append((mapping, key, mapping.get(key), key not in mapping))
+        mapping[key] = value
+
+    def restore(self):
+        while self._saved:
+            obj, name, old, missing = self._saved.pop()
+            if isinstance(obj, dict):
+                if missing:
+                    obj.pop(name, None)
+                else:
+                    obj[name] = old
+            elif missing:
+                delattr(obj, name)
+            else:
+                setattr(obj, name, old)
+
+
+def _install(clock: ReplayClock, market: RecordedMarket, broker: FakeBroker, alerts_sink) -> _Patches:
+    import importlib
+    import datetime as datetime_module
+    modules = [importlib.import_module(name) for name in REPLAY_MODULES]
+    from trading212_client import Trading212Client as real_client
+
+    patches = _Patches()
+    fake_dt = _make_datetime(clock)
+    fake_yf = market.as_module()
+    alerts_cls = _make_alerts(alerts_sink, clock)
+    client_factory = lambda *args, **kwargs: broker  # noqa: E731
+
+    patches.set(time, "time", clock.time)
+    patches.set(time, "sleep", clock.sleep)
+    patches.set(datetime_module, "datetime", fake_dt)
+    patches.set_item(sys.modules, "yfinance", fake_yf)
+    for module in modules:
+        if getattr(module, "datetime", None) is _REAL_DATETIME:
+            patches.set(module, "datetime", fake_dt)
+        if hasattr(module, "yf"):
+            patches.set(module, "yf", fake_yf)
+        if getattr(module, "Trading212Client", None) is real_client:
+            patches.set(module, "Trading212Client", client_factory)
+        if hasattr(module, "SovereignAlerts"):
+            patches.set(module, "SovereignAlerts", alerts_cls)
+
+    # Offline: no central audit DB writes, no LLM phase calls, fresh bar state
+    import audit_log, macro_clock, auditor, bar_aggregator, premarket_warmup, security_metadata
+    patches.set(audit_log, "_load_central_logger_class", lambda: None)
+    patches.set(audit_log, "_STDIO_WRAPPED", True)  # leave the caller's stdout/stderr alone
+    patches.set(macro_clock, "COUNCIL_AVAILABLE", False)
+    patches.set(macro_clock, "GEMINI_AVAILABLE", False)
+    patches.set(auditor, "GEMINI_AVAILABLE", False)
+    patches.set(bar_aggregator, "_AGGREGATORS", {})
+    patches.set(premarket_warmup, "_CACHE", None)  # loaded from the sandbox's data/ on first use
+    patches.set(security_metadata, "_STORE", None)
+    patches.set(security_metadata, "DB_PATH", "data/security_metadata.db")  # the sandbox, not $SECURITY_METADATA_DB
+    # Fresh phase timings, and no local /metrics listener from inside a replay
+    import main_bot, perf_metrics
+    patches.set(main_bot, "serve_metrics", lambda *args, **kwargs: None)
+    patches.set(main_bot, "PERF", perf_metrics.PerfRegistry())
+    return patches
+
+
+# --- REPLAY ---
+def run_replay(day: str, start: str = "14:00", end: str = "21:15", speed: Optional[float] = None,
+               root: str = REPLAY_ROOT, workdir: Optional[str] = None, cash: Optional[float] = None,
+               slippage_bps: float = 2.0, quiet: bool = False) -> Dict[str, Any]:
+    """
+    Replays `main_bot.run_sniper()` over a recorded day between start and end
+    (HH:MM UTC). Runs in a sandbox working directory so lock files, targets
+    and audit logs never touch the live data/ folder. Returns a report dict.
+    """
+    root = os.path.abspath(root)
+    session = RecordedSession(day, root)
+    d = _REAL_DATETIME.strptime(day, "%Y-%m-%d")
+    start_dt = _REAL_DATETIME.strptime(f"{day} {start}", "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+    end_dt = _REAL_DATETIME.strptime(f"{day} {end}", "%Y-%m-%d %H:%M").replace(tzinfo=timezone.utc)
+    if end_dt <= start_dt:
+        end_dt += timedelta(days=1)
+
+    clock = ReplayClock(start_dt, end_dt, speed)
+    market = RecordedMarket(session, clock)
+    seed = session.broker_seed()
+    broker = FakeBroker(market, cash=seed.get("cash", 10000.0) if cash is None else cash,
+                        positions=seed.get("positions"), slippage_bps=slippage_bps)
+    alerts: List[Dict[str, Any]] = []
+
+    sandbox = workdir or tempfile.mkdtemp(prefix=f"replay_{d:%Y%m%d}_")
+    session.restore_files(os.path.join(sandbox, "data"))
+
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    cwd = os.getcwd()
+    stdout = sys.stdout
+    outcome = "COMPLETE"
+    wall_start = _REAL_TIME()
+    patches = _install(clock, market, broker, alerts)
+    try:
+        os.chdir(sandbox)
+        if quiet:
+            sys.stdout = open(os.devnull, "w", encoding="utf-8")
+        import main_bot
+        main_bot.run_sniper()
+    except ReplayComplete:
+        pass
+    except SystemExit as e:
+        outcome = f"EXIT({e.code})"
+    finally:
+        patches.restore()
+        if quiet:
+            sys.stdout.close()
+            sys.stdout = stdout
+        os.chdir(cwd)
+    wall = _REAL_TIME() - wall_start
+
+    events = Counter()
+    log_path = os.path.join(sandbox, "data", "audit_log.csv")
+    if os.path.exists(log_path):
+        with open(log_path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                events[row["Action"]] += 1
+
+    virtual = clock.time() - clock.start
+    return {
+        "date": day,
+        "outcome": outcome,
+        "sandbox": sandbox,
+        "virtual_seconds": virtual,
+        "wall_seconds": wall,
+        "speedup": virtual / wall if wall > 0 else float("inf"),
+        "loops": clock.sleeps,
+        "fills": broker.fills,
+        "alerts": alerts,
+        "events": dict(events),
+        "account": broker.get_account_info(),
+        "positions": broker.get_positions(),
+        "market_calls": dict(market.calls),
+    }
+
+
+# --- CAPTURE ---
+class SessionRecorder:
+    """
+    Records live market data and broker responses for later replay. Bars are
+    merged in memory and flushed every `flush_interval` seconds (and at exit);
+    broker responses are appended to broker.jsonl as they happen.
+    """
+
+    def __init__(self, root: str = REPLAY_ROOT, day: Optional[str] = None, flush_interval: float = 300):
+        self.root = os.path.abspath(root)
+        self.day = day or _REAL_DATETIME.now(timezone.utc).strftime("%Y-%m-%d")
+        self.path = os.path.join(self.root, self.day)
+        self.flush_interval = flush_interval
+        self._frames: Dict[tuple, Any] = {}
+        self._dirty = set()
+        self._info: Dict[str, Dict[str, Any]] = {}
+        self._last_flush = _REAL_TIME()
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        try:
+            with open(os.path.join(self.path, "info.json"), "r") as f:
+                self._info = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+    def snapshot_files(self, data_dir: str = "data"):
+        dest = os.path.join(self.path, "files")
+        os.makedirs(dest, exist_ok=True)
+        for name in SNAPSHOT_FILES:
+            src = os.path.join(data_dir, name)
+            if os.path.exists(src):
+                shutil.copy2(src, os.path.join(dest, name))
+
+    def record_frame(self, ticker: str, interval: str, frame):
+        import pandas as pd
+        if frame is None or frame.empty:
+            return
+        frame = frame[[c for c in OHLCV if c in frame.columns]].dropna(subset=["Close"])
+        if frame.empty:
+            return
+        frame = frame.copy()
+        frame.index = (frame.index.tz_localize("UTC") if frame.index.tz is None
+                       else frame.index.tz_convert("UTC"))
+        key = (interval, ticker)
+        with self._lock:
+            old = self._frames.get(key)
+            if old is None:
+                old = self._load(interval, ticker)
+            merged = frame if old is None else pd.concat([old, frame])
+            self._frames[key] = merged[~merged.index.duplicated(keep="last")].sort_index()
+            self._dirty.add(key)
+        self._maybe_flush()
+
+    def _load(self, interval: str, ticker: str):
+        import pandas as pd
+        path = os.path.join(self.path, "bars", interval, f"{_safe_name(ticker)}.csv")
+        if not os.path.exists(path):
+            return None
+        frame = pd.read_csv(path, index_col=0)
+        frame.index = pd.to_datetime(frame.index, utc=True)
+        return frame
+
+    def record_download(self, tickers, interval: str, data):
+        for ticker, frame in _split_download(data, _normalise_tickers(tickers)):
+            self.record_frame(ticker, interval, frame)
+
+    def record_info(self, ticker: str, info):
+        if not isinstance(info, dict):
+            return
+        kept = {k: info[k] for k in INFO_FIELDS if info.get(k) is not None}
+        with self._lock:
+            self._info[ticker] = kept
+            self._dirty.add(("info", ticker))
+        self._maybe_flush()
+
+    def record_broker(self, method: str, args, response):
+        rec = {"ts": _REAL_TIME(), "method": method, "args": args, "response": response}
+        try:
+            line = json.dumps(rec, default=str)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            with open(os.path.join(self.path, "broker.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def _maybe_flush(self):
+        if _REAL_TIME() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            self._last_flush = _REAL_TIME()
+            for key in dirty:
+                if key[0] == "info":
+                    continue
+                interval, ticker = key
+                folder = os.path.join(self.path, "bars", interval)
+                os.makedirs(folder, exist_ok=True)
+                self._frames[key].to_csv(os.path.join(folder, f"{_safe_name(ticker)}.csv"))
+            if any(k[0] == "info" for k in dirty):
+                with open(os.path.join(self.path, "info.json"), "w") as f:
+                    json.dump(self._info, f, indent=2, default=str)
+
+    # --- wrappers ---
+    def wrap_download(self, real):
+        @functools.wraps(real)
+        def download(tickers, *args, **kwargs):
+            data = real(tickers, *args, **kwargs)
+            try:
+                self.record_download(tickers, kwargs.get("interval", "1d"), data)
+            except Exception as e:
+                print(f"⚠️ Capture failed (download): {e}")
+            return data
+        return download
+
+    def wrap_ticker(self, real_cls):
+        recorder = self
+
+        class RecordingTicker:
+            def __init__(self, ticker, *args, **kwargs):
+                self._ticker = ticker
+                self._real = real_cls(ticker, *args, **kwargs)
+
+            @property
+            def info(self):
+                info = self._real.info
+                try:
+                    recorder.record_info(self._ticker, info)
+                except Exception as e:
+                    print(f"⚠️ Capture failed (info): {e}")
+                return info
+
+            def history(self, *args, **kwargs):
+                frame = self._real.history(*args, **kwargs)
+                try:
+                    recorder.record_frame(self._ticker, kwargs.get("interval", "1d"), frame)
+                except Exception as e:
+                    print(f"⚠️ Capture failed (history): {e}")
+                return frame
+
+            def __getattr__(self, name):
+                return getattr(self._real, name)
+
+        return RecordingTicker
+
+    def wrap_broker_method(self, name: str, real):
+        @functools.wraps(real)
+        def method(client, *args, **kwargs):
+            response = real(client, *args, **kwargs)
+            try:
+                self.record_broker(name, list(args) + ([kwargs] if kwargs else []), response)
+            except Exception as e:
+                print(f"⚠️ Capture failed ({name}): {e}")
+            return response
+        return method
+
+
+_RECORDER: Optional[SessionRecorder] = None
+
+
+def enable_capture(root: str = REPLAY_ROOT, flush_interval: float = 300) -> SessionRecorder:
+    """
+    Capture mode for live sessions: wraps yfinance and Trading212Client so
+    every fetched bar, info snapshot and broker response lands in today's
+    replay folder. Call once at startup; idempotent.
+    """
+    global _RECORDER
+    if _RECORDER is not None:
+        return _RECORDER
+    import yfinance as yf
+    from trading212_client import Trading212Client
+
+    recorder = SessionRecorder(root, flush_interval=flush_interval)
+    recorder.snapshot_files()
+    yf.download = recorder.wrap_download(yf.download)
+    yf.Ticker = recorder.wrap_ticker(yf.Ticker)
+    for name in BROKER_METHODS:
+        setattr(Trading212Client, name, recorder.wrap_broker_method(name, getattr(Trading212Client, name)))
+    Trading212Client.get_open_positions = Trading212Client.get_positions
+    atexit.register(recorder.flush)
+    _RECORDER = recorder
+    print(f"🎥 CAPTURE MODE: recording session to {recorder.path}")
+    return recorder
+
+
+def _print_report(report: Dict[str, Any]):
+    print(f"\n🎬 REPLAY {report['date']} — {report['outcome']}")
+    print(f"   {report['virtual_seconds'] / 3600:.2f}h virtual in {report['wall_seconds']:.1f}s wall "
+          f"({report['speedup']:.0f}x, {report['loops']} loop beats)")
+    print(f"   Fills: {len(report['fills'])}")
+    for fill in report["fills"]:
+        print(f"     {fill['time'][11:19]} {fill['side']:<4} {fill['ticker']:<8} "
+              f"{fill['quantity']:.2f} @ {fill['price']:.2f}")
+    acct = report["account"]
+    print(f"   Account: total {acct['totalValue']:,.2f} | cash {acct['cash']['availableToTrade']:,.2f} | "
+          f"realized {acct['investments']['realizedProfitLoss']:+,.2f}")
+    print(f"   Alerts: {len(report['alerts'])}")
+    top = sorted(report["events"].items(), key=lambda kv: -kv[1])[:15]
+    print("   Events: " + ", ".join(f"{k}={v}" for k, v in top))
+    print(f"   Sandbox: {report['sandbox']}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay a recorded Sniper session")
+    parser.add_argument("--date", required=True, help="Recorded day (YYYY-MM-DD)")
+    parser.add_argument("--start", default="14:00", help="Virtual start time, UTC HH:MM")
+    parser.add_argument("--end", default="21:15", help="Virtual end time, UTC HH:MM")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="Real-time multiple (e.g. 100); default runs as fast as possible")
+    parser.add_argument("--root", default=REPLAY_ROOT, help="Recorded sessions folder")
+    parser.add_argument("--cash", type=float, default=None, help="Override the opening cash")
+    parser.add_argument("--workdir", default=None, help="Sandbox directory (default: temp)")
+    parser.add_argument("--verbose", action="store_true", help="Show the bot's console output")
+    args = parser.parse_args()
+
+    _print_report(run_replay(args.date, args.start, args.end, args.speed, args.root,
+                             args.workdir, args.cash, quiet=not args.verbose))
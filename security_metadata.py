@@ -0,0 +1,273 @@
+"""
+Security Metadata Cache (security_metadata.py)
+==============================================
+One persistent store for slow-moving per-security reference data, so sector
+reports and the dashboard read a local row instead of calling
+yf.Ticker().info per ticker.
+
+    meta = get_security_metadata()            # data/security_metadata.db
+    meta.prefetch(collect_tickers(client))    # positions + master universe, in parallel
+    meta.sector("NVDA_US_EQ")                 # "Technology" (never a network call)
+
+Fields and how long each stays fresh:
+    sector, industry       30 days
+    currency               90 days
+    avg_volume, market_cap  1 day
+
+Reads never fetch: they return the last stored value, however old, and
+prefetch() refreshes whatever has expired. A lookup that fails (error or
+empty info) is negatively cached and not retried for NEGATIVE_TTL, doubling
+per consecutive failure up to MAX_NEGATIVE_TTL.
+
+Tickers may be given in T212 form ("AAPL_US_EQ", "RRl_EQ") or yfinance form
+("AAPL", "RR.L"); rows are keyed by the yfinance symbol.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from shared.lazy_import import lazy_import
+
+yf = lazy_import("yfinance")
+
+DB_PATH = Path(os.getenv("SECURITY_METADATA_DB", "data/security_metadata.db"))
+UNIVERSE_FILE = "data/master_universe.json"
+DAY = 86400
+
+FIELD_TTLS = {
+    "sector": 30 * DAY,
+    "industry": 30 * DAY,
+    "currency": 90 * DAY,
+    "avg_volume": DAY,
+    "market_cap": DAY,
+}
+INFO_KEYS = {"sector": "sector", "industry": "industry", "currency": "currency",
+             "avg_volume": "averageVolume", "market_cap": "marketCap"}
+NEGATIVE_TTL = 6 * 3600
+MAX_NEGATIVE_TTL = 7 * DAY
+PREFETCH_DEADLINE = 60.0  # seconds for one prefetch's lookups together
+
+# yfinance sector names -> MacroClock sectors
+SECTOR_NAMES = {
+    "Technology": "Technology",
+    "Financial Services": "Financials",
+    "Financials": "Financials",
+    "Consumer Cyclical": "Consumer Discretionary",
+    "Consumer Defensive": "Consumer Staples",
+    "Energy": "Energy",
+    "Healthcare": "Healthcare",
+    "Industrials": "Industrials",
+    "Basic Materials": "Materials",
+    "Utilities": "Utilities",
+    "Real Estate": "Real Estate",  # MacroClock might not have RE explicit, usually falls into Financials or separate
+    "Communication Services": "Technology"  # Optional mapping, or add to MacroClock
+}
+
+
+def normalize_sector(name: Optional[str]) -> Optional[str]:
+    """Maps a yfinance sector name to the MacroClock standard (unknown names pass through)."""
+    return SECTOR_NAMES.get(name, name)
+
+
+def yf_symbol(ticker: str) -> str:
+    """'AAPL_US_EQ' -> 'AAPL', 'RRl_EQ' / 'RR_UK_EQ' -> 'RR.L'; yfinance symbols pass through."""
+    if ticker.endswith("_US_EQ"):
+        return ticker[:-len("_US_EQ")]
+    if ticker.endswith("_UK_EQ"):
+        return ticker[:-len("_UK_EQ")] + ".L"
+    if ticker.endswith("l_EQ"):
+        return ticker[:-len("l_EQ")] + ".L"
+    return ticker
+
+
+def metadata_from_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """The cached fields out of a yf.Ticker().info dict (missing keys are None)."""
+    fields = {field: info.get(key) for field, key in INFO_KEYS.items()}
+    for field in ("avg_volume", "market_cap"):
+        if fields[field] is not None:
+            fields[field] = int(fields[field])
+    return fields
+
+
+def _fetch_info(symbol: str) -> Dict[str, Any]:
+    return metadata_from_info(yf.Ticker(symbol).info or {})
+
+
+class SecurityMetadata:
+    """
+    SQLite-backed (WAL) with an in-memory copy of every row, so reads are a
+    dict lookup and safe from request threads. Writes go through one lock.
+    """
+
+    def __init__(self, path=DB_PATH, fetcher: Callable[[str], Dict[str, Any]] = None):
+        self.path = Path(path)
+        self.fetcher = fetcher or _fetch_info
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS fields (
+                symbol TEXT NOT NULL,
+                field TEXT NOT NULL,
+                value TEXT,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (symbol, field)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS failures (
+                symbol TEXT PRIMARY KEY,
+                attempts INTEGER NOT NULL,
+                retry_at REAL NOT NULL,
+                error TEXT
+            ) WITHOUT ROWID;
+        """)
+        self.conn.commit()
+        self._lock = threading.Lock()
+        self._background: Optional[threading.Thread] = None
+        self._rows: Dict[str, Dict[str, tuple]] = {}
+        for symbol, field, value, fetched_at in self.conn.execute("SELECT * FROM fields"):
+            self._rows.setdefault(symbol, {})[field] = (json.loads(value), fetched_at)
+        self._failures: Dict[str, tuple] = {
+            symbol: (attempts, retry_at)
+            for symbol, attempts, retry_at in self.conn.execute("SELECT symbol, attempts, retry_at FROM failures")}
+
+    # --- reads (never fetch) ---
+    def get(self, ticker: str, field: str, default=None):
+        value = self._rows.get(yf_symbol(ticker), {}).get(field, (None, 0))[0]
+        return default if value is None else value
+
+    def entry(self, ticker: str) -> Dict[str, Any]:
+        return {field: value for field, (value, _) in self._rows.get(yf_symbol(ticker), {}).items()}
+
+    def sector(self, ticker: str, default: str = "Unknown") -> str:
+        """MacroClock-normalized sector from the cache."""
+        sector = self.get(ticker, "sector")
+        return normalize_sector(sector) if sector else default
+
+    # --- freshness ---
+    def is_due(self, ticker: str, now: float = None) -> bool:
+        """True if any field is missing or expired and the symbol is not in failure backoff."""
+        now = time.time() if now is None else now
+        symbol = yf_symbol(ticker)
+        failure = self._failures.get(symbol)
+        if failure and failure[1] > now:
+            return False
+        row = self._rows.get(symbol, {})
+        return any(field not in row or now - row[field][1] >= ttl for field, ttl in FIELD_TTLS.items())
+
+    def due(self, tickers: Iterable[str], now: float = None) -> List[str]:
+        """yfinance symbols among `tickers` that a prefetch would look up (deduplicated)."""
+        symbols = dict.fromkeys(yf_symbol(t) for t in tickers if t)
+        return [s for s in symbols if self.is_due(s, now)]
+
+    # --- writes ---
+    def store(self, ticker: str, fields: Dict[str, Any], now: float = None):
+        """Records a successful lookup (None values are cached too: the field does not exist)."""
+        now = time.time() if now is None else now
+        symbol = yf_symbol(ticker)
+        rows = [(symbol, field, json.dumps(fields.get(field)), now) for field in FIELD_TTLS]
+        with self._lock:
+            self.conn.executemany("INSERT OR REPLACE INTO fields VALUES (?, ?, ?, ?)", rows)
+            self.conn.execute("DELETE FROM failures WHERE symbol = ?", (symbol,))
+            self.conn.commit()
+            self._rows[symbol] = {field: (fields.get(field), now) for field in FIELD_TTLS}
+            self._failures.pop(symbol, None)
+
+    def record_failure(self, ticker: str, error: str, now: float = None):
+        """Negative-caches a failed lookup with exponential backoff."""
+        now = time.time() if now is None else now
+        symbol = yf_symbol(ticker)
+        with self._lock:
+            attempts = self._failures.get(symbol, (0, 0))[0] + 1
+            retry_at = now + min(NEGATIVE_TTL * 2 ** (attempts - 1), MAX_NEGATIVE_TTL)
+            self.conn.execute("INSERT OR REPLACE INTO failures VALUES (?, ?, ?, ?)",
+                              (symbol, attempts, retry_at, str(error)[:200]))
+            self.conn.commit()
+            self._failures[symbol] = (attempts, retry_at)
+
+    # --- prefetch ---
+    def prefetch(self, tickers: Iterable[str], workers: int = 8,
+                 deadline: float = PREFETCH_DEADLINE) -> Dict[str, Any]:
+        """
+        Looks up every due ticker on a thread pool bounded by `deadline`.
+        Lookups still running at the deadline are abandoned (and retried by
+        the next prefetch); an exception or empty info is a failure.
+        """
+        started = time.monotonic()
+        tickers = [t for t in tickers if t]
+        symbols = self.due(tickers)
+        summary = {"requested": len(set(map(yf_symbol, tickers))), "fetched": 0, "failed": 0, "timeouts": 0}
+        if symbols:
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="metadata")
+            futures = {pool.submit(self.fetcher, s): s for s in symbols}
+            done, pending = wait(futures, timeout=deadline)
+            pool.shutdown(wait=False, cancel_futures=True)
+            for future in done:
+                symbol = futures[future]
+                try:
+                    fields = future.result()
+                    if not any(v is not None for v in fields.values()):
+                        raise ValueError("no metadata")
+                except Exception as e:
+                    self.record_failure(symbol, e)
+                    summary["failed"] += 1
+                    continue
+                self.store(symbol, fields)
+                summary["fetched"] += 1
+            summary["timeouts"] = len(pending)
+        summary["seconds"] = round(time.monotonic() - started, 1)
+        if symbols:
+            print(f"🗂️ Metadata prefetch: {summary}")
+        return summary
+
+    def prefetch_in_background(self, tickers: Iterable[str]) -> bool:
+        """Starts a prefetch on a daemon thread unless one is running or nothing is due."""
+        symbols = self.due(tickers)
+        with self._lock:
+            if not symbols or (self._background is not None and self._background.is_alive()):
+                return False
+            self._background = threading.Thread(target=self.prefetch, args=(symbols,),
+                                                name="metadata-prefetch", daemon=True)
+            self._background.start()
+        return True
+
+    def close(self):
+        self.conn.close()
+
+
+_STORE: Optional[SecurityMetadata] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_security_metadata(path=None) -> SecurityMetadata:
+    """Shared store for this process (`path` only applies to the first call)."""
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                _STORE = SecurityMetadata(path or DB_PATH)
+    return _STORE
+
+
+def collect_tickers(client=None, universe_path: str = UNIVERSE_FILE) -> List[str]:
+    """Held positions (if a client is given) plus every master_universe.json ticker."""
+    tickers = []
+    if client is not None:
+        positions = client.get_positions()
+        if isinstance(positions, list):
+            tickers += [p.get("ticker") for p in positions if p.get("ticker")]
+    try:
+        with open(universe_path, 'r') as f:
+            tickers += [inst['ticker'] for inst in json.load(f).get('instruments', [])]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"⚠️ Metadata universe unavailable: {e}")
+    return tickers
+
+
+if __name__ == "__main__":
+    from trading212_client import Trading212Client
+    get_security_metadata().prefetch(collect_tickers(Trading212Client()))
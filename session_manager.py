@@ -2,34 +2,48 @@ import json
 import os
 from datetime import datetime
 
+from ledger import SessionLedger
+
 class SessionManager:
     """
     Manages the Session Whitelist to isolate Day Trading from Long Term Holdings.
     Only tickers added to this whitelist (bought during the session) are eligible for:
     1. Curfew Liquidation
     2. Stop Loss / Take Profit checks (redundant safety)
+
+    Fills are recorded in the SessionLedger (quantity/cost per session); the
+    whitelist itself is a set, so membership checks are O(1).
     """
-    def __init__(self, filepath='data/session_whitelist.json'):
+    def __init__(self, filepath='data/session_whitelist.json', ledger=None):
         self.filepath = filepath
+        self._ledger = ledger
         self.whitelist = self._load_whitelist()
+        self._tickers = set(self.whitelist['tickers'])
+
+    @property
+    def ledger(self) -> SessionLedger:
+        """Opened on first fill, so whitelist-only users never load the trade history."""
+        if self._ledger is None:
+            self._ledger = SessionLedger()
+        return self._ledger
 
     def _load_whitelist(self):
         """Loads whitelist, resetting it if the date has changed (New Session)"""
         # Ensure directory exists
         os.makedirs(os.path.dirname(self.filepath), exist_ok=True)
-        
+
         if not os.path.exists(self.filepath):
             return {"date": datetime.utcnow().strftime('%Y-%m-%d'), "tickers": []}
-        
+
         try:
             with open(self.filepath, 'r') as f:
                 data = json.load(f)
-                
+
             # Date Check - Reset if old
             today = datetime.utcnow().strftime('%Y-%m-%d')
             if data.get('date') != today:
                 return {"date": today, "tickers": []}
-                
+
             return data
         except Exception as e:
             print(f"⚠️ Whitelist Load Error: {e}. Resetting.")
@@ -41,25 +55,35 @@ class SessionManager:
         with open(self.filepath, 'w') as f:
             json.dump(self.whitelist, f, indent=2)
 
-    def add_ticker(self, ticker):
-        """Adds a ticker to the session whitelist (on Buy)"""
+    def _roll_session(self):
+        """Auto-reset if day changed mid-run"""
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        if self.whitelist.get('date') != today:
+            self.whitelist = {"date": today, "tickers": []}
+            self._tickers = set()
+            self._save_whitelist()
+
+    def add_ticker(self, ticker, quantity=None, price=None):
+        """Adds a ticker to the session whitelist (on Buy) and records the fill in the ledger"""
         # Normalize ticker? T212 might have _US_EQ.
         # usually logic uses raw ticker.
-        if ticker not in self.whitelist['tickers']:
+        self._roll_session()
+        if ticker not in self._tickers:
+            self._tickers.add(ticker)
             self.whitelist['tickers'].append(ticker)
             self._save_whitelist()
             print(f"🛡️ SESSION MANAGER: {ticker} added to whitelist.")
+        if quantity is not None:
+            self.ledger.record_purchase(ticker, quantity, price or 0.0, side="BUY")
+
+    def record_sale(self, ticker, quantity, price):
+        """Records a Job C sell (risk exit or curfew) in the ledger"""
+        self.ledger.record_sale(ticker, quantity, price)
 
     def is_whitelisted(self, ticker):
         """Checks if ticker is in the current session whitelist"""
-        # Auto-reset if day changed mid-run
-        today = datetime.utcnow().strftime('%Y-%m-%d')
-        if self.whitelist.get('date') != today:
-            self.whitelist = {"date": today, "tickers": []}
-            self._save_whitelist()
-            return False
-            
-        return ticker in self.whitelist['tickers']
+        self._roll_session()
+        return ticker in self._tickers
 
     def get_whitelist(self):
         return self.whitelist['tickers']
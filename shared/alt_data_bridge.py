@@ -3,12 +3,12 @@ Alt Data Bridge — Cross-project alternative data consumer.
 Reads sentiment_snapshot.json produced by alt_data_engine.py.
 Provides normalized signals for any project (Sentinel, Krypto, etc.).
 """
-import os
-import json
 import logging
-from datetime import datetime, timedelta
 from pathlib import Path
 
+from .snapshot_reader import SnapshotReader, SnapshotView
+from .signal_store import SignalStore
+
 logger = logging.getLogger("AltDataBridge")
 
 # Snapshot location (relative to Sovereign-Sentinel root)
@@ -19,25 +19,29 @@ SNAPSHOT_PATHS = [
     Path(r"C:\Users\steve\Sovereign-Sentinel\data\sentiment_snapshot.json"), # Windows dev
 ]
 
+# Normalized per-signal history written alongside the snapshot
+SIGNAL_DB_PATHS = [
+    Path(__file__).parent.parent / "data" / "alt_signals.db",
+    Path("/home/ubuntu/Sovereign-Sentinel/data/alt_signals.db"),
+    Path(r"C:\Users\steve\Sovereign-Sentinel\data\alt_signals.db"),
+]
+MAX_SNAPSHOT_AGE_HOURS = 2
+
+# Parsed once per file version; accessors below are dict reads
+_reader = SnapshotReader(SNAPSHOT_PATHS)
+
+
+def _snapshot_view() -> SnapshotView:
+    view = _reader.read()
+    if view.is_stale(MAX_SNAPSHOT_AGE_HOURS):
+        # Once per file version, not on every accessor call
+        view.memo("stale_warned", lambda: logger.warning(f"Snapshot is {view.age_hours():.1f}h old (stale)"))
+    return view
+
 
 def _load_snapshot() -> dict:
     """Load the most recent sentiment snapshot from alt_data_engine."""
-    for path in SNAPSHOT_PATHS:
-        if path.exists():
-            try:
-                with open(path, 'r') as f:
-                    snapshot = json.load(f)
-                # Check freshness (< 2 hours old)
-                ts = snapshot.get("timestamp", "")
-                if ts:
-                    age = datetime.now() - datetime.fromisoformat(ts)
-                    if age > timedelta(hours=2):
-                        logger.warning(f"Snapshot is {age.total_seconds()/3600:.1f}h old (stale)")
-                return snapshot.get("data", {})
-            except Exception as e:
-                logger.error(f"Failed to read snapshot from {path}: {e}")
-    logger.warning("No sentiment snapshot found at any known path")
-    return {}
+    return _snapshot_view().data
 
 
 def get_crypto_fear_greed() -> dict:
@@ -64,34 +68,41 @@ def get_market_sentiment_score() -> float:
     0.0 = Extreme Fear, 1.0 = Extreme Greed.
     Falls back to 0.5 (neutral) if no data available.
     """
-    data = _load_snapshot()
-    if not data:
-        return 0.5
-
-    score = 0.5
-    signals = 0
-
-    # Fear & Greed (0-100 scale -> 0.0-1.0)
-    fg = data.get("fear_and_greed", {})
-    if fg and fg.get("value"):
-        try:
-            score = int(fg["value"]) / 100.0
-            signals += 1
-        except (ValueError, TypeError):
-            pass
-
-    # Google Trends: "market crash" searches inversely correlate with sentiment
-    trends = data.get("pytrends", {})
-    if trends and isinstance(trends, dict):
-        crash_interest = trends.get("market crash", 0)
-        dip_interest = trends.get("buy the dip", 0)
-        if crash_interest > 0 or dip_interest > 0:
-            # High "market crash" = fear, high "buy the dip" = greed
-            trend_score = dip_interest / max(crash_interest + dip_interest, 1)
-            score = (score * signals + trend_score) / (signals + 1)
-            signals += 1
-
-    return round(min(max(score, 0.0), 1.0), 3)
+    return _snapshot_view().score
+
+
+_store = None
+
+
+def _signal_store():
+    """Read-only SignalStore, opened on first use (None until the engine has created it)."""
+    global _store
+    if _store is None:
+        path = next((p for p in SIGNAL_DB_PATHS if p.exists()), None)
+        if path is not None:
+            _store = SignalStore(path, readonly=True)
+    return _store
+
+
+def get_signal_history(signal: str, n: int = 12) -> list:
+    """
+    Last `n` samples of one normalized signal (e.g. "fear_greed",
+    "trend.market_crash", "reddit.mentions"), oldest first: [(ts, value, z)].
+    """
+    store = _signal_store()
+    return store.last(signal, n) if store else []
+
+
+def get_fear_greed_trend() -> dict:
+    """
+    Fear & Greed with trend context: latest value, its rolling z-score and
+    the change over 24h. Output: {"value": 24.0, "z": -1.8, "change_24h": -11.0} or {}.
+    """
+    store = _signal_store()
+    latest = store.latest("fear_greed") if store else None
+    if latest is None:
+        return {}
+    return {"value": latest.value, "z": round(latest.z, 3), "change_24h": store.change("fear_greed", 86400)}
 
 
 def get_macro_fed_rate() -> dict:
@@ -12,16 +12,24 @@ from pathlib import Path
 DB_DIR = Path(__file__).parent / "data"
 DB_PATH = DB_DIR / "audit_trail.db"
 
-def get_connection():
+_DB_READY = False
+
+def _connect():
     DB_DIR.mkdir(parents=True, exist_ok=True)
     conn = sqlite3.connect(str(DB_PATH))
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     return conn
 
+def get_connection():
+    if not _DB_READY:
+        init_db()
+    return _connect()
+
 def init_db():
     """Create audit_events table if it doesn't exist."""
-    conn = get_connection()
+    global _DB_READY
+    conn = _connect()
     conn.executescript("""
         CREATE TABLE IF NOT EXISTS audit_events (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -40,9 +48,10 @@ def init_db():
     """)
     conn.commit()
     conn.close()
+    _DB_READY = True
 
-# Ensure DB exists on import
-init_db()
+# The schema is created on the first connection rather than at import time,
+# so entry points that never log centrally pay no SQLite cost at startup.
 
 
 class CentralAuditLogger:
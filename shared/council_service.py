@@ -29,22 +29,23 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 
-from secrets_loader import load_master_env, get_secret
-
-# Load environment
-load_master_env()
+from secrets_loader import get_secret
 
 logger = logging.getLogger("Council")
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(message)s")
 
 # --- Keys ---
-GOOGLE_API_KEY    = get_secret("GOOGLE_API_KEY")
-SAMBANOVA_API_KEY = get_secret("SAMBANOVA_API_KEY")
-GROQ_API_KEY      = get_secret("GROQ_API_KEY")
+# Resolved on first judge call: get_secret() loads master.env only if the
+# variable is missing, so importing this module touches no files.
+_KEY_CACHE: Dict[str, Optional[str]] = {}
+
+def _key(name: str) -> Optional[str]:
+    if name not in _KEY_CACHE:
+        _KEY_CACHE[name] = get_secret(name)
+    return _KEY_CACHE[name]
 
 # --- Audit Log ---
 DATA_DIR = Path(__file__).parent / "data"
-DATA_DIR.mkdir(exist_ok=True)
 COUNCIL_LOG = DATA_DIR / "council_log.json"
 
 
@@ -94,10 +95,11 @@ def _extract_json(text: str) -> dict:
 
 def _call_gemini(prompt: str) -> dict:
     """Judge 1: Google Gemini 2.0 Flash (REST)"""
-    if not GOOGLE_API_KEY:
+    api_key = _key("GOOGLE_API_KEY")
+    if not api_key:
         return {"error": "No GOOGLE_API_KEY"}
     try:
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={GOOGLE_API_KEY}"
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
         payload = {
             "contents": [{"parts": [{"text": prompt}]}],
             "generationConfig": {
@@ -121,13 +123,14 @@ def _call_gemini(prompt: str) -> dict:
 
 def _call_sambanova(prompt: str) -> dict:
     """Judge 2: SambaNova DeepSeek-R1-Distill-Llama-70B (OpenAI-compatible REST)"""
-    if not SAMBANOVA_API_KEY:
+    api_key = _key("SAMBANOVA_API_KEY")
+    if not api_key:
         return {"error": "No SAMBANOVA_API_KEY"}
     try:
         resp = requests.post(
             "https://api.sambanova.ai/v1/chat/completions",
             headers={
-                "Authorization": f"Bearer {SAMBANOVA_API_KEY}",
+                "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             },
             json={
@@ -150,13 +153,14 @@ def _call_sambanova(prompt: str) -> dict:
 
 def _call_groq(prompt: str) -> dict:
     """Judge 3: Groq Llama 3.3 70B (OpenAI-compatible REST)"""
-    if not GROQ_API_KEY:
+    api_key = _key("GROQ_API_KEY")
+    if not api_key:
         return {"error": "No GROQ_API_KEY"}
     try:
         resp = requests.post(
             "https://api.groq.com/openai/v1/chat/completions",
             headers={
-                "Authorization": f"Bearer {GROQ_API_KEY}",
+                "Authorization": f"Bearer {api_key}",
                 "Content-Type": "application/json"
             },
             json={
@@ -321,6 +325,7 @@ Respond ONLY in this JSON format:
         """Append council decision to local audit log."""
         try:
             log = []
+            DATA_DIR.mkdir(exist_ok=True)
             if COUNCIL_LOG.exists():
                 log = json.loads(COUNCIL_LOG.read_text())
             log.append(outcome)
@@ -349,9 +354,9 @@ if __name__ == "__main__":
 
     print("\n🏛️  Antigravity Council — Convening...\n")
     print(f"  Judges available:")
-    print(f"    Gemini:    {'✅' if GOOGLE_API_KEY else '❌ No key'}")
-    print(f"    SambaNova: {'✅' if SAMBANOVA_API_KEY else '❌ No key'}")
-    print(f"    Groq:      {'✅' if GROQ_API_KEY else '❌ No key'}")
+    print(f"    Gemini:    {'✅' if _key('GOOGLE_API_KEY') else '❌ No key'}")
+    print(f"    SambaNova: {'✅' if _key('SAMBANOVA_API_KEY') else '❌ No key'}")
+    print(f"    Groq:      {'✅' if _key('GROQ_API_KEY') else '❌ No key'}")
     print()
 
     if "--test" in sys.argv or len(sys.argv) == 1:
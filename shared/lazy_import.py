@@ -0,0 +1,71 @@
+"""
+Lazy Import — Deferred loading for heavy optional dependencies.
+Keeps entry-point cold starts cheap: the real module is imported on first
+attribute access instead of when the importing file is loaded.
+
+Usage:
+    from shared.lazy_import import lazy_import, is_available
+
+    yf = lazy_import("yfinance")          # nothing imported yet
+    GEMINI_AVAILABLE = is_available("google.generativeai")
+    df = yf.download("SPY")               # yfinance imported here
+"""
+import importlib
+import importlib.util
+import threading
+
+
+class LazyModule:
+    """
+    Module proxy that imports its target on first attribute access.
+    Import errors surface at the point of use, exactly as a normal import would.
+    """
+    __slots__ = ("_name", "_module", "_lock")
+
+    def __init__(self, name: str):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                module = self._module
+                if module is None:
+                    module = importlib.import_module(self._name)
+                    object.__setattr__(self, "_module", module)
+        return module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "deferred"
+        return f"<LazyModule '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    """Returns a proxy for `name` that imports the module on first use."""
+    return LazyModule(name)
+
+
+def is_available(name: str) -> bool:
+    """
+    Checks whether a module can be imported without executing it.
+    Only parent packages are imported (e.g. 'google' for 'google.generativeai').
+    """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
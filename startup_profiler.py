@@ -0,0 +1,143 @@
+"""
+Startup Profiler — Import-time cost report for Sentinel entry points.
+=====================================================================
+systemd restarts these services during market hours, so every
+millisecond spent importing is a millisecond the Sniper is blind.
+
+Runs each entry point under `python -X importtime` in a fresh interpreter
+and reports per-module cumulative import cost, plus a budget check.
+
+Usage:
+    python startup_profiler.py                 # Report all entry points
+    python startup_profiler.py --entry main_bot --top 25
+    python startup_profiler.py --check         # Exit 1 if any budget is blown
+"""
+
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Any, Optional
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Label -> importable module path (run from the project root)
+ENTRY_POINTS = {
+    "main_bot": "main_bot",
+    "orb_shield": "orb_shield",
+    "web/server": "web.server",
+    "telegram_listener": "telegram_listener",
+}
+
+# Cumulative import budget per entry point (milliseconds).
+# Sized for the VPS with headroom; eagerly importing pandas (~0.5s) or
+# yfinance (~0.8s) at module level is enough to blow any of them.
+STARTUP_BUDGETS_MS = {
+    "main_bot": 750.0,
+    "orb_shield": 500.0,
+    "web/server": 900.0,
+    "telegram_listener": 900.0,
+}
+
+# "import time:      self [us] |  cumulative | imported package"
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parses `-X importtime` output into rows of module/self_ms/cumulative_ms/depth."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        rows.append({
+            "module": module,
+            "self_ms": int(self_us) / 1000.0,
+            "cumulative_ms": int(cumulative_us) / 1000.0,
+            # importtime indents two spaces per nesting level after the '|'
+            "depth": max(0, (len(indent) - 1) // 2),
+        })
+    return rows
+
+
+def profile_entry_point(label: str, module: Optional[str] = None, timeout: int = 120) -> Dict[str, Any]:
+    """
+    Imports one entry point in a clean interpreter and measures it.
+    Returns {"label", "module", "ok", "error", "total_ms", "modules"}.
+    """
+    module = module or ENTRY_POINTS[label]
+    cmd = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run(cmd, cwd=ROOT_DIR, capture_output=True, text=True, timeout=timeout, env=env)
+
+    rows = parse_importtime(proc.stderr)
+    entry_row = next((r for r in reversed(rows) if r["module"] == module), None)
+
+    error = None
+    if proc.returncode != 0:
+        tail = [l for l in proc.stderr.splitlines() if l and not l.startswith("import time:")]
+        error = tail[-1] if tail else f"exit code {proc.returncode}"
+
+    return {
+        "label": label,
+        "module": module,
+        "ok": proc.returncode == 0,
+        "error": error,
+        "total_ms": entry_row["cumulative_ms"] if entry_row else sum(r["self_ms"] for r in rows),
+        "modules": rows,
+    }
+
+
+def top_modules(result: Dict[str, Any], top: int = 15) -> List[Dict[str, Any]]:
+    """Heaviest modules by cumulative cost, excluding the entry point itself."""
+    rows = [r for r in result["modules"] if r["module"] != result["module"]]
+    return sorted(rows, key=lambda r: r["cumulative_ms"], reverse=True)[:top]
+
+
+def check_budget(result: Dict[str, Any]) -> bool:
+    """True if the entry point imported within its startup budget."""
+    budget = STARTUP_BUDGETS_MS.get(result["label"])
+    return budget is None or result["total_ms"] <= budget
+
+
+def format_report(result: Dict[str, Any], top: int = 15) -> str:
+    budget = STARTUP_BUDGETS_MS.get(result["label"])
+    if not result["ok"]:
+        return f"❌ {result['label']}: import failed ({result['error']})\n"
+
+    status = "✅" if check_budget(result) else "🔴 OVER BUDGET"
+    budget_txt = f" / budget {budget:.0f}ms" if budget else ""
+    lines = [f"{status} {result['label']}: {result['total_ms']:.1f}ms{budget_txt}"]
+    lines.append(f"   {'cumulative':>10}  {'self':>8}  module")
+    for r in top_modules(result, top):
+        lines.append(f"   {r['cumulative_ms']:>8.1f}ms  {r['self_ms']:>6.1f}ms  {'  ' * r['depth']}{r['module']}")
+    return "\n".join(lines) + "\n"
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Import-time profiler for Sentinel entry points')
+    parser.add_argument('--entry', choices=sorted(ENTRY_POINTS), action='append', help='Entry point(s) to profile')
+    parser.add_argument('--top', type=int, default=15, help='Number of heaviest modules to list')
+    parser.add_argument('--check', action='store_true', help='Exit 1 if any entry point exceeds its budget')
+    args = parser.parse_args()
+
+    labels = args.entry or list(ENTRY_POINTS)
+    over_budget = []
+
+    print("⏱️  STARTUP IMPORT PROFILE")
+    print("=" * 60)
+    for label in labels:
+        result = profile_entry_point(label)
+        print(format_report(result, args.top))
+        if result["ok"] and not check_budget(result):
+            over_budget.append(label)
+
+    if args.check and over_budget:
+        print(f"🔴 Budget exceeded: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,12 +8,13 @@ import json
 import os
 import sys
 import io
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List, Any, Tuple
 # Removed standalone genai import - using consolidated client
 import requests
 from trading212_client import Trading212Client
 from audit_log import AuditLogger
+from security_metadata import get_security_metadata, normalize_sector
 # Avoid forced encoding overrides that can break in some environments
 # if sys.platform == "win32":
 #     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
@@ -731,10 +732,11 @@ Sector: {validation_data.get('sector', 'Unknown')}
 class SectorMapper:
     """
     Maps portfolio tickers to sectors and calculates weight deltas.
-    Caches sector data to reduce API calls.
+    Sectors come from the persistent security metadata cache.
     """
     def __init__(self):
         self.client = Trading212Client()
+        self.metadata = get_security_metadata()
         self.cache_path = 'data/sector_map.json'
         self.excluded_path = 'data/excluded_tickers.json'
         from macro_clock import MacroClock
@@ -766,48 +768,23 @@ class SectorMapper:
             json.dump(self.sector_map, f, indent=2)
 
     def get_ticker_sector(self, ticker: str) -> str:
-        """Get sector for a single ticker (with caching)"""
-        # specialized normalization for T212 tickers like "VOD.L" -> "VOD.L" or "VOD" for yfinance
-        # T212 often sends "AAPL_US_EQ", but get_positions usually returns "AAPL"
-        
-        # Check cache first
+        """Get sector for a single ticker from local caches (no network call)"""
+        # Manual overrides in data/sector_map.json win
         if ticker in self.sector_map:
             return self.sector_map[ticker]
-            
-        # Fetch from yfinance
-        try:
-            import yfinance as yf
-            # Handle UK tickers for yfinance (e.g. RR.L) if needed
-            # Assuming ticker format from T212 is compatible or simple enough
-            t = yf.Ticker(ticker)
-            sector = t.info.get('sector', 'Unknown')
-            # Normalize common sector names if needed (e.g. "Financial Services" -> "Financials")
-            # Map yfinance sectors to MacroClock sectors
-            sector = self.normalize_sector_name(sector)
-            
-            self.sector_map[ticker] = sector
-            return sector
-        except Exception as e:
-            print(f"⚠️ Failed to map sector for {ticker}: {e}")
-            return "Unknown"
+
+        # Pre-market warm-up already looked the universe up today
+        from premarket_warmup import get_warm_cache
+        warmed = get_warm_cache().get(ticker, 'sector')
+        if warmed:
+            return self.normalize_sector_name(warmed)
+
+        # Persistent metadata cache (filled by prefetch, see calculate_portfolio_deltas)
+        return self.metadata.sector(ticker)
 
     def normalize_sector_name(self, yf_sector: str) -> str:
         """Map yfinance sector names to MacroClock standard"""
-        mapping = {
-            "Technology": "Technology",
-            "Financial Services": "Financials",
-            "Financials": "Financials",
-            "Consumer Cyclical": "Consumer Discretionary",
-            "Consumer Defensive": "Consumer Staples",
-            "Energy": "Energy",
-            "Healthcare": "Healthcare",
-            "Industrials": "Industrials",
-            "Basic Materials": "Materials",
-            "Utilities": "Utilities",
-            "Real Estate": "Real Estate", # MacroClock might not have RE explicit, usually falls into Financials or separate
-            "Communication Services": "Technology" # Optional mapping, or add to MacroClock
-        }
-        return mapping.get(yf_sector, yf_sector)
+        return normalize_sector(yf_sector)
 
     def calculate_portfolio_deltas(self) -> Dict[str, Any]:
         """
@@ -831,8 +808,8 @@ class SectorMapper:
         filtered_equity = 0.0
         ignored_count = 0
         
-        # 1. Harvest & Map
-        new_mappings = False
+        # 1. Harvest & Map (one parallel refresh of expired metadata, then local reads)
+        self.metadata.prefetch([pos.get('ticker') for pos in positions if pos.get('ticker') not in self.excluded])
         for pos in positions:
             ticker = pos.get('ticker')
             
@@ -860,14 +837,8 @@ class SectorMapper:
             
             # Get Sector
             sector = self.get_ticker_sector(ticker)
-            if sector not in self.sector_map: # It was just fetched
-                new_mappings = True
-            
             sector_values[sector] = sector_values.get(sector, 0.0) + position_value
 
-        if new_mappings:
-            self.save_cache()
-            
         print(f"📉 Filtered {ignored_count} positions (Lab/Excluded).")
         
         # Use Filtered Equity + Cash for Total Analysis Value
@@ -919,14 +890,29 @@ class SectorMapper:
             
         return report
 
+def _refresh_intraday_bars(tickers: List[str], max_age: int = 300):
+    """
+    v3.2: Returns the shared equity BarAggregator with today's 1m tape for
+    `tickers`. Only tickers it has not seen in `max_age` seconds are fetched,
+    in ONE batched 1m download; 15m (and every other timeframe) is then read
+    from memory instead of a separate request per ticker/interval.
+    """
+    import time
+    from bar_aggregator import get_aggregator
+    agg = get_aggregator("equity")
+    stale = [t for t in tickers if (agg.last_timestamp(t) or 0) < time.time() - max_age]
+    if stale:
+        import yfinance as yf
+        data = yf.download(stale, period="1d", interval="1m", group_by='ticker', progress=False)
+        agg.ingest_download(data, stale)
+    return agg
+
 def generate_open_market_brief() -> str:
     """
     Generates the "Market Open Analysis" at 14:30 UTC.
     Scans the FULL Master Universe (100+ Tickers) for top movers.
     """
     print("⚡ Analyzing Market Open (Full Universe)...")
-    import yfinance as yf
-    import pandas as pd
     
     # 1. Load Universe
     try:
@@ -941,11 +927,10 @@ def generate_open_market_brief() -> str:
     if 'QQQ' not in tickers: tickers.append('QQQ')
 
     # 2. Batch Fetch Data (Fast) & Targeted 15m Candle
-    # v2.3: We now fetch intraday data to isolate the 14:30-14:45 UTC candle
-    # regardless of when this script is run (even hours later)
+    # v3.2: 15m candles come from the shared 1m bar aggregator; only tickers
+    # it hasn't seen recently are fetched (one batched 1m request)
     try:
-        # Fetch 5 days of 15m data to capture "today's open" reliably
-        df = yf.download(tickers, period="5d", interval="15m", group_by='ticker', progress=False)
+        agg = _refresh_intraday_bars(tickers)
     except Exception as e:
         return f"⚠️ Market Data Fetch Failed: {e}"
 
@@ -953,38 +938,20 @@ def generate_open_market_brief() -> str:
     
     # Target Open Time: Today at 14:30 UTC
     today_str = datetime.utcnow().strftime('%Y-%m-%d')
-    # Use pandas compatible string for indexing/search if needed, 
-    # but yfinance returns UTC index. 
+    day_start = datetime.strptime(today_str, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp()
     
     # 3. Process Each Ticker
     for t in tickers:
         try:
-            # Handle MultiIndex dataframe from yfinance
-            if len(tickers) > 1:
-                t_data = df[t]
-            else:
-                t_data = df
-            
-            if t_data.empty: continue
-            
-            # Find the 14:30-14:45 candle for "Today"
-            # Resample or just find the row
-            # Index is DatetimeIndex localized to UTC usually
-            
-            # Filter for today
-            today_data = t_data.loc[today_str] 
-            
-            # v2.5 Fix: Drop NaN rows! 
-            # If batch contains UK & US stocks, the index will include UK open times (08:00 UTC)
-            # where US stocks are NaN. We must filter these out to find the TRUE US open.
-            today_data = today_data.dropna()
-
-            if today_data.empty: continue
+            # First 15m candle of today (UTC). Per-ticker bars never include
+            # other exchanges' sessions, so no NaN filtering is needed.
+            today_data = [b for b in agg.bars(t, '15m') if b.start >= day_start]
+            if not today_data: continue
             
             # Find specific 14:30 candle (or first valid candle)
-            first_candle = today_data.iloc[0]
-            open_price = float(first_candle['Open'])
-            close_price = float(first_candle['Close'])
+            first_candle = today_data[0]
+            open_price = float(first_candle.open)
+            close_price = float(first_candle.close)
             
             # Calculate the move in that first 15m
             change = ((close_price - open_price) / open_price) * 100
@@ -1054,6 +1021,56 @@ class MorningBrief:
             print(f"⚠️ Failed to load master_universe.json: {e}")
             return ['NVDA', 'TSLA', 'AMD'] # Fallback
 
+    def compute_levels(self, us_watchlist: List[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """15m ORB trigger/stop levels for the watchlist: (all_targets, high_prob_setups)."""
+        all_targets = []
+        high_prob_setups = []
+
+        # v3.2: One batched 1m fetch for the watchlist; the 09:30 ET 15m candle
+        # is then read from the bar aggregator (was one 15m request per ticker)
+        try:
+            agg = _refresh_intraday_bars(us_watchlist)
+            session_open = agg.session_open()
+        except Exception as e:
+            print(f"⚠️ Intraday fetch failed: {e}")
+            agg = None
+
+        for ticker in us_watchlist:
+            try:
+                # Find 14:30 UTC / 09:30 ET
+                candle = agg.bar_at(ticker, '15m', session_open) if agg else None
+                if candle is None:
+                    continue # No 9:30 candle found
+                
+                # ORB Logic
+                orb_high = float(candle.high)
+                orb_low = float(candle.low)
+                
+                # Range check
+                if (orb_high - orb_low) / orb_low < 0.002: continue # <0.2% range ignored
+                
+                trigger = orb_high + 0.01
+                stop = orb_low - 0.01
+                qty = 5
+                
+                target_entry = {
+                    "ticker": ticker,
+                    "trigger_price": round(trigger, 2),
+                    "stop_loss": round(stop, 2),
+                    "quantity": qty,
+                    "measure": "15m_ORB"
+                }
+                
+                all_targets.append(target_entry)
+                
+                if ticker in ['NVDA', 'TSLA', 'MSTR'] or (len(high_prob_setups) < 12):
+                    high_prob_setups.append(ticker)
+                    
+            except Exception:
+                continue
+
+        return all_targets, high_prob_setups
+
     def generate_brief(self):
         """Calculates levels for ALL tickers and saves to JSON"""
         self.logger.log("BRIEF_START", "System", "Starting Morning Brief scan...")
@@ -1086,65 +1103,11 @@ class MorningBrief:
         watchlist = self.load_watchlist()
         print(f"📊 Scanning {len(watchlist)} tickers for Morning Brief...")
         
-        all_targets = []
-        high_prob_setups = []
-        
         # v2.5 FILTER: US-ONLY (No Stamp Duty)
         us_watchlist = [t for t in watchlist if not any(t.endswith(s) for s in ['.L', '.DE', '.PA', '.AS', '.TO', '.HK', '.MC', '.MI'])]
         print(f"🇺🇸 Filtered to {len(us_watchlist)} US Tickers (from {len(watchlist)}).")
         
-        today_str = datetime.utcnow().strftime('%Y-%m-%d')
-
-        for ticker in us_watchlist:
-            try:
-                import yfinance as yf
-                t_obj = yf.Ticker(ticker)
-                
-                # v2.0 ORB: Fetch 2 days of 15m data
-                hist = t_obj.history(period='2d', interval='15m')
-                if hist.empty: continue
-                
-                # Filter for TODAY
-                # Convert index to compatible string format for search
-                hist.index = hist.index.strftime('%Y-%m-%d %H:%M')    
-                
-                # Find 14:30 UTC / 09:30 ET
-                key_utc = f"{today_str} 14:30"
-                key_et = f"{today_str} 09:30"
-                
-                matching = [i for i in hist.index if key_et in str(i) or key_utc in str(i)]
-                
-                if not matching:
-                    continue # No 9:30 candle found
-                    
-                candle = hist.loc[matching[0]]
-                
-                # ORB Logic
-                orb_high = float(candle['High'])
-                orb_low = float(candle['Low'])
-                
-                # Range check
-                if (orb_high - orb_low) / orb_low < 0.002: continue # <0.2% range ignored
-                
-                trigger = orb_high + 0.01
-                stop = orb_low - 0.01
-                qty = 5
-                
-                target_entry = {
-                    "ticker": ticker,
-                    "trigger_price": round(trigger, 2),
-                    "stop_loss": round(stop, 2),
-                    "quantity": qty,
-                    "measure": "15m_ORB"
-                }
-                
-                all_targets.append(target_entry)
-                
-                if ticker in ['NVDA', 'TSLA', 'MSTR'] or (len(high_prob_setups) < 12):
-                    high_prob_setups.append(ticker)
-                    
-            except Exception:
-                continue
+        all_targets, high_prob_setups = self.compute_levels(us_watchlist)
         
         # Save FULL targets array
         os.makedirs('data', exist_ok=True)
@@ -1,14 +1,20 @@
 import json
 import os
-import yfinance as yf
-import pandas as pd
 from trading212_client import Trading212Client
+from shared.lazy_import import lazy_import
+from bar_aggregator import get_aggregator
+from perf_metrics import PERF
+
+# Heavy data stack: loaded on the first scan, not when main_bot starts
+yf = lazy_import("yfinance")
+pd = lazy_import("pandas")
 
 class SniperStrategy:
     """The Muscle: Analysis and Risk Management logic."""
     
-    def __init__(self, client: Trading212Client):
+    def __init__(self, client: Trading212Client, session_manager=None):
         self.client = client
+        self.session_manager = session_manager
         self.targets_file = 'data/targets.json'
         self.triggered_today = set() # Track executed tickers
         self.last_scan_date = None
@@ -43,7 +49,15 @@ class SniperStrategy:
             
         try:
             # Silent batch fetch
-            data = yf.download(tickers_to_scan, period="1d", interval="1m", progress=False, group_by='ticker')
+            with PERF.span("scan.download"):
+                data = yf.download(tickers_to_scan, period="1d", interval="1m", progress=False, group_by='ticker')
+
+            # v3.2: Publish the 1m tape to the shared aggregator so 5m/15m/1h/4h/1d
+            # consumers in this process read from memory instead of refetching
+            try:
+                get_aggregator("equity").ingest_download(data, tickers_to_scan)
+            except Exception as e:
+                print(f"⚠️ Bar aggregator ingest failed: {e}")
             
             for target in targets:
                 ticker = target['ticker']
@@ -145,9 +159,12 @@ class SniperStrategy:
     def check_risk_rules(self):
         """Checks open positions for Stop Loss / Take Profit"""
         try:
-            # 🛡️ IRON ISOLATION: Import Session Manager for whitelist enforcement
-            from session_manager import SessionManager
-            session_mgr = SessionManager()
+            # 🛡️ IRON ISOLATION: Session Manager for whitelist enforcement
+            # (shared with main_bot so buys are visible without re-reading the file)
+            if self.session_manager is None:
+                from session_manager import SessionManager
+                self.session_manager = SessionManager()
+            session_mgr = self.session_manager
             
             positions = self.client.get_positions()
             exits = []
@@ -11,6 +11,8 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Any
 
+from cost_basis import CostBasisLedger, is_working
+
 
 # ========================================================================
 # v1.9.4 PERSISTENCE LOCK: Protect the Holy Ledger
@@ -60,14 +62,19 @@ print(f"✅ Persistence lock verified for Holy Ledger sync")
 class T212LedgerSync:
     """Syncs Trading212 account data and calculates realized profits"""
     
-    def __init__(self):
+    def __init__(self, base_url: str = None):
         self.api_key = os.getenv("T212_API_TRADE_KEY")
         self.api_secret = os.getenv("T212_API_TRADE_SECRET")
-        self.base_url = "https://live.trading212.com/api/v0"
+        self.base_url = (base_url or os.getenv("T212_BASE_URL") or "https://live.trading212.com/api/v0").rstrip("/")
         self.balance_path = "data/eod_balance.json"
         
         if not self.api_key:
             raise ValueError("T212_API_TRADE_KEY environment variable not set")
+
+        # Fills, open lots and the history checkpoint live here between runs
+        self.ledger = CostBasisLedger(os.getenv("T212_COST_BASIS_DB", "data/cost_basis.db"),
+                                      method=os.getenv("T212_COST_BASIS_METHOD", "fifo"))
+        self.session = requests.Session()
     
     def _get_headers(self) -> Dict[str, str]:
         """Generate API headers with authentication"""
@@ -79,59 +86,116 @@ class T212LedgerSync:
     def get_account_cash(self) -> Dict[str, Any]:
         """Fetch current cash balance"""
         url = f"{self.base_url}/equity/account/cash"
-        response = requests.get(url, headers=self._get_headers())
+        response = self.session.get(url, headers=self._get_headers())
         response.raise_for_status()
         return response.json()
     
     def get_portfolio_positions(self) -> List[Dict[str, Any]]:
         """Fetch current open positions"""
         url = f"{self.base_url}/equity/portfolio"
-        response = requests.get(url, headers=self._get_headers())
+        response = self.session.get(url, headers=self._get_headers())
         response.raise_for_status()
         return response.json()
     
-    def get_order_history(self, days_back: int = 30) -> List[Dict[str, Any]]:
-        """Fetch historical orders"""
-        cursor = None
-        all_orders = []
-        
-        # T212 API uses pagination
+    def _history_pages(self, start_path: str = None):
+        """
+        Yields (items, next_path) newest first. T212 pages backwards in time;
+        next_path is the full nextPagePath to resume from (None at the end).
+        """
+        url = f"{self.base_url}/equity/history/orders"
+        params = {"limit": 50}
+        if start_path:
+            url, params = self._url_for(start_path), None
         while True:
-            url = f"{self.base_url}/equity/history/orders"
-            params = {"limit": 50}
-            if cursor:
-                params["cursor"] = cursor
-            
-            response = requests.get(url, headers=self._get_headers(), params=params)
+            response = self.session.get(url, headers=self._get_headers(), params=params)
             response.raise_for_status()
             data = response.json()
-            
-            orders = data.get("items", [])
-            all_orders.extend(orders)
-            
-            # Check if there are more pages
-            cursor = data.get("nextPageCursor")
-            if not cursor:
-                break
-        
-        return all_orders
-    
-    def calculate_realized_profit(self, orders: List[Dict[str, Any]]) -> float:
+            next_path = data.get("nextPagePath")
+            if next_path is None and data.get("nextPageCursor"):
+                next_path = f"/api/v0/equity/history/orders?limit=50&cursor={data['nextPageCursor']}"
+            yield data.get("items", []), next_path
+            if not next_path:
+                return
+            url, params = self._url_for(next_path), None
+
+    def _url_for(self, path: str) -> str:
+        """nextPagePath is host-relative and already includes /api/v0."""
+        root = self.base_url.split("/api/", 1)[0]
+        return f"{root}{path}"
+
+    def get_order_history(self, days_back: int = 30) -> List[Dict[str, Any]]:
+        """Fetch historical orders from the last `days_back` days (stops paging at the cutoff)"""
+        cutoff = (datetime.utcnow() - timedelta(days=days_back)).isoformat()
+        recent = []
+        for items, _ in self._history_pages():
+            for item in items:
+                order = item.get("order", item)
+                created = str(order.get("dateExecuted") or order.get("dateCreated") or "")
+                if created and created[:19] < cutoff[:19]:
+                    return recent
+                recent.append(item)
+        return recent
+
+    def sync_order_history(self) -> int:
         """
-        Calculate realized profit from closed positions
-        Note: This is a simplified calculation. For production, you'd want more sophisticated P&L tracking.
+        Incremental history sync into the cost basis ledger; returns fills booked.
+
+        First run: a full backfill, checkpointing nextPagePath after every page
+        so an interrupted backfill resumes where it stopped; fills are booked
+        (chronologically) once it reaches the oldest page.
+        Afterwards: pages from the newest order back until an order already in
+        the ledger appears and every order that was still working at the last
+        sync has been seen again, so cost is proportional to new fills.
         """
-        total_realized = 0.0
-        
-        for order in orders:
-            # Only count filled sell orders
-            if order.get("type") == "SELL" and order.get("status") == "FILLED":
-                filled_value = order.get("filledValue", 0.0)
-                # Subtract fees
-                total_realized += filled_value
-        
-        return total_realized
-    
+        ledger = self.ledger
+        if not ledger.get_state("backfill_complete", False):
+            resume = ledger.get_state("backfill_cursor")
+            if resume:
+                print(f"⏩ Resuming history backfill from {resume}")
+            working = set(ledger.get_state("open_orders", [])) if resume else set()
+            pages = 0
+            for items, next_path in self._history_pages(resume):
+                if not resume and pages == 0 and items:
+                    ledger.set_state("head_id", str(items[0].get("order", items[0]).get("id")), commit=False)
+                ledger.stage(items)
+                working.update(str(item.get("order", item).get("id")) for item in items if is_working(item))
+                ledger.set_state("open_orders", sorted(working), commit=False)
+                ledger.set_state("backfill_cursor", next_path)  # commits the page with its cursor
+                pages += 1
+            ledger.set_state("backfill_complete", True)
+            print(f"📚 Backfilled {ledger.fill_count()} fills over {pages} pages")
+            return ledger.apply_pending()
+
+        head_id = ledger.get_state("head_id")
+        # Orders still working at the last sync: their fills land below the head, so page back to them
+        unseen = set(ledger.get_state("open_orders", []))
+        working, newest, new, caught_up = set(), None, 0, False
+        for items, _ in self._history_pages():
+            ids = [str(item.get("order", item).get("id")) for item in items]
+            newest = newest or (ids[0] if ids else None)
+            # head_id also covers cancelled/rejected orders, which never reach the fills table
+            caught_up = caught_up or head_id in ids or any(ledger.has_order(i) for i in ids)
+            working.update(i for i, item in zip(ids, items) if is_working(item))
+            unseen.difference_update(ids)
+            new += ledger.stage(items)
+            if caught_up and not unseen:
+                break  # everything older is already in the ledger
+        ledger.set_state("open_orders", sorted(working), commit=False)
+        booked = ledger.apply_pending()
+        if newest:
+            ledger.set_state("head_id", newest)
+        print(f"🔁 Incremental sync: {new} new fills")
+        return booked
+
+    def calculate_realized_profit(self, orders: List[Dict[str, Any]] = None) -> float:
+        """
+        Realized P&L (net of fees) from the cost basis ledger. `orders`, if
+        given, are booked first (already-known order ids are ignored).
+        """
+        if orders:
+            self.ledger.apply_orders(orders)
+        return self.ledger.realized_total()
+
     def sync_balance(self) -> Dict[str, Any]:
         """
         Main sync function: fetch T212 data and update eod_balance.json
@@ -143,15 +207,14 @@ class T212LedgerSync:
             # Fetch data from T212
             cash_data = self.get_account_cash()
             positions = self.get_portfolio_positions()
-            orders = self.get_order_history()
+            self.sync_order_history()
             
             # Calculate metrics
             total_cash = cash_data.get("total", 0.0)
             free_cash = cash_data.get("free", 0.0)
             
-            # Calculate realized profit (simplified)
-            # In production, you'd track cost basis more carefully
-            realized_profit = self.calculate_realized_profit(orders)
+            # Realized P&L from matched lots (not sell proceeds)
+            realized_profit = self.calculate_realized_profit()
             
             # Load existing balance state
             try:
@@ -171,6 +234,7 @@ class T212LedgerSync:
             balance_state["total_cash"] = total_cash
             balance_state["free_cash"] = free_cash
             balance_state["position_count"] = len(positions)
+            balance_state["total_trades"] = self.ledger.fill_count()
             
             # Check if scaling should be activated
             if realized_profit >= 1000.0:
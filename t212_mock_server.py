@@ -0,0 +1,562 @@
+"""
+T212 Mock Server (t212_mock_server.py)
+======================================
+Local stand-in for the Trading 212 v0 REST API, for load and latency
+testing without touching the live account.
+
+    python t212_mock_server.py --port 8212 --latency lognormal:40:0.5 --partial-fill-rate 0.3
+    export T212_BASE_URL=http://127.0.0.1:8212/api/v0     # Trading212Client / sync_ledger follow it
+
+    with T212MockServer(latency="0", rate_limits={}) as mock:
+        client = Trading212Client(base_url=mock.base_url)
+
+Endpoints (under /api/v0):
+    GET    /equity/account/summary        GET /equity/account/cash
+    GET    /equity/portfolio[/{ticker}]   GET /equity/metadata/instruments
+    GET    /equity/orders[/{id}]          DELETE /equity/orders/{id}
+    POST   /equity/orders/limit           GET /equity/history/orders?limit=&cursor=&ticker=
+
+Faults it models:
+    latency      per-route distributions ("fixed:50", "uniform:20:80",
+                 "normal:60:15", "lognormal:<median ms>:<sigma>")
+    rate limits  T212's per-endpoint windows -> 429 (HTML page like the
+                 Cloudflare edge by default, JSON with html_429=False)
+    errors       random 502/503 HTML pages at `error_rate`
+    fills        limit orders fill against a (optionally random-walking)
+                 price; `partial_fill_rate` splits fills over several polls
+
+GET /__mock/stats returns request/status counters (no auth, no faults).
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+API_PREFIX = "/api/v0"
+
+# (method, route key, path regex, handler)
+ROUTES = [
+    ("GET", "/equity/account/summary", r"/equity/account/summary", "_account_summary"),
+    ("GET", "/equity/account/cash", r"/equity/account/cash", "_account_cash"),
+    ("GET", "/equity/portfolio", r"/equity/portfolio", "_portfolio"),
+    ("GET", "/equity/portfolio/{ticker}", r"/equity/portfolio/(?P<ticker>[^/]+)", "_position"),
+    ("GET", "/equity/orders", r"/equity/orders", "_orders"),
+    ("GET", "/equity/orders/{id}", r"/equity/orders/(?P<order_id>\d+)", "_order"),
+    ("DELETE", "/equity/orders/{id}", r"/equity/orders/(?P<order_id>\d+)", "_cancel"),
+    ("POST", "/equity/orders/limit", r"/equity/orders/limit", "_place_limit"),
+    ("GET", "/equity/metadata/instruments", r"/equity/metadata/instruments", "_instruments"),
+    ("GET", "/equity/history/orders", r"/equity/history/orders", "_history"),
+]
+_COMPILED = [(method, key, re.compile(pattern + r"/?$"), handler) for method, key, pattern, handler in ROUTES]
+
+# Published T212 limits: (requests, period seconds) per API key
+RATE_LIMITS = {
+    "GET /equity/account/summary": (1, 5),
+    "GET /equity/account/cash": (1, 2),
+    "GET /equity/portfolio": (1, 5),
+    "GET /equity/portfolio/{ticker}": (1, 1),
+    "GET /equity/orders": (1, 5),
+    "GET /equity/orders/{id}": (1, 1),
+    "DELETE /equity/orders/{id}": (50, 60),
+    "POST /equity/orders/limit": (1, 2),
+    "GET /equity/metadata/instruments": (1, 50),
+    "GET /equity/history/orders": (6, 60),
+}
+
+DEFAULT_INSTRUMENTS = [
+    # (ticker, shortName, currency, price)
+    ("NVDA_US_EQ", "NVDA", "USD", 180.0), ("TSLA_US_EQ", "TSLA", "USD", 420.0),
+    ("AMD_US_EQ", "AMD", "USD", 160.0), ("AAPL_US_EQ", "AAPL", "USD", 230.0),
+    ("MSFT_US_EQ", "MSFT", "USD", 510.0), ("META_US_EQ", "META", "USD", 740.0),
+    ("AMZN_US_EQ", "AMZN", "USD", 225.0), ("GOOGL_US_EQ", "GOOGL", "USD", 245.0),
+    ("PLTR_US_EQ", "PLTR", "USD", 180.0), ("COIN_US_EQ", "COIN", "USD", 330.0),
+    ("MSTR_US_EQ", "MSTR", "USD", 310.0), ("SOFI_US_EQ", "SOFI", "USD", 28.0),
+    ("RRl_EQ", "RR", "GBX", 1150.0), ("BARCl_EQ", "BARC", "GBX", 380.0),
+]
+
+_ERROR_PAGE = """<!DOCTYPE html>
+<html><head><title>{code} {reason} | live.trading212.com | Cloudflare</title></head>
+<body><div id="cf-wrapper"><h1>{reason}</h1><span>Error code {code}</span>
+<p>Ray ID: {ray}</p></div></body></html>"""
+
+
+def parse_latency(spec):
+    """
+    Latency spec -> callable returning seconds. Numbers are milliseconds:
+    "0", "50" / "fixed:50", "uniform:20:80", "normal:60:15", "lognormal:40:0.5".
+    """
+    if callable(spec):
+        return spec
+    parts = str(spec).split(":")
+    kind, args = (parts[0], [float(p) for p in parts[1:]]) if not _is_number(parts[0]) else ("fixed", [float(parts[0])])
+    if kind == "fixed":
+        ms = args[0] if args else 0.0
+        return lambda rng: ms / 1000
+    if kind == "uniform":
+        lo, hi = args
+        return lambda rng: rng.uniform(lo, hi) / 1000
+    if kind == "normal":
+        mean, sd = args
+        return lambda rng: max(0.0, rng.gauss(mean, sd)) / 1000
+    if kind == "lognormal":
+        median, sigma = args
+        mu = math.log(median)
+        return lambda rng: rng.lognormvariate(mu, sigma) / 1000
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def _is_number(text):
+    try:
+        float(text)
+        return True
+    except ValueError:
+        return False
+
+
+def _iso(ts=None):
+    return (ts or datetime.now(timezone.utc)).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+class MockError(Exception):
+    """T212-style business error -> JSON {"code", "message"} with an HTTP status."""
+
+    def __init__(self, status, code, message=""):
+        super().__init__(message or code)
+        self.status, self.code, self.message = status, code, message or code
+
+
+class T212MockServer:
+    """
+    In-memory broker behind a ThreadingHTTPServer. All knobs are plain
+    attributes and may be changed while it runs (e.g. error_rate = 1.0 to
+    simulate an outage).
+    """
+
+    def __init__(self, port=0, host="127.0.0.1", latency="lognormal:40:0.5", latency_overrides=None,
+                 rate_limits=None, html_429=True, error_rate=0.0, partial_fill_rate=0.0, fill_delay=0.0,
+                 volatility=0.0, cash=10000.0, currency="GBP", instruments=None, positions=None,
+                 history=0, api_key=None, seed=None):
+        self.host, self.port = host, port
+        self.latency = parse_latency(latency)
+        self.latency_overrides = {k: parse_latency(v) for k, v in (latency_overrides or {}).items()}
+        self.rate_limits = dict(RATE_LIMITS if rate_limits is None else rate_limits)
+        self.html_429 = html_429
+        self.error_rate = error_rate
+        self.partial_fill_rate = partial_fill_rate
+        self.fill_delay = fill_delay
+        self.volatility = volatility  # per-sqrt-second log-return sd of the price walk
+        self.api_key = api_key  # None: any non-empty Authorization header is accepted
+
+        self.rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._stats = {"routes": Counter(), "status": Counter()}
+        self._server = None
+
+        self.currency = currency
+        self.cash = float(cash)
+        self.realized = 0.0
+        self.instruments = {}
+        self.prices = {}
+        self._price_ts = {}
+        for item in instruments or [self._instrument(*row) for row in DEFAULT_INSTRUMENTS]:
+            self.instruments[item["ticker"]] = item
+            self.prices[item["ticker"]] = float(item.get("price") or self.rng.uniform(10, 500))
+        self.positions = {}
+        for ticker, (quantity, avg_price) in (positions or {}).items():
+            self.positions[ticker] = {"quantity": float(quantity), "averagePrice": float(avg_price),
+                                      "initialFillDate": _iso()}
+        self.orders = {}
+        self.history = []
+        self._next_id = 1
+        self._seed_history(history)
+
+    @staticmethod
+    def _instrument(ticker, short, currency, price):
+        return {"ticker": ticker, "shortName": short, "name": short, "currencyCode": currency, "type": "STOCK",
+                "isin": "", "minTradeQuantity": 0.01, "maxOpenQuantity": 100000, "addedOn": "2020-01-01T00:00:00Z",
+                "price": price}
+
+    # --- LIFECYCLE ---
+    def start(self):
+        handler = type("T212MockHandler", (_MockHandler,), {"mock": self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name="T212Mock", daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}{API_PREFIX}"
+
+    def stats(self):
+        with self._lock:
+            return {"routes": dict(self._stats["routes"]), "status": {str(k): v for k, v in self._stats["status"].items()},
+                    "open_orders": len(self.orders), "history": len(self.history)}
+
+    # --- REQUEST PIPELINE ---
+    def handle(self, method, path, query=None, body=None, auth=None):
+        """
+        One request through auth -> routing -> latency -> faults -> rate limit -> handler.
+        Returns (status, body, content_type, headers) with body a str.
+        """
+        query = query or {}
+        if path == "/__mock/stats":
+            return 200, json.dumps(self.stats()), "application/json", {}
+        if not path.startswith(API_PREFIX):
+            return self._json(404, {"code": "NotFound", "message": path})
+        path = path[len(API_PREFIX):]
+
+        match = None
+        for route_method, key, regex, name in _COMPILED:
+            m = regex.match(path)
+            if m and route_method == method:
+                match = (key, m.groupdict(), getattr(self, name))
+                break
+        route = f"{method} {match[0]}" if match else f"{method} {path}"
+        delay = self.latency_overrides.get(route, self.latency)(self.rng)
+        if delay > 0:
+            time.sleep(delay)
+
+        status, *rest = self._respond(route, match, query, body, auth)
+        with self._lock:
+            self._stats["routes"][route] += 1
+            self._stats["status"][status] += 1
+        return (status, *rest)
+
+    def _respond(self, route, match, query, body, auth):
+        if not auth or (self.api_key and self.api_key not in auth):
+            return 401, "", "text/plain", {}
+        if match is None:
+            return self._json(404, {"code": "NotFound", "message": route})
+        if self.error_rate and self.rng.random() < self.error_rate:
+            code, reason = self.rng.choice([(502, "Bad gateway"), (503, "Service Temporarily Unavailable")])
+            return code, _ERROR_PAGE.format(code=code, reason=reason, ray=f"{self.rng.getrandbits(64):016x}"), "text/html", {}
+        limited = self._rate_limit(route, auth)
+        if limited:
+            return limited
+
+        key, params, handler = match
+        try:
+            if body:
+                params["payload"] = json.loads(body)
+            with self._lock:
+                self._advance(time.monotonic())
+                return self._json(200, handler(query=query, **params))
+        except MockError as e:
+            return self._json(e.status, {"code": e.code, "message": e.message})
+        except (ValueError, KeyError, TypeError) as e:
+            return self._json(400, {"code": "BadRequest", "message": str(e)})
+
+    def _rate_limit(self, route, auth):
+        limit = self.rate_limits.get(route)
+        if not limit:
+            return None
+        count, period = limit
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.setdefault((auth, route), deque())
+            while window and now - window[0] >= period:
+                window.popleft()
+            reset = int(time.time() + (period - (now - window[0]) if window else period))
+            headers = {"x-ratelimit-limit": str(count), "x-ratelimit-period": str(period),
+                       "x-ratelimit-reset": str(reset)}
+            if len(window) >= count:
+                headers["x-ratelimit-remaining"] = "0"
+                if self.html_429:
+                    page = _ERROR_PAGE.format(code=429, reason="Too Many Requests", ray=f"{self.rng.getrandbits(64):016x}")
+                    return 429, page, "text/html", headers
+                return 429, json.dumps({"code": "TooManyRequests", "message": route}), "application/json", headers
+            window.append(now)
+        return None
+
+    @staticmethod
+    def _json(status, data):
+        return status, json.dumps(data), "application/json", {}
+
+    # --- MARKET & FILLS (called under the lock) ---
+    def _price(self, ticker, now=None):
+        price = self.prices.get(ticker)
+        if price is None:
+            return None
+        now = now if now is not None else time.monotonic()
+        last = self._price_ts.get(ticker, now)
+        if self.volatility and now > last:
+            price *= math.exp(self.rng.gauss(0, self.volatility * math.sqrt(now - last)))
+            self.prices[ticker] = price
+        self._price_ts[ticker] = now
+        return price
+
+    def _advance(self, now):
+        """Works every open order whose next fill is due and whose limit is marketable."""
+        for order in list(self.orders.values()):
+            if now < order["_next_fill"]:
+                continue
+            price = self._price(order["ticker"], now)
+            buy = order["quantity"] > 0
+            if (buy and order["limitPrice"] < price) or (not buy and order["limitPrice"] > price):
+                continue
+            remaining = abs(order["quantity"]) - abs(order["filledQuantity"])
+            chunk = remaining
+            if self.partial_fill_rate and self.rng.random() < self.partial_fill_rate:
+                chunk = max(0.01, round(remaining * self.rng.uniform(0.2, 0.8), 2))
+            chunk = min(chunk, remaining)
+            self._fill(order, chunk, price)
+            if abs(order["filledQuantity"]) >= abs(order["quantity"]) - 1e-9:
+                self._close(order, "FILLED")
+            else:
+                order["status"] = "PARTIALLY_FILLED"
+                order["_next_fill"] = now + max(self.fill_delay, 0.001)
+
+    def _fill(self, order, quantity, price):
+        ticker = order["ticker"]
+        position = self.positions.get(ticker)
+        if order["quantity"] > 0:
+            if position is None:
+                position = self.positions[ticker] = {"quantity": 0.0, "averagePrice": 0.0, "initialFillDate": _iso()}
+            held = position["quantity"]
+            position["averagePrice"] = (held * position["averagePrice"] + quantity * price) / (held + quantity)
+            position["quantity"] = held + quantity
+            self.cash -= quantity * price
+            order["filledQuantity"] = round(order["filledQuantity"] + quantity, 8)
+        else:
+            self.realized += quantity * (price - position["averagePrice"])
+            position["quantity"] -= quantity
+            self.cash += quantity * price
+            if position["quantity"] <= 1e-9:
+                del self.positions[ticker]
+            order["filledQuantity"] = round(order["filledQuantity"] - quantity, 8)
+        order["filledValue"] = round(order["filledValue"] + quantity * price, 8)
+
+    def _close(self, order, status):
+        order["status"] = status
+        del self.orders[order["id"]]
+        self.history.append(self._history_item(order, _iso()))
+
+    def _history_item(self, order, executed):
+        filled = order["filledQuantity"]
+        fill_price = round(order["filledValue"] / abs(filled), 6) if filled else None
+        public = self._public(order)
+        public.update(status=order["status"], fillPrice=fill_price, dateExecuted=executed if filled else None,
+                      dateModified=executed, side="BUY" if order["quantity"] > 0 else "SELL")
+        item = {"order": public}
+        if filled:
+            item["fill"] = {"id": order["id"], "quantity": filled, "price": fill_price, "filledAt": executed,
+                            "type": "TRADE", "walletImpact": {"currency": self.currency, "taxes": []}}
+        return item
+
+    def _seed_history(self, count):
+        """`count` synthetic filled orders over the last days (older ids than any live order)."""
+        tickers = list(self.instruments)
+        start = datetime.now(timezone.utc) - timedelta(minutes=count * 7 + 60)
+        for i in range(count):
+            ticker = self.rng.choice(tickers)
+            quantity = round(self.rng.uniform(1, 20), 2) * (1 if i % 3 else -1)
+            price = round(self.prices[ticker] * self.rng.uniform(0.9, 1.1), 2)
+            order = {"id": self._new_id(), "ticker": ticker, "type": "LIMIT", "quantity": quantity,
+                     "filledQuantity": quantity, "filledValue": abs(quantity) * price, "limitPrice": price,
+                     "status": "FILLED", "creationTime": _iso(start + timedelta(minutes=7 * i))}
+            self.history.append(self._history_item(order, order["creationTime"]))
+
+    def _new_id(self):
+        order_id = self._next_id
+        self._next_id += 1
+        return order_id
+
+    @staticmethod
+    def _public(order):
+        return {k: v for k, v in order.items() if not k.startswith("_") and k != "filledValue"}
+
+    def _reserved(self):
+        return sum((o["quantity"] - o["filledQuantity"]) * o["limitPrice"] for o in self.orders.values()
+                   if o["quantity"] > 0)
+
+    def _valuation(self):
+        value = cost = 0.0
+        for ticker, p in self.positions.items():
+            value += p["quantity"] * self._price(ticker)
+            cost += p["quantity"] * p["averagePrice"]
+        return value, cost
+
+    # --- ENDPOINTS ---
+    def _account_summary(self, query):
+        value, cost = self._valuation()
+        reserved = self._reserved()
+        return {"id": 1, "currency": self.currency, "totalValue": round(self.cash + value, 2),
+                "cash": {"availableToTrade": round(self.cash - reserved, 2), "reservedForOrders": round(reserved, 2),
+                         "inPies": 0.0},
+                "investments": {"currentValue": round(value, 2), "totalCost": round(cost, 2),
+                                "realizedProfitLoss": round(self.realized, 2),
+                                "unrealizedProfitLoss": round(value - cost, 2)}}
+
+    def _account_cash(self, query):
+        value, cost = self._valuation()
+        reserved = self._reserved()
+        return {"free": round(self.cash - reserved, 2), "total": round(self.cash + value, 2),
+                "ppl": round(value - cost, 2), "result": round(self.realized, 2), "invested": round(cost, 2),
+                "pieCash": 0.0, "blocked": round(reserved, 2)}
+
+    def _position_view(self, ticker, p):
+        price = self._price(ticker)
+        return {"ticker": ticker, "quantity": p["quantity"], "averagePrice": round(p["averagePrice"], 6),
+                "currentPrice": round(price, 4), "ppl": round(p["quantity"] * (price - p["averagePrice"]), 2),
+                "fxPpl": None, "initialFillDate": p["initialFillDate"], "frontend": "API",
+                "maxBuy": None, "maxSell": p["quantity"], "pieQuantity": 0.0}
+
+    def _portfolio(self, query):
+        return [self._position_view(t, p) for t, p in self.positions.items()]
+
+    def _position(self, query, ticker):
+        if ticker not in self.positions:
+            raise MockError(404, "TickerNotFound", ticker)
+        return self._position_view(ticker, self.positions[ticker])
+
+    def _orders(self, query):
+        return [self._public(o) for o in self.orders.values()]
+
+    def _order(self, query, order_id):
+        order = self.orders.get(int(order_id))
+        if order is None:
+            raise MockError(404, "OrderNotFound", order_id)
+        return self._public(order)
+
+    def _cancel(self, query, order_id):
+        order = self.orders.get(int(order_id))
+        if order is None:
+            raise MockError(404, "OrderNotFound", order_id)
+        self._close(order, "CANCELLED")
+        return {}
+
+    def _place_limit(self, query, payload):
+        ticker = payload["ticker"]
+        quantity = float(payload["quantity"])
+        limit_price = float(payload["limitPrice"])
+        if ticker not in self.instruments:
+            raise MockError(400, "InstrumentNotFound", ticker)
+        if quantity == 0 or limit_price <= 0:
+            raise MockError(400, "InvalidValue", "quantity and limitPrice must be non-zero")
+        if quantity > 0 and quantity * limit_price > self.cash - self._reserved() + 1e-9:
+            raise MockError(400, "InsufficientFreeForStocksException", "Insufficient funds")
+        if quantity < 0:
+            pending = sum(-(o["quantity"] - o["filledQuantity"]) for o in self.orders.values()
+                          if o["ticker"] == ticker and o["quantity"] < 0)
+            if -quantity > self.positions.get(ticker, {}).get("quantity", 0.0) - pending + 1e-9:
+                raise MockError(400, "SellingEquityNotOwned", ticker)
+        order = {"id": self._new_id(), "ticker": ticker, "type": "LIMIT", "strategy": "QUANTITY",
+                 "quantity": quantity, "limitPrice": limit_price, "filledQuantity": 0.0, "filledValue": 0.0,
+                 "status": "NEW", "timeValidity": payload.get("timeValidity", "DAY"), "creationTime": _iso(),
+                 "_next_fill": time.monotonic() + self.fill_delay}
+        self.orders[order["id"]] = order
+        self._advance(time.monotonic())
+        return self._public(order)
+
+    def _instruments(self, query):
+        return [{k: v for k, v in item.items() if k != "price"} for item in self.instruments.values()]
+
+    def _history(self, query):
+        limit = min(int(query.get("limit", ["20"])[0]), 50)
+        cursor = query.get("cursor", [None])[0]
+        ticker = query.get("ticker", [None])[0]
+        items = [h for h in reversed(self.history)
+                 if (cursor is None or h["order"]["id"] < int(cursor)) and (ticker is None or h["order"]["ticker"] == ticker)]
+        page = items[:limit]
+        next_path = None
+        if len(items) > limit:
+            next_path = f"{API_PREFIX}/equity/history/orders?limit={limit}&cursor={page[-1]['order']['id']}"
+            if ticker:
+                next_path += f"&ticker={ticker}"
+        return {"items": page, "nextPagePath": next_path}
+
+
+class _MockHandler(BaseHTTPRequestHandler):
+    mock = None  # bound per server by T212MockHandler
+    protocol_version = "HTTP/1.1"
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else None
+        status, text, content_type, headers = self.mock.handle(method, url.path, parse_qs(url.query), body,
+                                                               self.headers.get("Authorization"))
+        payload = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def log_message(self, format, *args):
+        pass  # keep load tests quiet
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Trading 212 v0 API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8212)
+    parser.add_argument("--latency", default="lognormal:40:0.5", help="fixed:MS | uniform:LO:HI | normal:MEAN:SD | lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--route-latency", action="append", default=[], metavar="'METHOD /path=SPEC'",
+                        help="Per-route override, e.g. 'POST /equity/orders/limit=uniform:150:600'")
+    parser.add_argument("--no-rate-limits", action="store_true")
+    parser.add_argument("--json-429", action="store_true", help="JSON 429 bodies instead of the HTML edge page")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--partial-fill-rate", type=float, default=0.0)
+    parser.add_argument("--fill-delay", type=float, default=0.0, help="Seconds between placement/partial fills")
+    parser.add_argument("--volatility", type=float, default=0.0)
+    parser.add_argument("--cash", type=float, default=10000.0)
+    parser.add_argument("--instruments", help="JSON list (e.g. data/master_instruments.json)")
+    parser.add_argument("--history", type=int, default=0, help="Synthetic filled orders to preload")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    instruments = None
+    if args.instruments:
+        with open(args.instruments) as f:
+            instruments = json.load(f)
+    overrides = dict(item.split("=", 1) for item in args.route_latency)
+    mock = T212MockServer(port=args.port, host=args.host, latency=args.latency, latency_overrides=overrides,
+                          rate_limits={} if args.no_rate_limits else None, html_429=not args.json_429,
+                          error_rate=args.error_rate, partial_fill_rate=args.partial_fill_rate,
+                          fill_delay=args.fill_delay, volatility=args.volatility, cash=args.cash,
+                          instruments=instruments, history=args.history, seed=args.seed).start()
+    print(f"🧪 T212 mock listening: {mock.base_url} ({len(mock.instruments)} instruments)")
+    print(f"   export T212_BASE_URL={mock.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        mock.stop()
+
+
+if __name__ == "__main__":
+    main()
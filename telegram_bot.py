@@ -1,4 +1,5 @@
 from trading212_client import Trading212Client
+from telegram_dispatcher import get_dispatcher
 import sys
 import os
 
@@ -18,12 +19,12 @@ class SovereignAlerts:
         self.use_krypto_channel = use_krypto_channel
         
     def send_message(self, msg):
-        """Send raw markdown message"""
+        """Queue raw markdown message (non-blocking; delivered by the dispatcher)"""
         if hub:
             if self.use_krypto_channel:
-                hub.send_crypto_alert(msg)
+                get_dispatcher().enqueue_via("hub:crypto", msg, hub.send_crypto_alert)
             else:
-                hub.send_stock_alert(msg)
+                get_dispatcher().enqueue_via("hub:stock", msg, hub.send_stock_alert)
         else:
             # Fallback to legacy client method if hub fails
             self.client.send_telegram(msg, use_krypto_channel=self.use_krypto_channel)
@@ -47,6 +48,25 @@ class SovereignAlerts:
         msg = f"⚡ **SENTINEL STATUS** ⚡\n💰 Wealth: £{total:,.2f}"
         self.send_message(msg)
 
+    # v3.2: Called by main_bot / MorningBrief but previously missing (AttributeError
+    # aborted the brief after targets were written, and every hourly pulse)
+    def send_formatted_message(self, source, emoji, title, body, category="INFO"):
+        """Titled report block (Morning Brief, sector deltas)"""
+        msg = f"{emoji} **{title}**\n"
+        msg += f"_{source} | {category}_\n\n"
+        msg += body
+        self.send_message(msg)
+
+    def send_health_alert(self, source, status, details):
+        """Job health notification (session complete, repeated failures)"""
+        msg = f"🩺 **{status}**\nJob: `{source}`\n{details}"
+        self.send_message(msg)
+
+    def send_pulse(self, target_count, time_str):
+        """Hourly Sniper heartbeat"""
+        msg = f"💓 **SNIPER PULSE** ({time_str} UTC)\nTracking {target_count} targets."
+        self.send_message(msg)
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description='Send Telegram Alert')
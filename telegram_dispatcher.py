@@ -0,0 +1,297 @@
+"""
+Telegram Dispatcher — Background alert delivery for the trading loop.
+====================================================================
+Alerts used to be posted synchronously from inside run_sniper, so a slow
+Telegram API stalled order handling. Callers now enqueue and return
+immediately; a single worker thread does the network I/O.
+
+- Bounded queue: enqueue never blocks; when full the message is dropped
+  and counted (alerts must never back-pressure the trade path).
+- Per-chat rate limiting: Telegram allows ~1 msg/s per chat and ~30 msg/s
+  per bot, and answers 429 + retry_after beyond that.
+- Coalescing: a burst of alerts for the same chat is joined into one
+  message (up to the 4096-char limit) instead of N separate posts.
+- Markdown fallback: if Telegram rejects the Markdown, resend as plain text.
+- Flush on exit: pending alerts are delivered (with a deadline) at shutdown;
+  once closed, enqueue refuses new alerts (False, counted as dropped).
+
+Usage:
+    from telegram_dispatcher import get_dispatcher
+    get_dispatcher().enqueue("🚀 **TRADE ENTRY**", chat_id, bot_token)
+"""
+
+import atexit
+import collections
+import queue
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+# Telegram hard limit is 4096; keep headroom for the coalescing separator
+MAX_MESSAGE_CHARS = 4000
+COALESCE_SEPARATOR = "\n\n"
+
+
+class TelegramDispatcher:
+    """Non-blocking, rate-limited, coalescing Telegram sender."""
+
+    def __init__(self, max_queue: int = 500, per_chat_interval: float = 1.0,
+                 global_interval: float = 1.0 / 25, coalesce_window: float = 0.25,
+                 request_timeout: float = 10.0, max_retry_after: float = 30.0):
+        self.per_chat_interval = per_chat_interval
+        self.global_interval = global_interval
+        self.coalesce_window = coalesce_window
+        self.request_timeout = request_timeout
+        self.max_retry_after = max_retry_after
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        # key -> deque of pending texts; key -> (sender) for delivery
+        self._pending: Dict[Tuple, collections.deque] = {}
+        self._senders: Dict[Tuple, Callable[[str], None]] = {}
+        self._next_allowed: Dict[Tuple, float] = {}
+        self._first_queued: Dict[Tuple, float] = {}
+        self._last_send = 0.0
+
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._flush_waiters = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._closed = False  # set by close(): new messages are refused, queued ones still drain
+
+        self.stats = {"enqueued": 0, "sent": 0, "coalesced": 0, "dropped": 0,
+                      "failed": 0, "plain_fallbacks": 0, "rate_limited": 0}
+
+    # --- PUBLIC API ---
+    def enqueue(self, text: str, chat_id, bot_token: str) -> bool:
+        """Queues a Markdown message for a chat. Never blocks; False if dropped."""
+        if not text or not chat_id or not bot_token:
+            return False
+        key = ("http", bot_token, str(chat_id))
+        return self._put(key, text, lambda msg: self._post(bot_token, chat_id, msg))
+
+    def enqueue_via(self, key: str, text: str, sender: Callable[[str], None]) -> bool:
+        """
+        Queues a message for a custom sender (e.g. the orchestrator telegram_hub).
+        Messages sharing `key` are rate-limited and coalesced together.
+        """
+        if not text:
+            return False
+        return self._put(("custom", key), text, sender)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Waits until everything queued so far is delivered. True if drained."""
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            # A pending flush skips the coalesce window so the backlog goes out now
+            self._flush_waiters += 1
+            try:
+                while self._queue.unfinished_tasks or self._in_flight or any(self._pending.values()):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    self._idle.wait(min(remaining, 0.1))
+            finally:
+                self._flush_waiters -= 1
+        return True
+
+    def close(self, timeout: float = 10.0) -> bool:
+        """Refuses further messages, flushes what was accepted, and stops the worker."""
+        with self._lock:
+            self._closed = True
+        drained = self.flush(timeout)
+        self._stopping = True
+        return drained
+
+    # --- INTERNALS ---
+    def _put(self, key: Tuple, text: str, sender: Callable[[str], None]) -> bool:
+        if not self._closed:
+            self._ensure_worker()
+        with self._lock:
+            # Checked under the lock close() takes, so nothing lands behind its flush
+            if self._closed:
+                reason = "dispatcher closed"
+            else:
+                try:
+                    self._queue.put_nowait((key, text, sender))
+                except queue.Full:
+                    reason = "queue full"
+                else:
+                    self.stats["enqueued"] += 1
+                    return True
+            self.stats["dropped"] += 1
+            dropped = self.stats["dropped"]
+        print(f"⚠️ Telegram {reason}, alert dropped ({dropped} total)")
+        return False
+
+    def _count(self, stat: str, n: int = 1) -> int:
+        """Bumps a stat (callers' threads and the worker both update them)."""
+        with self._lock:
+            self.stats[stat] += n
+            return self.stats[stat]
+
+    def _ensure_worker(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="TelegramDispatcher", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while not self._stopping:
+            wait = self._next_wakeup()
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                self._absorb(item)
+                # Drain whatever else is already waiting so bursts coalesce
+                while True:
+                    try:
+                        self._absorb(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+            key = self._ready_key()
+            if key is not None:
+                self._deliver(key)
+
+    def _absorb(self, item):
+        key, text, sender = item
+        with self._lock:
+            self._pending.setdefault(key, collections.deque()).append(text)
+            self._senders[key] = sender
+            self._first_queued.setdefault(key, time.monotonic())
+        self._queue.task_done()
+
+    def _next_wakeup(self) -> float:
+        """Seconds until the earliest pending chat may send (capped for responsiveness)."""
+        now = time.monotonic()
+        with self._lock:
+            waits = [max(self._send_time(key), self._first_queued.get(key, now) + self.coalesce_window) - now
+                     for key, texts in self._pending.items() if texts]
+        if not waits:
+            return 0.5
+        return max(0.0, min(min(waits), 0.5))
+
+    def _send_time(self, key: Tuple) -> float:
+        return max(self._next_allowed.get(key, 0.0), self._last_send + self.global_interval)
+
+    def _ready_key(self) -> Optional[Tuple]:
+        now = time.monotonic()
+        with self._lock:
+            skip_window = self._flush_waiters > 0
+            ready = [key for key, texts in self._pending.items()
+                     if texts and self._send_time(key) <= now
+                     and (skip_window or now - self._first_queued.get(key, now) >= self.coalesce_window)]
+            if not ready:
+                return None
+            # Oldest backlog first
+            return min(ready, key=lambda k: self._first_queued.get(k, now))
+
+    def _take_batch(self, key: Tuple) -> str:
+        """Pops as many pending texts for `key` as fit in one message (caller holds _lock)."""
+        texts = self._pending[key]
+        parts = [texts.popleft()]
+        size = len(parts[0])
+        while texts and size + len(COALESCE_SEPARATOR) + len(texts[0]) <= MAX_MESSAGE_CHARS:
+            nxt = texts.popleft()
+            size += len(COALESCE_SEPARATOR) + len(nxt)
+            parts.append(nxt)
+        if len(parts) > 1:
+            self.stats["coalesced"] += len(parts) - 1
+        if texts:
+            self._first_queued[key] = time.monotonic() - self.coalesce_window
+        else:
+            self._first_queued.pop(key, None)
+        return COALESCE_SEPARATOR.join(parts)
+
+    def _deliver(self, key: Tuple):
+        with self._lock:
+            batch = self._take_batch(key)
+            sender = self._senders[key]
+            self._in_flight += 1
+        sent = 0
+        try:
+            # Oversized single messages are split rather than rejected
+            while sent < len(batch):
+                sender(batch[sent:sent + MAX_MESSAGE_CHARS])
+                sent += MAX_MESSAGE_CHARS
+            self._count("sent")
+        except _RetryAfter as e:
+            with self._lock:
+                self.stats["rate_limited"] += 1
+                # Only the chunks Telegram has not accepted yet go back
+                self._pending[key].appendleft(batch[sent:])
+                self._first_queued.setdefault(key, time.monotonic() - self.coalesce_window)
+                self._next_allowed[key] = time.monotonic() + min(e.seconds, self.max_retry_after)
+        except Exception as e:
+            self._count("failed")
+            print(f"⚠️ Telegram Send Error: {e}")
+        finally:
+            with self._idle:
+                now = time.monotonic()
+                self._last_send = now
+                self._next_allowed[key] = max(self._next_allowed.get(key, 0.0), now + self.per_chat_interval)
+                self._in_flight -= 1
+                self._idle.notify_all()
+
+    def _post(self, bot_token: str, chat_id, text: str):
+        """Bot API sendMessage with timeout, 429 handling and Markdown fallback."""
+        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        res = requests.post(url, data={"chat_id": chat_id, "text": text, "parse_mode": "Markdown"},
+                            timeout=self.request_timeout)
+        if res.status_code == 429:
+            raise _RetryAfter(_retry_after(res))
+        if res.status_code != 200:
+            # Fallback: Try without Markdown if parsing fails (common with special chars)
+            self._count("plain_fallbacks")
+            res = requests.post(url, data={"chat_id": chat_id, "text": text}, timeout=self.request_timeout)
+            if res.status_code == 429:
+                raise _RetryAfter(_retry_after(res))
+            if res.status_code != 200:
+                raise RuntimeError(f"Telegram HTTP {res.status_code}: {res.text[:200]}")
+
+
+class _RetryAfter(Exception):
+    def __init__(self, seconds: float):
+        super().__init__(f"rate limited for {seconds}s")
+        self.seconds = seconds
+
+
+def _retry_after(res) -> float:
+    try:
+        return float(res.json().get("parameters", {}).get("retry_after", 1))
+    except Exception:
+        return 1.0
+
+
+# --- PROCESS-WIDE INSTANCE ---
+_DISPATCHER: Optional[TelegramDispatcher] = None
+_DISPATCHER_LOCK = threading.Lock()
+
+
+def get_dispatcher() -> TelegramDispatcher:
+    """Shared dispatcher; registers a flush at interpreter exit on first use."""
+    global _DISPATCHER
+    if _DISPATCHER is None:
+        with _DISPATCHER_LOCK:
+            if _DISPATCHER is None:
+                _DISPATCHER = TelegramDispatcher()
+                atexit.register(_DISPATCHER.close)
+    return _DISPATCHER
+
+
+def flush(timeout: float = 10.0) -> bool:
+    """Delivers pending alerts now (e.g. before a systemd stop)."""
+    return _DISPATCHER.flush(timeout) if _DISPATCHER is not None else True
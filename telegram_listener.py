@@ -91,6 +91,18 @@ async def panic_sell(update: Update, context: ContextTypes.DEFAULT_TYPE):
     except Exception as e:
         await update.message.reply_text(f"❌ Panic Error: {e}")
 
+async def perf(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    if not await authenticate(update): return
+
+    # main_bot dumps its phase timings to data/perf_metrics.json every 15 min
+    from perf_metrics import load_snapshot, format_report
+    snapshot = load_snapshot()
+    if snapshot is None:
+        await update.message.reply_text("⏱️ No perf snapshot yet (main_bot not running?)")
+        return
+    prefix = context.args[0] if context.args else None  # e.g. /perf gate.
+    await update.message.reply_text(format_report(snapshot, prefix))
+
 async def heartbeat_job(context: ContextTypes.DEFAULT_TYPE):
     # Sends daily heartbeat
     for uid in ALLOWED_USERS:
@@ -103,6 +115,7 @@ if __name__ == '__main__':
     application.add_handler(CommandHandler('status', status))
     application.add_handler(CommandHandler('set_baserisk', set_baserisk))
     application.add_handler(CommandHandler('panic_sell', panic_sell))
+    application.add_handler(CommandHandler('perf', perf))
     
     # Schedule Heartbeat at 08:00 UTC
     job_queue = application.job_queue
@@ -0,0 +1,99 @@
+"""
+Alt Data Collector Test
+Runs the collector against fake sources: fast sources must reach the
+snapshot without waiting for slow ones, deadlines are reported per source,
+and a failing source keeps its last good value.
+"""
+import json
+import threading
+import time
+
+import alt_data_engine
+from alt_data_engine import AltDataCollector
+from shared.snapshot_reader import SnapshotReader
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_partial_snapshots(tmp_path, monkeypatch):
+    path = tmp_path / "sentiment_snapshot.json"
+    monkeypatch.setattr(alt_data_engine, "DATA_FILE", str(path))
+    release = threading.Event()
+    threads = {}
+
+    def slow():
+        release.wait(5)
+        return ["slow headline"]
+
+    def reddit():
+        threads.setdefault("reddit", set()).add(threading.get_ident())
+        return ["post"]
+
+    collector = AltDataCollector({
+        "fear_and_greed": (lambda: {"value": "30", "sentiment": "Fear"}, 0.05, 1),
+        "rss_breaking": (slow, 60, 0.05),
+        "reddit": (reddit, 0.05, 1),
+    }, tick=0.01)
+    try:
+        started = time.monotonic()
+        while "fear_and_greed" not in collector.data:
+            collector.step()
+        assert time.monotonic() - started < 1  # not held back by the slow source
+        snapshot = read(path)
+        assert snapshot["data"]["fear_and_greed"]["value"] == "30" and "rss_breaking" not in snapshot["data"]
+        assert snapshot["sources"]["fear_and_greed"]["ok"] and snapshot["sources"]["fear_and_greed"]["fetched_at"]
+
+        # The slow source overruns its deadline: reported, but others keep refreshing
+        deadline = time.monotonic() + 1
+        while "deadline" not in (collector.meta["rss_breaking"]["error"] or "") and time.monotonic() < deadline:
+            collector.step()
+        assert "deadline" in read(path)["sources"]["rss_breaking"]["error"]
+
+        # Its late result is still taken
+        release.set()
+        deadline = time.monotonic() + 1
+        while "rss_breaking" not in collector.data and time.monotonic() < deadline:
+            collector.step()
+        assert read(path)["data"]["rss_breaking"] == ["slow headline"]
+
+        # Reddit always runs on the one browser thread
+        for _ in range(20):
+            collector.step()
+        assert len(threads["reddit"]) == 1
+
+        view = SnapshotReader([path]).read()
+        assert view.fear_greed == 30 and not view.is_stale(1, source="fear_and_greed")
+    finally:
+        release.set()
+        collector.shutdown()
+
+
+def test_failed_source_keeps_last_value(tmp_path, monkeypatch):
+    path = tmp_path / "sentiment_snapshot.json"
+    monkeypatch.setattr(alt_data_engine, "DATA_FILE", str(path))
+    results = iter([{"value": "55"}, {}, RuntimeError("boom")])
+
+    def flaky():
+        value = next(results)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    collector = AltDataCollector({"fear_and_greed": (flaky, 0, 1)}, tick=0.01)
+    try:
+        for expected_error in (None, "empty result", "boom"):
+            while not collector.step():
+                pass
+            assert collector.data["fear_and_greed"] == {"value": "55"}
+            assert collector.meta["fear_and_greed"]["error"] == expected_error
+
+        # A restarted collector starts from the last snapshot
+        fresh = AltDataCollector({"fear_and_greed": (flaky, 0, 1)})
+        fresh.load_previous(str(path))
+        assert fresh.data["fear_and_greed"] == {"value": "55"} and fresh.meta["fear_and_greed"]["fetched_at"]
+        fresh.shutdown()
+    finally:
+        collector.shutdown()
@@ -0,0 +1,105 @@
+"""
+Bar Aggregator Test
+Checks every timeframe built from 1m bars against a pandas resample, plus
+session alignment across DST and forming-bar revisions.
+"""
+import numpy as np
+import pandas as pd
+
+from bar_aggregator import BarAggregator
+
+AGG = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+
+def make_session_bars(start, end, tz="America/New_York", rth_only=True, seed=0):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range(start, end, freq="1min", tz="UTC")
+    if rth_only:
+        local = idx.tz_convert(tz)
+        minutes = local.hour * 60 + local.minute
+        idx = idx[(minutes >= 570) & (minutes < 960) & (local.weekday < 5)]
+    close = 100 + np.cumsum(rng.normal(0, 0.1, len(idx)))
+    return pd.DataFrame({
+        "Open": close + rng.normal(0, 0.02, len(idx)),
+        "High": close + 0.05,
+        "Low": close - 0.05,
+        "Close": close,
+        "Volume": rng.integers(1, 100, len(idx)).astype(float),
+    }, index=idx)
+
+
+def test_equity_timeframes_match_resample():
+    df = make_session_bars("2025-02-03 14:30", "2025-02-07 21:00")
+    agg = BarAggregator("equity")
+    agg.ingest_frame("NVDA", df)
+
+    ny = df.tz_convert("America/New_York")
+    for tf, rule, offset in [("1m", "1min", None), ("5m", "5min", None), ("15m", "15min", None),
+                             ("1h", "60min", "9h30min"), ("4h", "240min", "9h30min"), ("1d", "1D", None)]:
+        kwargs = {"offset": offset} if offset else {}
+        expected = ny.resample(rule, **kwargs).agg(AGG).dropna()
+        got = agg.to_dataframe("NVDA", tf)
+        assert list(got.index) == list(expected.index), tf
+        assert np.allclose(got.to_numpy(), expected.to_numpy()), tf
+
+
+def test_session_anchor_survives_dst():
+    # US clocks went forward on 2025-03-09
+    df = make_session_bars("2025-03-06 14:30", "2025-03-11 21:00")
+    agg = BarAggregator("equity")
+    agg.ingest_frame("SPY", df)
+    starts = {ts.strftime("%H:%M") for ts in agg.to_dataframe("SPY", "4h").index}
+    assert starts == {"09:30", "13:30"}
+    starts_1h = {ts.strftime("%H:%M") for ts in agg.to_dataframe("SPY", "1h").index}
+    assert min(starts_1h) == "09:30"
+
+
+def test_crypto_is_utc_aligned():
+    df = make_session_bars("2025-03-08 00:00", "2025-03-10 00:00", rth_only=False)
+    agg = BarAggregator("crypto")
+    agg.ingest_frame("BTC/USD", df)
+    daily = agg.to_dataframe("BTC/USD", "1d")
+    assert [ts.strftime("%Y-%m-%d %H:%M") for ts in daily.index] == \
+        ["2025-03-08 00:00", "2025-03-09 00:00", "2025-03-10 00:00"]
+    four_h = agg.to_dataframe("BTC/USD", "4h")
+    assert {ts.hour for ts in four_h.index} == {0, 4, 8, 12, 16, 20}
+
+
+def test_forming_bar_revisions():
+    df = make_session_bars("2025-02-03 14:30", "2025-02-03 15:10")
+    agg = BarAggregator("equity")
+    agg.ingest_frame("AMD", df.iloc[:-1])
+
+    ts = int(df.index[-1].timestamp())
+    last = df.iloc[-1]
+    # Two provisional versions of the newest 1m bar, then the final one
+    agg.ingest("AMD", ts, last.Open, last.High + 3, last.Low - 3, last.Close + 1, 500)
+    agg.ingest("AMD", ts, last.Open, last.High + 1, last.Low, last.Close - 1, 50)
+    agg.ingest("AMD", ts, last.Open, last.High, last.Low, last.Close, last.Volume)
+
+    expected = df.tz_convert("America/New_York").resample("15min").agg(AGG)
+    got = agg.to_dataframe("AMD", "15m")
+    assert np.allclose(got.to_numpy(), expected.to_numpy())
+
+    # Older bars are ignored
+    assert not agg.ingest("AMD", ts - 600, 1, 1, 1, 1, 1)
+
+
+def test_forming_bar_closes_by_time():
+    df = make_session_bars("2025-02-03 14:30", "2025-02-03 14:44")
+    agg = BarAggregator("equity")
+    agg.ingest_frame("TSLA", df)
+
+    forming = agg.forming("TSLA", "15m")
+    assert agg.bars("TSLA", "15m", include_forming=False) == []
+    assert agg.bars("TSLA", "15m", include_forming=False, now=forming.end) == [forming]
+    assert agg.bar_at("TSLA", "15m", agg.session_open(pd.Timestamp("2025-02-03").date())) is forming
+
+
+if __name__ == "__main__":
+    test_equity_timeframes_match_resample()
+    test_session_anchor_survives_dst()
+    test_crypto_is_utc_aligned()
+    test_forming_bar_revisions()
+    test_forming_bar_closes_by_time()
+    print("✅ All aggregator tests passed")
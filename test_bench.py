@@ -0,0 +1,75 @@
+"""
+Bench Test
+Checks the baseline comparison (calibration scaling, tolerance, statuses),
+baseline merging, and a quick offline smoke run of one case per tree.
+"""
+import bench
+
+
+def _results(cases, calibration=None):
+    return {"calibration_ms": calibration or {"sentinel": 10.0}, "cases": cases}
+
+
+def test_compare_statuses_and_calibration():
+    baselines = {"calibration_ms": {"sentinel": 10.0}, "cases": {
+        "sentinel.a": {"min_ms": 5.0, "tree": "sentinel", "calibration_ms": 10.0},
+        "sentinel.b": {"min_ms": 5.0, "tree": "sentinel", "calibration_ms": 10.0},
+        "sentinel.c": {"min_ms": 5.0, "tree": "sentinel", "calibration_ms": 10.0},
+        "sentinel.d": {"min_ms": 5.0, "tree": "sentinel", "calibration_ms": 5.0},
+    }}
+    results = _results({
+        "sentinel.a": {"min_ms": 5.5, "tree": "sentinel"},
+        "sentinel.b": {"min_ms": 9.0, "tree": "sentinel"},
+        "sentinel.c": {"min_ms": 2.0, "tree": "sentinel"},
+        # 2x slower machine: raw time doubled but so did the calibration
+        "sentinel.d": {"min_ms": 10.0, "tree": "sentinel"},
+        "sentinel.e": {"min_ms": 1.0, "tree": "sentinel"},
+        "sentinel.f": {"error": "AssertionError: 0", "tree": "sentinel"},
+    })
+    rows = {r["name"]: r for r in bench.compare(results, baselines)}
+
+    assert rows["sentinel.a"]["status"] == "OK" and rows["sentinel.a"]["ratio"] == 1.1
+    assert rows["sentinel.b"]["status"] == "REGRESSION"
+    assert rows["sentinel.c"]["status"] == "FASTER"
+    assert rows["sentinel.d"]["status"] == "OK" and rows["sentinel.d"]["ratio"] == 1.0
+    assert rows["sentinel.e"]["status"] == "NEW"
+    assert rows["sentinel.f"]["status"] == "ERROR"
+    assert "REGRESSION" in [r["status"] for r in bench.compare(results, baselines, tolerance=0.05)
+                            if r["name"] == "sentinel.a"]
+    report = bench.format_report(list(rows.values()))
+    assert "🔴 sentinel.b" in report and "AssertionError" in report
+
+
+def test_case_tolerance_overrides_default():
+    baselines = {"cases": {"sentinel.io": {"min_ms": 10.0, "tree": "sentinel", "calibration_ms": 10.0}}}
+    results = _results({"sentinel.io": {"min_ms": 14.0, "tree": "sentinel", "tolerance": 0.5}})
+    assert bench.compare(results, baselines)[0]["status"] == "OK"
+
+
+def test_confirm_keeps_faster_run():
+    results = _results({"sentinel.a": {"min_ms": 9.0, "tree": "sentinel", "calibration_ms": 10.0},
+                        "sentinel.b": {"min_ms": 5.0, "tree": "sentinel", "calibration_ms": 10.0}})
+    rerun = _results({"sentinel.a": {"min_ms": 6.0, "tree": "sentinel", "calibration_ms": 12.0},
+                      "sentinel.b": {"min_ms": 9.0, "tree": "sentinel", "calibration_ms": 10.0}})
+    bench.confirm(results, rerun)
+    assert results["cases"]["sentinel.a"]["min_ms"] == 6.0  # 0.5 normalised beats 0.9
+    assert results["cases"]["sentinel.b"]["min_ms"] == 5.0
+
+
+def test_save_baselines_merges(tmp_path):
+    path = str(tmp_path / "baselines.json")
+    bench.save_baselines(_results({"sentinel.a": {"min_ms": 1.0, "median_ms": 1.2, "tree": "sentinel"}}), path)
+    bench.save_baselines(_results({"sentinel.b": {"min_ms": 2.0, "median_ms": 2.1, "tree": "sentinel"},
+                                   "sentinel.x": {"error": "boom", "tree": "sentinel"}}), path)
+    cases = bench.load_baselines(path)["cases"]
+    assert set(cases) == {"sentinel.a", "sentinel.b"}
+    assert cases["sentinel.b"] == {"min_ms": 2.0, "median_ms": 2.1, "tree": "sentinel", "calibration_ms": 10.0}
+
+
+def test_quick_run_offline():
+    results = bench.run_all(only=["sentinel.resolve_ticker", "krypto.smart_money"], quick=True)
+    assert set(results["cases"]) == {"sentinel.resolve_ticker", "krypto.smart_money"}
+    for result in results["cases"].values():
+        assert "error" not in result, result.get("trace")
+        assert result["min_ms"] > 0
+    assert set(results["calibration_ms"]) == {"sentinel", "krypto"}
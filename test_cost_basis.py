@@ -0,0 +1,156 @@
+"""
+Cost Basis Test
+Checks FIFO and average-cost realized P&L (fees included), idempotent
+booking, and that T212LedgerSync backfills once, resumes an interrupted
+backfill from its checkpoint, then fetches only new pages plus any
+order that was still working at the last sync.
+"""
+import pytest
+
+from cost_basis import CostBasisLedger, normalize_order
+
+
+def order(order_id, quantity, price, day, ticker="AAPL_US_EQ", fee=0.0, status="FILLED"):
+    return {"id": order_id, "ticker": ticker, "status": status, "filledQuantity": quantity, "fillPrice": price,
+            "filledValue": abs(quantity) * price, "dateExecuted": f"2025-03-{day:02d}T15:00:00Z",
+            "taxes": [{"name": "CURRENCY_CONVERSION_FEE", "quantity": -fee}] if fee else []}
+
+
+HISTORY = [
+    order(1, 10, 100.0, 1, fee=1.0),
+    order(2, 10, 120.0, 2),
+    order(3, -15, 130.0, 3, fee=1.5),
+    order(4, 5, 90.0, 4, ticker="MSFT_US_EQ"),
+    order(5, -5, 80.0, 5, ticker="MSFT_US_EQ"),
+    order(6, 0, 140.0, 6, status="CANCELLED"),
+]
+
+
+def test_normalize_order():
+    fill = normalize_order(order(3, -15, 130.0, 3, fee=1.5))
+    assert fill["quantity"] == -15 and fill["fees"] == 1.5 and fill["id"] == "3"
+    nested = normalize_order({"order": {"id": 9, "ticker": "X", "status": "FILLED", "side": "SELL"},
+                              "fill": {"quantity": 2, "price": 5.0, "filledAt": "2025-03-01T10:00:00Z"}})
+    assert nested["quantity"] == -2 and nested["price"] == 5.0
+    assert normalize_order(order(6, 0, 140.0, 6, status="CANCELLED")) is None
+    assert normalize_order(order(7, 3, 140.0, 6, status="PARTIALLY_FILLED")) is None  # booked once final
+    assert normalize_order(order(7, 3, 140.0, 6, status="CANCELLED"))["quantity"] == 3
+
+
+def test_partially_filled_then_cancelled(tmp_path, caplog):
+    ledger = CostBasisLedger(tmp_path / "partial.db")
+    history = [order(1, 10, 100.0, 1), order(2, 4, 110.0, 2, status="CANCELLED"), order(3, -14, 120.0, 3)]
+    assert ledger.apply_orders(history) == 3
+    assert ledger.position("AAPL_US_EQ")["realized"] == pytest.approx(10 * 20.0 + 4 * 10.0)
+    assert "exceeds known holdings" not in caplog.text
+    ledger.close()
+
+
+def test_fifo_and_average(tmp_path):
+    fifo = CostBasisLedger(tmp_path / "fifo.db", method="fifo")
+    assert fifo.apply_orders(reversed(HISTORY)) == 5  # booked chronologically whatever the page order
+    # AAPL: 10 @ (1000+1)/10 then 5 of the 120 lot: proceeds 15*130-1.5 = 1948.5, cost 1001 + 600
+    assert fifo.position("AAPL_US_EQ")["realized"] == pytest.approx(347.5)
+    assert fifo.open_lots("AAPL_US_EQ") == [("2", fifo.open_lots("AAPL_US_EQ")[0][1], 5.0, 120.0)]
+    assert fifo.realized_total() == pytest.approx(347.5 - 50.0)
+
+    # Re-delivered orders are ignored
+    assert fifo.apply_orders(HISTORY) == 0 and fifo.fill_count() == 5
+
+    average = CostBasisLedger(tmp_path / "avg.db", method="average")
+    average.apply_orders(HISTORY)
+    # pooled cost 2201/20 per share
+    assert average.position("AAPL_US_EQ")["realized"] == pytest.approx(1948.5 - 15 * 2201 / 20)
+    assert average.position("AAPL_US_EQ")["avg_cost"] == pytest.approx(2201 / 20)
+    average.close()
+
+    # Switching method replays the stored fills
+    fifo.close()
+    switched = CostBasisLedger(tmp_path / "fifo.db", method="average")
+    assert switched.position("AAPL_US_EQ")["realized"] == pytest.approx(1948.5 - 15 * 2201 / 20)
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeT212:
+    """Serves history newest first, 2 per page, with T212-style nextPagePath."""
+
+    def __init__(self, orders, fail_after=None):
+        self.orders = list(orders)
+        self.requests = []
+        self.fail_after = fail_after
+
+    def get(self, url, headers=None, params=None):
+        if self.fail_after is not None and len(self.requests) >= self.fail_after:
+            raise ConnectionError("network down")
+        self.requests.append(url)
+        newest_first = sorted(self.orders, key=lambda o: o["id"], reverse=True)
+        cursor = int(url.split("cursor=")[1]) if "cursor=" in url else None
+        page = [o for o in newest_first if cursor is None or o["id"] < cursor][:2]
+        more = page and any(o["id"] < page[-1]["id"] for o in newest_first)
+        next_path = f"/api/v0/equity/history/orders?limit=2&cursor={page[-1]['id']}" if more else None
+        return FakeResponse({"items": page, "nextPagePath": next_path})
+
+
+def test_incremental_sync(tmp_path, monkeypatch):
+    monkeypatch.setenv("T212_API_TRADE_KEY", "key")
+    monkeypatch.setenv("T212_COST_BASIS_DB", str(tmp_path / "cost_basis.db"))
+    from sync_ledger import T212LedgerSync
+
+    sync = T212LedgerSync()
+    sync.session = FakeT212(HISTORY, fail_after=2)
+    with pytest.raises(ConnectionError):
+        sync.sync_order_history()  # backfill interrupted after 2 of 3 pages
+    assert sync.ledger.get_state("backfill_cursor").endswith("cursor=3")
+
+    sync.session = FakeT212(HISTORY)
+    assert sync.sync_order_history() == 5
+    assert sync.session.requests == ["https://live.trading212.com/api/v0/equity/history/orders?limit=2&cursor=3"]
+    assert sync.calculate_realized_profit() == pytest.approx(297.5)
+
+    # Two new fills fill the first page; paging stops at the page holding a known order
+    sync.session = FakeT212(HISTORY + [order(7, 2, 150.0, 7), order(8, -2, 160.0, 8)])
+    assert sync.sync_order_history() == 2
+    assert len(sync.session.requests) == 2
+    # FIFO: the 2 shares sold come from the remaining 120 lot
+    assert sync.ledger.position("AAPL_US_EQ")["realized"] == pytest.approx(347.5 + 2 * (160.0 - 120.0))
+
+    # Nothing new: one request, nothing booked
+    assert sync.sync_order_history() == 0 and len(sync.session.requests) == 3
+
+
+def test_order_working_at_last_sync(tmp_path, monkeypatch):
+    monkeypatch.setenv("T212_API_TRADE_KEY", "key")
+    monkeypatch.setenv("T212_COST_BASIS_DB", str(tmp_path / "cost_basis.db"))
+    from sync_ledger import T212LedgerSync
+
+    working = dict(order(2, 0, 90.0, 2), status="WORKING", fillPrice=None, dateExecuted=None)
+    history = [order(1, 10, 100.0, 1), working, order(3, -15, 130.0, 3)]
+    sync = T212LedgerSync()
+    sync.session = FakeT212(history)
+    assert sync.sync_order_history() == 2
+    # The sell outruns the known holdings until order 2's fill shows up
+    assert sync.calculate_realized_profit() == pytest.approx(300.0)
+    assert sync.ledger.get_state("open_orders") == ["2"]
+
+    # Order 2 filled (before the sell) and a newer order arrived: the first page
+    # holds a known order, but paging continues back to order 2
+    history[1] = order(2, 5, 90.0, 2)
+    sync.session = FakeT212(history + [order(4, 1, 150.0, 4)])
+    assert sync.sync_order_history() == 2
+    assert len(sync.session.requests) == 2
+    # AAPL replayed in execution order: the sell now also closes the 90 lot
+    assert sync.calculate_realized_profit() == pytest.approx(10 * 30.0 + 5 * 40.0)
+    assert [lot[0] for lot in sync.ledger.open_lots("AAPL_US_EQ")] == ["4"]
+    assert sync.ledger.get_state("open_orders") == []
+
+    assert sync.sync_order_history() == 0 and len(sync.session.requests) == 3
@@ -0,0 +1,123 @@
+"""
+ORB Backtest Test
+Checks the vectorized pass against a bar-by-bar loop over every ticker-day,
+plus session layout, gap filling and pool/serial agreement.
+"""
+import numpy as np
+import pandas as pd
+
+from orb_backtest import SessionArrays, evaluate_group, expand_grid, run_grid
+
+
+def make_frames(tickers=("AAA", "BBB", "CCC"), days=12, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = {}
+    sessions = pd.bdate_range("2025-03-03", periods=days)  # crosses the 2025-03-09 DST change
+    for k, t in enumerate(tickers):
+        parts = []
+        for day in sessions:
+            idx = pd.date_range(f"{day.date()} 09:30", periods=390, freq="1min", tz="America/New_York")
+            drift = rng.normal(0, 0.0008)
+            close = (50 + 10 * k) * np.exp(np.cumsum(rng.normal(drift, 0.0015, 390)))
+            open_p = np.r_[close[0] * (1 + rng.normal(0, 0.003)), close[:-1]]
+            high = np.maximum(open_p, close) * (1 + rng.uniform(0, 0.001, 390))
+            low = np.minimum(open_p, close) * (1 - rng.uniform(0, 0.001, 390))
+            parts.append(pd.DataFrame({"Open": open_p, "High": high, "Low": low, "Close": close,
+                                       "Volume": 100.0}, index=idx.tz_convert("UTC")))
+        frames[t] = pd.concat(parts)
+    return frames
+
+
+def loop_reference(arrays, p):
+    """Straightforward per-row, per-bar simulation of the same rules."""
+    o, h, l, c = (np.asarray(m, dtype=np.float64) for m in (arrays.open, arrays.high, arrays.low, arrays.close))
+    w, curfew = p["window"], p["curfew_minute"]
+    last_entry = min(p["last_entry_minute"], curfew)
+    rets = []
+    for r in range(c.shape[0]):
+        if np.isnan(c[r, w - 1]):
+            continue
+        hi, lo = np.nanmax(h[r, :w]), np.nanmin(l[r, :w])
+        if (hi - lo) / lo * 100 < p["min_range_pct"]:
+            continue
+        if p["require_green"] and c[r, w - 1] < o[r, np.argmax(~np.isnan(o[r, :w]))]:
+            continue
+        trigger = hi + p["trigger_offset"]
+        entry = None
+        for m in range(w, 390):
+            hit = h[r, m] >= trigger if p["entry"] == "touch" else c[r, m] > trigger
+            if hit:
+                entry = (m, max(trigger, o[r, m]) if p["entry"] == "touch" else c[r, m])
+                break
+        if entry is None or entry[0] >= last_entry:
+            continue
+        m0, px = entry
+        stop = lo - p["stop_offset"]
+        risk = px - stop
+        if risk <= 0:
+            continue
+        target = px + p["reward_r"] * risk
+        exit_px = c[r, curfew - 1]
+        for m in range(m0 + 1, curfew):
+            if l[r, m] <= stop:
+                exit_px = min(stop, o[r, m])
+                break
+            if h[r, m] >= target:
+                exit_px = max(target, o[r, m])
+                break
+        rets.append(exit_px / px - 1 - p["cost_bps"] * 2 / 10000)
+    return np.array(rets)
+
+
+def test_session_layout_and_gaps():
+    frames = make_frames(("AAA", "BBB"), days=3)
+    # Drop a few minutes mid-session and a whole late start for BBB on day 2
+    frames["AAA"] = frames["AAA"].drop(frames["AAA"].index[100:105])
+    bbb = frames["BBB"]
+    frames["BBB"] = bbb.drop(bbb.index[390:400])
+    arrays = SessionArrays.from_frames(frames)
+
+    assert arrays.shape == (6, 390) and arrays.tickers == ["AAA", "BBB"]
+    assert arrays.days == ["2025-03-03", "2025-03-04", "2025-03-05"]
+    row = arrays.close[arrays.row(0, 0)]
+    assert np.all(row[100:105] == row[99])                           # forward-filled flat bars
+    assert np.all(arrays.high[arrays.row(0, 0), 100:105] == row[99])
+    late = arrays.close[arrays.row(1, 1)]
+    assert np.isnan(late[:10]).all() and not np.isnan(late[10:]).any()  # nothing before first trade
+
+
+def test_vectorized_matches_loop():
+    arrays = SessionArrays.from_frames(make_frames())
+    grid = {"window": [5, 15], "entry": ["touch", "close"], "stop_offset": [0.0, 0.01],
+            "reward_r": [1.0, 2.0], "min_range_pct": [0.2, 0.5], "require_green": [True, False],
+            "curfew_minute": [300, 390], "last_entry_minute": [120, 390], "cost_bps": [0.0, 5.0]}
+    combos = expand_grid(grid)
+    checked = 0
+    for combo in combos[::7]:
+        result = evaluate_group(arrays, combo["window"], combo["trigger_offset"], combo["entry"], [combo])[0]
+        ref = loop_reference(arrays, combo)
+        assert result["trades"] == len(ref), combo
+        assert np.isclose(result["total_return_pct"], ref.sum() * 100, atol=1e-6), combo
+        assert np.isclose(result["hit_rate"], (ref > 0).mean() if len(ref) else 0.0), combo
+        checked += 1
+    assert checked > 50
+
+
+def test_grid_pool_matches_serial():
+    arrays = SessionArrays.from_frames(make_frames(days=6))
+    grid = {"window": [5, 15], "reward_r": [1.5, 2.0, 3.0], "min_range_pct": [0.2, 0.8]}
+    serial = run_grid(arrays, grid, workers=1)
+    pooled = run_grid(arrays, grid, workers=2)
+    assert len(serial) == len(expand_grid(grid))
+    keys = ["window", "reward_r", "min_range_pct", "stop_offset", "require_green"]
+    a = serial.sort_values(keys, ignore_index=True)
+    b = pooled.sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(a, b)
+    assert (serial["max_drawdown_pct"] >= 0).all()
+
+
+if __name__ == "__main__":
+    test_session_layout_and_gaps()
+    test_vectorized_matches_loop()
+    test_grid_pool_matches_serial()
+    print("✅ All ORB backtest tests passed")
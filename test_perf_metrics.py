@@ -0,0 +1,110 @@
+"""
+Perf Metrics Test
+Checks span recording into fixed buckets, quantile estimates, the periodic
+audit dump, the Prometheus/JSON endpoint and the Telegram /perf text.
+"""
+import json
+import time
+import urllib.request
+
+from perf_metrics import PerfRegistry, BUCKETS_MS, format_report, load_snapshot, serve_metrics, to_prometheus
+
+
+class ListLogger:
+    def __init__(self):
+        self.events = []
+
+    def log(self, action, target="-", details="", status="INFO"):
+        self.events.append((action, details))
+
+
+def test_spans_and_quantiles():
+    perf = PerfRegistry()
+    for _ in range(3):
+        with perf.span("gate.vwap_gate"):
+            pass
+    for ms in [3] * 90 + [40] * 9 + [20000]:
+        perf.record("phase.scan_market", ms / 1000)
+
+    spans = perf.snapshot()["spans"]
+    assert spans["gate.vwap_gate"]["count"] == 3 and spans["gate.vwap_gate"]["buckets"][0] >= 1
+    scan = spans["phase.scan_market"]
+    assert scan["count"] == 100 and sum(scan["buckets"]) == 100
+    # Power-of-two buckets: 3 ms lands under 2**22 ns, 40 ms under 2**26 ns
+    assert (scan["p50_ms"], scan["p95_ms"], scan["p99_ms"]) == (2 ** 22 / 1e6, 2 ** 26 / 1e6, 2 ** 26 / 1e6)
+    assert scan["max_ms"] == 20000 and len(scan["buckets"]) == len(BUCKETS_MS) + 1
+
+    # An exception inside a span still records it and propagates
+    try:
+        with perf.span("phase.shield"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert perf.snapshot()["spans"]["phase.shield"]["count"] == 1
+    assert perf.span("phase.shield") is perf.span("phase.shield")
+
+
+def test_bucket_edges_and_sum():
+    perf = PerfRegistry()
+    hist = perf.histogram("phase.pulse")
+    for elapsed_ns in (0, 2 ** 17 - 1, 2 ** 17, 2 ** 20, 2 ** 35 - 1, 2 ** 35, 10 ** 12):
+        hist.record_ns(elapsed_ns)
+    buckets = perf.snapshot()["spans"]["phase.pulse"]["buckets"]
+    # A bucket holds samples below its bound: 2**17 - 1 ns stays in the first, 2**17 ns moves up
+    assert buckets[0] == 2 and buckets[1] == 1 and buckets[4] == 1
+    assert buckets[len(BUCKETS_MS) - 1] == 1 and buckets[len(BUCKETS_MS)] == 2
+
+    # _sum is the exact total, not the rounded mean times the count
+    perf.histogram("gate.yf_info").record_ns(123_400)
+    perf.histogram("gate.yf_info").record_ns(123_400)
+    text = to_prometheus(perf.snapshot())
+    assert 'sentinel_span_seconds_sum{span="gate.yf_info"} 0.000246800' in text
+
+
+def test_dump_and_readers(tmp_path):
+    perf = PerfRegistry()
+    perf.record("phase.scan_market", 0.004)
+    perf.record("gate.yf_info", 0.3)
+    logger = ListLogger()
+    path = str(tmp_path / "perf_metrics.json")
+
+    assert perf.maybe_dump(logger, interval=3600, path=path) is None
+    perf.maybe_dump(logger, interval=0, path=path)
+    action, details = logger.events[-1]
+    assert action == "PERF_METRICS" and json.loads(details)["gate.yf_info"] == [1, 2 ** 29 / 1e6, 2 ** 29 / 1e6, 300.0]
+
+    snapshot = load_snapshot(path)
+    report = format_report(snapshot)
+    assert report.index("gate.yf_info") < report.index("phase.scan_market")  # slowest first
+    assert "phase.scan_market" not in format_report(snapshot, prefix="gate.")
+
+    text = to_prometheus(snapshot)
+    assert f'sentinel_span_seconds_bucket{{span="phase.scan_market",le="{2 ** 22 / 1e9:g}"}} 1' in text
+    assert f'sentinel_span_seconds_bucket{{span="phase.scan_market",le="{2 ** 21 / 1e9:g}"}} 0' in text
+    assert 'sentinel_span_seconds_count{span="gate.yf_info"} 1' in text
+
+
+def test_metrics_endpoint():
+    perf = PerfRegistry()
+    perf.record("phase.pulse", 0.2)
+    server = serve_metrics(0, registry=perf)
+    try:
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        with urllib.request.urlopen(base + "/metrics", timeout=5) as resp:
+            assert 'span="phase.pulse",le="+Inf"} 1' in resp.read().decode()
+        with urllib.request.urlopen(base + "/metrics.json", timeout=5) as resp:
+            assert json.load(resp)["spans"]["phase.pulse"]["count"] == 1
+    finally:
+        server.shutdown()
+
+
+def test_span_overhead():
+    perf = PerfRegistry()
+    span = perf.span
+    n = 20000
+    start = time.perf_counter()
+    for _ in range(n):
+        with span("phase.loop"):
+            pass
+    per_span = (time.perf_counter() - start) / n
+    assert per_span < 20e-6  # generous bound for slow CI; ~0.6us on a shared VPS core
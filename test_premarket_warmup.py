@@ -0,0 +1,127 @@
+"""
+Pre-market Warm-up Test
+Checks the day-scoped warm cache (build, persist, reload, expiry, re-seeding
+daily bars) and that the existing gauntlet checks read it instead of
+fetching at the open.
+"""
+import sys
+import types
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import bar_aggregator
+import premarket_warmup
+import security_metadata
+from premarket_warmup import NY, WarmCache, trading_day, warm_up
+
+TICKERS = ["NVDA", "AMD", "GHOST"]
+
+
+def _daily(price, days=45):
+    """Exchange-dated daily bars up to and including today (today's bar is partial)."""
+    today = pd.Timestamp(datetime.now(NY).date())
+    idx = pd.bdate_range(end=today - timedelta(days=1), periods=days - 1).append(pd.DatetimeIndex([today]))
+    idx = idx.tz_localize(NY)
+    return pd.DataFrame({"Open": price, "High": price + 2.0, "Low": price - 1.0, "Close": price,
+                         "Volume": 1_000_000.0}, index=idx)
+
+
+class FakeYF(types.ModuleType):
+    def __init__(self, earnings_today=()):
+        super().__init__("yfinance")
+        self.earnings_today = earnings_today
+        self.downloads = []
+
+    def download(self, tickers, period=None, interval="1d", group_by="column", **kwargs):
+        self.downloads.append((tuple(tickers), period, interval))
+        frames = {"NVDA": _daily(100.0), "AMD": _daily(50.0)}
+        frames["NVDA"].iloc[-1, frames["NVDA"].columns.get_loc("High")] = 500.0  # today's spike ignored
+        return pd.concat(frames, axis=1)
+
+    def Ticker(self, symbol):
+        stamp = datetime.now(NY).replace(hour=16) if symbol in self.earnings_today else datetime.now(NY) + timedelta(days=30)
+        info = {"sector": "Technology", "averageVolume": 42_000_000, "earningsTimestamp": int(stamp.timestamp())}
+        return types.SimpleNamespace(info=info if symbol != "GHOST" else {})
+
+
+class FakeClient:
+    def __init__(self):
+        self.synced = 0
+
+    def sync_master_list(self):
+        self.synced += 1
+        return True
+
+    def _load_master_list(self):
+        pass
+
+    def resolve_ticker(self, ticker):
+        if ticker == "GHOST":
+            return None, None
+        return f"{ticker}_US_EQ", {"currencyCode": "USD", "minTradeQuantity": 0.01}
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(bar_aggregator, "_AGGREGATORS", {})
+    cache = WarmCache(str(tmp_path / "data" / "warm_cache.json"))
+    monkeypatch.setattr(premarket_warmup, "_CACHE", cache)
+    monkeypatch.setattr(security_metadata, "_STORE",
+                        security_metadata.SecurityMetadata(tmp_path / "data" / "security_metadata.db"))
+    fake = FakeYF(earnings_today=("AMD",))
+    monkeypatch.setattr(premarket_warmup, "yf", fake)
+    return tmp_path, cache, fake
+
+
+def test_warm_up_builds_day_cache(workspace):
+    tmp_path, cache, fake = workspace
+    client = FakeClient()
+    summary = warm_up(TICKERS, client=client)
+
+    assert summary["daily"] == 2 and summary["info"] == 3 and summary["instruments"] == 2
+    assert fake.downloads == [(tuple(TICKERS), "2mo", "1d")] and client.synced == 1
+    assert cache.is_fresh() and cache.date == trading_day()
+    assert cache.get("NVDA", "atr20") == 3.0  # today's partial bar is excluded
+    assert cache.get("NVDA_US_EQ", "prev_close") == 100.0
+    assert cache.get("NVDA", "avg_volume") == 42_000_000 and cache.get("NVDA", "sector") == "Technology"
+    assert cache.get("AMD", "instrument") == {"ticker": "AMD_US_EQ", "currency": "USD", "min_quantity": 0.01}
+    assert cache.earnings_today("AMD") and not cache.earnings_today("NVDA")
+    assert cache.get("GHOST", "atr20", "cold") == "cold"
+    assert security_metadata.get_security_metadata().sector("NVDA_US_EQ") == "Technology"  # same lookup
+    daily = bar_aggregator.get_aggregator("equity").bars("NVDA", "1d")
+    assert len(daily) == 30 and max(b.high for b in daily) == 102.0
+
+    # A restart reloads the day from disk and re-seeds the daily bars once
+    reloaded = WarmCache(cache.path)
+    assert reloaded.get("AMD", "atr20") == 3.0
+    fresh = bar_aggregator.BarAggregator("equity")
+    assert reloaded.seed_aggregator(fresh) == 60 and reloaded.seed_aggregator(fresh) == 0
+
+    # Next trading day: everything reads as cold until the next warm-up
+    reloaded.date = "2000-01-03"
+    assert reloaded.get("AMD", "atr20") is None and not reloaded.earnings_today("AMD")
+
+
+def test_warm_up_without_bars_raises(workspace):
+    tmp_path, cache, fake = workspace
+    with pytest.raises(RuntimeError):
+        warm_up(["GHOST"])
+    assert not cache.is_fresh()
+
+
+def test_existing_gates_read_warm_cache(workspace, monkeypatch):
+    tmp_path, cache, fake = workspace
+    warm_up(TICKERS)
+    monkeypatch.setitem(sys.modules, "yfinance", None)  # any fetch at the open would raise
+
+    from auditor import TradingAuditor
+    auditor = TradingAuditor()
+    blocked, facts = auditor.fact_check_filter("AMD")
+    assert blocked and facts["source"] == "warm_cache"
+    assert cache.get("NVDA", "avg_volume") is not None  # the gauntlet's volume filter input
+
+    # The warm-up only feeds data: the VWAP/volatility/risk-cap gates are not part of it
+    assert not hasattr(auditor, "check_vwap_gate") and not hasattr(auditor, "check_global_risk_cap")
@@ -0,0 +1,144 @@
+"""
+Replay Harness Test
+Builds a small recorded session on disk and replays the real run_sniper loop
+over it: brief, shield stop-out, curfew close, protected holdings and speed.
+"""
+import json
+import os
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from replay_harness import ReplayClock, RecordedSession, RecordedMarket, FakeBroker, run_replay
+
+DAY = "2025-02-04"  # Tuesday, NY = UTC-5
+
+
+def _minute_frame(path_fn):
+    idx = pd.date_range(f"{DAY} 14:30", f"{DAY} 20:59", freq="1min", tz="UTC")
+    t = np.arange(len(idx))
+    close = np.array([path_fn(i) for i in t], dtype=float)
+    open_p = np.r_[close[0], close[:-1]]
+    return pd.DataFrame({"Open": open_p, "High": np.maximum(open_p, close) + 0.02,
+                         "Low": np.minimum(open_p, close) - 0.02, "Close": close,
+                         "Volume": np.full(len(idx), 1000.0)}, index=idx)
+
+
+def _daily_frame(price):
+    idx = pd.date_range("2024-12-01", f"{DAY}", freq="B", tz="UTC")
+    return pd.DataFrame({"Open": price, "High": price * 1.01, "Low": price * 0.99,
+                         "Close": price, "Volume": 5e6}, index=idx)
+
+
+def nvda_path(i):
+    # 100 -> 105 over the first hour, then down to 95 by 16:30 UTC
+    return 100 + 5 * i / 60 if i <= 60 else max(95.0, 105 - 10 * (i - 60) / 60)
+
+
+def make_session(root):
+    path = os.path.join(root, DAY)
+    series = {"NVDA": nvda_path, "AMD": lambda i: 50.0 + 0.01 * (i % 3),
+              "MSFT": lambda i: 400.0, "SPY": lambda i: 600 + i / 100, "QQQ": lambda i: 500 + i / 100}
+    for ticker, fn in series.items():
+        for interval, frame in (("1m", _minute_frame(fn)), ("1d", _daily_frame(fn(0)))):
+            os.makedirs(os.path.join(path, "bars", interval), exist_ok=True)
+            frame.to_csv(os.path.join(path, "bars", interval, f"{ticker}.csv"))
+    with open(os.path.join(path, "info.json"), "w") as f:
+        json.dump({t: {"averageVolume": 5_000_000, "bid": 99.99, "ask": 100.0} for t in series}, f)
+    with open(os.path.join(path, "broker.jsonl"), "w") as f:
+        f.write(json.dumps({"ts": 0, "method": "get_account_summary", "args": [],
+                            "response": {"free": 5000.0}}) + "\n")
+        f.write(json.dumps({"ts": 0, "method": "get_positions", "args": [], "response": [
+            {"ticker": "NVDA", "quantity": 10, "averagePrice": 98.0, "currentPrice": 100.0},
+            {"ticker": "AMD", "quantity": 20, "averagePrice": 50.0, "currentPrice": 50.0},
+            {"ticker": "MSFT", "quantity": 2, "averagePrice": 400.0, "currentPrice": 400.0},
+        ]}) + "\n")
+    files = os.path.join(path, "files")
+    os.makedirs(files, exist_ok=True)
+    for name, payload in {
+        "master_universe.json": {"instruments": [{"ticker": "NVDA"}, {"ticker": "AMD"}]},
+        "session_whitelist.json": {"date": DAY, "tickers": ["NVDA", "AMD"]},
+        "strategic_holdings.json": {"tickers": ["MSFT"]},
+    }.items():
+        with open(os.path.join(files, name), "w") as f:
+            json.dump(payload, f)
+
+
+def _clock(hhmmss):
+    start = datetime.fromisoformat(f"{DAY}T{hhmmss}+00:00")
+    return ReplayClock(start, start.replace(hour=23))
+
+
+def test_market_has_no_lookahead(tmp_path):
+    make_session(str(tmp_path))
+    clock = _clock("15:00:30")
+    market = RecordedMarket(RecordedSession(DAY, str(tmp_path)), clock)
+
+    bars = market.download("NVDA", period="1d", interval="1m")
+    assert bars.index[-1] == pd.Timestamp(f"{DAY} 15:00", tz="UTC")
+    # The forming minute only exposes its open
+    last = bars.iloc[-1]
+    assert last.Open == last.High == last.Low == last.Close and last.Volume == 0
+
+    fifteen = market.download(["NVDA", "AMD"], period="1d", interval="15m", group_by="ticker")
+    assert fifteen["NVDA"].index[-1] == pd.Timestamp(f"{DAY} 15:00", tz="UTC")
+    assert fifteen["NVDA"]["Close"].iloc[-2] == bars.loc[f"{DAY} 14:59:00+00:00", "Close"]
+
+    daily = market.ticker("NVDA").history(period="1mo", interval="1d")
+    assert daily.index[-1].date() == pd.Timestamp(DAY).date()
+    assert daily["Close"].iloc[-1] == bars["Close"].iloc[-1]
+
+    info = market.ticker("NVDA").info
+    assert info["bid"] < info["ask"] and abs(info["ask"] - market.last_price("NVDA")) < 0.02
+
+
+def test_fake_broker_accounting(tmp_path):
+    make_session(str(tmp_path))
+    clock = _clock("15:30:00")
+    market = RecordedMarket(RecordedSession(DAY, str(tmp_path)), clock)
+    broker = FakeBroker(market, cash=1000.0, slippage_bps=0)
+
+    assert broker.execute_order("NVDA", 5, "BUY")["status"] == "FILLED"
+    assert broker.execute_order("NVDA", 100, "BUY")["status"] == "FAILED"  # insufficient funds
+    entry = broker.fills[-1]["price"]
+
+    clock.sleep(1800)
+    exit_price = market.last_price("NVDA")
+    assert broker.get_positions()[0]["ppl"] == (exit_price - entry) * 5
+    broker.execute_order("NVDA", 5, "SELL")
+    acct = broker.get_account_info()
+    assert acct["investments"]["realizedProfitLoss"] == (exit_price - entry) * 5
+    assert acct["totalValue"] == broker.cash and broker.get_positions() == []
+
+
+def test_full_day_replay(tmp_path):
+    make_session(str(tmp_path))
+    report = run_replay(DAY, start="14:50", end="21:10", root=str(tmp_path),
+                        workdir=str(tmp_path / "sandbox"), slippage_bps=0, quiet=True)
+
+    assert report["outcome"] == "COMPLETE"
+    # Backfilled brief at 14:50 sees the closed 09:30 ET candle
+    assert report["events"].get("OPEN_BRIEF_COMPLETE") == 1
+    sells = {f["ticker"]: f for f in report["fills"] if f["side"] == "SELL"}
+    # Shield: NVDA drops through the ORB stop in the afternoon
+    assert "16:00" < sells["NVDA"]["time"][11:16] < "17:00"
+    # Curfew closes the remaining session position, never the strategic holding
+    assert sells["AMD"]["time"][11:16] == "21:00"
+    assert "MSFT" not in sells
+    assert [p["ticker"] for p in report["positions"]] == ["MSFT"]
+    assert report["speedup"] > 100
+
+    # Clock patches are gone again
+    import datetime as datetime_module
+    assert datetime_module.datetime is datetime
+    assert abs(time.time() - datetime.now(timezone.utc).timestamp()) < 5
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+    for test in (test_market_has_no_lookahead, test_fake_broker_accounting, test_full_day_replay):
+        test(Path(tempfile.mkdtemp()))
+    print("✅ All replay tests passed")
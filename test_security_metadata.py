@@ -0,0 +1,127 @@
+"""
+Security Metadata Test
+Checks the persistent metadata cache: per-field TTLs, negative caching with
+backoff, parallel prefetch under a deadline, reload from disk, and that the
+sector report and dashboard read it without a per-ticker lookup.
+"""
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+import security_metadata
+from security_metadata import (DAY, NEGATIVE_TTL, SecurityMetadata, collect_tickers, metadata_from_info,
+                               yf_symbol)
+
+INFO = {
+    "AAPL": {"sector": "Technology", "industry": "Consumer Electronics", "averageVolume": 50_000_000,
+             "marketCap": 3.1e12, "currency": "USD"},
+    "RR.L": {"sector": "Industrials", "industry": "Aerospace & Defense", "averageVolume": 40_000_000,
+             "marketCap": 5.0e10, "currency": "GBp"},
+    "JPM": {"sector": "Financial Services", "industry": "Banks - Diversified", "currency": "USD"},
+}
+
+
+class Fetcher:
+    def __init__(self, slow=()):
+        self.calls = []
+        self.slow = slow
+        self.release = threading.Event()
+
+    def __call__(self, symbol):
+        self.calls.append(symbol)
+        if symbol in self.slow:
+            self.release.wait(5)
+        if symbol == "BROKEN":
+            raise ConnectionError("yahoo 404")
+        return metadata_from_info(INFO.get(symbol, {}))
+
+
+@pytest.fixture
+def store(tmp_path):
+    fetcher = Fetcher()
+    meta = SecurityMetadata(tmp_path / "security_metadata.db", fetcher=fetcher)
+    yield meta, fetcher
+    meta.close()
+
+
+def test_symbols_and_fields():
+    assert [yf_symbol(t) for t in ("AAPL_US_EQ", "RRl_EQ", "BARC_UK_EQ", "VOD.L", "NVDA")] == \
+        ["AAPL", "RR.L", "BARC.L", "VOD.L", "NVDA"]
+    assert metadata_from_info(INFO["JPM"]) == {"sector": "Financial Services", "industry": "Banks - Diversified",
+                                               "currency": "USD", "avg_volume": None, "market_cap": None}
+
+
+def test_prefetch_ttls_and_negative_cache(store, tmp_path):
+    meta, fetcher = store
+    summary = meta.prefetch(["AAPL_US_EQ", "AAPL", "RRl_EQ", "JPM", "GHOST", "BROKEN"])
+    assert summary["requested"] == 5 and summary["fetched"] == 3 and summary["failed"] == 2
+    assert sorted(fetcher.calls) == ["AAPL", "BROKEN", "GHOST", "JPM", "RR.L"]
+    assert meta.sector("AAPL_US_EQ") == "Technology" and meta.sector("JPM") == "Financials"
+    assert meta.get("RRl_EQ", "market_cap") == 50_000_000_000 and meta.get("JPM", "avg_volume", 0) == 0
+    assert meta.sector("GHOST") == "Unknown"
+
+    # Nothing due: fresh rows and failures in backoff are skipped
+    fetcher.calls.clear()
+    assert meta.prefetch(["AAPL", "RR.L", "GHOST", "BROKEN"])["fetched"] == 0 and fetcher.calls == []
+
+    now = time.time()
+    assert meta.due(["AAPL", "GHOST"], now + 3600) == []
+    assert meta.due(["AAPL", "JPM"], now + DAY) == ["AAPL", "JPM"]     # volume/market cap expired
+    assert meta.due(["GHOST"], now + NEGATIVE_TTL + 1) == ["GHOST"]    # first backoff over
+    meta.record_failure("GHOST", "still missing", now)
+    assert meta.due(["GHOST"], now + NEGATIVE_TTL + 1) == []           # doubled
+
+    # Reloaded from disk: rows, stale reads and backoff survive a restart
+    reopened = SecurityMetadata(tmp_path / "security_metadata.db", fetcher=fetcher)
+    assert reopened.entry("AAPL")["industry"] == "Consumer Electronics"
+    assert reopened.due(["AAPL", "GHOST", "BROKEN"], now + NEGATIVE_TTL + 1) == ["BROKEN"]
+    assert reopened.sector("AAPL") == "Technology"  # expired rows still serve reads
+    reopened.close()
+
+
+def test_prefetch_deadline_and_background(store):
+    meta, fetcher = store
+    fetcher.slow = ("JPM",)
+    summary = meta.prefetch(["AAPL", "JPM"], deadline=0.2)
+    assert summary["fetched"] == 1 and summary["timeouts"] == 1 and meta.due(["JPM"]) == ["JPM"]
+    fetcher.release.set()
+
+    assert meta.prefetch_in_background(["JPM_US_EQ", "AAPL"])
+    meta._background.join(5)
+    assert meta.sector("JPM") == "Financials"
+    assert not meta.prefetch_in_background(["AAPL", "JPM"])  # nothing due
+
+
+def test_sector_report_and_dashboard_read_the_cache(store, tmp_path, monkeypatch):
+    meta, fetcher = store
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(security_metadata, "_STORE", meta)
+    monkeypatch.setitem(sys.modules, "yfinance", None)  # no per-ticker lookups anywhere
+
+    class Client:
+        def get_positions(self):
+            return [{"ticker": "AAPL_US_EQ", "quantity": 10, "currentPrice": 200.0},
+                    {"ticker": "RRl_EQ", "quantity": 100, "currentPrice": 1150.0}]
+
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "master_universe.json").write_text(json.dumps({"instruments": [{"ticker": "JPM"}]}))
+    assert collect_tickers(Client()) == ["AAPL_US_EQ", "RRl_EQ", "JPM"]
+
+    from strategic_moat import SectorMapper
+    mapper = SectorMapper.__new__(SectorMapper)
+    mapper.metadata, mapper.sector_map = meta, {"RRl_EQ": "Defence"}
+    meta.prefetch(collect_tickers(Client()))
+    assert mapper.get_ticker_sector("AAPL_US_EQ") == "Technology"
+    assert mapper.get_ticker_sector("JPM") == "Financials"
+    assert mapper.get_ticker_sector("RRl_EQ") == "Defence"  # manual override
+    assert mapper.get_ticker_sector("NEW_US_EQ") == "Unknown"
+    assert fetcher.calls.count("AAPL") == 1
+
+    monkeypatch.syspath_prepend(str(Path(__file__).parent / "web"))
+    server = pytest.importorskip("server")
+    assert server.get_sector_for_ticker("RRl_EQ") == "Industrials"
+    assert server.get_sector_for_ticker("NEW_US_EQ") == "Other"
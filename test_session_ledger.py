@@ -0,0 +1,85 @@
+"""
+Session Ledger Test
+Checks the running (session, ticker) aggregates, that records append to the
+journal instead of rewriting the snapshot, that a reopen (including one after
+a crash mid-compaction) rebuilds the same state, and that SessionManager
+accepts main_bot's add_ticker/record_sale calls.
+"""
+import json
+from datetime import datetime
+
+import pytest
+
+from ledger import SessionLedger
+from session_manager import SessionManager
+
+
+def test_aggregates_and_journal(tmp_path):
+    path = str(tmp_path / "session_ledger.json")
+    ledger = SessionLedger(path, compact_every=4)
+    ledger.record_purchase("NVDA", 10, 100.0)
+    ledger.record_purchase("NVDA", 10, 110.0)
+    ledger.record_sale("NVDA", 5, 120.0)
+
+    position = ledger.get_session_position("NVDA")
+    assert position["quantity"] == 15 and position["avg_price"] == pytest.approx(105.0)
+    assert ledger.is_job_c_holding("NVDA") and not ledger.is_job_c_holding("AMD")
+    assert ledger.get_session_quantity("NVDA") == 15
+    # Nothing compacted yet: three journal lines, no snapshot
+    with open(path + ".journal") as f:
+        assert len(f.readlines()) == 3
+    assert not (tmp_path / "session_ledger.json").exists()
+
+    ledger.record_sale("NVDA", 20, 90.0)  # oversell clamps to flat; 4th record compacts
+    assert ledger.get_session_quantity("NVDA") == 0.0
+    with open(path + ".journal") as f:
+        assert f.read() == ""
+    ledger.record_purchase("AMD", 3, 50.0)
+
+    reopened = SessionLedger(path)
+    assert reopened.data["positions"] == ledger.data["positions"]
+    assert len(reopened.get_audit_trail("NVDA")) == 4 and reopened.is_job_c_holding("AMD")
+
+    # Crash after the snapshot replace but before the journal was emptied: no double count
+    with open(path + ".journal", "a") as f:
+        for entry in reopened.get_audit_trail("NVDA"):
+            f.write(json.dumps({"ticker": "NVDA", **entry}) + "\n")
+    assert SessionLedger(path).data["positions"] == ledger.data["positions"]
+
+
+def test_oversell_carries_forward(tmp_path):
+    ledger = SessionLedger(str(tmp_path / "session_ledger.json"))
+    ledger.record_purchase("NVDA", 10, 100.0)
+    ledger.record_sale("NVDA", 15, 120.0)
+    assert ledger.get_session_quantity("NVDA") == 0.0 and not ledger.is_job_c_holding("NVDA")
+    # Same answer as summing the trades: the next buy first covers the 5 oversold
+    ledger.record_purchase("NVDA", 10, 110.0)
+    position = ledger.get_session_position("NVDA")
+    assert position["quantity"] == 5 and position["avg_price"] == pytest.approx(110.0)
+    assert SessionLedger(ledger.filepath).data["positions"] == ledger.data["positions"]
+
+
+def test_legacy_ledger_file(tmp_path):
+    today = datetime.utcnow().strftime('%Y-%m-%d')
+    path = tmp_path / "session_ledger.json"
+    path.write_text(json.dumps({"date": today, "trades": {"TSLA": [
+        {"timestamp": "x", "side": "BUY", "quantity": 4, "price": 200.0, "session_date": today},
+        {"timestamp": "x", "side": "BUY", "quantity": 9, "price": 150.0, "session_date": "2024-01-02"},
+    ]}}))
+    ledger = SessionLedger(str(path))
+    assert ledger.get_session_quantity("TSLA") == 4
+    ledger.record_purchase("TSLA", 1, 210.0)
+    assert ledger.get_session_position("TSLA")["avg_price"] == pytest.approx(202.0)
+
+
+def test_session_manager_records_fills(tmp_path):
+    ledger = SessionLedger(str(tmp_path / "session_ledger.json"))
+    manager = SessionManager(str(tmp_path / "session_whitelist.json"), ledger=ledger)
+    manager.add_ticker("NVDA", 5, 100.0)
+    manager.add_ticker("NVDA", 5, 104.0)
+    manager.record_sale("NVDA", 4, 110.0)
+    assert manager.is_whitelisted("NVDA") and not manager.is_whitelisted("AAPL")
+    assert ledger.get_session_quantity("NVDA") == 6
+
+    reloaded = SessionManager(str(tmp_path / "session_whitelist.json"), ledger=ledger)
+    assert reloaded.get_whitelist() == ["NVDA"]
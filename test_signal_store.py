@@ -0,0 +1,106 @@
+"""
+Signal Store Test
+Checks signal normalization, range/last-N queries, that the rolling
+z-scores maintained at append time match a full recomputation (including
+after the store is reopened), and that re-polling a reading the source has
+not updated adds no sample.
+"""
+import statistics
+
+from alt_data_engine import AltDataCollector
+from shared.signal_store import (DEFAULT_WINDOW, SIGNAL_WINDOWS, SignalStore, RollingStats, extract_signals,
+                                 source_timestamp)
+
+
+def test_extract_signals():
+    assert extract_signals("fear_and_greed", {"value": "24", "sentiment": "Extreme Fear"}) == {"fear_greed": 24.0}
+    assert extract_signals("fear_and_greed", {}) == {}
+    assert extract_signals("pytrends", {"market crash": 40, "buy the dip": 10, "isPartial": True}) == \
+        {"trend.market_crash": 40.0, "trend.buy_the_dip": 10.0}
+    assert extract_signals("rss_breaking", ["a", "b"]) == {"headlines.rss_breaking": 2.0}
+    reddit = extract_signals("reddit", ["$NVDA to the moon", "$NVDA $TSLA puts", "no tickers"])
+    assert reddit == {"reddit.posts": 3.0, "reddit.mentions": 3.0, "reddit.mentions.NVDA": 2.0,
+                      "reddit.mentions.TSLA": 1.0}
+    assert extract_signals("unknown", {"value": 1}) == {}
+    assert source_timestamp("fear_and_greed", {"value": "24", "timestamp": "1700006400"}) == 1700006400.0
+    assert source_timestamp("macro_data", {"date": "2024-05-01", "value": "5.33"}) == 1714521600.0
+    assert source_timestamp("fear_and_greed", {"value": "24"}) is None
+    assert source_timestamp("reddit", ["$NVDA"]) is None
+
+
+def test_rolling_zscores_match_recomputation(tmp_path):
+    path = tmp_path / "alt_signals.db"
+    values = [50, 48, 45, 47, 30, 28, 35, 60, 62, 20, 25, 26]
+    store = SignalStore(path, window=5)
+    for i, value in enumerate(values[:8]):
+        store.append("fear_greed", value, ts=1000.0 + i)
+    store.close()
+
+    # Reopening rebuilds the window from the last rows
+    store = SignalStore(path, window=5)
+    for i, value in enumerate(values[8:], start=8):
+        store.append("fear_greed", value, ts=1000.0 + i)
+
+    for i, sample in enumerate(store.last("fear_greed", len(values))):
+        window = values[max(0, i - 4):i + 1]
+        expected = (values[i] - statistics.fmean(window)) / statistics.pstdev(window) if len(window) > 1 else 0.0
+        assert abs(sample.z - expected) < 1e-9, (i, sample.z, expected)
+
+    assert [s.value for s in store.last("fear_greed", 3)] == [20.0, 25.0, 26.0]
+    assert [s.ts for s in store.range("fear_greed", 1002.0, 1004.0)] == [1002.0, 1003.0, 1004.0]
+    assert store.latest("fear_greed").value == 26.0 and store.change("fear_greed", 3) == 26.0 - 62.0
+    assert store.latest("missing") is None and store.last("missing", 5) == []
+
+    reader = SignalStore(path, readonly=True)
+    assert reader.latest("fear_greed") == store.latest("fear_greed")
+    assert RollingStats(5, [1, 1, 1]).zscore(1) == 0.0
+
+
+def test_collector_appends_fresh_fetches(tmp_path, monkeypatch):
+    import alt_data_engine
+    monkeypatch.setattr(alt_data_engine, "DATA_FILE", str(tmp_path / "sentiment_snapshot.json"))
+    store = SignalStore(tmp_path / "alt_signals.db")
+    readings = iter([{"value": "40", "timestamp": "1700000000"}, {"value": "40", "timestamp": "1700000000"},
+                     {"value": "35", "timestamp": "1700086400"}, {"value": "30", "timestamp": "1700172800"}])
+    collector = AltDataCollector({"fear_and_greed": (lambda: next(readings), 0, 1)}, tick=0.01, store=store)
+    try:
+        for _ in range(4):
+            while not collector.step():
+                pass
+    finally:
+        collector.shutdown()
+    reader = SignalStore(tmp_path / "alt_signals.db", readonly=True)
+    assert [s.value for s in reader.last("fear_greed", 10)] == [40.0, 35.0, 30.0]
+    assert reader.latest("fear_greed").ts == 1700172800.0
+
+
+def test_unchanged_readings_add_no_samples(tmp_path):
+    path = tmp_path / "alt_signals.db"
+    store = SignalStore(path)
+    # Fear & Greed is published once a day and polled every few minutes: keyed on its own timestamp
+    for day, polls in enumerate([(24, 24, 24), (24, 24), (31,)]):
+        for value in polls:
+            store.append("fear_greed", value, ts=1700000000.0 + day * 86400)
+    assert [s.value for s in store.last("fear_greed", 10)] == [24.0, 24.0, 31.0]
+    assert store.append("fear_greed", 40, ts=1700000000.0) is None  # older than the newest sample
+
+    # No source timestamp: only a changed value is a new reading
+    for value in (5, 5, 5, 6, 6, 5):
+        store.append("headlines.rss_breaking", value)
+    assert [s.value for s in store.last("headlines.rss_breaking", 10)] == [5.0, 6.0, 5.0]
+    store.close()
+
+    # The newest sample survives a reopen
+    store = SignalStore(path)
+    assert store.append("headlines.rss_breaking", 5) is None
+    assert store.append("fear_greed", 31, ts=1700000000.0 + 2 * 86400) is None
+    assert store.window_for("fear_greed") == SIGNAL_WINDOWS["fear_greed"]
+    assert store.window_for("reddit.posts") == DEFAULT_WINDOW and SignalStore(path, window=5).window_for("fear_greed") == 5
+
+    # A day's worth of identical polls leaves the z-score window measured in daily readings
+    for day in range(3, 40):
+        store.append("fear_greed", 20 + day % 7, ts=1700000000.0 + day * 86400)
+        for _ in range(3):
+            store.append("fear_greed", 20 + day % 7, ts=1700000000.0 + day * 86400)
+    assert len(store._rolling(store._signal_id("fear_greed"), "fear_greed").values) == SIGNAL_WINDOWS["fear_greed"]
+    assert len(store.last("fear_greed", 100)) == 40
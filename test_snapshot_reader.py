@@ -0,0 +1,66 @@
+"""
+Snapshot Reader Test
+Checks that the sentiment snapshot is parsed once per file version, that
+derived fields match the bridge's historical semantics, and that torn
+writes and stale snapshots are handled.
+"""
+import json
+import os
+from datetime import datetime, timedelta
+
+from shared import alt_data_bridge
+from shared.snapshot_reader import SnapshotReader, EMPTY
+
+
+def write_snapshot(path, data, age_hours=0.0):
+    ts = (datetime.now() - timedelta(hours=age_hours)).isoformat()
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({"timestamp": ts, "data": data}, f)
+    os.replace(tmp, path)
+
+
+def test_parses_once_per_version(tmp_path):
+    path = tmp_path / "sentiment_snapshot.json"
+    reader = SnapshotReader([tmp_path / "missing.json", path], recheck_interval=0)
+    assert reader.read() is EMPTY and reader.read().score == 0.5
+
+    write_snapshot(path, {"fear_and_greed": {"value": "72", "sentiment": "Greed"},
+                          "pytrends": {"market crash": 10, "buy the dip": 30}})
+    view = reader.read()
+    assert view.fear_greed == 72 and view.score == round((0.72 + 0.75) / 2, 3)
+    for _ in range(100):
+        assert reader.read() is view
+    assert reader.loads == 1
+
+    write_snapshot(path, {"fear_and_greed": {"value": 15}})
+    assert reader.read().fear_greed == 15 and reader.loads == 2
+
+    # A torn write keeps serving the last good version
+    path.write_text('{"timestamp": "2025-')
+    assert reader.read().fear_greed == 15
+
+
+def test_staleness_and_memo(tmp_path):
+    path = tmp_path / "sentiment_snapshot.json"
+    write_snapshot(path, {"fear_and_greed": {"value": 0}}, age_hours=3)
+    view = SnapshotReader([path]).read()
+    assert view.fear_greed == 0 and view.score == 0.0  # 0 is Extreme Fear, not "missing"
+    assert view.is_stale(2) and not view.is_stale(4) and 2.9 < view.age_hours() < 3.1
+
+    calls = []
+    for _ in range(3):
+        view.memo("gate", lambda: calls.append(1) or "blocked")
+    assert calls == [1]
+
+
+def test_bridge_accessors(tmp_path, monkeypatch):
+    path = tmp_path / "sentiment_snapshot.json"
+    write_snapshot(path, {"fear_and_greed": {"value": "40"}, "cryptopanic": [{"title": "BTC"}],
+                          "rss_breaking": ["Fed holds"]})
+    monkeypatch.setattr(alt_data_bridge, "_reader", SnapshotReader([path]))
+    assert alt_data_bridge.get_market_sentiment_score() == 0.4
+    assert alt_data_bridge.get_crypto_fear_greed() == {"value": "40"}
+    assert alt_data_bridge.get_crypto_news() == [{"title": "BTC"}]
+    assert alt_data_bridge.get_breaking_headlines() == ["Fed holds"]
+    assert alt_data_bridge._reader.loads == 1
@@ -0,0 +1,44 @@
+"""
+Startup Budget Test
+Fails if any entry point's cumulative import time exceeds its budget
+(see STARTUP_BUDGETS_MS in startup_profiler.py).
+"""
+import pytest
+
+from startup_profiler import ENTRY_POINTS, STARTUP_BUDGETS_MS, profile_entry_point, format_report
+
+# Best-of-N damps disk-cache noise on the first cold import
+RUNS = 2
+
+
+@pytest.mark.parametrize("label", sorted(ENTRY_POINTS))
+def test_entry_point_within_budget(label):
+    results = [profile_entry_point(label) for _ in range(RUNS)]
+    best = min(results, key=lambda r: r["total_ms"])
+
+    if not best["ok"]:
+        if "ModuleNotFoundError" in (best["error"] or ""):
+            pytest.skip(f"{label}: dependency not installed ({best['error']})")
+        pytest.fail(f"{label} failed to import: {best['error']}")
+
+    print(format_report(best, top=10))
+    budget = STARTUP_BUDGETS_MS[label]
+    assert best["total_ms"] <= budget, (
+        f"{label} imports in {best['total_ms']:.0f}ms (budget {budget:.0f}ms)"
+    )
+
+
+def test_entry_points_do_not_import_heavy_stack():
+    """The data stack must stay deferred for the Sniper and the Shield."""
+    for label in ("main_bot", "orb_shield"):
+        result = profile_entry_point(label)
+        if not result["ok"]:
+            pytest.skip(f"{label}: {result['error']}")
+        imported = {r["module"] for r in result["modules"]}
+        for heavy in ("pandas", "yfinance", "google.generativeai", "sqlite3"):
+            assert heavy not in imported, f"{label} eagerly imports {heavy}"
+
+
+if __name__ == "__main__":
+    for label in ENTRY_POINTS:
+        print(format_report(profile_entry_point(label)))
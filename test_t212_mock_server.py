@@ -0,0 +1,123 @@
+"""
+T212 Mock Server Test
+Drives Trading212Client and T212LedgerSync against the local stand-in:
+account/portfolio reads, limit-order fills (full and partial), cancels,
+HTML 429 and 5xx pages, latency distributions and cursor-paged history.
+"""
+import json
+import random
+import time
+
+import pytest
+import requests
+
+from cost_basis import normalize_order
+from t212_mock_server import T212MockServer, parse_latency
+
+
+@pytest.fixture
+def client_for(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TRADING212_API_KEY", "mock-key")
+    monkeypatch.setenv("TRADING212_API_SECRET", "mock-secret")
+    servers = []
+
+    def build(**kwargs):
+        kwargs = dict({"latency": "0", "rate_limits": {}, "seed": 7}, **kwargs)
+        mock = T212MockServer(**kwargs).start()
+        servers.append(mock)
+        (tmp_path / "data").mkdir(exist_ok=True)
+        (tmp_path / "data" / "master_instruments.json").write_text(json.dumps(mock._instruments({})))
+        from trading212_client import Trading212Client
+        return mock, Trading212Client(base_url=mock.base_url)
+
+    yield build
+    for mock in servers:
+        mock.stop()
+
+
+def test_account_orders_and_fills(client_for):
+    mock, client = client_for(cash=5000.0)
+    assert client.get_positions() == []
+    assert client.get_account_info()["cash"]["availableToTrade"] == 5000.0
+
+    order = client.place_limit_order("NVDA", 10, 185.0)  # marketable (mock price 180)
+    assert order["status"] == "FILLED" and order["filledQuantity"] == 10
+    sold = client.place_limit_order("NVDA", 4, 175.0, side="SELL")
+    assert sold["filledQuantity"] == -4
+    [position] = client.get_positions()
+    assert position["ticker"] == "NVDA_US_EQ" and position["quantity"] == 6 and position["averagePrice"] == 180.0
+
+    resting = client.place_limit_order("TSLA", 2, 400.0)  # below the 420 market: rests
+    assert [o["id"] for o in client.get_open_orders()] == [resting["id"]]
+    assert client.get_account_summary()["blocked"] == 800.0
+    assert client.cancel_order(resting["id"]) == {}
+    assert client.get_open_orders() == []
+
+    assert client.place_limit_order("NVDA", 100, 185.0)["error"].startswith("400: Insufficient")
+    assert client.place_limit_order("AMD", 1, 150.0, side="SELL")["error"].startswith("400:")
+    assert client.get_account_summary()["free"] == pytest.approx(5000.0 - 6 * 180.0)
+
+
+def test_partial_fills_complete_over_polls(client_for):
+    mock, client = client_for(partial_fill_rate=1.0, fill_delay=0.0)
+    order = client.place_limit_order("AAPL", 10, 240.0)
+    assert order["status"] == "PARTIALLY_FILLED" and 0 < order["filledQuantity"] < 10
+
+    for _ in range(200):
+        if not client.get_open_orders():
+            break
+    history = requests.get(f"{mock.base_url}/equity/history/orders", headers=client.headers).json()["items"]
+    fill = normalize_order(history[0])
+    assert history[0]["order"]["status"] == "FILLED"
+    assert fill["quantity"] == pytest.approx(10) and fill["price"] == 230.0
+
+
+def test_rate_limits_and_error_pages(client_for):
+    mock, client = client_for(rate_limits=None)  # T212's published windows
+    assert "cash" in client.get_account_info()
+    limited = client.get_account_info()
+    assert limited["status"] == "FAILED" and "429" in limited["error"] and "Non-JSON" in limited["error"]
+    res = requests.get(f"{mock.base_url}/equity/account/summary", headers=client.headers)
+    assert res.status_code == 429 and res.text.startswith("<!DOCTYPE html>")
+    assert res.headers["x-ratelimit-remaining"] == "0" and res.headers["x-ratelimit-period"] == "5"
+
+    mock.html_429 = False
+    assert requests.get(f"{mock.base_url}/equity/account/summary", headers=client.headers).json()["code"] == "TooManyRequests"
+
+    mock.error_rate = 1.0
+    outage = client.get_positions()
+    assert outage["status"] == "FAILED" and ("502" in outage["error"] or "503" in outage["error"])
+    assert requests.get(f"{mock.base_url}/equity/portfolio").status_code == 401
+    assert mock.stats()["status"]["429"] == 3
+
+
+def test_latency_distributions():
+    rng = random.Random(1)
+    assert parse_latency("0")(rng) == 0 and parse_latency("fixed:50")(rng) == 0.05
+    assert all(0.02 <= parse_latency("uniform:20:80")(rng) <= 0.08 for _ in range(100))
+    samples = sorted(parse_latency("lognormal:40:0.5")(rng) for _ in range(2001))
+    assert samples[1000] == pytest.approx(0.04, rel=0.1)
+    with pytest.raises(ValueError):
+        parse_latency("pareto:1")
+
+    with T212MockServer(latency="0", latency_overrides={"GET /equity/portfolio": "fixed:120"},
+                        rate_limits={}) as mock:
+        start = time.perf_counter()
+        requests.get(f"{mock.base_url}/equity/portfolio", headers={"Authorization": "k"})
+        assert time.perf_counter() - start >= 0.12
+
+
+def test_history_cursor_paging(tmp_path, monkeypatch):
+    monkeypatch.setenv("T212_API_TRADE_KEY", "key")
+    monkeypatch.setenv("T212_COST_BASIS_DB", str(tmp_path / "cost_basis.db"))
+    from sync_ledger import T212LedgerSync
+
+    with T212MockServer(latency="0", history=120, seed=3) as mock:  # 6 history requests per minute
+        sync = T212LedgerSync(base_url=mock.base_url)
+        pages = list(sync._history_pages())
+        assert [len(items) for items, _ in pages] == [50, 50, 20]
+        assert pages[0][1] == "/api/v0/equity/history/orders?limit=50&cursor=71"
+        ids = [item["order"]["id"] for items, _ in pages for item in items]
+        assert ids == sorted(ids, reverse=True) and len(set(ids)) == 120
+        assert sync.sync_order_history() == 120
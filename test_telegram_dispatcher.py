@@ -0,0 +1,137 @@
+"""
+Telegram Dispatcher Test
+Verifies enqueue never blocks, bursts coalesce, per-chat rate limits hold
+flush delivers everything before returning, and a 429 part-way through a
+split message resends only the chunks not yet delivered, and a closed
+dispatcher refuses new messages.
+"""
+import threading
+import time
+
+from telegram_dispatcher import TelegramDispatcher, MAX_MESSAGE_CHARS, _RetryAfter
+
+
+class RecordingSender:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, text):
+        time.sleep(self.delay)
+        with self.lock:
+            self.calls.append((time.monotonic(), text))
+
+
+def test_enqueue_does_not_block_on_slow_sender():
+    sender = RecordingSender(delay=0.5)
+    d = TelegramDispatcher(coalesce_window=0.0, per_chat_interval=0.0)
+
+    start = time.perf_counter()
+    for i in range(20):
+        assert d.enqueue_via("chat", f"alert {i}", sender)
+    elapsed = time.perf_counter() - start
+
+    print(f"20 enqueues in {elapsed * 1000:.2f}ms")
+    assert elapsed < 0.1
+    assert d.flush(timeout=10)
+
+
+def test_burst_is_coalesced_into_one_message():
+    sender = RecordingSender()
+    d = TelegramDispatcher(coalesce_window=0.2)
+    for i in range(5):
+        d.enqueue_via("chat", f"line {i}", sender)
+    assert d.flush(timeout=5)
+
+    assert len(sender.calls) == 1
+    assert sender.calls[0][1] == "\n\n".join(f"line {i}" for i in range(5))
+    assert d.stats["coalesced"] == 4
+
+
+def test_coalesced_batches_respect_message_limit():
+    sender = RecordingSender()
+    d = TelegramDispatcher(coalesce_window=0.2, per_chat_interval=0.0)
+    chunk = "x" * (MAX_MESSAGE_CHARS // 2)
+    for _ in range(4):
+        d.enqueue_via("chat", chunk, sender)
+    assert d.flush(timeout=5)
+
+    assert all(len(text) <= MAX_MESSAGE_CHARS for _, text in sender.calls)
+    assert sum(text.count("x") for _, text in sender.calls) == 4 * len(chunk)
+
+
+def test_per_chat_rate_limit_spaces_sends():
+    sender = RecordingSender()
+    d = TelegramDispatcher(coalesce_window=0.0, per_chat_interval=0.3)
+    d.enqueue_via("chat", "first", sender)
+    assert d.flush(timeout=5)
+    d.enqueue_via("chat", "second", sender)
+    assert d.flush(timeout=5)
+
+    (t1, _), (t2, _) = sender.calls
+    assert t2 - t1 >= 0.28
+
+
+def test_full_queue_drops_instead_of_blocking():
+    gate = threading.Event()
+    d = TelegramDispatcher(max_queue=2, coalesce_window=0.0)
+    # Park the worker inside a send so the queue can fill up
+    d.enqueue_via("block", "hold", lambda _: gate.wait(5))
+    time.sleep(0.1)
+
+    results = [d.enqueue_via("chat", str(i), lambda _: None) for i in range(5)]
+    gate.set()
+
+    assert results.count(False) >= 1
+    assert d.stats["dropped"] == results.count(False)
+    assert d.flush(timeout=5)
+
+
+def test_rate_limit_mid_split_resends_only_the_rest():
+    sender = RecordingSender()
+    limited = []
+
+    def flaky(text):
+        # Telegram answers 429 once, on the second chunk
+        if len(sender.calls) == 1 and not limited:
+            limited.append(text)
+            raise _RetryAfter(0.1)
+        sender(text)
+
+    d = TelegramDispatcher(coalesce_window=0.0, per_chat_interval=0.0)
+    message = "a" * MAX_MESSAGE_CHARS + "b" * MAX_MESSAGE_CHARS + "c" * 10
+    d.enqueue_via("chat", message, flaky)
+    assert d.flush(timeout=5)
+
+    assert [text[0] for _, text in sender.calls] == ["a", "b", "c"]
+    assert "".join(text for _, text in sender.calls) == message
+    assert limited == ["b" * MAX_MESSAGE_CHARS]
+    assert d.stats["rate_limited"] == 1 and d.stats["sent"] == 1
+
+
+def test_enqueue_after_close_is_refused():
+    sender = RecordingSender(delay=0.2)
+    d = TelegramDispatcher(coalesce_window=0.0, per_chat_interval=0.0)
+    assert d.enqueue_via("chat", "before close", sender)
+    # close() is still flushing when this arrives: refused, not queued behind the flush
+    closer = threading.Thread(target=d.close)
+    closer.start()
+    time.sleep(0.05)
+    assert not d.enqueue_via("chat", "during close", sender)
+    closer.join(timeout=5)
+    assert not d.enqueue_via("chat", "after close", sender)
+
+    assert [text for _, text in sender.calls] == ["before close"]
+    assert d.stats["dropped"] == 2 and d.stats["enqueued"] == 1
+
+
+if __name__ == "__main__":
+    test_enqueue_does_not_block_on_slow_sender()
+    test_burst_is_coalesced_into_one_message()
+    test_coalesced_batches_respect_message_limit()
+    test_per_chat_rate_limit_spaces_sends()
+    test_full_queue_drops_instead_of_blocking()
+    test_rate_limit_mid_split_resends_only_the_rest()
+    test_enqueue_after_close_is_refused()
+    print("✅ All dispatcher tests passed")
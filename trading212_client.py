@@ -1,15 +1,19 @@
 import os, requests, base64, json
 from dotenv import load_dotenv
+from telegram_dispatcher import get_dispatcher
 
 # Load environment variables from .env file
 load_dotenv()
 
+LIVE_BASE_URL = "https://live.trading212.com/api/v0"
+
 class Trading212Client:
-    def __init__(self):
+    def __init__(self, base_url=None):
         # 1. AUTHENTICATION (37-Char Key Support)
         self.api_key = os.getenv('TRADING212_API_KEY')
         self.api_secret = os.getenv('TRADING212_API_SECRET')
-        self.base_url = "https://live.trading212.com/api/v0"
+        # T212_BASE_URL points the client at a stand-in (e.g. t212_mock_server.py)
+        self.base_url = (base_url or os.getenv('T212_BASE_URL') or LIVE_BASE_URL).rstrip('/')
         
         # 2. PERSISTENT TELEGRAM CONFIG
         self.bot_token = os.getenv('TELEGRAM_TOKEN', "8585563319:AAH0wx3peZycxqG1KC9q7FMuSwBw2ps1TGA")
@@ -262,7 +266,11 @@ class Trading212Client:
         return f"Gemini All Models Failed. Last Error: {last_error}"
 
     def send_telegram(self, message, use_krypto_channel=False):
-        """Sends message to Telegram, splitting if > 4096 chars"""
+        """
+        Queues message for Telegram and returns immediately.
+        Delivery (splitting > 4096 chars, rate limits, Markdown fallback)
+        happens on the background dispatcher so it never blocks trading.
+        """
         # Select channel based on flag
         if use_krypto_channel:
             bot_token = os.getenv('TELEGRAM_TOKEN_KRYPTO', self.bot_token)
@@ -270,21 +278,8 @@ class Trading212Client:
         else:
             bot_token = self.bot_token
             chat_id = self.chat_id
-            
-        url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-        
-        # Split into chunks of 4000 to be safe (limit is 4096)
-        chunk_size = 4000
-        
-        for i in range(0, len(message), chunk_size):
-            chunk = message[i:i+chunk_size]
-            try:
-                res = requests.post(url, data={"chat_id": chat_id, "text": chunk, "parse_mode": "Markdown"})
-                if res.status_code != 200:
-                    # Fallback: Try without Markdown if parsing fails (common with special chars)
-                    requests.post(url, data={"chat_id": chat_id, "text": chunk})
-            except Exception as e:
-                print(f"⚠️ Telegram Send Error: {e}")
+
+        return get_dispatcher().enqueue(message, chat_id, bot_token)
 
     # --- SECTION C: DATA INTEGRITY (Neon Sentry) ---
     def sync_master_list(self):
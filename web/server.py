@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 from trading212_client import Trading212Client
 from auditor import TradingAuditor
 from macro_clock import MacroClock
+from security_metadata import get_security_metadata
 from datetime import datetime
 
 app = Flask(__name__)
@@ -27,6 +28,7 @@ STATE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "live_state.j
 EOD_BALANCE_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "eod_balance.json")
 EQUITY_HISTORY_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "equity_history.json")
 SNIPER_TARGETS_FILE = os.path.join(os.path.dirname(__file__), "..", "data", "job_c_targets.json")
+METADATA_DB = os.path.join(os.path.dirname(__file__), "..", "data", "security_metadata.db")
 
 @app.route('/')
 def index():
@@ -108,6 +110,12 @@ def live_data():
         enriched_positions = []
         
         if isinstance(positions, list):
+            # Missing/expired sectors are refreshed off the request thread
+            get_security_metadata(METADATA_DB).prefetch_in_background([p.get('ticker') for p in positions])
+            for pos in positions:
+                ticker = pos.get('ticker', '')
+                qty = float(pos.get('quantity', 0.0))
+
                 # Normalize prices upfront
                 avg_price = auditor.normalize_uk_price(ticker, pos.get('averagePrice', 0.0))
                 current_price = auditor.normalize_uk_price(ticker, pos.get('currentPrice', 0.0))
@@ -286,40 +294,8 @@ def log_equity_curve(total_wealth):
     except Exception as e: print(f"⚠️ Equity log error: {e}")
 
 def get_sector_for_ticker(ticker):
-    """Simple sector mapping - can be enhanced with Trading212 instrument metadata"""
-    sector_map = {
-        "AAPL": "Technology",
-        "MSFT": "Technology",
-        "NVDA": "Technology",
-        "GOOGL": "Technology",
-        "META": "Technology",
-        "AMZN": "Consumer Discretionary",
-        "TSLA": "Consumer Discretionary",
-        "JNJ": "Healthcare",
-        "PFE": "Healthcare",
-        "UNH": "Healthcare",
-        "XOM": "Energy",
-        "CVX": "Energy",
-        "COP": "Energy",
-        "JPM": "Financials",
-        "BAC": "Financials",
-        "WFC": "Financials",
-        "CAT": "Industrials",
-        "BA": "Industrials",
-        "HON": "Industrials",
-        "PG": "Consumer Staples",
-        "KO": "Consumer Staples",
-        "WMT": "Consumer Staples",
-        "NEE": "Utilities",
-        "DUK": "Utilities",
-        "SO": "Utilities",
-        "FCX": "Materials",
-        "NEM": "Materials",
-        "LIN": "Materials"
-    }
-    
-    clean_ticker = ticker.replace('_US_EQ', '').replace('_UK_EQ', '')
-    return sector_map.get(clean_ticker, "Other")
+    """Sector from the security metadata cache ("Other" until it has been prefetched)"""
+    return get_security_metadata(METADATA_DB).sector(ticker, default="Other")
 
 def determine_market_phase(session_pnl, total_wealth):
     """Determine market phase based on portfolio performance"""